@@ -0,0 +1,133 @@
+"""Persistent cache for accelerator detection results"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import platform
+import shutil
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from ramalama.logger import logger
+
+ACCEL_CACHE_VERSION = 1
+
+# PCI base classes of display controllers (0x03) and processing accelerators (0x12)
+PCI_ACCEL_CLASSES = ("0x03", "0x12")
+
+DRIVER_MODULES = ("nvidia", "amdgpu", "i915", "xe", "mtgpu", "drv_davinci")
+VENDOR_TOOLS = ("nvidia-smi", "nvidia-ctk", "npu-smi", "mthreads-gmi")
+CDI_SPEC_DIRS = ("var/run/cdi", "etc/cdi")
+
+
+def default_cache_path() -> Optional[str]:
+    """
+    Location of the cache file. RAMALAMA_ACCEL_CACHE overrides it; setting it to an
+    empty string disables the cache.
+    """
+    path = os.getenv("RAMALAMA_ACCEL_CACHE")
+    if path is not None:
+        return path or None
+    cache_home = os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(cache_home, "ramalama", "accel.json")
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def _pci_devices(root: str) -> list[str]:
+    devices = []
+    for device in sorted(glob.glob(os.path.join(root, "sys/bus/pci/devices/*"))):
+        pci_class = _read(os.path.join(device, "class"))
+        if not pci_class.startswith(PCI_ACCEL_CLASSES):
+            continue
+        vendor = _read(os.path.join(device, "vendor"))
+        device_id = _read(os.path.join(device, "device"))
+        devices.append(f"{os.path.basename(device)} {vendor}:{device_id} {pci_class}")
+    return devices
+
+
+def _driver_modules(root: str) -> dict[str, str]:
+    modules = {}
+    for module in DRIVER_MODULES:
+        module_dir = os.path.join(root, "sys/module", module)
+        if os.path.isdir(module_dir):
+            modules[module] = _read(os.path.join(module_dir, "version")) or _read(
+                os.path.join(module_dir, "srcversion")
+            )
+    return modules
+
+
+def _cdi_specs(root: str) -> list[tuple[str, int]]:
+    specs = []
+    for spec_dir in CDI_SPEC_DIRS:
+        for path in sorted(glob.glob(os.path.join(root, spec_dir, "**", "*"), recursive=True)):
+            try:
+                specs.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                continue
+    return specs
+
+
+def fingerprint(env_names: Iterable[str], root: str = "/") -> Optional[dict[str, Any]]:
+    """
+    Cheap description of the accelerator-relevant state of the host: GPU and accelerator
+    PCI devices, loaded driver module versions, CDI specs, vendor tools on PATH and the
+    device selection environment. Nothing is executed. Returns None on hosts without
+    sysfs, where detection is not cached.
+    """
+    if platform.system() != "Linux" or not os.path.isdir(os.path.join(root, "sys/bus/pci")):
+        return None
+
+    return {
+        "machine": platform.machine(),
+        "pci": _pci_devices(root),
+        "modules": _driver_modules(root),
+        "device_tree": _read(os.path.join(root, "proc/device-tree/compatible")),
+        "kfd_nodes": len(glob.glob(os.path.join(root, "sys/devices/virtual/kfd/kfd/topology/nodes/*"))),
+        "cdi": [list(spec) for spec in _cdi_specs(root)],
+        "tools": {tool: shutil.which(tool) for tool in VENDOR_TOOLS},
+        "env": {name: os.environ.get(name) for name in sorted(env_names)},
+    }
+
+
+def load(path: str, host_fingerprint: dict[str, Any]) -> Optional[tuple[str, dict[str, str]]]:
+    """Return the cached accelerator and the environment it set, if the host is unchanged."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != ACCEL_CACHE_VERSION or data.get("fingerprint") != host_fingerprint:
+        return None
+    return data["accel"], data.get("env", {})
+
+
+def save(path: str, host_fingerprint: dict[str, Any], accel: str, env: dict[str, str]) -> None:
+    data = {"version": ACCEL_CACHE_VERSION, "fingerprint": host_fingerprint, "accel": accel, "env": env}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Failed to write accelerator cache {path}: {e}")
+
+
+def invalidate(path: Optional[str]) -> None:
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Failed to remove accelerator cache {path}: {e}")
@@ -84,6 +84,7 @@ class ChatSubArgsType(Protocol):
     list: bool
     model: Optional[str]
     rag: Optional[str]
+    rag_top_k: int
     api_key: Optional[str]
     ARGS: Optional[List[str]]
     max_tokens: Optional[int]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from ramalama.benchmarks.manager import FILTER_COLUMNS, record_model, record_test
+from ramalama.benchmarks.schemas import BenchmarkRecord, BenchmarkRecordV1, ServeBenchRecordV1
+from ramalama.benchmarks.stats import Comparison, compare
+from ramalama.benchmarks.utilities import print_table
+
+
+def parse_selector(selector: str) -> dict[str, str]:
+    """
+    A selector is either a record id, standing for every record of the run that produced
+    it, or comma separated KEY=VALUE filters such as `image=quay.io/ramalama/cuda:0.12`.
+    """
+    if selector.isdigit():
+        return {"run": selector}
+    filters = {}
+    for item in selector.split(","):
+        key, sep, value = item.partition("=")
+        if not sep or key not in FILTER_COLUMNS:
+            raise ValueError(
+                f"invalid benchmark selector '{item}', expected an id or KEY=VALUE with KEY one of "
+                f"{', '.join(FILTER_COLUMNS)}"
+            )
+        filters[key] = value
+    return filters
+
+
+def throughput_samples(record: BenchmarkRecord) -> list[float]:
+    """
+    Tokens per second measured by a record. llama-bench keeps every repetition, so a
+    single record already carries repeated samples; a serving run is one sample.
+    """
+    if isinstance(record, ServeBenchRecordV1):
+        value = record.result.output_token_throughput
+        return [value] if value is not None else []
+    if isinstance(record, BenchmarkRecordV1):
+        result = record.result
+        if result.samples_ts:
+            try:
+                return [float(sample) for sample in json.loads(result.samples_ts)]
+            except (ValueError, TypeError):
+                pass
+        return [result.avg_ts] if result.avg_ts is not None else []
+    return []
+
+
+@dataclass
+class ComparedTest:
+    model: str
+    test: str
+    comparison: Comparison
+
+    @property
+    def verdict(self) -> str:
+        if self.comparison.ci_low is None:
+            return "insufficient samples"
+        if not self.comparison.significant:
+            return "no change"
+        return "improvement" if self.comparison.diff > 0 else "regression"
+
+
+def compare_records(
+    baseline: list[BenchmarkRecord], candidate: list[BenchmarkRecord], match_models: bool = True
+) -> list[ComparedTest]:
+    """
+    Pair up baseline and candidate records measuring the same test and compare their
+    throughput. With match_models the model has to match too; turn it off to compare
+    two models or model digests against each other.
+    """
+
+    def group(records: list[BenchmarkRecord]) -> dict[tuple[str, str], list[float]]:
+        groups: dict[tuple[str, str], list[float]] = defaultdict(list)
+        for record in records:
+            key = (record_model(record) if match_models else "", record_test(record))
+            groups[key].extend(throughput_samples(record))
+        return groups
+
+    base_groups, cand_groups = group(baseline), group(candidate)
+    comparisons = []
+    for key in sorted(base_groups.keys() & cand_groups.keys()):
+        base_samples, cand_samples = base_groups[key], cand_groups[key]
+        if base_samples and cand_samples:
+            comparisons.append(ComparedTest(key[0], key[1], compare(base_samples, cand_samples)))
+    return comparisons
+
+
+def _fmt(value: Optional[float], spec: str = ".2f") -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def comparison_to_dict(item: ComparedTest) -> dict:
+    c = item.comparison
+    return {
+        "model": item.model,
+        "test": item.test,
+        "baseline": {"n": c.baseline.n, "mean": c.baseline.mean, "ci": [c.baseline.ci_low, c.baseline.ci_high]},
+        "candidate": {"n": c.candidate.n, "mean": c.candidate.mean, "ci": [c.candidate.ci_low, c.candidate.ci_high]},
+        "diff": c.diff,
+        "diff_ci": [c.ci_low, c.ci_high],
+        "change_pct": c.change_pct,
+        "significant": c.significant,
+        "verdict": item.verdict,
+    }
+
+
+def print_comparisons(comparisons: list[ComparedTest]) -> None:
+    rows: list[dict[str, Optional[object]]] = []
+    for item in comparisons:
+        c = item.comparison
+        diff_ci = f"[{_fmt(c.ci_low, '+.2f')}, {_fmt(c.ci_high, '+.2f')}]" if c.ci_low is not None else "-"
+        rows.append(
+            {
+                "model": item.model,
+                "test": item.test,
+                "baseline t/s": f"{c.baseline.mean:.2f} ± {c.baseline.mean - c.baseline.ci_low:.2f} (n={c.baseline.n})",
+                "candidate t/s": f"{c.candidate.mean:.2f} ± {c.candidate.mean - c.candidate.ci_low:.2f} "
+                f"(n={c.candidate.n})",
+                "change": f"{_fmt(c.change_pct, '+.1f')}%",
+                "95% CI": diff_ci,
+                "result": item.verdict,
+            }
+        )
+    headers = list(rows[0])
+    if all(not row["model"] for row in rows):
+        headers.remove("model")
+    print_table(headers, rows)
@@ -0,0 +1,250 @@
+"""Load generator driving an OpenAI compatible server, for `ramalama bench --serve`"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.client import HTTPConnection, HTTPException
+from typing import Optional
+from urllib.parse import urlparse
+
+from ramalama.logger import logger
+
+# One short common word per token keeps synthetic prompts close to their target length
+PROMPT_WORD = " hello"
+
+
+@dataclass
+class LengthDistribution:
+    """
+    Token lengths drawn for each request. Written as a fixed length ("128"), an
+    inclusive uniform range ("64-512") or a set of equally likely choices ("128,512,2048").
+    """
+
+    spec: str
+    choices: list[int] = field(default_factory=list)
+    low: int = 0
+    high: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LengthDistribution":
+        try:
+            if "," in spec:
+                choices = [int(value) for value in spec.split(",")]
+                if min(choices) < 1:
+                    raise ValueError
+                return cls(spec=spec, choices=choices)
+            if "-" in spec:
+                low, high = (int(value) for value in spec.split("-", 1))
+                if low < 1 or high < low:
+                    raise ValueError
+                return cls(spec=spec, low=low, high=high)
+            value = int(spec)
+            if value < 1:
+                raise ValueError
+            return cls(spec=spec, low=value, high=value)
+        except ValueError:
+            raise ValueError(f"invalid token length '{spec}', expected N, MIN-MAX or N,N,...") from None
+
+    def sample(self, rng: random.Random) -> int:
+        if self.choices:
+            return rng.choice(self.choices)
+        return rng.randint(self.low, self.high)
+
+
+@dataclass
+class LoadSpec:
+    prompt_tokens: LengthDistribution
+    output_tokens: LengthDistribution
+    num_requests: int = 32
+    concurrency: int = 4
+    # Poisson arrivals per second; 0 sends the next request as soon as a slot frees up
+    request_rate: float = 0.0
+    slo_ttft_ms: float = 1000.0
+    slo_itl_ms: float = 100.0
+    seed: int = 0
+    timeout: float = 600.0
+
+
+@dataclass
+class RequestResult:
+    prompt_tokens: int
+    output_tokens: int = 0
+    ttft: Optional[float] = None
+    latency: Optional[float] = None
+    itls: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.ttft is not None
+
+
+@dataclass
+class LoadReport:
+    requests: list[RequestResult]
+    duration: float
+    spec: LoadSpec
+
+    @property
+    def completed(self) -> list[RequestResult]:
+        return [result for result in self.requests if result.ok]
+
+    def meets_slo(self, result: RequestResult) -> bool:
+        mean_itl = sum(result.itls) / len(result.itls) if result.itls else 0.0
+        return (
+            result.ttft is not None
+            and result.ttft * 1000 <= self.spec.slo_ttft_ms
+            and mean_itl * 1000 <= self.spec.slo_itl_ms
+        )
+
+    def summary(self) -> dict[str, Optional[float]]:
+        completed = self.completed
+        ttfts = [result.ttft * 1000 for result in completed if result.ttft is not None]
+        latencies = [result.latency * 1000 for result in completed if result.latency is not None]
+        itls = [itl * 1000 for result in completed for itl in result.itls]
+        duration = self.duration or math.inf
+
+        summary: dict[str, Optional[float]] = {
+            "completed": len(completed),
+            "failed": len(self.requests) - len(completed),
+            "duration_s": self.duration,
+            "request_throughput": len(completed) / duration,
+            "output_token_throughput": sum(result.output_tokens for result in completed) / duration,
+            "goodput": sum(1 for result in completed if self.meets_slo(result)) / duration,
+        }
+        for name, values in (("ttft_ms", ttfts), ("itl_ms", itls), ("e2e_ms", latencies)):
+            for p in (50, 90, 99):
+                summary[f"{name}_p{p}"] = percentile(values, p)
+        return summary
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """Linearly interpolated percentile, None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def synthetic_prompt(tokens: int) -> str:
+    return "Repeat the following words:" + PROMPT_WORD * max(tokens - 5, 1)
+
+
+class LoadGenerator:
+    """
+    Sends streaming chat completion requests and times every token. With a request rate
+    the arrivals are open loop, so latencies include the time a request queued behind a
+    busy server; without one, `concurrency` clients issue requests back to back.
+    """
+
+    def __init__(self, url: str, model: str, spec: LoadSpec):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.path = parsed.path.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.spec = spec
+
+    def run(self) -> LoadReport:
+        rng = random.Random(self.spec.seed)
+        plan = [
+            (self.spec.prompt_tokens.sample(rng), self.spec.output_tokens.sample(rng))
+            for _ in range(self.spec.num_requests)
+        ]
+        arrivals = self._arrivals(rng)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(self.spec.concurrency, 1)) as executor:
+            futures = []
+            for (prompt_tokens, output_tokens), arrival in zip(plan, arrivals):
+                if arrival is not None:
+                    delay = start + arrival - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    scheduled = start + arrival
+                else:
+                    scheduled = None
+                futures.append(executor.submit(self._request, prompt_tokens, output_tokens, scheduled))
+            results = [future.result() for future in futures]
+        return LoadReport(requests=results, duration=time.perf_counter() - start, spec=self.spec)
+
+    def _arrivals(self, rng: random.Random) -> list[Optional[float]]:
+        if self.spec.request_rate <= 0:
+            return [None] * self.spec.num_requests
+        offsets: list[Optional[float]] = []
+        offset = 0.0
+        for _ in range(self.spec.num_requests):
+            offsets.append(offset)
+            offset += rng.expovariate(self.spec.request_rate)
+        return offsets
+
+    def _request(self, prompt_tokens: int, output_tokens: int, scheduled: Optional[float]) -> RequestResult:
+        result = RequestResult(prompt_tokens=prompt_tokens)
+        body = json.dumps(
+            {
+                "model": self.model,
+                "messages": [{"role": "user", "content": synthetic_prompt(prompt_tokens)}],
+                "max_tokens": output_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+                # llama-server extension: generate exactly max_tokens
+                "ignore_eos": True,
+            }
+        )
+        conn = HTTPConnection(self.host, self.port, timeout=self.spec.timeout)
+        sent = time.perf_counter()
+        start = scheduled if scheduled is not None else sent
+        try:
+            conn.request("POST", self.path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            if response.status != 200:
+                result.error = f"HTTP {response.status}: {response.read()[:200]!r}"
+                return result
+            self._read_stream(response, result, start)
+            result.latency = time.perf_counter() - start
+        except (OSError, HTTPException, ValueError) as e:
+            logger.debug(f"Benchmark request failed: {e}")
+            result.error = str(e)
+        finally:
+            conn.close()
+        return result
+
+    @staticmethod
+    def _read_stream(response, result: RequestResult, start: float) -> None:
+        last: Optional[float] = None
+        chunks = 0
+        usage_tokens: Optional[int] = None
+        for raw_line in response:
+            line = raw_line.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            payload = json.loads(data)
+            if usage := payload.get("usage"):
+                usage_tokens = usage.get("completion_tokens", usage_tokens)
+            choices = payload.get("choices") or []
+            if not any((choice.get("delta") or {}).get("content") for choice in choices):
+                continue
+            now = time.perf_counter()
+            if last is None:
+                result.ttft = now - start
+            else:
+                result.itls.append(now - last)
+            last = now
+            chunks += 1
+        result.output_tokens = usage_tokens if usage_tokens is not None else chunks
+
+
+def run_load(url: str, model: str, spec: LoadSpec) -> LoadReport:
+    return LoadGenerator(url, model, spec).run()
@@ -1,26 +1,127 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import sqlite3
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import asdict
 from functools import cached_property
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from ramalama.benchmarks.errors import MissingStorageFolderError
-from ramalama.benchmarks.schemas import BenchmarkRecord, DeviceInfoV1, get_benchmark_record
-from ramalama.benchmarks.utilities import parse_jsonl
+from ramalama.benchmarks.schemas import (
+    BenchmarkRecord,
+    BenchmarkRecordV1,
+    DeviceInfoV1,
+    ServeBenchRecordV1,
+    get_benchmark_record,
+)
+from ramalama.logger import logger
 
 SCHEMA_VERSION = 1
 BENCHMARKS_FILENAME = "benchmarks.jsonl"
+INDEX_FILENAME = "benchmarks.db"
+
+# Bytes at the start of the JSONL file whose digest tells a rewrite from an append
+HEAD_SIZE = 4096
+
+# Filter keys accepted by list() and compare selectors, mapped to indexed columns
+FILTER_COLUMNS = {
+    "id": "id",
+    "run": "created_at",
+    "model": "model",
+    "digest": "digest",
+    "runtime": "runtime",
+    "engine": "engine",
+    "image": "image",
+    "host": "host",
+    "accel": "accel",
+    "config": "config",
+    "kind": "kind",
+    "test": "test",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    created_at TEXT,
+    model TEXT,
+    digest TEXT,
+    runtime TEXT,
+    engine TEXT,
+    image TEXT,
+    host TEXT,
+    accel TEXT,
+    config TEXT,
+    test TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_model ON records (model);
+CREATE INDEX IF NOT EXISTS records_digest ON records (digest);
+CREATE INDEX IF NOT EXISTS records_runtime ON records (runtime, engine);
+CREATE INDEX IF NOT EXISTS records_image ON records (image);
+CREATE INDEX IF NOT EXISTS records_device ON records (host, accel);
+CREATE INDEX IF NOT EXISTS records_config ON records (config);
+CREATE INDEX IF NOT EXISTS records_created_at ON records (created_at);
+"""
+
+
+def record_model(record: BenchmarkRecord) -> str:
+    if isinstance(record, ServeBenchRecordV1):
+        return record.result.model or ""
+    if isinstance(record, BenchmarkRecordV1):
+        return record.result.model_filename or ""
+    return ""
+
+
+def record_test(record: BenchmarkRecord) -> str:
+    """The workload a record measured; only records with the same test are comparable."""
+    if isinstance(record, ServeBenchRecordV1):
+        r = record.result
+        return f"serve c{r.concurrency} rate{r.request_rate or 0:g} in{r.prompt_tokens} out{r.output_tokens}"
+    if isinstance(record, BenchmarkRecordV1):
+        r = record.result
+        parts = [f"pp{r.n_prompt or 0}", f"tg{r.n_gen or 0}"]
+        for name, value in (
+            ("d", r.n_depth),
+            ("ngl", r.n_gpu_layers),
+            ("t", r.n_threads),
+            ("b", r.n_batch),
+            ("ub", r.n_ubatch),
+            ("fa", r.flash_attn),
+            ("ncmoe", r.n_cpu_moe),
+        ):
+            if value:
+                parts.append(f"{name}{value}")
+        return " ".join(parts)
+    return ""
+
+
+def record_config(record: BenchmarkRecord) -> str:
+    """Short hash of the runtime arguments the benchmark was run with."""
+    runtime_args = getattr(getattr(record, "configuration", None), "runtime_args", None)
+    return hashlib.sha256(json.dumps(runtime_args, sort_keys=True).encode()).hexdigest()[:12]
 
 
 class BenchmarksManager:
+    """
+    Benchmark results are appended to a JSONL file, the durable and portable copy, and
+    indexed in an SQLite database next to it for queries. Lines appended to the JSONL file
+    by any writer, including older RamaLama versions, are imported on the next access.
+    """
+
     def __init__(self, storage_folder: Union[str, Path, None]):
         if storage_folder is None:
             raise MissingStorageFolderError
 
         self.storage_folder = Path(storage_folder)
         self.storage_file = self.storage_folder / BENCHMARKS_FILENAME
+        self.index_file = self.storage_folder / INDEX_FILENAME
         self.storage_file.parent.mkdir(parents=True, exist_ok=True)
 
     @cached_property
@@ -39,9 +140,139 @@ class BenchmarksManager:
                 handle.write(json.dumps(asdict(record), ensure_ascii=True))
                 handle.write("\n")
 
-    def list(self) -> list[BenchmarkRecord]:
-        """List benchmark results from JSONL storage."""
+    def list(
+        self,
+        filters: Optional[Mapping[str, str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[BenchmarkRecord]:
+        """List benchmark results in the order they were saved."""
+        return [record for _, record in self.query(filters, limit, offset)]
+
+    def query(
+        self,
+        filters: Optional[Mapping[str, str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[tuple[int, BenchmarkRecord]]:
+        """Return (id, record) pairs matching all filters; see FILTER_COLUMNS for the keys."""
         if not self.storage_file.exists():
             return []
-        content = self.storage_file.read_text(encoding="utf-8")
-        return [get_benchmark_record(result) for result in parse_jsonl(content)]
+
+        clauses, params = [], []
+        for key, value in (filters or {}).items():
+            if key not in FILTER_COLUMNS:
+                raise ValueError(f"unknown benchmark filter '{key}', expected one of {', '.join(FILTER_COLUMNS)}")
+            if key == "run":
+                clauses.append("created_at = (SELECT created_at FROM records WHERE id = ?)")
+            elif key == "config":
+                clauses.append("config LIKE ? || '%'")
+            else:
+                clauses.append(f"{FILTER_COLUMNS[key]} = ?")
+            params.append(value)
+
+        sql = "SELECT id, payload FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [(row_id, get_benchmark_record(json.loads(payload))) for row_id, payload in rows]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_file, timeout=30, isolation_level=None)
+        try:
+            conn.executescript(_SCHEMA)
+            self._sync(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _sync(self, conn: sqlite3.Connection) -> None:
+        """Import lines appended to the JSONL file since the last sync."""
+        if not self.storage_file.exists():
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            offset = int(self._meta(conn, "jsonl_offset") or 0)
+            with self.storage_file.open("rb") as handle:
+                stat = os.fstat(handle.fileno())
+                inode = str(stat.st_ino)
+                head = hashlib.sha256(handle.read(min(offset, HEAD_SIZE))).hexdigest()
+                if (
+                    self._meta(conn, "schema_version") != str(SCHEMA_VERSION)
+                    or stat.st_size < offset
+                    or self._meta(conn, "jsonl_inode") not in (None, inode)
+                    or self._meta(conn, "jsonl_head") not in (None, head)
+                ):
+                    # new index, or the JSONL file was replaced or rewritten: rebuild from scratch
+                    conn.execute("DELETE FROM records")
+                    offset = 0
+                if stat.st_size == offset:
+                    conn.execute("COMMIT")
+                    return
+
+                handle.seek(offset)
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        # a writer is still appending this line
+                        break
+                    offset += len(line)
+                    if line.strip():
+                        self._insert_line(conn, line)
+
+                handle.seek(0)
+                head = hashlib.sha256(handle.read(min(offset, HEAD_SIZE))).hexdigest()
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("jsonl_offset", str(offset)),
+                    ("jsonl_inode", inode),
+                    ("jsonl_head", head),
+                    ("schema_version", str(SCHEMA_VERSION)),
+                ],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _insert_line(self, conn: sqlite3.Connection, line: bytes) -> None:
+        """Index one JSONL line; a line that cannot be read, e.g. cut short by a crash, is skipped."""
+        try:
+            self._insert(conn, json.loads(line))
+        except (ValueError, TypeError, KeyError, AttributeError, NotImplementedError) as e:
+            logger.debug(f"Skipping unreadable benchmark record in {self.storage_file}: {e}")
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, payload: dict) -> None:
+        record = get_benchmark_record(payload)
+        configuration = getattr(record, "configuration", None)
+        device = getattr(record, "device", None)
+        conn.execute(
+            "INSERT INTO records (kind, created_at, model, digest, runtime, engine, image, host, accel, config, test, "
+            "payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                payload.get("kind", "llama-bench"),
+                getattr(record, "created_at", None),
+                record_model(record),
+                getattr(configuration, "model_digest", None),
+                getattr(configuration, "inference_engine", None),
+                getattr(configuration, "container_runtime", None),
+                getattr(configuration, "container_image", None),
+                getattr(device, "hostname", None),
+                getattr(device, "accel", None),
+                record_config(record),
+                record_test(record),
+                json.dumps(payload),
+            ),
+        )
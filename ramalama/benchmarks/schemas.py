@@ -50,6 +50,7 @@ class TestConfigurationV1(TestConfiguration):
     inference_engine: str = ""
     version: Literal["v1"] = "v1"
     runtime_args: Optional[list[str]] = None
+    model_digest: Optional[str] = None
 
 
 @dataclass
@@ -109,6 +110,45 @@ class LlamaBenchResultV1(LlamaBenchResult):
         return cls(**{f.name: payload[f.name] for f in fields(cls) if f.name in payload})
 
 
+@dataclass
+class ServeBenchResult:
+    pass
+
+
+@dataclass
+class ServeBenchResultV1(ServeBenchResult):
+    """Latency and throughput seen by clients of a running inference server."""
+
+    version: Literal["v1"] = "v1"
+    model: Optional[str] = None
+    num_requests: Optional[int] = None
+    concurrency: Optional[int] = None
+    request_rate: Optional[float] = None
+    prompt_tokens: Optional[str] = None
+    output_tokens: Optional[str] = None
+    slo_ttft_ms: Optional[float] = None
+    slo_itl_ms: Optional[float] = None
+    completed: Optional[int] = None
+    failed: Optional[int] = None
+    duration_s: Optional[float] = None
+    request_throughput: Optional[float] = None
+    output_token_throughput: Optional[float] = None
+    goodput: Optional[float] = None
+    ttft_ms_p50: Optional[float] = None
+    ttft_ms_p90: Optional[float] = None
+    ttft_ms_p99: Optional[float] = None
+    itl_ms_p50: Optional[float] = None
+    itl_ms_p90: Optional[float] = None
+    itl_ms_p99: Optional[float] = None
+    e2e_ms_p50: Optional[float] = None
+    e2e_ms_p90: Optional[float] = None
+    e2e_ms_p99: Optional[float] = None
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ServeBenchResultV1":
+        return cls(**{f.name: payload[f.name] for f in fields(cls) if f.name in payload})
+
+
 @dataclass
 class BenchmarkRecord:
     pass
@@ -135,6 +175,30 @@ class BenchmarkRecordV1(BenchmarkRecord):
         return cls(configuration=configuration, result=result, **payload)
 
 
+@dataclass
+class ServeBenchRecordV1(BenchmarkRecord):
+    """Result of `ramalama bench --serve`, told apart from llama-bench records by its kind."""
+
+    configuration: TestConfigurationV1
+    result: ServeBenchResultV1
+    version: Literal["v1"] = "v1"
+    kind: Literal["serve"] = "serve"
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    device: DeviceInfoV1 = field(default_factory=DeviceInfoV1.current_device_info)
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ServeBenchRecordV1":
+        payload = {**payload}
+
+        if 'device' in payload:
+            payload['device'] = DeviceInfoV1(**payload.pop("device"))
+
+        configuration = TestConfigurationV1(**payload.pop('configuration', {}))
+        result = ServeBenchResultV1.from_payload(payload.pop('result', {}))
+
+        return cls(configuration=configuration, result=result, **payload)
+
+
 @overload
 def get_device_info(payload: dict) -> DeviceInfoV1: ...
 
@@ -201,6 +265,9 @@ def get_benchmark_record(payload: dict, version: Any = None) -> BenchmarkRecord:
     if version is None:
         version = payload.get('version', "v1")
 
+    if version == "v1" and payload.get("kind") == "serve":
+        return ServeBenchRecordV1.from_payload(payload)
+
     if version == "v1":
         return BenchmarkRecordV1.from_payload(payload)
 
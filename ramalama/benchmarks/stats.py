@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+# Two-sided 95% critical values of Student's t distribution for 1..30 degrees of freedom
+_T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+_T_95_LARGE = ((40, 2.021), (60, 2.000), (120, 1.980))
+
+
+def t_critical(df: float) -> float:
+    """95% two-sided critical value, rounding df down so intervals stay conservative."""
+    df = max(int(df), 1)
+    if df <= len(_T_95):
+        return _T_95[df - 1]
+    value = _T_95[-1]
+    for limit, critical in _T_95_LARGE:
+        if df < limit:
+            return value
+        value = critical
+    return 1.960 if df >= 1000 else value
+
+
+def mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values)
+
+
+def variance(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    m = mean(values)
+    return sum((value - m) ** 2 for value in values) / (len(values) - 1)
+
+
+@dataclass
+class SampleSummary:
+    n: int
+    mean: float
+    stddev: float
+    ci_low: float
+    ci_high: float
+
+    @classmethod
+    def of(cls, values: Sequence[float]) -> "SampleSummary":
+        m = mean(values)
+        sd = math.sqrt(variance(values))
+        half = t_critical(len(values) - 1) * sd / math.sqrt(len(values)) if len(values) > 1 else 0.0
+        return cls(n=len(values), mean=m, stddev=sd, ci_low=m - half, ci_high=m + half)
+
+
+@dataclass
+class Comparison:
+    """Difference of candidate against baseline means, with a Welch 95% confidence interval."""
+
+    baseline: SampleSummary
+    candidate: SampleSummary
+    diff: float
+    ci_low: Optional[float]
+    ci_high: Optional[float]
+
+    @property
+    def change_pct(self) -> Optional[float]:
+        if self.baseline.mean == 0:
+            return None
+        return self.diff / self.baseline.mean * 100
+
+    @property
+    def significant(self) -> bool:
+        if self.ci_low is None or self.ci_high is None:
+            return False
+        return self.ci_low > 0 or self.ci_high < 0
+
+
+def compare(baseline: Sequence[float], candidate: Sequence[float]) -> Comparison:
+    a, b = SampleSummary.of(baseline), SampleSummary.of(candidate)
+    diff = b.mean - a.mean
+    if a.n < 2 or b.n < 2:
+        # without repeated samples on both sides there is no variance to test against
+        return Comparison(a, b, diff, None, None)
+
+    va, vb = a.stddev**2 / a.n, b.stddev**2 / b.n
+    se = math.sqrt(va + vb)
+    if se == 0:
+        return Comparison(a, b, diff, diff, diff)
+    df = (va + vb) ** 2 / (va**2 / (a.n - 1) + vb**2 / (b.n - 1))
+    half = t_critical(df) * se
+    return Comparison(a, b, diff, diff - half, diff + half)
@@ -0,0 +1,198 @@
+"""Parameter search for `ramalama bench --tune` and the tuned profiles it saves"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ramalama.benchmarks.errors import MissingStorageFolderError
+from ramalama.benchmarks.schemas import DeviceInfoV1
+from ramalama.logger import logger
+
+TUNED_PROFILES_VERSION = 1
+TUNED_PROFILES_FILENAME = "tuned.json"
+
+# (batch, ubatch) pairs tried; llama.cpp requires ubatch <= batch
+BATCH_SIZES = ((512, 128), (512, 512), (1024, 256), (2048, 512))
+
+# llama-server flags that set each tuned value; a tuned value is not applied over them
+RUNTIME_FLAGS = {
+    "threads": ("-t", "--threads"),
+    "batch_size": ("-b", "--batch-size"),
+    "ubatch_size": ("-ub", "--ubatch-size"),
+    "flash_attn": ("-fa", "--flash-attn"),
+    "ngl": ("-ngl", "--gpu-layers", "--n-gpu-layers"),
+    "ncmoe": ("-ncmoe", "--n-cpu-moe"),
+}
+
+# Prompt and generation lengths of each llama-bench measurement while tuning
+TUNE_PROMPT_TOKENS = 256
+TUNE_GEN_TOKENS = 64
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """One llama.cpp configuration to measure; None leaves the llama.cpp default."""
+
+    threads: Optional[int] = None
+    batch_size: Optional[int] = None
+    ubatch_size: Optional[int] = None
+    flash_attn: Optional[bool] = None
+    ngl: Optional[str] = None
+    ncmoe: Optional[int] = None
+
+    def settings(self) -> dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+    def describe(self) -> str:
+        return " ".join(f"{key}={value}" for key, value in self.settings().items())
+
+
+def thread_choices(cpu_count: int) -> list[int]:
+    """Quarters of the available CPUs, which brackets the physical core count on SMT hosts."""
+    return sorted({max(1, cpu_count * quarter // 4) for quarter in (1, 2, 3, 4)})
+
+
+def search_space(
+    cpu_count: int,
+    gpu: bool,
+    threads: Optional[int] = None,
+    ngl: Optional[str] = None,
+    ncmoe: Optional[int] = None,
+    moe_layers: int = 0,
+) -> list[Candidate]:
+    """
+    Candidates to tune over. Values passed in are held fixed. On GPU hosts the layers
+    stay offloaded and, for Mixture of Experts models, keeping some expert weights on
+    the CPU is tried instead of varying threads, which barely matter there.
+    """
+    if threads is not None:
+        thread_values: list[Optional[int]] = [threads]
+    elif gpu:
+        thread_values = [None]
+    else:
+        thread_values = list(thread_choices(cpu_count))
+
+    if ngl is not None:
+        ngl_values: list[Optional[str]] = [ngl]
+    else:
+        ngl_values = ["999" if gpu else None]
+
+    if ncmoe is not None:
+        ncmoe_values: list[Optional[int]] = [ncmoe]
+    elif gpu and moe_layers:
+        ncmoe_values = [None, moe_layers // 4, moe_layers // 2]
+    else:
+        ncmoe_values = [None]
+
+    return [
+        Candidate(t, batch, ubatch, fa, n, moe)
+        for t in thread_values
+        for batch, ubatch in BATCH_SIZES
+        for fa in (False, True)
+        for n in ngl_values
+        for moe in ncmoe_values
+    ]
+
+
+def successive_halving(
+    candidates: Sequence[Candidate],
+    evaluate: Callable[[Candidate, int], Optional[float]],
+    eta: int = 3,
+    max_repetitions: int = 9,
+) -> tuple[Candidate, float]:
+    """
+    Measure every candidate once, keep the best third (for eta=3) and measure those again
+    with eta times the repetitions, until one is left. Most of the budget goes to the few
+    configurations that are close, instead of being spread over a full grid.
+
+    evaluate(candidate, repetitions) returns a score to maximise, or None if the
+    configuration failed to run.
+    """
+    survivors = list(dict.fromkeys(candidates))
+    if not survivors:
+        raise ValueError("no configurations to tune")
+
+    repetitions = 1
+    scores: dict[Candidate, float] = {}
+    while True:
+        scores = {}
+        for candidate in survivors:
+            score = evaluate(candidate, repetitions)
+            if score is None or not math.isfinite(score):
+                logger.debug(f"Tuning: {candidate.describe()} failed")
+                continue
+            logger.debug(f"Tuning: {candidate.describe()} scored {score:.2f} over {repetitions} repetition(s)")
+            scores[candidate] = score
+        if not scores:
+            raise ValueError("every configuration failed to run")
+
+        ranked = sorted(scores, key=lambda candidate: scores[candidate], reverse=True)
+        keep = math.ceil(len(ranked) / eta)
+        if keep == 1:
+            return ranked[0], scores[ranked[0]]
+        survivors = ranked[:keep]
+        repetitions = min(repetitions * eta, max_repetitions)
+
+
+def throughput_score(results: Sequence[dict]) -> Optional[float]:
+    """Geometric mean of the tokens per second of the llama-bench tests, so pp and tg count alike."""
+    values = [float(result["avg_ts"]) for result in results if result.get("avg_ts")]
+    if not values:
+        return None
+    return math.exp(sum(math.log(value) for value in values) / len(values))
+
+
+def device_fingerprint(device: Optional[DeviceInfoV1] = None) -> str:
+    """Identifies the hardware a profile was tuned on, so identical nodes share profiles."""
+    device = device or DeviceInfoV1.current_device_info()
+    key = json.dumps([device.cpu_info, device.accel, os.cpu_count()])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+class TunedProfiles:
+    """Best configuration found per (model digest, device fingerprint), kept next to the benchmark results."""
+
+    def __init__(self, storage_folder: Union[str, Path, None]):
+        if storage_folder is None:
+            raise MissingStorageFolderError
+        self.storage_file = Path(storage_folder) / TUNED_PROFILES_FILENAME
+
+    @staticmethod
+    def _key(digest: str, fingerprint: str) -> str:
+        return f"{digest}/{fingerprint}"
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with self.storage_file.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != TUNED_PROFILES_VERSION:
+            return {}
+        return data.get("profiles", {})
+
+    def get(self, digest: str, fingerprint: str) -> Optional[dict[str, Any]]:
+        profile = self._load().get(self._key(digest, fingerprint))
+        return profile.get("settings") if isinstance(profile, dict) else None
+
+    def save(self, digest: str, fingerprint: str, model: str, candidate: Candidate, score: float) -> None:
+        profiles = self._load()
+        profiles[self._key(digest, fingerprint)] = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "score": score,
+            "settings": candidate.settings(),
+        }
+        self.storage_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_file.with_name(f"{self.storage_file.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"version": TUNED_PROFILES_VERSION, "profiles": profiles}, handle, indent=2)
+        os.replace(tmp_path, self.storage_file)
@@ -6,6 +6,7 @@ from typing import Optional
 from ramalama.benchmarks.schemas import (
     BenchmarkRecord,
     BenchmarkRecordV1,
+    ServeBenchRecordV1,
     normalize_benchmark_record,
 )
 
@@ -28,14 +29,63 @@ def parse_json(content: str) -> list[dict]:
     return data
 
 
-def print_bench_results(records: list[BenchmarkRecord]):
-    """Format benchmark results as a table for display."""
+def _format_float(value: Optional[float], precision: int = 2) -> str:
+    return "-" if value is None else f"{value:.{precision}f}"
+
+
+def print_serve_bench_results(records: list[tuple[int, ServeBenchRecordV1]]):
+    """Format `bench --serve` results, given with their ids, as a table for display."""
+    rows: list[dict[str, Optional[object]]] = []
+    for i, item in records:
+        result = item.result
+        rate = f"{result.request_rate:g}/s" if result.request_rate else "max"
+        rows.append(
+            {
+                "id": i,
+                "model": result.model or "",
+                "conc": result.concurrency,
+                "rate": rate,
+                "in/out": f"{result.prompt_tokens}/{result.output_tokens}",
+                "req/s": _format_float(result.request_throughput),
+                "tok/s": _format_float(result.output_token_throughput),
+                "goodput": _format_float(result.goodput),
+                "ttft p50/p99": f"{_format_float(result.ttft_ms_p50, 0)}/{_format_float(result.ttft_ms_p99, 0)} ms",
+                "itl p50/p99": f"{_format_float(result.itl_ms_p50, 1)}/{_format_float(result.itl_ms_p99, 1)} ms",
+                "failed": result.failed,
+                "engine": item.configuration.container_runtime,
+                "date": item.created_at,
+            }
+        )
+
+    headers = list(rows[0])
+    for optional in ["engine", "date"]:
+        if all(not row.get(optional) for row in rows):
+            headers.remove(optional)
+    print_table(headers, rows)
+
+
+def print_bench_results(records: list[BenchmarkRecord], ids: Optional[list[int]] = None):
+    """Format benchmark results as a table for display, labelled with ids if given."""
     if not records:
         return
-    normalized_records: list[BenchmarkRecordV1] = [normalize_benchmark_record(result) for result in records]
+    numbered = list(zip(ids if ids is not None else range(len(records)), records))
+    serve_records = [(i, item) for i, item in numbered if isinstance(item, ServeBenchRecordV1)]
+    bench_records = [(i, item) for i, item in numbered if not isinstance(item, ServeBenchRecordV1)]
+    if bench_records:
+        _print_llama_bench_results(bench_records)
+    if serve_records:
+        if bench_records:
+            print()
+        print_serve_bench_results(serve_records)
+
+
+def _print_llama_bench_results(records: list[tuple[int, BenchmarkRecord]]):
+    normalized_records: list[tuple[int, BenchmarkRecordV1]] = [
+        (i, normalize_benchmark_record(result)) for i, result in records
+    ]
 
     rows: list[dict[str, Optional[object]]] = []
-    for i, item in enumerate(normalized_records):
+    for i, item in normalized_records:
         result = item.result
         model = result.model_filename or ""
         params = f"{result.model_n_params / 1e9:.2f} B" if result.model_n_params else "-"
@@ -91,6 +141,10 @@ def print_bench_results(records: list[BenchmarkRecord]):
         if all((row.get(key) in [default, '-']) for row in rows):
             headers.remove(key)
 
+    print_table(headers, rows)
+
+
+def print_table(headers: list[str], rows: list[dict[str, Optional[object]]]):
     col_widths: dict[str, int] = {}
     for header in headers:
         max_len = len(header)
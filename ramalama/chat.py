@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import _thread
 import cmd
 import copy
 import itertools
@@ -15,10 +14,11 @@ import time
 import urllib.error
 import urllib.request
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import timedelta
 from typing import Optional
 
+from ramalama import tracing
 from ramalama.arg_types import ChatArgsType
 from ramalama.chat_providers import ChatProvider, ChatRequestOptions
 from ramalama.chat_providers.openai import OpenAICompletionsChatProvider
@@ -34,11 +34,13 @@ from ramalama.chat_utils import (
 from ramalama.common import perror
 from ramalama.config import ActiveConfig
 from ramalama.console import should_colorize
-from ramalama.engine import stop_container
+from ramalama.engine import stop_containers
 from ramalama.file_loaders.file_manager import OpanAIChatAPIMessageBuilder
+from ramalama.file_loaders.retrieval import LocalRetrievalIndex
 from ramalama.logger import logger
 from ramalama.mcp.mcp_agent import LLMAgent
 from ramalama.mcp.mcp_client import PureMCPClient
+from ramalama.monitor import ServerMonitor
 from ramalama.plugins.interface import InferenceRuntimePlugin
 from ramalama.plugins.loader import get_runtime
 from ramalama.proxy_support import setup_proxy_support
@@ -163,6 +165,9 @@ class RamaLamaShell(cmd.Cmd):
         self.provider = provider or OpenAICompletionsChatProvider(args.url, getattr(args, "api_key", None))
         self.url = self.provider.build_url()
 
+        self.rag_builder = OpanAIChatAPIMessageBuilder()
+        self.rag_index: Optional[LocalRetrievalIndex] = None
+        self.rag_top_k = 0
         self.prep_rag_message()
         self.mcp_agent: Optional[LLMAgent] = None
         self.initialize_mcp()
@@ -186,10 +191,27 @@ class RamaLamaShell(cmd.Cmd):
         if (context := getattr(self.args, 'rag', None)) is None:
             return
 
-        builder = OpanAIChatAPIMessageBuilder()
-        messages = builder.load(context)
+        top_k = getattr(self.args, "rag_top_k", 0)
+        if isinstance(top_k, int) and top_k > 0:
+            self.rag_top_k = top_k
+            store = getattr(self.args, "store", None) or ActiveConfig().store
+            self.rag_index, messages = self.rag_builder.load_retrieval(context, os.path.join(store, "rag-index"))
+        else:
+            messages = self.rag_builder.load(context)
         self.conversation_history.extend(messages)
 
+    def _request_messages(self) -> list[ChatMessageType]:
+        """Return the conversation history, with retrieved --rag context prepended to the latest user turn."""
+        messages = list(self.conversation_history)
+        if self.rag_index is None or not messages or not isinstance(messages[-1], UserMessage):
+            return messages
+
+        query = messages[-1].text or ""
+        context = self.rag_builder.retrieval_message(self.rag_index, query, self.rag_top_k)
+        if context:
+            messages[-1] = replace(messages[-1], text=f"{context}\n\n{query}")
+        return messages
+
     def _summarize_conversation(self):
         """Summarize the conversation history to prevent context growth."""
         if len(self.conversation_history) < 10:
@@ -522,60 +544,65 @@ class RamaLamaShell(cmd.Cmd):
             stream=True,
             max_tokens=getattr(self.args, "max_tokens", None),
         )
-        request = self.provider.create_request(self.conversation_history, options)
+        request = self.provider.create_request(self._request_messages(), options)
         logger.debug("Request: URL=%s, Data=%s, Headers=%s", request.full_url, request.data, request.headers)
         return request
 
     def _req(self):
-        request = self._make_request_data()
+        with tracing.span("chat.request", messages=len(self.conversation_history)) as span:
+            request = self._make_request_data()
 
-        i: float = 0.01
-        total_time_slept: float = 0
-        response = None
+            i: float = 0.01
+            total_time_slept: float = 0
+            response = None
 
-        max_timeout = 16
+            max_timeout = 16
 
-        last_error: Optional[Exception] = None
+            last_error: Optional[Exception] = None
 
-        spinner = Spinner().start()
+            spinner = Spinner().start()
 
-        while True:
-            try:
-                response = urllib.request.urlopen(request)
-                spinner.stop()
-                break
-            except urllib.error.HTTPError as http_err:
-                error_body = http_err.read().decode("utf-8", "ignore").strip()
-                message = f"HTTP {http_err.code}"
-                if error_body:
-                    message = f"{message}: {error_body}"
-                perror(f"\r{message}")
-
-                self.kills()
-                spinner.stop()
-                return None
-            except Exception as exc:
-                last_error = exc
-
-            if total_time_slept > max_timeout:
-                break
+            while True:
+                try:
+                    response = urllib.request.urlopen(request)
+                    spinner.stop()
+                    span.set(status=response.status, retry_wait=total_time_slept)
+                    break
+                except urllib.error.HTTPError as http_err:
+                    error_body = http_err.read().decode("utf-8", "ignore").strip()
+                    message = f"HTTP {http_err.code}"
+                    if error_body:
+                        message = f"{message}: {error_body}"
+                    perror(f"\r{message}")
+                    span.set(status=http_err.code)
+
+                    self.kills()
+                    spinner.stop()
+                    return None
+                except Exception as exc:
+                    last_error = exc
+
+                if total_time_slept > max_timeout:
+                    break
 
-            total_time_slept += i
-            time.sleep(i)
+                total_time_slept += i
+                time.sleep(i)
 
-            i = min(i * 2, 0.1)
+                i = min(i * 2, 0.1)
 
-        spinner.stop()
-        if response:
-            return stream_response(response, self.args.color, self.provider)
-
-        error_suffix = ""
-        if last_error:
-            error_suffix = f" ({last_error})"
-        perror(f"\rError: could not connect to: {self.url}{error_suffix}")
-        self.kills()
+            spinner.stop()
+            if response:
+                with tracing.span("chat.stream"):
+                    return stream_response(response, self.args.color, self.provider)
+
+            error_suffix = ""
+            if last_error:
+                error_suffix = f" ({last_error})"
+            perror(f"\rError: could not connect to: {self.url}{error_suffix}")
+            span.set(error=f"could not connect{error_suffix}")
+            self.kills()
 
-        return None
+            return None
 
     def kills(self):
         # Clean up MCP connections first
@@ -597,12 +624,10 @@ class RamaLamaShell(cmd.Cmd):
         elif getattr(self.args, "name", None):
             args = copy.copy(self.args)
             args.ignore = True
-            name = getattr(self.args, "name", None)
+            names = [getattr(self.args, "name", None), getattr(self.operational_args, "name", None)]
             # Remove containers on normal exit (remove=True)
-            if name:
-                stop_container(args, name, remove=True)
-            if extra_name := getattr(self.operational_args, "name", None):
-                stop_container(args, extra_name, remove=True)
+            if names := [name for name in names if name]:
+                stop_containers(args, names, remove=True)
 
     def loop(self):
         while True:
@@ -637,161 +662,6 @@ def alarm_handler(signum, frame):
     raise TimeoutException()
 
 
-class ServerMonitor:
-    """Monitor server process or container and report when it exits."""
-
-    def __init__(
-        self,
-        server_process=None,
-        container_name=None,
-        container_engine=None,
-        join_timeout=3.0,
-        check_interval=0.5,
-        inspect_timeout=30.0,
-    ):
-        """
-        Initialize the server monitor.
-
-        Args:
-            server_process: subprocess.Popen object to monitor
-            container_name: Container name to monitor (for container monitoring)
-            container_engine: Container engine command (podman/docker)
-            join_timeout: Seconds for thread join when stopping (default: 3.0)
-            check_interval: Seconds between monitoring checks (default: 0.5)
-            inspect_timeout: Seconds to wait for container inspect command to complete (default: 30.0)
-
-        Note: If neither server_process nor container_name is provided, the monitor
-        operates in no-op mode (no actual monitoring occurs).
-        """
-        self.server_process = server_process
-        self.container_name = container_name
-        self.container_engine = container_engine
-        self.timeout = join_timeout
-        self.check_interval = check_interval
-        self.inspect_timeout = inspect_timeout
-        self._stop_event = threading.Event()
-        self._exited_event = threading.Event()
-        self._exit_info = {}
-        self._monitor_thread = None
-
-        # Determine monitoring mode
-        if self.server_process:
-            self._mode = "process"
-        elif container_name and container_engine:
-            self._mode = "container"
-        else:
-            # No monitoring needed - chat is being used without a service
-            self._mode = "none"
-
-    def start(self):
-        """Start the monitoring thread."""
-        # No-op if not monitoring anything
-        if self._mode == "none":
-            return
-
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            logger.warning("Monitor thread already running")
-            return
-
-        if self._mode == "process":
-            target = self._monitor_process
-        else:
-            target = self._monitor_container
-
-        self._monitor_thread = threading.Thread(target=target, daemon=True)
-        self._monitor_thread.start()
-
-    def stop(self):
-        """Stop the monitoring thread."""
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._stop_event.set()
-            self._monitor_thread.join(timeout=self.timeout)
-
-    def is_exited(self):
-        """Check if the monitored server/container has exited."""
-        return self._exited_event.is_set()
-
-    def is_stopping(self):
-        """Check if the monitor is in the process of stopping."""
-        return self._stop_event.is_set()
-
-    def get_exit_info(self):
-        """Get information about the exit."""
-        return self._exit_info.copy()
-
-    def _monitor_process(self):
-        """Monitor the server process and report if it exits."""
-        while not self._stop_event.is_set():
-            try:
-                exit_code = self.server_process.poll()
-                if exit_code is not None:
-                    # Process has exited
-                    self._exit_info["pid"] = self.server_process.pid
-                    self._exit_info["type"] = "exit"
-                    self._exit_info["code"] = exit_code
-                    self._exited_event.set()
-                    # Send SIGINT to main process to interrupt the chat
-                    _thread.interrupt_main()
-                    break
-            except Exception as e:
-                logger.debug(f"Error monitoring process: {e}", exc_info=True)
-                self._exit_info["pid"] = self.server_process.pid
-                self._exit_info["type"] = "missing"
-                self._exited_event.set()
-                _thread.interrupt_main()
-                break
-
-            # Use wait() instead of sleep() for responsive shutdown
-            self._stop_event.wait(self.check_interval)
-
-    def _monitor_container(self):
-        """Monitor the container and report if it exits."""
-        while not self._stop_event.is_set():
-            try:
-                # Check if container is still running and get its state and exit code in one go
-                inspect_format = "{{.State.Status}}\n{{.State.ExitCode}}"
-                result = subprocess.run(
-                    [self.container_engine, "inspect", "--format", inspect_format, self.container_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.inspect_timeout,
-                )
-                output_lines = result.stdout.strip().split('\n')
-                status = output_lines[0] if output_lines else ""
-                exit_code_str = output_lines[1] if len(output_lines) > 1 else ""
-
-                # Explicitly check for non-running states
-                if status in ["exited", "dead", "removing"] or (status == "" and exit_code_str != ""):
-                    # Container has exited
-                    self._exit_info["name"] = self.container_name
-                    self._exit_info["type"] = "container"
-                    # Default to 'exited' if status is empty but exit code exists
-                    self._exit_info["status"] = status if status else "exited"
-
-                    try:
-                        self._exit_info["code"] = int(exit_code_str)
-                    except (ValueError, AttributeError):
-                        self._exit_info["code"] = "unknown"
-
-                    self._exited_event.set()
-                    # Send SIGINT to main process to interrupt the chat
-                    _thread.interrupt_main()
-                    break
-            except subprocess.TimeoutExpired:
-                logger.debug(f"Timeout checking container {self.container_name} status")
-            except subprocess.CalledProcessError:
-                # Container not found or error checking status
-                self._exit_info["name"] = self.container_name
-                self._exit_info["type"] = "container_missing"
-                self._exited_event.set()
-                _thread.interrupt_main()
-                break
-            except Exception as e:
-                logger.debug(f"Error checking container status: {e}")
-            # Use wait() instead of sleep() for responsive shutdown
-            self._stop_event.wait(self.check_interval)
-
-
 def _report_server_exit(monitor):
     """Report details about server exit."""
     exit_info = monitor.get_exit_info()
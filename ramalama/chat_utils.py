@@ -6,6 +6,7 @@ from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Any, Literal, Optional, Protocol, Union
 
+from ramalama import tracing
 from ramalama.console import should_colorize
 
 # Strip ANSI escape sequences and control chars to prevent terminal injection (e.g. from LLM output)
@@ -102,6 +103,8 @@ def stream_response(chunks: Iterable[bytes], color: str, provider: StreamParser)
             text = getattr(event, "text", None)
             if not text:
                 continue
+            if not assistant_response:
+                tracing.mark("chat.first_token")
             safe_text = sanitize_for_terminal(text)
             print(f"{color_yellow}{safe_text}{color_default}", end="", flush=True)
             assistant_response += text
@@ -24,10 +24,10 @@ try:
 except Exception:
     suppressCompleter = None
 
-from ramalama import engine
+from ramalama import engine, tracing
 from ramalama.arg_types import DefaultArgsType
 from ramalama.cli_arg_normalization import normalize_pull_arg
-from ramalama.common import accel_image, exec_cmd, get_accel, perror
+from ramalama.common import accel_image, exec_cmd, get_accel, perror, refresh_accel
 from ramalama.config import (
     SUPPORTED_ENGINES,
     ActiveConfig,
@@ -41,7 +41,10 @@ from ramalama.host_utils import format_bind_host_for_url
 from ramalama.log_levels import LogLevel
 from ramalama.logger import configure_logger, logger
 from ramalama.model_inspect.error import ParseError
+from ramalama.model_inspect.memory_plan import ModelLayout, host_budgets, parse_ngl, plan_memory
 from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.hub_cache import HUB_SOURCES, default_cache_dir, import_hub_caches
+from ramalama.oci_tools import convert_from_human_readable_size
 from ramalama.plugins.loader import get_all_runtimes, get_runtime
 from ramalama.prompt_utils import default_prefix
 from ramalama.rag import rag_image
@@ -207,6 +210,10 @@ def parse_args_from_cmd(cmd: list[str]) -> tuple[argparse.ArgumentParser, argpar
     config = ActiveConfig()
     if any(arg in ("--dryrun", "--dry-run", "--generate") or arg.startswith("--generate=") for arg in sys.argv[1:]):
         config.dryrun = True
+    # Parser defaults such as the container image depend on accelerator detection,
+    # so a refresh has to happen before any parser is built.
+    if "--refresh-accel" in cmd:
+        refresh_accel()
     # Phase 1: Parse the initial arguments to set CONFIG.runtime etc... as this can affect the subcommands
     initial_parser = get_initial_parser()
     initial_args, _ = initial_parser.parse_known_args(cmd)
@@ -313,6 +320,12 @@ The RAMALAMA_IN_CONTAINER environment variable modifies default behaviour.""",
         action="store_true",
         help="Reduce output verbosity (silences warnings, simplifies list output)",
     )
+    parser.add_argument(
+        "--refresh-accel",
+        dest="refresh_accel",
+        action="store_true",
+        help="detect the accelerator again instead of using the cached detection result",
+    )
     parser.add_argument(
         "--runtime",
         default=config.runtime,
@@ -325,6 +338,14 @@ The RAMALAMA_IN_CONTAINER environment variable modifies default behaviour.""",
         type=abspath,
         help="store AI Models in the specified directory",
     )
+    parser.add_argument(
+        "--trace",
+        dest="trace",
+        metavar="FILE",
+        default=os.getenv("RAMALAMA_TRACE") or None,
+        help="""record timed spans of the command and write them to FILE as Chrome trace-event JSON.
+The RAMALAMA_TRACE environment variable modifies default behaviour.""",
+    )
     parser.add_argument(
         "--noout",
         help=argparse.SUPPRESS,
@@ -344,6 +365,8 @@ def configure_subcommands(parser):
     chat_parser(subparsers)
     containers_parser(subparsers)
     help_parser(subparsers)
+    images_parser(subparsers)
+    import_cache_parser(subparsers)
     info_parser(subparsers)
     inspect_parser(subparsers)
     list_parser(subparsers)
@@ -565,6 +588,100 @@ def list_containers(args):
     print("\n".join(containers))
 
 
+def images_parser(subparsers):
+    parser = subparsers.add_parser("images", help="manage the container images used by RamaLama")
+    parser.set_defaults(func=lambda _: parser.print_help())
+    images_subparsers = parser.add_subparsers(dest="images_command")
+
+    prefetch = images_subparsers.add_parser(
+        "prefetch", help="pull the inference container images for this host in parallel"
+    )
+    prefetch.add_argument("--rag", action="store_true", help="also pull the RAG image")
+    prefetch.add_argument(
+        "--image", action="append", dest="images", default=[], help="additional image to pull", completer=local_images
+    )
+    prefetch.set_defaults(func=images_prefetch_cli)
+
+
+def images_prefetch_cli(args):
+    from concurrent.futures import wait
+
+    from ramalama.image_cache import start_prefetch
+
+    config = ActiveConfig()
+    if not config.engine:
+        raise ValueError("ramalama images prefetch requires a container engine")
+
+    images = [accel_image(config)]
+    if args.rag:
+        images.append(rag_image(config))
+    images = list(dict.fromkeys([*images, *args.images]))
+
+    futures = start_prefetch(config.engine, images)
+    wait(futures)
+    failed = []
+    for image, future in zip(images, futures):
+        if future.exception() is not None:
+            failed.append(image)
+        else:
+            print(future.result())
+    if failed:
+        raise ValueError(f"failed to pull {', '.join(failed)}")
+
+
+def import_cache_parser(subparsers):
+    config = ActiveConfig()
+    parser = subparsers.add_parser(
+        "import-cache", help="import AI Models from Hugging Face and ModelScope caches into local storage"
+    )
+    parser.add_argument(
+        "--source",
+        action="append",
+        choices=HUB_SOURCES,
+        help="hub cache to import, may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory of the hub cache, defaults to the location used by the hub client; requires one --source",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of files without a recorded digest hashed in parallel",
+    )
+    parser.add_argument(
+        "--verify",
+        default=config.verify,
+        action=CoerceToBool,
+        help="verify the imported models, disable to allow importing models with different endianness",
+    )
+    parser.set_defaults(func=import_cache_cli)
+
+
+def import_cache_cli(args):
+    sources = list(dict.fromkeys(args.source or HUB_SOURCES))
+    if args.cache_dir and len(sources) != 1:
+        raise ValueError("--cache-dir requires exactly one --source")
+    caches = [(source, args.cache_dir or default_cache_dir(source)) for source in sources]
+
+    summary = import_hub_caches(args.store, caches, jobs=args.jobs, verify=args.verify, dryrun=args.dryrun)
+    if not args.quiet:
+        for model in summary.imported:
+            print(f"{'Would import' if args.dryrun else 'Imported'} {model}")
+        transfers = ", ".join(f"{count} {method}" for method, count in sorted(summary.transfers.items()))
+        perror(
+            f"{len(summary.imported)} models imported, {len(summary.existing)} already in local storage"
+            + (f"; blobs: {transfers}" if transfers else "")
+            + (f"; {summary.hashed} files hashed" if summary.hashed else "")
+        )
+    if summary.failed:
+        for model, error in summary.failed:
+            perror(f"Failed to import '{model}': {error}")
+        raise ValueError(f"Failed to import the following models: {', '.join(model for model, _ in summary.failed)}")
+
+
 def info_parser(subparsers):
     parser = subparsers.add_parser("info", help="display information pertaining to setup of RamaLama.")
     parser.add_argument(
@@ -985,6 +1102,13 @@ If GPU device on host is accessible to via group access, this option leaks the u
         help="override the default OCI runtime used to launch the container",
         completer=suppressCompleter,
     )
+    if command in ("run", "serve"):
+        parser.add_argument(
+            "--prewarm",
+            default=config.prewarm,
+            action=CoerceToBool,
+            help="read the AI Model into the page cache while the server starts",
+        )
     parser.add_argument(
         "--privileged", dest="privileged", action="store_true", help="give extended privileges to container"
     )
@@ -1061,6 +1185,14 @@ def chat_parser(subparsers):
     parser.add_argument("--url", type=str, default="http://127.0.0.1:8080/v1", help="the url to send requests to")
     parser.add_argument("--model", "-m", type=str, completer=local_models, help="model for inferencing")
     parser.add_argument("--rag", type=str, help="a file or directory to use as context for the chat")
+    parser.add_argument(
+        "--rag-top-k",
+        dest="rag_top_k",
+        type=int,
+        default=0,
+        help="index --rag text files locally and send only the N best matching chunks with each message "
+        "(0 = send all files up front)",
+    )
     parser.add_argument(
         "--max-tokens",
         dest="max_tokens",
@@ -1139,9 +1271,13 @@ def stop_container(args):
     if args.NAME:
         raise ValueError(f"specifying --all and container name, {args.NAME}, not allowed")
     args.ignore = True
-    args.format = "{{ .Names }}"
-    for i in engine.containers(args):
-        engine.stop_container(args, i)
+    failed = []
+    for name, error in engine.stop_containers(args).items():
+        if error is not None:
+            perror(f"Error: failed to stop {name}: {error}")
+            failed.append(name)
+    if failed:
+        raise ValueError(f"failed to stop {len(failed)} container(s): {', '.join(failed)}")
 
 
 def daemon_parser(subparsers) -> None:
@@ -1223,10 +1359,11 @@ def daemon_start_cli(args):
             args.image,
         ]
 
+    daemon_cmd += ["ramalama", "--store", daemon_model_store_dir]
+    if args.trace and not is_daemon_in_container:
+        # the daemon process records its own spans next to those of this one
+        daemon_cmd += ["--trace", args.trace]
     daemon_cmd += [
-        "ramalama",
-        "--store",
-        daemon_model_store_dir,
         "daemon",
         "run",
         "--port",
@@ -1328,6 +1465,46 @@ def inspect_parser(subparsers):
         help="display specific metadata field of AI Model",
     )
     parser.add_argument("--json", dest="json", action="store_true", help="display AI Model information in JSON format")
+    parser.add_argument(
+        "--plan",
+        dest="plan",
+        action="store_true",
+        help="display the context size and GPU offload that fit the AI Model into memory",
+    )
+    parser.add_argument(
+        "--ctx-size",
+        dest="ctx_size",
+        type=int,
+        help="plan for this context size instead of the largest that fits",
+        completer=suppressCompleter,
+    )
+    parser.add_argument(
+        "--ngl",
+        dest="ngl",
+        help="plan for this number of layers in VRAM: a number, or 'all'",
+        completer=suppressCompleter,
+    )
+    parser.add_argument(
+        "--ncmoe",
+        dest="ncmoe",
+        type=int,
+        help="plan with the Mixture of Experts (MoE) weights of the first N layers in the CPU",
+        completer=suppressCompleter,
+    )
+    parser.add_argument(
+        "--memory",
+        dest="memory",
+        type=convert_from_human_readable_size,
+        help="plan for this much host memory, e.g. 32GB, instead of what is available",
+        completer=suppressCompleter,
+    )
+    parser.add_argument(
+        "--gpu-memory",
+        dest="gpu_memory",
+        type=convert_from_human_readable_size,
+        help="plan for this much GPU memory, e.g. 24GB, instead of what is free (0 = no GPU)",
+        completer=suppressCompleter,
+    )
     parser.add_argument("MODEL", nargs="?", completer=local_models)  # positional argument
     parser.set_defaults(func=inspect_cli)
 
@@ -1339,11 +1516,32 @@ def inspect_cli(args):
     args.pull = "never"
 
     model = New(args.MODEL, args)
+    if getattr(args, "plan", False):
+        print(plan_cli(args, model))
+        return
     inspect = model.inspect(args.all, args.get == "all", args.get, args.json, args.dryrun)  # type: ignore[call-arg]
 
     print(inspect)
 
 
+def plan_cli(args, model) -> str:
+    layout = ModelLayout.from_gguf(model.gguf_parts())
+    host_budget, gpu_budget = host_budgets()
+    if args.memory is not None:
+        host_budget = args.memory
+    if args.gpu_memory is not None:
+        gpu_budget = args.gpu_memory
+    plan = plan_memory(
+        layout,
+        host_budget,
+        gpu_budget,
+        ctx_size=args.ctx_size,
+        ngl=parse_ngl(args.ngl, layout.layers),
+        ncmoe=args.ncmoe,
+    )
+    return plan.serialize(json_output=args.json)
+
+
 def main() -> None:
     def eprint(e: Exception | str, exit_code: int):
         try:
@@ -1371,7 +1569,10 @@ def main() -> None:
             perror("ramalama: requires a subcommand")
             return
 
-        args.func(args)
+        if args.trace:
+            tracing.enable(args.trace)
+        with tracing.span(f"ramalama {args.subcommand}"):
+            args.func(args)
     except urllib.error.HTTPError as e:
         eprint(f"pulling {e.geturl()} failed: {e}", errno.EINVAL)
     except FileNotFoundError as e:
@@ -21,7 +21,9 @@ if TYPE_CHECKING:
     from typing_extensions import TypeAlias
 import yaml
 
+import ramalama.accel_cache as accel_cache
 import ramalama.amdkfd as amdkfd
+import ramalama.tracing as tracing
 from ramalama.logger import logger
 from ramalama.version import version
 
@@ -510,6 +512,57 @@ def check_rocm_amd() -> Optional[Literal["hip"]]:
     return None
 
 
+def get_available_memory() -> Optional[int]:
+    """Bytes of memory available to new work without swapping, None where it cannot be read."""
+    try:
+        with open("/proc/meminfo", "r") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def get_gpu_memory() -> Optional[int]:
+    """
+    Bytes of GPU memory a model can use, summed over the visible GPUs llama.cpp splits
+    layers across. None without an NVIDIA or ROCm GPU, or where it cannot be read.
+    """
+    accel = get_accel()
+    if accel == "cuda":
+        try:
+            command = ['nvidia-smi', '--query-gpu=index,memory.free', '--format=csv,noheader,nounits']
+            result = run_cmd(command, encoding="utf-8")
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        visible = os.environ.get("CUDA_VISIBLE_DEVICES", "")
+        free_mib = 0
+        for line in result.stdout.splitlines():
+            index, _, free = (item.strip() for item in line.partition(","))
+            if not free.isdigit() or (visible and index not in visible.split(",")):
+                continue
+            free_mib += int(free)
+        return free_mib * 1024 * 1024 if free_mib else None
+
+    if accel == "hip":
+        visible = os.environ.get("HIP_VISIBLE_DEVICES", "")
+        vram = 0
+        for i, (np, props) in enumerate(amdkfd.gpus()):
+            if visible and str(i) not in visible.split(","):
+                continue
+            for bank in range(int(props['mem_banks_count'])):
+                bank_props = amdkfd.parse_props(np + f'/mem_banks/{bank}/properties')
+                if bank_props['heap_type'] in [amdkfd.HEAP_TYPE_FB_PUBLIC, amdkfd.HEAP_TYPE_FB_PRIVATE]:
+                    vram += int(bank_props['size_in_bytes'])
+        return vram or None
+
+    return None
+
+
 def is_arm() -> bool:
     return platform.machine() in ('arm64', 'aarch64')
 
@@ -581,8 +634,7 @@ def check_mthreads() -> Optional[Literal["musa"]]:
 AccelType: TypeAlias = Literal["asahi", "cuda", "cann", "hip", "intel", "musa"]
 
 
-@lru_cache(maxsize=1)
-def get_accel() -> AccelType | Literal["none"]:
+def _detect_accel() -> AccelType | Literal["none"]:
     checks: tuple[Callable[[], Optional[AccelType]], ...] = (
         check_asahi,
         cast(Callable[[], Optional[Literal['cuda']]], check_nvidia),
@@ -597,6 +649,37 @@ def get_accel() -> AccelType | Literal["none"]:
     return "none"
 
 
+@lru_cache(maxsize=1)
+def get_accel() -> AccelType | Literal["none"]:
+    """
+    Detect the accelerator of this host. The result, and the device selection variables
+    the detection exported, are cached on disk and reused for as long as the host's
+    accelerator fingerprint is unchanged, so most invocations run no probing commands.
+    """
+    env_names = [*get_args(GPUEnvVar), *get_args(AccelEnvVar)]
+    cache_path = accel_cache.default_cache_path()
+    fingerprint = accel_cache.fingerprint(env_names) if cache_path else None
+    if cache_path and fingerprint and (cached := accel_cache.load(cache_path, fingerprint)):
+        accel, env = cached
+        logger.debug(f"Using cached accelerator detection result: {accel}")
+        os.environ.update(env)
+        return cast(Union[AccelType, Literal["none"]], accel)
+
+    env_before = {name: os.environ.get(name) for name in env_names}
+    accel = _detect_accel()
+    if cache_path and fingerprint:
+        env = {name: value for name in env_names if (value := os.environ.get(name)) != env_before[name] and value}
+        accel_cache.save(cache_path, fingerprint, accel, env)
+    return accel
+
+
+def refresh_accel() -> None:
+    """Drop the cached accelerator detection result so the next get_accel() probes again."""
+    accel_cache.invalidate(accel_cache.default_cache_path())
+    check_nvidia.cache_clear()
+    get_accel.cache_clear()
+
+
 def set_accel_env_vars():
     if get_accel_env_vars():
         return
@@ -739,8 +822,24 @@ def ensure_image(conman: Optional[str], image: str, should_pull: bool = False, q
     if ":" not in image:
         image = f"{image}:latest"
 
+    from ramalama.image_cache import wait_for_prefetch
+
+    with tracing.span("image.ensure", image=image) as span:
+        wait_for_prefetch(conman, image)
+        image = _ensure_image(conman, image, should_pull, quiet)
+        span.set(resolved=image)
+    return image
+
+
+def _ensure_image(conman: str, image: str, should_pull: bool, quiet: bool) -> str:
+    from ramalama import image_cache
+
+    if image_cache.is_present(conman, image):
+        return image
+
     try:
         if run_cmd([conman, "inspect", image], ignore_all=True):
+            image_cache.record_present(conman, image)
             return image
     except Exception:
         pass
@@ -750,7 +849,9 @@ def ensure_image(conman: Optional[str], image: str, should_pull: bool = False, q
 
     pull_stdout = subprocess.DEVNULL if quiet else None
     try:
-        run_cmd([conman, "pull", image], stdout=pull_stdout, ignore_stderr=quiet)
+        with tracing.span("image.pull", image=image):
+            run_cmd([conman, "pull", image], stdout=pull_stdout, ignore_stderr=quiet)
+        image_cache.record_present(conman, image)
         return image
     except Exception:
         pass
@@ -762,7 +863,9 @@ def ensure_image(conman: Optional[str], image: str, should_pull: bool = False, q
     if base and base.startswith("quay.io/ramalama/"):
         latest = latest_tagged_image(base)
         try:
-            run_cmd([conman, "pull", latest], stdout=pull_stdout, ignore_stderr=quiet)
+            with tracing.span("image.pull", image=latest):
+                run_cmd([conman, "pull", latest], stdout=pull_stdout, ignore_stderr=quiet)
+            image_cache.record_present(conman, latest)
             return latest
         except Exception as e:
             raise ValueError(f"Failed to pull image {image} or {latest}: {e}")
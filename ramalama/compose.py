@@ -7,6 +7,7 @@ from typing import Optional
 
 from ramalama.common import RAG_DIR, get_accel_env_vars, get_gpu_devices
 from ramalama.file import PlainFile
+from ramalama.model_resources import PROBE_PERIOD_SECONDS, ModelResources, container_port
 from ramalama.version import version
 
 
@@ -39,6 +40,9 @@ class Compose:
         self.args = args
         self.exec_args = exec_args
         self.image = args.image
+        self.resources = ModelResources.estimate(
+            [self.src_model_path, self.src_draft_model_path, self.src_mmproj_path], args
+        )
 
     def _gen_volumes(self) -> str:
         volumes = "    volumes:"
@@ -134,17 +138,42 @@ class Compose:
 
     def _gen_gpu_deployment(self) -> str:
         gpu_keywords = ["cuda", "rocm", "gpu"]
-        if not any(keyword in self.image.lower() for keyword in gpu_keywords):
+        gpu = any(keyword in self.image.lower() for keyword in gpu_keywords)
+        if not gpu and self.resources is None:
             return ""
 
-        return """\
+        deploy = """\
     deploy:
-      resources:
-        reservations:
+      resources:"""
+        if self.resources is not None:
+            deploy += f"""
+        limits:
+          memory: {self.resources.memory_limit_mib}M"""
+        deploy += """
+        reservations:"""
+        if self.resources is not None:
+            deploy += f"""
+          memory: {self.resources.memory_request_mib}M"""
+            if self.resources.cpus:
+                deploy += f'\n          cpus: "{self.resources.cpus}"'
+        if gpu:
+            deploy += """
           devices:
             - driver: nvidia
               count: all
               capabilities: [gpu]"""
+        return deploy
+
+    def _gen_healthcheck(self) -> str:
+        if self.resources is None or not self.resources.health_path:
+            return ""
+
+        url = f"http://localhost:{container_port(self.args) or 8080}{self.resources.health_path}"
+        return f"""\
+    healthcheck:
+      test: ["CMD", "curl", "-sf", "{url}"]
+      interval: {PROBE_PERIOD_SECONDS}s
+      start_period: {self.resources.startup_seconds}s"""
 
     def _gen_command(self) -> str:
         if not self.exec_args:
@@ -162,6 +191,7 @@ class Compose:
         environment_string = self._gen_environment()
         devices_string = self._gen_devices()
         gpu_deploy_string = self._gen_gpu_deployment()
+        healthcheck_string = self._gen_healthcheck()
         command_string = self._gen_command()
 
         # Assemble the final file content
@@ -179,6 +209,7 @@ services:
 {environment_string}
 {devices_string}
 {gpu_deploy_string}
+{healthcheck_string}
 {command_string}
     restart: unless-stopped
 """
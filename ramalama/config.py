@@ -7,8 +7,9 @@ import tempfile
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal, Mapping, Optional
+from typing import Any, Literal, Mapping, Optional, Union
 
+from ramalama import config_cache
 from ramalama.cli_arg_normalization import normalize_pull_arg
 from ramalama.common import apple_vm, available, version_tagged_image
 from ramalama.config_types import SUPPORTED_ENGINES, SUPPORTED_RUNTIMES
@@ -100,6 +101,13 @@ def coerce_to_bool(value: Any) -> bool:
     raise ValueError(f"Cannot coerce {value!r} to bool")
 
 
+def coerce_to_int_or_auto(value: Any) -> Union[int, Literal["auto"]]:
+    """Settings the memory planner can choose take "auto" in place of a number."""
+    if isinstance(value, str) and value.strip().lower() == "auto":
+        return "auto"
+    return int(value)
+
+
 def get_storage_folder(base_path: Optional[str] = None):
     if base_path is None:
         base_path = get_default_store()
@@ -162,7 +170,7 @@ class BaseConfig:
     benchmarks: Benchmarks = field(default_factory=Benchmarks)
     carimage: str = "registry.access.redhat.com/ubi10-micro:latest"
     container: bool = None  # type: ignore
-    ctx_size: int = 0
+    ctx_size: Union[int, Literal["auto"]] = 0
     convert_type: Literal["artifact", "car", "raw"] = "raw"
     default_image: str = DEFAULT_IMAGE
     default_rag_image: str = DEFAULT_RAG_IMAGE
@@ -185,6 +193,7 @@ class BaseConfig:
     max_tokens: int = 0
     port: str = "8080"
     prefix: str = None  # type: ignore
+    prewarm: bool = False
     pull: str = "newer"
     runtime: SUPPORTED_RUNTIMES = "llama.cpp"
     runtimes: dict[str, Any] = field(default_factory=dict)
@@ -200,6 +209,7 @@ class BaseConfig:
 
     def __post_init__(self):
         self.container = coerce_to_bool(self.container) if self.container is not None else self.engine is not None
+        self.ctx_size = coerce_to_int_or_auto(self.ctx_size)
         self.image = self.image if self.image is not None else self.default_image
         self.pull = normalize_pull_arg(self.pull, self.engine)
         self.log_level = coerce_log_level(self.log_level) if self.log_level is not None else self.log_level
@@ -233,8 +243,8 @@ class Config(LayeredMixin, BaseConfig):
                 self.engine = "docker" if available("docker") else None
 
 
-def load_file_config() -> dict[str, Any]:
-    parser = TOMLParser()
+def config_file_paths() -> list[str]:
+    """The ramalama.conf files to load, in the order their settings apply."""
     config_paths: list[str] = []
 
     if (config_path := os.getenv("RAMALAMA_CONFIG", None)) and os.path.exists(config_path):
@@ -250,11 +260,20 @@ def load_file_config() -> dict[str, Any]:
             if os.path.isdir(path_str):
                 for conf_file in sorted(Path(path_str).glob("*.conf")):
                     config_paths.append(str(conf_file))
+    return config_paths
 
-    for file in config_paths:
-        parser.parse_file(file)
 
-    config: dict[str, Any] = parser.data
+def load_file_config() -> dict[str, Any]:
+    config_paths = config_file_paths()
+    stamps = config_cache.source_stamps(config_paths)
+    config: Optional[dict[str, Any]] = config_cache.load("config", stamps)
+    if config is None:
+        parser = TOMLParser()
+        for file in config_paths:
+            parser.parse_file(file)
+        config = parser.data
+        config_cache.save("config", stamps, config)
+
     if config:
         config = config.get('ramalama', {})
         config['settings'] = {'config_files': config_paths}
@@ -296,13 +315,14 @@ def load_env_config(env: Optional[Mapping[str, str]] = None) -> dict[str, Any]:
         if key in config:
             config[key] = json.loads(config[key])
 
-    for key in ['keep_groups', 'container', 'verify']:
+    for key in ['keep_groups', 'container', 'prewarm', 'verify']:
         if key in config:
             config[key] = coerce_to_bool(config[key])
 
-    for key in ['ctx_size', 'summarize_after']:
-        if key in config:
-            config[key] = int(config[key])
+    if 'ctx_size' in config:
+        config['ctx_size'] = coerce_to_int_or_auto(config['ctx_size'])
+    if 'summarize_after' in config:
+        config['summarize_after'] = int(config['summarize_after'])
     if log_level := config.get("log_level"):
         config["log_level"] = coerce_log_level(log_level)
     return config
@@ -0,0 +1,93 @@
+"""Compiled snapshot of the parsed ramalama.conf layers and shortname tables, read once per invocation"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from ramalama.logger import logger
+
+CONFIG_CACHE_VERSION = 1
+
+_snapshot: Optional[dict[str, Any]] = None
+_snapshot_path: Optional[str] = None
+
+
+def default_cache_path() -> Optional[str]:
+    """
+    Location of the cache file. RAMALAMA_CONFIG_CACHE overrides it; setting it to an
+    empty string disables the cache.
+    """
+    path = os.getenv("RAMALAMA_CONFIG_CACHE")
+    if path is not None:
+        return path or None
+    cache_home = os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(cache_home, "ramalama", "config.json")
+
+
+def source_stamps(paths: Iterable[str]) -> list[list[Any]]:
+    """
+    (absolute path, mtime, size) of every source file that exists. The paths are the ones the
+    environment selects (RAMALAMA_CONFIG, XDG_* and the working directory), so a change to the
+    environment or to any file, or a file appearing or disappearing, changes the stamps.
+    """
+    stamps = []
+    for path in paths:
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps.append([path, st.st_mtime_ns, st.st_size])
+    return stamps
+
+
+def _read(path: str) -> dict[str, Any]:
+    global _snapshot, _snapshot_path
+    if _snapshot is None or _snapshot_path != path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        _snapshot = data if isinstance(data, dict) and data.get("version") == CONFIG_CACHE_VERSION else {}
+        _snapshot_path = path
+    return _snapshot
+
+
+def load(section: str, stamps: list[list[Any]]) -> Optional[Any]:
+    """The data compiled for section from the sources with these stamps, None if they changed since."""
+    path = default_cache_path()
+    if path is None:
+        return None
+    entry = _read(path).get(section)
+    if not isinstance(entry, dict) or entry.get("sources") != stamps:
+        return None
+    # callers merge into what they get, which must not leak into the snapshot
+    return copy.deepcopy(entry.get("data"))
+
+
+def save(section: str, stamps: list[list[Any]], data: Any) -> None:
+    path = default_cache_path()
+    if path is None:
+        return
+    snapshot = dict(_read(path), version=CONFIG_CACHE_VERSION)
+    snapshot[section] = {"sources": stamps, "data": copy.deepcopy(data)}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Failed to write config cache {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    global _snapshot
+    _snapshot = snapshot
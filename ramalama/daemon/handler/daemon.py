@@ -133,7 +133,8 @@ class DaemonAPIHandler(APIHandler):
         inference_engine_command = assemble_command(args)
 
         logger.info(f"Starting model runner for {serve_request.model_name} with command: {inference_engine_command}")
-        managed_model = ManagedModel(model, inference_engine_command, port, timedelta(seconds=30))
+        page_cache_paths = model.page_cache_paths() if args.prewarm else None
+        managed_model = ManagedModel(model, inference_engine_command, port, timedelta(seconds=30), page_cache_paths)
         serve_path = ModelProxyHandler.build_proxy_path(model)
         self.model_runner.add_model(managed_model)
         self.model_runner.start_model(managed_model.id, serve_path)
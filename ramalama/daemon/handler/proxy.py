@@ -4,6 +4,7 @@ import http.server
 import urllib.parse
 import urllib.request
 
+from ramalama import tracing
 from ramalama.daemon.handler.base import APIHandler
 from ramalama.daemon.logging import logger
 from ramalama.daemon.service.model_runner import ModelRunner
@@ -66,6 +67,12 @@ class ModelProxyHandler(APIHandler):
             logger.error(msg)
             handler.send_error(404, msg)
             return
+        if model.exited:
+            exit_code = model.monitor.get_exit_info().get("code", "unknown")
+            msg = f"Model server for path '{proxy_path}' exited with code {exit_code}"
+            logger.error(msg)
+            handler.send_error(502, msg)
+            return
         model.update_expiration_date()
 
         target_url = f"http://127.0.0.1:{model.port}{forward_path}"
@@ -80,27 +87,33 @@ class ModelProxyHandler(APIHandler):
         logger.debug(f"Forwarding request -X {method} {target_url}\nHEADER: {headers} \nDATA: {data!r}")
 
         request = urllib.request.Request(target_url, data=data, headers=dict(headers), method=method)
-        with urllib.request.urlopen(request) as response:
-            handler.send_response(response.status)
-
-            hop_by_hop_headers = [
-                'connection',
-                'keep-alive',
-                'proxy-authenticate',
-                'proxy-authorization',
-                'te',
-                'trailers',
-                'transfer-encoding',
-                'upgrade',
-            ]
-            for key, value in response.getheaders():
-                if key.lower() in hop_by_hop_headers:
-                    continue
-                handler.send_header(key, value)
-
-            handler.end_headers()
-            for line in response:
-                handler.wfile.write(line)
-            handler.wfile.flush()
-
-            logger.debug(f"Received response from -X {method} {target_url}\nRESPONSE: ")
+        with tracing.span("daemon.proxy", method=method, model=proxy_path, path=forward_path) as span:
+            with urllib.request.urlopen(request) as response:
+                span.set(status=response.status)
+                handler.send_response(response.status)
+
+                hop_by_hop_headers = [
+                    'connection',
+                    'keep-alive',
+                    'proxy-authenticate',
+                    'proxy-authorization',
+                    'te',
+                    'trailers',
+                    'transfer-encoding',
+                    'upgrade',
+                ]
+                for key, value in response.getheaders():
+                    if key.lower() in hop_by_hop_headers:
+                        continue
+                    handler.send_header(key, value)
+
+                handler.end_headers()
+                first = True
+                for line in response:
+                    if first:
+                        tracing.mark("daemon.proxy.first_byte", model=proxy_path)
+                        first = False
+                    handler.wfile.write(line)
+                handler.wfile.flush()
+
+                logger.debug(f"Received response from -X {method} {target_url}\nRESPONSE: ")
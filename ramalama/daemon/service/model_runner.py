@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from ramalama.common import generate_sha256
+from ramalama.model_store.page_cache import evict, start_prewarm
+from ramalama.monitor import ServerMonitor
 from ramalama.transports.transport_factory import CLASS_MODEL_TYPES
 
 
@@ -19,28 +21,46 @@ class ManagedModel:
         run_cmd: list[str],
         port: int,
         expires_after: timedelta = timedelta(minutes=5),
+        page_cache_paths: Optional[list[str]] = None,
     ):
         self.model = model
         self.id = generate_model_id(model)
         self.run_cmd: list[str] = run_cmd
         self.port: int = port
+        # model files read into the page cache on start and dropped from it on stop
+        self.page_cache_paths: list[str] = page_cache_paths or []
 
         self.expires_after = expires_after
         self.expiration_date: Optional[datetime] = None
 
         self.process: Optional[subprocess.Popen] = None
+        self.monitor: Optional[ServerMonitor] = None
 
     def start(self):
         if self.process is not None:
             raise RuntimeError(f"Model {self.id} is already running.")
         self.update_expiration_date()
         self.process = subprocess.Popen(self.run_cmd)
+        if self.page_cache_paths:
+            start_prewarm(self.page_cache_paths, quiet=True)
+        self.monitor = ServerMonitor(server_process=self.process)
+        self.monitor.start(interrupt_main=False)
+
+    @property
+    def exited(self) -> bool:
+        """True if the inference server exited on its own."""
+        return self.monitor is not None and self.monitor.is_exited()
 
     def stop(self):
+        if self.monitor:
+            self.monitor.stop()
+            self.monitor = None
         if self.process:
             self.process.terminate()
             self.process.wait()
             self.process = None
+            if self.page_cache_paths:
+                evict(self.page_cache_paths)
 
     def update_expiration_date(self):
         self.expiration_date = datetime.now() + self.expires_after
@@ -9,19 +9,24 @@ import sys
 import time
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from http.client import HTTPConnection, HTTPException
 from typing import Any, Optional
 
 # Live reference for checking global vars
 import ramalama.common
+from ramalama import tracing
 from ramalama.arg_types import BaseEngineArgsType
-from ramalama.common import check_nvidia, exec_cmd, get_accel_env_vars, perror, run_cmd
+from ramalama.common import exec_cmd, get_accel, get_accel_env_vars, perror, run_cmd
 from ramalama.compat import NamedTemporaryFile
 from ramalama.config import ActiveConfig
 from ramalama.host_utils import format_bind_host_for_connection, format_bind_host_publish_prefix
 from ramalama.logger import logger
+from ramalama.oci_tools import decode_json_documents
 from ramalama.path_utils import normalize_host_path_for_container
 
+MAX_STOP_WORKERS = 16
+
 
 class BaseEngine(ABC):
     """General-purpose engine for running podman or docker commands"""
@@ -81,7 +86,7 @@ class BaseEngine(ABC):
         if oci_runtime is not None:
             self.exec_args += ["--runtime", oci_runtime]
             return
-        if check_nvidia() == "cuda":
+        if get_accel() == "cuda":
             if self.use_docker:
                 self.exec_args += ["--runtime", "nvidia"]
             elif os.access("/usr/bin/nvidia-container-runtime", os.X_OK):
@@ -161,14 +166,16 @@ class BaseEngine(ABC):
         dry_run(self.exec_args)
 
     def run(self):
-        run_cmd(self.exec_args, stdout=None)
+        with tracing.span("engine.run", engine=self.exec_args[0], command=self.exec_args[1:2]):
+            run_cmd(self.exec_args, stdout=None)
 
     def run_process(self) -> subprocess.CompletedProcess:
         """Run the command and return the CompletedProcess."""
         return run_cmd(self.exec_args, encoding="utf-8")
 
     def exec(self, stdout2null: bool = False, stderr2null: bool = False):
-        exec_cmd(self.exec_args, stdout2null, stderr2null)
+        with tracing.span("engine.exec", engine=self.exec_args[0], command=self.exec_args[1:2]):
+            exec_cmd(self.exec_args, stdout2null, stderr2null)
 
     def relabel(self):
         if getattr(self.args, "selinux", False) and self.use_podman:
@@ -417,60 +424,138 @@ def logs(args, name: str, ignore_stderr: bool = False):
     return run_cmd(conman_args, ignore_stderr=ignore_stderr).stdout.decode("utf-8").strip()
 
 
-def stop_container(args, name: str, remove: bool = False):
-    if not name:
-        raise ValueError("must specify a container name")
+def _container_names(entry: dict[str, Any]) -> list[str]:
+    # podman reports a list of names, docker a comma separated string
+    names = entry.get("Names", [])
+    return names.split(",") if isinstance(names, str) else list(names)
+
+
+def list_containers_json(conman: str, label: Optional[str] = None) -> list[dict[str, Any]]:
+    """Return every container, or those carrying label, from a single `ps --format json`."""
+    conman_args = [conman, "ps", "-a"]
+    if label:
+        conman_args += ["--filter", f"label={label}"]
+    conman_args += ["--format", "{{json .}}" if os.path.basename(conman) == "docker" else "json"]
+    output = run_cmd(conman_args, ignore_stderr=True).stdout.decode("utf-8").strip()
+    return decode_json_documents(output) if output else []
+
+
+def _resolve_stop_targets(
+    entries: list[dict[str, Any]], names: Sequence[str]
+) -> tuple[dict[str, str], dict[str, str], list[str]]:
+    """
+    Map each requested name to the pod or container to stop. A name also matches its
+    `<name>-pod-model-server` container, whose pod is removed as a whole.
+    """
+    by_name: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        for entry_name in _container_names(entry):
+            by_name[entry_name] = entry
+        entry_id = entry.get("Id") or entry.get("ID") or ""
+        if entry_id:
+            by_name[entry_id] = entry
+            by_name[entry_id[:12]] = entry
+
+    pods: dict[str, str] = {}
+    containers: dict[str, str] = {}
+    unknown: list[str] = []
+    for name in names:
+        entry = by_name.get(name) or by_name.get(f"{name}-pod-model-server")
+        if entry is None:
+            unknown.append(name)
+        elif entry.get("Pod"):
+            pods[name] = entry["Pod"]
+        else:
+            containers[name] = name
+    return pods, containers, unknown
+
+
+def stop_containers(
+    args, names: Optional[Sequence[str]] = None, remove: bool = False, timeout: int = 0
+) -> dict[str, Optional[Exception]]:
+    """
+    Stop several containers at once and return the error, or None, for each of them.
+
+    Targets are resolved with one `ps`; with names=None every RamaLama container is
+    stopped. Pods are removed in one call, containers are sent the stop signal
+    concurrently with a shared timeout and, if remove is set, removed in one batch.
+    Names that do not exist are reported as errors unless args.ignore is set. A failure to
+    list the containers is raised as a ValueError when names is None.
+    """
     conman = str(args.engine) if args.engine is not None else None
     if conman == "" or conman is None:
         raise ValueError("no container manager (Podman, Docker) found")
+    ignore = bool(getattr(args, "ignore", False))
 
-    ignore_stderr = False
-    pod = ""
-    try:
-        pod = inspect(args, name, format="{{ .Pod }}", ignore_stderr=True)
-    except Exception as e1:
-        logger.debug(e1)
-        try:
-            pod = inspect(args, f"{name}-pod-model-server", format="{{ .Pod }}", ignore_stderr=True)
-        except Exception as e2:  # Ignore errors, the stop command will handle it.
-            logger.debug(e2)
-            pass
-
-    if pod != "":
-        conman_args = [conman, "pod", "rm", "-t=0", "--ignore", "--force", pod]
-    else:
-        conman_args = [conman, "stop", "-t=0"]
-        if args.ignore:
-            if conman == "podman":
-                conman_args += ["--ignore", str(args.ignore)]
-            else:
-                ignore_stderr = True
-
-        conman_args += [name]
     try:
-        run_cmd(conman_args, ignore_stderr=ignore_stderr)
-    except subprocess.CalledProcessError:
-        if args.ignore and conman == "docker":
-            return
+        entries = list_containers_json(conman, label="ai.ramalama" if names is None else None)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        if names is None:
+            # without a listing there is nothing to stop, which must not pass for success
+            raise ValueError(f"failed to list RamaLama containers: {e}") from e
+        # named containers are still stopped, and the engine reports the ones that do not exist
+        logger.debug(f"Failed to list containers: {e}")
+        entries = []
+    if names is None:
+        names = [_container_names(entry)[0] for entry in entries if _container_names(entry)]
+
+    pods, containers, unknown = _resolve_stop_targets(entries, names)
+    results: dict[str, Optional[Exception]] = {}
+    for name in unknown:
+        if ignore:
+            results[name] = None
         else:
-            raise
-
-    # Remove the container if requested and not a pod (pods are already removed above)
-    if remove and pod == "":
-        conman_args = [conman, "rm"]
-        if args.ignore:
-            if conman == "podman":
-                conman_args += ["--ignore"]
-            else:
-                ignore_stderr = True
-        conman_args += [name]
+            # let the engine report the missing container as it always has
+            containers[name] = name
+
+    if pods:
+        pod_ids = list(dict.fromkeys(pods.values()))
+        try:
+            run_cmd([conman, "pod", "rm", "-t=0", "--ignore", "--force", *pod_ids], ignore_stderr=ignore)
+            results.update({name: None for name in pods})
+        except subprocess.CalledProcessError as e:
+            results.update({name: e for name in pods})
+
+    def stop_one(name: str) -> Optional[Exception]:
+        try:
+            run_cmd([conman, "stop", f"-t={timeout}", name], ignore_stderr=ignore)
+            return None
+        except subprocess.CalledProcessError as e:
+            return e
+
+    if containers:
+        with ThreadPoolExecutor(max_workers=min(len(containers), MAX_STOP_WORKERS)) as executor:
+            results.update(zip(containers, executor.map(stop_one, containers.values())))
+
+    to_remove = [name for name in containers if results.get(name) is None]
+    if remove and to_remove:
+        rm_args = [conman, "rm", "--force"]
+        if conman == "podman":
+            rm_args += ["--ignore"]
         try:
-            run_cmd(conman_args, ignore_stderr=ignore_stderr)
+            run_cmd([*rm_args, *to_remove], ignore_stderr=True)
         except subprocess.CalledProcessError:
-            if args.ignore and conman == "docker":
-                return
-            else:
-                raise
+            # containers started with --rm may already be gone; only report what is left
+            remaining = set()
+            for entry in list_containers_json(conman):
+                remaining.update(_container_names(entry))
+            for name in to_remove:
+                if name in remaining:
+                    results[name] = ValueError(f"failed to remove container {name}")
+
+    if ignore and conman != "podman":
+        # docker has no --ignore, mirror it by dropping errors for containers that are gone
+        results = {name: None for name in results}
+    return results
+
+
+def stop_container(args, name: str, remove: bool = False):
+    if not name:
+        raise ValueError("must specify a container name")
+
+    error = stop_containers(args, [name], remove=remove)[name]
+    if error is not None:
+        raise error
 
 
 def add_labels(args, add_label: Callable[[str], None]):
@@ -503,8 +588,22 @@ def is_healthy(args, timeout: int = 3, model_name: Optional[str] = None):
             conn.close()
 
 
+def _health_monitor(args):
+    """Watch the server being probed, so its death ends the wait instead of the timeout."""
+    from ramalama.monitor import ServerMonitor
+
+    name, engine = getattr(args, "name", None), getattr(args, "engine", None)
+    if getattr(args, "container", False) is True and isinstance(name, str) and isinstance(engine, str):
+        return ServerMonitor(container_name=name, container_engine=engine)
+    return ServerMonitor(server_process=getattr(args, "server_process", None))
+
+
 def wait_for_healthy(args, health_func: Callable[[Any], bool], timeout=None):
-    """Waits for a container to become healthy by polling its endpoint."""
+    """
+    Waits for a container to become healthy by probing its endpoint. Probes back off from
+    0.1s to 1s and are retried early when the engine reports a health change; the wait
+    fails immediately if the container or server process exits.
+    """
     if timeout is None:
         from ramalama.plugins.loader import get_runtime
 
@@ -515,18 +614,30 @@ def wait_for_healthy(args, health_func: Callable[[Any], bool], timeout=None):
 
     display_dots = not getattr(args, "debug", False) and sys.stdin.isatty()
     n = 0
-    while time.time() - start_time < timeout:
-        try:
-            if display_dots:
-                perror('\r' + n * '.', end='', flush=True)
-            if health_func(args):
-                if display_dots:
-                    perror('\r' + n * ' ' + '\r', end='', flush=True)
-                return
-        except (ConnectionError, HTTPException, UnicodeDecodeError, json.JSONDecodeError, TimeoutError) as e:
-            logger.debug(f"Health check of {container_name} failed, retrying... Error: {e}")
-            n += 1
-        time.sleep(1)
+    delay = 0.1
+    monitor = _health_monitor(args)
+    monitor.start(interrupt_main=False)
+    try:
+        with tracing.span("server.wait_for_healthy", timeout=timeout) as span:
+            while time.time() - start_time < timeout:
+                try:
+                    if display_dots:
+                        perror('\r' + n * '.', end='', flush=True)
+                    if health_func(args):
+                        if display_dots:
+                            perror('\r' + n * ' ' + '\r', end='', flush=True)
+                        return
+                except (ConnectionError, HTTPException, UnicodeDecodeError, json.JSONDecodeError, TimeoutError) as e:
+                    logger.debug(f"Health check of {container_name} failed, retrying... Error: {e}")
+                    n += 1
+                    span.set(failed_probes=n)
+                if monitor.wait_for_change(min(delay, max(timeout - (time.time() - start_time), 0))):
+                    exit_code = monitor.get_exit_info().get("code", "unknown")
+                    raise ValueError(f"{container_name} exited with code {exit_code} before becoming healthy")
+                delay = min(delay * 2, 1)
+            span.set(timed_out=True)
+    finally:
+        monitor.stop()
 
     raise subprocess.TimeoutExpired(
         f"health check of {container_name}", timeout, output=logs(args, args.name, ignore_stderr=not args.debug)
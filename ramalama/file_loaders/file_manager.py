@@ -3,11 +3,12 @@ from __future__ import annotations
 import os
 from abc import ABC, abstractmethod
 from string import Template
-from typing import Type
+from typing import Optional, Type
 from warnings import warn
 
 from ramalama.chat_utils import AttachmentPart, ChatMessageType, ImageURLPart, UserMessage
 from ramalama.file_loaders.file_types import base, image, txt
+from ramalama.file_loaders.retrieval import Chunk, LocalRetrievalIndex
 
 
 class BaseFileManager(ABC):
@@ -56,6 +57,12 @@ class TextFileManager(BaseFileManager):
 
         return "".join(contents)
 
+    def format_chunks(self, chunks: list[Chunk]) -> str:
+        """
+        Generate the output string for a set of retrieved chunks.
+        """
+        return "".join(f"\n{self.document_delimiter.substitute(name=chunk.source)}\n{chunk.text}" for chunk in chunks)
+
 
 class ImageFileManager(BaseFileManager):
     @classmethod
@@ -118,6 +125,12 @@ class OpanAIChatAPIMessageBuilder:
     def supported_extensions(self) -> set[str]:
         return self.text_manager.loaders.keys() | self.image_manager.loaders.keys()
 
+    def _image_message(self, image_files: list[str]) -> UserMessage:
+        attachments: list[AttachmentPart] = []
+        for data_url in self.image_manager.load(image_files):
+            attachments.append(ImageURLPart(url=data_url))
+        return UserMessage(attachments=attachments)
+
     def load(self, file_path: str) -> list[ChatMessageType]:
         text_files, image_files, unsupported_files = self.partition_files(file_path)
 
@@ -128,8 +141,29 @@ class OpanAIChatAPIMessageBuilder:
         if text_files:
             messages.append(UserMessage(text=self.text_manager.load(text_files)))
         if image_files:
-            attachments: list[AttachmentPart] = []
-            for data_url in self.image_manager.load(image_files):
-                attachments.append(ImageURLPart(url=data_url))
-            messages.append(UserMessage(attachments=attachments))
+            messages.append(self._image_message(image_files))
         return messages
+
+    def load_retrieval(
+        self, file_path: str, cache_dir: Optional[str] = None
+    ) -> tuple[Optional[LocalRetrievalIndex], list[ChatMessageType]]:
+        """
+        Index text files for per-turn retrieval instead of loading them into the chat history.
+        Images are still returned as messages since they cannot be retrieved lexically.
+        """
+        text_files, image_files, unsupported_files = self.partition_files(file_path)
+
+        if unsupported_files:
+            unsupported_files_warning(unsupported_files, list(self.supported_extensions()))
+
+        index = LocalRetrievalIndex(text_files, cache_dir=cache_dir) if text_files else None
+        messages: list[ChatMessageType] = []
+        if image_files:
+            messages.append(self._image_message(image_files))
+        return index, messages
+
+    def retrieval_message(self, index: LocalRetrievalIndex, query: str, top_k: int) -> Optional[str]:
+        chunks = index.search(query, top_k)
+        if not chunks:
+            return None
+        return self.text_manager.format_chunks(chunks)
@@ -1,9 +1,39 @@
 from __future__ import annotations
 
 import base64
+import io
 import mimetypes
 
 from ramalama.file_loaders.file_types.base import BaseFileLoader
+from ramalama.logger import logger
+
+# Longest edge, in pixels, of images sent to the model. Vision encoders resize
+# inputs to well below this anyway, so larger images only inflate the request.
+MAX_IMAGE_DIMENSION = 1536
+
+
+def downscale_image(data: bytes, max_dimension: int = MAX_IMAGE_DIMENSION) -> bytes:
+    """
+    Shrink an encoded image so its longest edge is at most max_dimension pixels.
+    Returns the original bytes when Pillow is not installed or the image is already small enough.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= max_dimension:
+                return data
+            image_format = img.format
+            img.thumbnail((max_dimension, max_dimension))
+            out = io.BytesIO()
+            img.save(out, format=image_format)
+            return out.getvalue()
+    except Exception as e:
+        logger.debug(f"Failed to downscale image, sending original: {e}")
+        return data
 
 
 class BasicImageFileLoader(BaseFileLoader):
@@ -24,11 +54,11 @@ class BasicImageFileLoader(BaseFileLoader):
     @staticmethod
     def load(file: str) -> str:
         """
-        Load the content of the text file.
+        Load the image file as a base64 data URL, downscaling large images first.
         """
 
         mime_type, _ = mimetypes.guess_type(file)
         with open(file, "rb") as f:
-            data = base64.b64encode(f.read()).decode("utf-8")
+            data = base64.b64encode(downscale_image(f.read())).decode("utf-8")
 
         return f"data:{mime_type};base64,{data}"
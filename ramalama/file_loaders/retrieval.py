@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ramalama.logger import logger
+
+INDEX_VERSION = 1
+DEFAULT_CHUNK_SIZE = 1500
+DEFAULT_CHUNK_OVERLAP = 200
+DEFAULT_TOP_K = 5
+READ_BLOCK_SIZE = 64 * 1024
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def iter_file_chunks(
+    file: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> Iterator[str]:
+    """
+    Lazily split a text file into overlapping chunks of roughly chunk_size characters.
+    Chunks are cut on whitespace when possible so words are not split in half.
+    """
+    if overlap >= chunk_size:
+        raise ValueError(f"chunk overlap ({overlap}) must be smaller than chunk size ({chunk_size})")
+
+    # cuts are sought past half the stride, so each chunk starts at least that far after the last
+    stride = chunk_size - overlap
+    earliest_cut = max(chunk_size // 2, overlap + (stride + 1) // 2)
+
+    buffer = ""
+    with open(file, "r", errors="replace") as f:
+        while block := f.read(READ_BLOCK_SIZE):
+            buffer += block
+            while len(buffer) >= chunk_size:
+                cut = buffer.rfind(" ", earliest_cut, chunk_size)
+                if cut == -1:
+                    cut = chunk_size
+                chunk = buffer[:cut].strip()
+                if chunk:
+                    yield chunk
+                buffer = buffer[cut - overlap :]
+
+    if chunk := buffer.strip():
+        yield chunk
+
+
+def file_digest(file: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file, "rb") as f:
+        while block := f.read(READ_BLOCK_SIZE):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+@dataclass
+class Chunk:
+    source: str
+    text: str
+    terms: dict[str, int] = field(default_factory=dict)
+    length: int = 0
+
+    @classmethod
+    def from_text(cls, source: str, text: str) -> "Chunk":
+        tokens = tokenize(text)
+        return cls(source=source, text=text, terms=dict(Counter(tokens)), length=len(tokens))
+
+
+@dataclass
+class _FileEntry:
+    mtime: float
+    size: int
+    sha256: str
+    chunks: list[Chunk]
+
+    def to_dict(self) -> dict:
+        return {
+            "mtime": self.mtime,
+            "size": self.size,
+            "sha256": self.sha256,
+            "chunks": [{"text": c.text, "terms": c.terms, "length": c.length} for c in self.chunks],
+        }
+
+    @classmethod
+    def from_dict(cls, source: str, data: dict) -> "_FileEntry":
+        return cls(
+            mtime=data["mtime"],
+            size=data["size"],
+            sha256=data["sha256"],
+            chunks=[Chunk(source=source, **chunk) for chunk in data["chunks"]],
+        )
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over text chunks.
+    """
+
+    def __init__(self, chunks: Iterable[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks: list[Chunk] = list(chunks)
+        self.doc_freq: Counter[str] = Counter()
+        for chunk in self.chunks:
+            self.doc_freq.update(chunk.terms.keys())
+        total_length = sum(chunk.length for chunk in self.chunks)
+        self.avg_length = total_length / len(self.chunks) if self.chunks else 0.0
+
+    def idf(self, term: str) -> float:
+        n = len(self.chunks)
+        df = self.doc_freq.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, chunk: Chunk, query_terms: Iterable[str]) -> float:
+        score = 0.0
+        norm = self.k1 * (1 - self.b + self.b * chunk.length / self.avg_length) if self.avg_length else self.k1
+        for term in query_terms:
+            tf = chunk.terms.get(term, 0)
+            if tf:
+                score += self.idf(term) * tf * (self.k1 + 1) / (tf + norm)
+        return score
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> list[Chunk]:
+        query_terms = set(tokenize(query))
+        if not query_terms or not self.chunks:
+            return []
+
+        scored = ((self.score(chunk, query_terms), i) for i, chunk in enumerate(self.chunks))
+        best = heapq.nlargest(top_k, (item for item in scored if item[0] > 0))
+        return [self.chunks[i] for _, i in best]
+
+
+class LocalRetrievalIndex:
+    """
+    Lexical retrieval over a set of local text files.
+
+    Files are chunked lazily and the resulting chunks are cached on disk, keyed by
+    file path, mtime and content hash, so unchanged files are not re-read on the next run.
+    """
+
+    def __init__(
+        self,
+        files: list[str],
+        cache_dir: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_CHUNK_OVERLAP,
+    ):
+        self.files = sorted(os.path.abspath(file) for file in files)
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.cache_path = self._cache_path(cache_dir) if cache_dir else None
+        self.entries = self._load_entries()
+        self.index = BM25Index(chunk for entry in self.entries.values() for chunk in entry.chunks)
+
+    def _cache_path(self, cache_dir: str) -> str:
+        key = hashlib.sha256(f"{self.chunk_size}:{self.overlap}:{':'.join(self.files)}".encode()).hexdigest()
+        return os.path.join(cache_dir, f"{key}.json")
+
+    def _read_cache(self) -> dict[str, _FileEntry]:
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return {}
+
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return {source: _FileEntry.from_dict(source, entry) for source, entry in data["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable RAG index cache {self.cache_path}: {e}")
+            return {}
+
+    def _write_cache(self, entries: dict[str, _FileEntry]):
+        if self.cache_path is None:
+            return
+
+        data = {"version": INDEX_VERSION, "files": {source: entry.to_dict() for source, entry in entries.items()}}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Failed to write RAG index cache {self.cache_path}: {e}")
+
+    def _load_entries(self) -> dict[str, _FileEntry]:
+        cached = self._read_cache()
+        entries: dict[str, _FileEntry] = {}
+        dirty = set(cached) != set(self.files)
+
+        for file in self.files:
+            stat = os.stat(file)
+            entry = cached.get(file)
+            if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                entries[file] = entry
+                continue
+
+            digest = file_digest(file)
+            dirty = True
+            if entry is not None and entry.sha256 == digest:
+                entry.mtime, entry.size = stat.st_mtime, stat.st_size
+                entries[file] = entry
+                continue
+
+            logger.debug(f"Indexing {file}")
+            chunks = [Chunk.from_text(file, text) for text in iter_file_chunks(file, self.chunk_size, self.overlap)]
+            entries[file] = _FileEntry(mtime=stat.st_mtime, size=stat.st_size, sha256=digest, chunks=chunks)
+
+        if dirty:
+            self._write_cache(entries)
+        return entries
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> list[Chunk]:
+        return self.index.search(query, top_k)
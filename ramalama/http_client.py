@@ -5,10 +5,12 @@ import os
 import shutil
 import sys
 import time
+import urllib.parse
 import urllib.request
 from typing import Optional
 
 import ramalama.console as console
+from ramalama import tracing
 from ramalama.common import perror
 from ramalama.config import ActiveConfig
 from ramalama.file import File
@@ -32,7 +34,10 @@ class HttpClient:
             output_file_partial = output_file + ".partial"
 
         self.file_size = self.set_resume_point(output_file_partial)
-        self.urlopen(url, headers)
+        # DNS, TLS, redirects and auth all happen before the response headers arrive
+        with tracing.span("http.connect", resume_from=self.file_size) as span:
+            self.urlopen(url, headers)
+            span.set(status=self.response.status)
         self.total_to_download = int(self.response.getheader('content-length', 0))
         if response_bytes is not None:
             response_bytes.append(self.response.read())
@@ -47,7 +52,8 @@ class HttpClient:
 
                 self.now_downloaded = 0
                 self.start_time = time.time()
-                self.perform_download(out.file, show_progress)
+                with tracing.span("http.transfer", bytes=self.total_to_download):
+                    self.perform_download(out.file, show_progress)
             finally:
                 del out  # Ensure file is closed before rename
 
@@ -192,51 +198,60 @@ def download_file(url: str, dest_path: str, headers: Optional[dict[str, str]] =
     max_retries = ActiveConfig().http_client.max_retries
     retries = 0
 
-    while retries <= max_retries:
-        try:
-            # Initialize HTTP client for the request
-            http_client.init(url=url, headers=headers, output_file=dest_path, show_progress=show_progress)
-            return  # Exit function if successful
+    with tracing.span("http.download", url=_trace_url(url), file=os.path.basename(dest_path)) as span:
+        while retries <= max_retries:
+            span.set(retries=retries)
+            try:
+                # Initialize HTTP client for the request
+                http_client.init(url=url, headers=headers, output_file=dest_path, show_progress=show_progress)
+                return  # Exit function if successful
+
+            except KeyboardInterrupt:
+                perror("\nDownload interrupted by user. Exiting cleanly.")
+                raise
+
+            except urllib.error.HTTPError as e:
+                if e.code in [HTTP_RANGE_NOT_SATISFIABLE, HTTP_NOT_FOUND]:
+                    raise e
+                retries += 1
+
+            except urllib.error.URLError as e:
+                console.error(f"Network Error: {e.reason}")
+                retries += 1
+
+            except TimeoutError:
+                retries += 1
+                console.warning(
+                    f"TimeoutError: The server took too long to respond. Retrying {retries}/{max_retries} ..."
+                )
 
-        except KeyboardInterrupt:
-            perror("\nDownload interrupted by user. Exiting cleanly.")
-            raise
+            except RuntimeError as e:  # Catch network-related errors from HttpClient
+                retries += 1
+                console.warning(f"{e}. Retrying {retries}/{max_retries} ...")
 
-        except urllib.error.HTTPError as e:
-            if e.code in [HTTP_RANGE_NOT_SATISFIABLE, HTTP_NOT_FOUND]:
+            except IOError as e:
+                retries += 1
+                console.warning(f"I/O Error: {e}. Retrying {retries}/{max_retries} ...")
+
+            except Exception as e:
+                console.error(f"Unexpected error: {str(e)}")
                 raise e
-            retries += 1
-
-        except urllib.error.URLError as e:
-            console.error(f"Network Error: {e.reason}")
-            retries += 1
-
-        except TimeoutError:
-            retries += 1
-            console.warning(f"TimeoutError: The server took too long to respond. Retrying {retries}/{max_retries} ...")
-
-        except RuntimeError as e:  # Catch network-related errors from HttpClient
-            retries += 1
-            console.warning(f"{e}. Retrying {retries}/{max_retries} ...")
-
-        except IOError as e:
-            retries += 1
-            console.warning(f"I/O Error: {e}. Retrying {retries}/{max_retries} ...")
-
-        except Exception as e:
-            console.error(f"Unexpected error: {str(e)}")
-            raise e
-
-        if retries > max_retries:
-            error_message = (
-                "\nDownload failed after multiple attempts.\n"
-                "Possible causes:\n"
-                "- Internet connection issue\n"
-                "- Server is down or unresponsive\n"
-                "- Firewall or proxy blocking the request\n"
-            )
-            raise ConnectionError(error_message)
-
-        time.sleep(
-            min(ActiveConfig().http_client.max_retry_delay, 2 ** (retries - 1) * 0.1)
-        )  # Exponential backoff (0.1s, 0.2s, 0.4s... max_retry_delay)
+
+            if retries > max_retries:
+                error_message = (
+                    "\nDownload failed after multiple attempts.\n"
+                    "Possible causes:\n"
+                    "- Internet connection issue\n"
+                    "- Server is down or unresponsive\n"
+                    "- Firewall or proxy blocking the request\n"
+                )
+                raise ConnectionError(error_message)
+
+            time.sleep(
+                min(ActiveConfig().http_client.max_retry_delay, 2 ** (retries - 1) * 0.1)
+            )  # Exponential backoff (0.1s, 0.2s, 0.4s... max_retry_delay)
+
+
+def _trace_url(url: str) -> str:
+    """The url without query or fragment, which may carry signed tokens."""
+    return urllib.parse.urlsplit(url)._replace(query="", fragment="").geturl()
@@ -0,0 +1,121 @@
+"""Container image presence cache and background image prefetching"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future, wait
+from typing import Any, Optional
+
+from ramalama.logger import logger
+from ramalama.oci_tools import storage_fingerprint
+
+IMAGE_CACHE_VERSION = 1
+
+_lock = threading.Lock()
+_prefetches: dict[tuple[str, str], Future] = {}
+
+
+def default_cache_path() -> Optional[str]:
+    """
+    Location of the cache file. RAMALAMA_IMAGE_CACHE overrides it; setting it to an
+    empty string disables the cache.
+    """
+    path = os.getenv("RAMALAMA_IMAGE_CACHE")
+    if path is not None:
+        return path or None
+    cache_home = os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(cache_home, "ramalama", "images.json")
+
+
+def _load(path: str) -> dict[str, Any]:
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != IMAGE_CACHE_VERSION:
+        return {}
+    return data.get("engines", {})
+
+
+def is_present(engine: str, image: str) -> bool:
+    """
+    True if image was seen in the engine's storage and the storage has not changed since.
+    Engines whose storage cannot be fingerprinted are never cached.
+    """
+    path = default_cache_path()
+    if path is None or (fingerprint := storage_fingerprint(engine)) is None:
+        return False
+    entry = _load(path).get(engine, {})
+    return entry.get("fingerprint") == [list(item) for item in fingerprint] and image in entry.get("images", [])
+
+
+def record_present(engine: str, image: str) -> None:
+    path = default_cache_path()
+    if path is None or (fingerprint := storage_fingerprint(engine)) is None:
+        return
+
+    with _lock:
+        engines = _load(path)
+        entry = engines.get(engine, {})
+        current = [list(item) for item in fingerprint]
+        images = entry.get("images", []) if entry.get("fingerprint") == current else []
+        if image in images:
+            return
+        engines[engine] = {"fingerprint": current, "images": [*images, image]}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"version": IMAGE_CACHE_VERSION, "engines": engines}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to write image cache {path}: {e}")
+
+
+def _run_prefetch(future: Future, engine: str, image: str) -> None:
+    from ramalama.common import _ensure_image
+
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(_ensure_image(engine, image, should_pull=True, quiet=True))
+    except BaseException as e:
+        future.set_exception(e)
+
+
+def start_prefetch(engine: str, images: Iterable[str]) -> list[Future]:
+    """
+    Start pulling the given images in background threads, quietly, and return their futures.
+    ensure_image() waits for a running prefetch of the same image instead of pulling it twice.
+    The threads are daemonic so a failing command does not wait for a pull it no longer needs.
+    """
+    futures = []
+    with _lock:
+        for image in dict.fromkeys(images):
+            if ":" not in image:
+                image = f"{image}:latest"
+            key = (engine, image)
+            if key not in _prefetches:
+                logger.debug(f"Prefetching image {image}")
+                future: Future = Future()
+                threading.Thread(
+                    target=_run_prefetch, args=(future, engine, image), name="image-prefetch", daemon=True
+                ).start()
+                _prefetches[key] = future
+            futures.append(_prefetches[key])
+    return futures
+
+
+def wait_for_prefetch(engine: str, image: str) -> None:
+    """Block until a background prefetch of image, if one was started, has finished."""
+    with _lock:
+        future = _prefetches.pop((engine, image), None)
+    if future is None:
+        return
+    wait([future])
+    if (exc := future.exception()) is not None:
+        logger.debug(f"Background pull of {image} failed: {exc}")
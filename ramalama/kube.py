@@ -6,6 +6,7 @@ from typing import Optional, Tuple
 
 from ramalama.common import MNT_DIR, RAG_DIR, ContainerEntryPoint, check_nvidia, get_accel_env_vars, get_gpu_devices
 from ramalama.file import PlainFile
+from ramalama.model_resources import PROBE_PERIOD_SECONDS, ModelResources, container_port
 from ramalama.path_utils import normalize_host_path_for_container
 from ramalama.version import version
 
@@ -39,6 +40,8 @@ class Kube:
         self.exec_args = exec_args
         self.image = args.image
         self.artifact = artifact
+        model_files = [src_path for src_path, _ in self.model_paths.values()] + [self.src_mmproj_path]
+        self.resources = ModelResources.estimate(model_files, args)
 
     def _gen_volumes(self) -> Tuple[str, str]:
         mounts = """\
@@ -213,20 +216,49 @@ class Kube:
             type: spc_t"""
 
     def __gen_resources(self) -> str:
+        requests = []
+        limits = []
+        if self.resources is not None:
+            requests.append(f"memory: {self.resources.memory_request_mib}Mi")
+            if self.resources.cpus:
+                requests.append(f"cpu: {self.resources.cpus}")
+            limits.append(f"memory: {self.resources.memory_limit_mib}Mi")
+
         if check_nvidia() == "cuda":
-            return """
-        resources:
-          limits:
-             'nvidia.com/gpu=all': 1"""
+            limits.append("'nvidia.com/gpu=all': 1")
+        else:
+            limits += [f"'podman.io/device={path}': 1" for path in get_gpu_devices().values()]
 
-        devices = get_gpu_devices()
-        if devices:
-            limits = "".join(f"\n             'podman.io/device={path}': 1" for path in devices.values())
-            return f"""
-        resources:
-          limits:{limits}"""
+        if not requests and not limits:
+            return ""
 
-        return ""
+        resources = """
+        resources:"""
+        for section, entries in (("requests", requests), ("limits", limits)):
+            if entries:
+                resources += f"""
+          {section}:"""
+                resources += "".join(f"\n             {entry}" for entry in entries)
+        return resources
+
+    def __gen_probes(self) -> str:
+        port = container_port(self.args)
+        if self.resources is None or not self.resources.health_path or port is None:
+            return ""
+
+        # the startup probe covers loading the model, readiness then only has to catch a stuck server
+        return f"""
+        startupProbe:
+          httpGet:
+            path: {self.resources.health_path}
+            port: {port}
+          periodSeconds: {PROBE_PERIOD_SECONDS}
+          failureThreshold: {self.resources.startup_failure_threshold}
+        readinessProbe:
+          httpGet:
+            path: {self.resources.health_path}
+            port: {port}
+          periodSeconds: {PROBE_PERIOD_SECONDS}"""
 
     def __gen_container(self, container_args) -> str:
         content = f"""\
@@ -249,6 +281,9 @@ class Kube:
         if "resources_string" in container_args:
             content += f"""\
 {container_args["resources_string"]}"""
+        if "probes_string" in container_args:
+            content += f"""\
+{container_args["probes_string"]}"""
         return content
 
     def generate_content(self, name=None, labels="", container=None) -> str:
@@ -264,6 +299,7 @@ class Kube:
             "port_string": port_string,
             "mounts_string": mounts_string,
             "resources_string": self.__gen_resources(),
+            "probes_string": self.__gen_probes(),
         }
         if not isinstance(self.exec_args[0], ContainerEntryPoint):
             model_container["command"] = self.exec_args[0]
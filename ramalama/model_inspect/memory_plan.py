@@ -0,0 +1,347 @@
+"""Context size and GPU offload that fit a GGUF model into the memory of this host, from its tensors and metadata"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Union
+
+from ramalama.common import get_available_memory, get_gpu_memory
+from ramalama.model_inspect.gguf_info import GGUFModelInfo
+from ramalama.model_inspect.gguf_parser import GGML_TYPE
+
+GIB = 1024**3
+
+# (elements per block, bytes per block) of the GGML tensor types
+GGML_TYPE_SIZES: dict[str, tuple[int, int]] = {
+    GGML_TYPE.GGML_TYPE_F32.name: (1, 4),
+    GGML_TYPE.GGML_TYPE_F16.name: (1, 2),
+    GGML_TYPE.GGML_TYPE_Q4_0.name: (32, 18),
+    GGML_TYPE.GGML_TYPE_Q4_1.name: (32, 20),
+    GGML_TYPE.GGML_TYPE_Q5_0.name: (32, 22),
+    GGML_TYPE.GGML_TYPE_Q5_1.name: (32, 24),
+    GGML_TYPE.GGML_TYPE_Q8_0.name: (32, 34),
+    GGML_TYPE.GGML_TYPE_Q8_1.name: (32, 36),
+    GGML_TYPE.GGML_TYPE_Q2_K.name: (256, 84),
+    GGML_TYPE.GGML_TYPE_Q3_K.name: (256, 110),
+    GGML_TYPE.GGML_TYPE_Q4_K.name: (256, 144),
+    GGML_TYPE.GGML_TYPE_Q5_K.name: (256, 176),
+    GGML_TYPE.GGML_TYPE_Q6_K.name: (256, 210),
+    GGML_TYPE.GGML_TYPE_Q8_K.name: (256, 292),
+    GGML_TYPE.GGML_TYPE_IQ2_XXS.name: (256, 66),
+    GGML_TYPE.GGML_TYPE_IQ2_XS.name: (256, 74),
+    GGML_TYPE.GGML_TYPE_IQ3_XXS.name: (256, 98),
+    GGML_TYPE.GGML_TYPE_IQ1_S.name: (256, 50),
+    GGML_TYPE.GGML_TYPE_IQ4_NL.name: (32, 18),
+    GGML_TYPE.GGML_TYPE_IQ3_S.name: (256, 110),
+    GGML_TYPE.GGML_TYPE_IQ2_S.name: (256, 82),
+    GGML_TYPE.GGML_TYPE_IQ4_XS.name: (256, 136),
+    GGML_TYPE.GGML_TYPE_I8.name: (1, 1),
+    GGML_TYPE.GGML_TYPE_I16.name: (1, 2),
+    GGML_TYPE.GGML_TYPE_I32.name: (1, 4),
+    GGML_TYPE.GGML_TYPE_I64.name: (1, 8),
+    GGML_TYPE.GGML_TYPE_F64.name: (1, 8),
+    GGML_TYPE.GGML_TYPE_IQ1_M.name: (256, 56),
+    GGML_TYPE.GGML_TYPE_BF16.name: (1, 2),
+    GGML_TYPE.GGML_TYPE_TQ1_0.name: (256, 54),
+    GGML_TYPE.GGML_TYPE_TQ2_0.name: (256, 66),
+    GGML_TYPE.GGML_TYPE_MXFP4.name: (32, 17),
+}
+
+# Bytes per element of the KV cache, which llama.cpp keeps in f16 by default
+KV_CACHE_ELEMENT_SIZE = 2
+
+# Tokens llama.cpp evaluates per micro batch, which sizes its compute buffers
+COMPUTE_UBATCH = 512
+
+# Share of the free memory a plan may use; drivers, the CUDA context and the rest of the host need the remainder
+MEMORY_HEADROOM = 0.9
+
+# Smallest context a plan goes down to before reporting that the model does not fit
+MIN_CTX_SIZE = 2048
+DEFAULT_CTX_SIZE = 4096
+
+LAYER_TENSOR = re.compile(r"^blk\.(\d+)\.")
+EXPERT_TENSOR = re.compile(r"^blk\.\d+\.ffn_\w+_exps\.")
+
+
+def tensor_bytes(dimensions: Sequence[int], tensor_type: str) -> Optional[int]:
+    """Size of a tensor's data, None for types without a fixed block size."""
+    if tensor_type not in GGML_TYPE_SIZES:
+        return None
+    block_elements, block_bytes = GGML_TYPE_SIZES[tensor_type]
+    elements = 1
+    for dimension in dimensions:
+        elements *= dimension
+    return -(-elements // block_elements) * block_bytes
+
+
+@dataclass
+class ModelLayout:
+    """Where the bytes of a GGUF model are: per repeating layer, in its experts, and outside the layers."""
+
+    layers: int
+    context_length: int
+    embedding_length: int
+    vocab_size: int
+    max_heads: int
+    kv_bytes_per_token: list[int]
+    layer_bytes: list[int]
+    expert_bytes: list[int]
+    output_bytes: int
+    other_bytes: int
+
+    @classmethod
+    def from_gguf(cls, parts: Sequence[GGUFModelInfo]) -> "ModelLayout":
+        """Layout of a model from its parsed GGUF files; split models pass every part."""
+        metadata = parts[0].Metadata.data
+        architecture = metadata.get("general.architecture")
+        layers = int(metadata.get(f"{architecture}.block_count") or 0)
+        if not layers:
+            raise ValueError(f"GGUF model {parts[0].Path} has no {architecture}.block_count")
+
+        heads = metadata.get(f"{architecture}.attention.head_count") or 0
+        kv_heads = metadata.get(f"{architecture}.attention.head_count_kv", heads)
+        heads = heads if isinstance(heads, list) else [heads] * layers
+        kv_heads = kv_heads if isinstance(kv_heads, list) else [kv_heads] * layers
+        max_heads = max(heads) or 1
+        embedding = int(metadata.get(f"{architecture}.embedding_length") or 0)
+        key_length = int(metadata.get(f"{architecture}.attention.key_length") or embedding // max_heads)
+        value_length = int(metadata.get(f"{architecture}.attention.value_length") or embedding // max_heads)
+        vocab_size = metadata.get(f"{architecture}.vocab_size") or len(metadata.get("tokenizer.ggml.tokens") or [])
+        kv_element_bytes = (key_length + value_length) * KV_CACHE_ELEMENT_SIZE
+
+        layout = cls(
+            layers=layers,
+            context_length=int(metadata.get(f"{architecture}.context_length") or 0),
+            embedding_length=embedding,
+            vocab_size=int(vocab_size),
+            max_heads=int(max_heads),
+            kv_bytes_per_token=[int(n) * kv_element_bytes for n in kv_heads][:layers],
+            layer_bytes=[0] * layers,
+            expert_bytes=[0] * layers,
+            output_bytes=0,
+            other_bytes=0,
+        )
+        for part in parts:
+            layout._add_tensors(part)
+        return layout
+
+    def _add_tensors(self, part: GGUFModelInfo) -> None:
+        tensors = sorted(part.Tensors, key=lambda tensor: tensor.offset)
+        for i, tensor in enumerate(tensors):
+            size = tensor_bytes(tensor.dimensions, tensor.type)
+            if size is None:
+                # the data of a tensor runs up to the next one, which also covers alignment
+                size = tensors[i + 1].offset - tensor.offset if i + 1 < len(tensors) else 0
+            if match := LAYER_TENSOR.match(tensor.name):
+                layer = int(match.group(1))
+                if layer >= self.layers:
+                    self.other_bytes += size
+                    continue
+                self.layer_bytes[layer] += size
+                if EXPERT_TENSOR.match(tensor.name):
+                    self.expert_bytes[layer] += size
+            elif tensor.name.startswith("output."):
+                self.output_bytes += size
+            else:
+                self.other_bytes += size
+
+    @property
+    def weights(self) -> int:
+        return sum(self.layer_bytes) + self.output_bytes + self.other_bytes
+
+    @property
+    def is_moe(self) -> bool:
+        return any(self.expert_bytes)
+
+    def compute_bytes(self, ctx_size: int) -> int:
+        """
+        llama.cpp compute buffers: the logits and activations of one micro batch, and the
+        attention scores of one head, the most flash attention keeps around at a time.
+        """
+        return COMPUTE_UBATCH * (self.vocab_size + 4 * self.embedding_length + ctx_size) * 4
+
+    def gpu_layers(self, ngl: int) -> range:
+        """llama.cpp offloads the last ngl repeating layers, and the output layer once ngl exceeds them."""
+        return range(max(self.layers - ngl, 0), self.layers)
+
+    def gpu_weights(self, ngl: int, ncmoe: int) -> int:
+        weights = sum(self.layer_bytes[i] - (self.expert_bytes[i] if i < ncmoe else 0) for i in self.gpu_layers(ngl))
+        return weights + (self.output_bytes if ngl > self.layers else 0)
+
+
+@dataclass
+class Footprint:
+    weights: int = 0
+    kv_cache: int = 0
+    compute: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.weights + self.kv_cache + self.compute
+
+
+@dataclass
+class MemoryPlan:
+    """Options that fit the model into the budgets, and the memory they take on the GPU and the host."""
+
+    ctx_size: int
+    # None when the offload is left to llama.cpp, as no GPU budget is known
+    ngl: Optional[int]
+    ncmoe: int
+    layers: int
+    # None when the host memory cannot be read, so the context is not limited by it
+    host_budget: Optional[int]
+    gpu_budget: int
+    fits: bool
+    gpu: Footprint = field(default_factory=Footprint)
+    host: Footprint = field(default_factory=Footprint)
+
+    @property
+    def ngl_option(self) -> Optional[str]:
+        if self.ngl is None:
+            return None
+        return "all" if self.ngl > self.layers else str(self.ngl)
+
+    def options(self) -> list[str]:
+        options = ["--ctx-size", str(self.ctx_size)]
+        if self.ngl_option is not None:
+            options += ["--ngl", self.ngl_option]
+        if self.ncmoe:
+            options += ["--ncmoe", str(self.ncmoe)]
+        return options
+
+    def serialize(self, json_output: bool = False) -> str:
+        if json_output:
+            data = asdict(self)
+            data["options"] = self.options()
+            return json.dumps(data, sort_keys=True, indent=4)
+
+        lines = [
+            f"Budget: {format_budget(self.host_budget)} host, {format_gib(self.gpu_budget)} GPU",
+            f"Options: {' '.join(self.options())}" + ("" if self.fits else " (does not fit)"),
+            f"{'':12}{'GPU':>12}{'Host':>12}",
+        ]
+        rows = (("Weights", "weights"), ("KV cache", "kv_cache"), ("Compute", "compute"), ("Total", "total"))
+        for label, name in rows:
+            gpu, host = getattr(self.gpu, name), getattr(self.host, name)
+            lines.append(f"{label:12}{format_gib(gpu):>12}{format_gib(host):>12}")
+        return "\n".join(lines)
+
+
+def format_gib(size: int) -> str:
+    return f"{size / GIB:.2f} GiB"
+
+
+def format_budget(size: Optional[int]) -> str:
+    return "unknown" if size is None else format_gib(size)
+
+
+def context_candidates(layout: ModelLayout, ctx_size: Optional[int] = None) -> list[int]:
+    """Context sizes to try, largest first: the trained context halved down to MIN_CTX_SIZE."""
+    if ctx_size:
+        return [ctx_size]
+    largest = layout.context_length or DEFAULT_CTX_SIZE
+    candidates = [largest]
+    while candidates[-1] // 2 >= MIN_CTX_SIZE:
+        candidates.append(candidates[-1] // 2)
+    return candidates
+
+
+def footprints(layout: ModelLayout, ctx_size: int, ngl: int, ncmoe: int) -> tuple[Footprint, Footprint]:
+    gpu_layers = layout.gpu_layers(ngl)
+    gpu_kv = sum(layout.kv_bytes_per_token[i] for i in gpu_layers) * ctx_size
+    gpu_weights = layout.gpu_weights(ngl, ncmoe)
+    gpu = Footprint(gpu_weights, gpu_kv, layout.compute_bytes(ctx_size) if ngl else 0)
+    host = Footprint(
+        layout.weights - gpu_weights,
+        sum(layout.kv_bytes_per_token) * ctx_size - gpu_kv,
+        # fully offloaded models only embed the input tokens on the host
+        layout.compute_bytes(ctx_size) if ngl <= layout.layers else COMPUTE_UBATCH * layout.embedding_length * 4,
+    )
+    return gpu, host
+
+
+def offload_splits(layout: ModelLayout, ngl: Optional[int], ncmoe: Optional[int]) -> list[tuple[int, int]]:
+    """
+    (ngl, ncmoe) pairs from the most to the least placed on the GPU. Mixture of Experts
+    models first move expert weights to the CPU, which costs less speed than whole layers.
+    """
+    moe_choices = [ncmoe] if ncmoe is not None else (range(layout.layers + 1) if layout.is_moe else [0])
+    if ngl is not None:
+        return [(ngl, moe) for moe in moe_choices]
+
+    splits = [(layout.layers + 1, moe) for moe in moe_choices]
+    partial_moe = ncmoe if ncmoe is not None else (layout.layers if layout.is_moe else 0)
+    splits += [(n, partial_moe) for n in range(layout.layers, 0, -1)]
+    return splits + [(0, 0)]
+
+
+def plan_memory(
+    layout: ModelLayout,
+    host_budget: Optional[int],
+    gpu_budget: int = 0,
+    ctx_size: Optional[int] = None,
+    ngl: Optional[int] = None,
+    ncmoe: Optional[int] = None,
+) -> MemoryPlan:
+    """
+    Largest context and offload that fit the budgets; options passed in are held fixed. The
+    offload achievable at the smallest context is kept, and the context grown as far as that
+    offload allows, so a longer context never costs layers on the GPU. Without a GPU budget,
+    as on hosts whose GPU memory cannot be read, the context is planned as if the whole model
+    were in host memory and the offload is left to llama.cpp. Without a host budget the
+    context is only limited by the GPU.
+    """
+    host_only = not gpu_budget and ngl is None
+    if host_only:
+        ngl, ncmoe = 0, ncmoe or 0
+
+    def best_split(ctx: int) -> Optional[tuple[int, int]]:
+        for split in offload_splits(layout, ngl, ncmoe):
+            # without a known GPU budget a fixed --ngl is taken as fitting
+            if split[0] == 0 or not gpu_budget or footprints(layout, ctx, *split)[0].total <= gpu_budget:
+                return split
+        return None
+
+    def make_plan(ctx: int, split: tuple[int, int], fits: bool) -> MemoryPlan:
+        gpu, host = footprints(layout, ctx, *split)
+        plan_ngl = None if host_only else split[0]
+        return MemoryPlan(ctx, plan_ngl, split[1], layout.layers, host_budget, gpu_budget, fits, gpu, host)
+
+    contexts = context_candidates(layout, ctx_size)
+    target = best_split(contexts[-1])
+    if target is None:
+        return make_plan(contexts[-1], (ngl or 0, ncmoe or 0), False)
+    target_gpu_weights = layout.gpu_weights(*target)
+
+    for ctx in contexts:
+        split = best_split(ctx)
+        if split is None or layout.gpu_weights(*split) < target_gpu_weights:
+            continue
+        plan = make_plan(ctx, split, True)
+        if host_budget is None or plan.host.total <= host_budget:
+            return plan
+    return make_plan(contexts[-1], target, False)
+
+
+def host_budgets() -> tuple[Optional[int], int]:
+    """
+    Host and GPU memory a plan may use on this host. The host budget is None where the free
+    memory cannot be read, as on macOS; a GPU budget of 0 means no supported GPU.
+    """
+    available = get_available_memory()
+    host_budget = int(available * MEMORY_HEADROOM) if available is not None else None
+    return host_budget, int((get_gpu_memory() or 0) * MEMORY_HEADROOM)
+
+
+def parse_ngl(value: Union[str, int, None], layers: int) -> Optional[int]:
+    """--ngl as a layer count for planning, None when llama.cpp or the planner chooses."""
+    if value is None or str(value) == "auto":
+        return None
+    if str(value) in ("all", "-1"):
+        return layers + 1
+    return int(value)
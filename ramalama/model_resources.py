@@ -0,0 +1,136 @@
+"""Memory, CPU and startup sizing of a model server container for the generated kube, quadlet and compose files"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from ramalama.config import ActiveConfig
+from ramalama.logger import logger
+from ramalama.model_inspect.gguf_parser import GGUFInfoParser
+from ramalama.plugins.loader import get_runtime
+
+MIB = 1024 * 1024
+
+# Bytes per element of the llama.cpp KV cache, which defaults to f16
+KV_CACHE_ELEMENT_SIZE = 2
+
+# Compute buffers, server state and allocator slack on top of weights and KV cache
+MEMORY_OVERHEAD_BYTES = 512 * MIB
+MEMORY_OVERHEAD_RATIO = 0.1
+
+# The limit leaves room above the request for prompt processing peaks
+MEMORY_LIMIT_RATIO = 1.25
+
+# Startup probes assume storage this slow, so a cold page cache on network volumes does not fail them
+LOAD_BYTES_PER_SECOND = 100 * MIB
+MIN_STARTUP_SECONDS = 60
+PROBE_PERIOD_SECONDS = 10
+
+
+def kv_cache_bytes(metadata: dict[str, Any], ctx_size: int = 0) -> int:
+    """
+    KV cache of a GGUF model for ctx_size tokens, or the trained context length when 0,
+    as llama.cpp does. 0 when the metadata lacks the attention layout.
+    """
+    architecture = metadata.get("general.architecture")
+    layers = int(metadata.get(f"{architecture}.block_count") or 0)
+    heads = metadata.get(f"{architecture}.attention.head_count")
+    kv_heads = metadata.get(f"{architecture}.attention.head_count_kv", heads)
+    embedding = int(metadata.get(f"{architecture}.embedding_length") or 0)
+    if not ctx_size:
+        ctx_size = int(metadata.get(f"{architecture}.context_length") or 0)
+    if not (layers and heads and kv_heads and ctx_size):
+        return 0
+
+    # head counts are per layer arrays in models mixing attention layouts
+    if not isinstance(heads, list):
+        heads = [heads] * layers
+    if not isinstance(kv_heads, list):
+        kv_heads = [kv_heads] * layers
+    max_heads = max(heads) or 1
+    key_length = int(metadata.get(f"{architecture}.attention.key_length") or embedding // max_heads)
+    value_length = int(metadata.get(f"{architecture}.attention.value_length") or embedding // max_heads)
+    elements = sum(int(n) for n in kv_heads[:layers]) * (key_length + value_length) * ctx_size
+    return elements * KV_CACHE_ELEMENT_SIZE
+
+
+@dataclass
+class ModelResources:
+    """What a model server container needs; sizes in bytes, startup in seconds."""
+
+    weights: int
+    kv_cache: int
+    memory_request: int
+    memory_limit: int
+    cpus: Optional[int]
+    startup_seconds: int
+    health_path: Optional[str]
+
+    @classmethod
+    def estimate(cls, model_files: list[str], args) -> Optional["ModelResources"]:
+        """
+        Size the container for the local model_files (weights, draft model, mmproj). None when
+        any of them cannot be read, e.g. models in OCI images, whose size is only known once pulled.
+        """
+        files = [path.removeprefix("oci://") for path in model_files if path]
+        if not files:
+            return None
+        try:
+            weights = sum(os.path.getsize(path) for path in files)
+        except OSError:
+            return None
+
+        kv_cache = 0
+        gguf = next((path for path in files if GGUFInfoParser.is_model_gguf(path)), None)
+        if gguf is not None:
+            try:
+                ctx_size = getattr(args, "ctx_size", 0)
+                ctx_size = ctx_size if isinstance(ctx_size, int) else 0
+                kv_cache = kv_cache_bytes(GGUFInfoParser.parse_metadata(gguf).data, ctx_size)
+            except Exception as e:
+                logger.debug(f"Failed to read the attention layout of {gguf}: {e}")
+
+        memory = weights + kv_cache
+        memory_request = math.ceil(memory * (1 + MEMORY_OVERHEAD_RATIO)) + MEMORY_OVERHEAD_BYTES
+        startup_seconds = max(MIN_STARTUP_SECONDS, math.ceil(weights / LOAD_BYTES_PER_SECOND))
+        threads = getattr(args, "threads", None)
+        return cls(
+            weights=weights,
+            kv_cache=kv_cache,
+            memory_request=memory_request,
+            memory_limit=math.ceil(memory_request * MEMORY_LIMIT_RATIO),
+            cpus=int(threads) if isinstance(threads, int) and threads > 0 else None,
+            startup_seconds=math.ceil(startup_seconds / PROBE_PERIOD_SECONDS) * PROBE_PERIOD_SECONDS,
+            health_path=runtime_health_path(),
+        )
+
+    @property
+    def memory_request_mib(self) -> int:
+        return math.ceil(self.memory_request / MIB)
+
+    @property
+    def memory_limit_mib(self) -> int:
+        return math.ceil(self.memory_limit / MIB)
+
+    @property
+    def startup_failure_threshold(self) -> int:
+        return self.startup_seconds // PROBE_PERIOD_SECONDS
+
+
+def runtime_health_path() -> Optional[str]:
+    try:
+        return get_runtime(ActiveConfig().runtime).health_check_path
+    except ValueError as e:
+        logger.debug(f"No health endpoint to probe: {e}")
+        return None
+
+
+def container_port(args) -> Optional[str]:
+    """Port the server listens on inside the container, from --port [container:host]."""
+    port = getattr(args, "port", None)
+    if not port:
+        return None
+    return str(port).split(":", 1)[0]
@@ -3,3 +3,8 @@ from __future__ import annotations
 DIRECTORY_NAME_BLOBS = "blobs"
 DIRECTORY_NAME_REFS = "refs"
 DIRECTORY_NAME_SNAPSHOTS = "snapshots"
+DIRECTORY_NAME_INTERMEDIATES = "intermediates"
+
+# Counter bumped whenever a ref file is written or removed, so caches of the store can be validated cheaply
+FILE_NAME_GENERATION = "generation"
+FILE_NAME_ROUTER_MANIFEST = "router-manifest.json"
@@ -6,7 +6,12 @@ from typing import Dict, List
 
 from ramalama import oci_tools
 from ramalama.arg_types import EngineArgs
-from ramalama.model_store.constants import DIRECTORY_NAME_BLOBS, DIRECTORY_NAME_REFS, DIRECTORY_NAME_SNAPSHOTS
+from ramalama.model_store.constants import (
+    DIRECTORY_NAME_BLOBS,
+    DIRECTORY_NAME_REFS,
+    DIRECTORY_NAME_SNAPSHOTS,
+    FILE_NAME_GENERATION,
+)
 from ramalama.model_store.reffile import RefJSONFile, migrate_reffile_to_refjsonfile
 
 
@@ -29,6 +34,28 @@ class GlobalModelStore:
     def path(self) -> str:
         return self._store_base_path
 
+    @property
+    def generation_file(self) -> str:
+        return os.path.join(self.path, FILE_NAME_GENERATION)
+
+    def generation(self) -> tuple[int, int]:
+        """The (counter, mtime_ns) of the generation file; (0, 0) before any ref was written."""
+        try:
+            with open(self.generation_file, "r") as f:
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                return int(f.read().strip() or 0), mtime_ns
+        except (OSError, ValueError):
+            return 0, 0
+
+    def bump_generation(self) -> None:
+        """Record that refs changed. Concurrent writers may lose an increment, but never the new mtime."""
+        counter, _ = self.generation()
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{self.generation_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(counter + 1))
+        os.replace(tmp_path, self.generation_file)
+
     def list_models(self, engine: str, show_container: bool) -> Dict[str, List[ModelFile]]:
         models: Dict[str, List[ModelFile]] = {}
 
@@ -77,7 +104,9 @@ class GlobalModelStore:
                     models[model_name] = collected_files
 
         if show_container:
-            oci_models = oci_tools.list_models(EngineArgs(engine=engine))
+            oci_models = oci_tools.list_models(
+                EngineArgs(engine=engine), cache_dir=os.path.join(os.path.dirname(self.path), "cache")
+            )
             for oci_model in oci_models:
                 name, modified, size = (oci_model["name"], oci_model["modified"], oci_model["size"])
 
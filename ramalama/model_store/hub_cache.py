@@ -0,0 +1,343 @@
+"""Import models already downloaded by the Hugging Face and ModelScope hub clients into the model store"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ramalama.common import SPLIT_MODEL_PATH_RE
+from ramalama.logger import logger
+from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.snapshot_file import SnapshotFile, SnapshotFileType
+from ramalama.model_store.store import ModelStore
+from ramalama.path_utils import link_or_copy
+
+HUB_SOURCES = ("huggingface", "modelscope")
+TRANSPORT_PREFIXES = {"huggingface": "hf", "modelscope": "ms"}
+
+# Hugging Face names LFS blobs after their sha256; other files after their git sha1
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+_SPLIT_PART_RE = re.compile(r"-(\d{5})-of-(\d{5})\.gguf$")
+# Quantization of a GGUF file name, e.g. granite-3.3-8b-instruct-Q4_K_M.gguf
+_QUANT_RE = re.compile(r"[-._]((?:I?Q\d(?:_[A-Z0-9]+)*)|BF16|F16|F32)(?=[-._])", re.IGNORECASE)
+DEFAULT_QUANTIZATION = "Q4_K_M"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def huggingface_cache_dir() -> str:
+    if hub_cache := os.environ.get("HF_HUB_CACHE"):
+        return hub_cache
+    hf_home = os.environ.get("HF_HOME") or os.path.join(os.path.expanduser("~"), ".cache", "huggingface")
+    return os.path.join(hf_home, "hub")
+
+
+def modelscope_cache_dir() -> str:
+    return os.environ.get("MODELSCOPE_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "modelscope", "hub")
+
+
+def default_cache_dir(source: str) -> str:
+    return huggingface_cache_dir() if source == "huggingface" else modelscope_cache_dir()
+
+
+@dataclass
+class CachedFile:
+    name: str
+    path: str
+    # "sha256:<hex>" when the hub client recorded the content digest
+    digest: Optional[str] = None
+
+
+@dataclass
+class CachedRevision:
+    """The files of one repository revision found in a hub cache."""
+
+    source: str
+    organization: str
+    name: str
+    tag: str
+    files: list[CachedFile]
+
+
+@dataclass
+class PlannedModel:
+    """A model store reference to create from cached files; the first file is the model."""
+
+    source: str
+    organization: str
+    name: str
+    tag: str
+    files: list[tuple[CachedFile, SnapshotFileType]]
+
+    @property
+    def model(self) -> str:
+        path = f"{self.organization}/{self.name}" if self.organization else self.name
+        return f"{TRANSPORT_PREFIXES[self.source]}://{path}:{self.tag}"
+
+    @property
+    def snapshot_hash(self) -> str:
+        digest = self.files[0][0].digest
+        assert digest is not None
+        return digest
+
+    def model_store(self, store_path: str) -> ModelStore:
+        return ModelStore(GlobalModelStore(store_path), self.name, self.source, self.organization)
+
+
+@dataclass
+class ImportSummary:
+    imported: list[str] = field(default_factory=list)
+    existing: list[str] = field(default_factory=list)
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    # how blobs were placed in the store: hardlink, reflink or copy
+    transfers: Counter[str] = field(default_factory=Counter)
+    hashed: int = 0
+
+
+class CachedSnapshotFile(SnapshotFile):
+    """A snapshot file placed in the store by linking the hub cache's copy instead of downloading it."""
+
+    def __init__(self, cached: CachedFile, type: SnapshotFileType, transfers: Counter[str]):
+        assert cached.digest is not None
+        super().__init__(cached.path, {}, cached.digest, cached.name, type)
+        self.transfers = transfers
+
+    def download(self, blob_file_path: str, snapshot_dir: str) -> str:
+        if not os.path.exists(blob_file_path):
+            method = link_or_copy(self.url, blob_file_path)
+            self.transfers[method] += 1
+            logger.debug(f"Imported {self.url} to {blob_file_path} ({method})")
+        prefix = os.path.dirname(self.name)
+        if prefix:
+            snapshot_dir = os.path.join(snapshot_dir, prefix)
+        return os.path.relpath(blob_file_path, start=snapshot_dir)
+
+
+def _walk_files(directory: str) -> Iterable[tuple[str, str]]:
+    """Yield (name relative to directory, path) for every file, skipping hidden entries."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for filename in sorted(files):
+            if filename.startswith("."):
+                continue
+            path = os.path.join(root, filename)
+            yield os.path.relpath(path, directory).replace(os.sep, "/"), path
+
+
+def _revision_tag(ref: str) -> str:
+    return "latest" if ref == "main" else ref.replace("/", "-")
+
+
+def scan_huggingface_cache(cache_dir: str) -> list[CachedRevision]:
+    """
+    Every revision in a Hugging Face hub cache. Snapshots hold symlinks into the repo's
+    blobs directory, so the sha256 of LFS files comes from the blob name without reading them.
+    """
+    revisions: list[CachedRevision] = []
+    if not os.path.isdir(cache_dir):
+        return revisions
+
+    for entry in sorted(os.listdir(cache_dir)):
+        if not entry.startswith("models--"):
+            continue
+        repo_dir = os.path.join(cache_dir, entry)
+        repo_id = entry[len("models--") :]
+        # the cache encodes "org/repo" as "org--repo"; neither part may contain "--"
+        organization, _, name = repo_id.partition("--") if "--" in repo_id else ("", "", repo_id)
+        snapshots_dir = os.path.join(repo_dir, "snapshots")
+        blobs_dir = os.path.realpath(os.path.join(repo_dir, "blobs"))
+        if not os.path.isdir(snapshots_dir):
+            continue
+
+        tags: dict[str, list[str]] = {}
+        for ref, ref_path in _walk_files(os.path.join(repo_dir, "refs")):
+            try:
+                with open(ref_path) as f:
+                    commit = f.read().strip()
+            except OSError:
+                continue
+            tags.setdefault(commit, []).append(_revision_tag(ref))
+
+        for commit in sorted(os.listdir(snapshots_dir)):
+            snapshot_dir = os.path.join(snapshots_dir, commit)
+            files = []
+            for file_name, path in _walk_files(snapshot_dir):
+                real_path = os.path.realpath(path)
+                if not os.path.isfile(real_path):
+                    # dangling link of an interrupted download
+                    continue
+                digest = None
+                blob_name = os.path.basename(real_path)
+                if os.path.dirname(real_path) == blobs_dir and _SHA256_RE.fullmatch(blob_name):
+                    digest = f"sha256:{blob_name}"
+                files.append(CachedFile(file_name, real_path, digest))
+            if not files:
+                continue
+            for tag in tags.get(commit, [commit]):
+                revisions.append(CachedRevision("huggingface", organization, name, tag, files))
+
+    return revisions
+
+
+def scan_modelscope_cache(cache_dir: str) -> list[CachedRevision]:
+    """The repositories of a ModelScope hub cache, which keeps one revision of each as plain files."""
+    revisions: list[CachedRevision] = []
+    models_dir = os.path.join(cache_dir, "models")
+    if not os.path.isdir(models_dir):
+        return revisions
+
+    for organization in sorted(os.listdir(models_dir)):
+        org_dir = os.path.join(models_dir, organization)
+        if organization.startswith(".") or not os.path.isdir(org_dir):
+            continue
+        for repo in sorted(os.listdir(org_dir)):
+            repo_dir = os.path.join(org_dir, repo)
+            if repo.startswith(".") or not os.path.isdir(repo_dir):
+                continue
+            files = [CachedFile(name, os.path.realpath(path)) for name, path in _walk_files(repo_dir)]
+            if files:
+                # ModelScope stores "." in repository names as "___"
+                revisions.append(CachedRevision("modelscope", organization, repo.replace("___", "."), "latest", files))
+
+    return revisions
+
+
+def scan_cache(source: str, cache_dir: str) -> list[CachedRevision]:
+    if source == "huggingface":
+        return scan_huggingface_cache(cache_dir)
+    return scan_modelscope_cache(cache_dir)
+
+
+def quantization_tag(file_name: str) -> Optional[str]:
+    stem = _SPLIT_PART_RE.sub("", os.path.basename(file_name)).removesuffix(".gguf")
+    matches = _QUANT_RE.findall(f"{stem}.")
+    return matches[-1].upper() if matches else None
+
+
+def plan_models(revision: CachedRevision) -> list[PlannedModel]:
+    """
+    Map a cached revision to model references the way pulling it would have created them.
+    Each GGUF model becomes <org>/<repo>/<file>, and for the main revision also
+    <org>/<repo>:<quantization>, with latest pointing at Q4_K_M or the only model. A
+    Safetensors repository becomes one <org>/<repo> reference holding all its files.
+    """
+    by_name = {file.name: file for file in revision.files}
+    ggufs = [file for file in revision.files if file.name.endswith(".gguf")]
+    mmprojs = [file for file in ggufs if "mmproj" in os.path.basename(file.name).lower()]
+    models = [
+        file
+        for file in ggufs
+        if file not in mmprojs and (not _SPLIT_PART_RE.search(file.name) or re.match(SPLIT_MODEL_PATH_RE, file.name))
+    ]
+
+    planned: list[PlannedModel] = []
+    if models:
+        repo_path = f"{revision.organization}/{revision.name}" if revision.organization else revision.name
+        quantized: dict[str, list[tuple[CachedFile, SnapshotFileType]]] = {}
+        for model in models:
+            files = [(model, SnapshotFileType.GGUFModel)]
+            if match := re.match(SPLIT_MODEL_PATH_RE, model.name):
+                prefix = model.name[: -len("-00001-of-00000.gguf")]
+                part_names = [f"{prefix}-{part:05d}-of-{match[3]}.gguf" for part in range(2, int(match[3]) + 1)]
+                parts = [by_name[part_name] for part_name in part_names if part_name in by_name]
+                if len(parts) != len(part_names):
+                    logger.debug(f"Skipping {model.name} of {repo_path}, not all of its parts are cached")
+                    continue
+                files += [(part, SnapshotFileType.Other) for part in parts]
+            if len(mmprojs) == 1:
+                files.append((mmprojs[0], SnapshotFileType.Mmproj))
+
+            file_organization, _, file_name = f"{repo_path}/{model.name}".rpartition("/")
+            planned.append(PlannedModel(revision.source, file_organization, file_name, revision.tag, files))
+            if revision.tag == "latest" and (quantization := quantization_tag(model.name)):
+                quantized.setdefault(quantization, files)
+
+        if revision.tag == "latest":
+            if DEFAULT_QUANTIZATION in quantized:
+                quantized["latest"] = quantized[DEFAULT_QUANTIZATION]
+            elif len(planned) == 1:
+                quantized["latest"] = planned[0].files
+            for tag, files in quantized.items():
+                planned.append(PlannedModel(revision.source, revision.organization, revision.name, tag, files))
+        return planned
+
+    safetensors = sorted(
+        (file for file in revision.files if file.name.endswith(".safetensors")), key=lambda file: file.name
+    )
+    if not safetensors:
+        return planned
+    others = [file for file in revision.files if not file.name.endswith((".safetensors", ".gguf"))]
+    files = [(file, SnapshotFileType.SafetensorModel) for file in safetensors]
+    files += [(file, SnapshotFileType.Other) for file in others]
+    planned.append(PlannedModel(revision.source, revision.organization, revision.name, revision.tag, files))
+    return planned
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def hash_files(files: Iterable[CachedFile], jobs: int) -> int:
+    """Fill in the digest of files the hub did not record one for, hashing in parallel. Returns the count."""
+    pending: dict[str, list[CachedFile]] = {}
+    for file in files:
+        if file.digest is None:
+            pending.setdefault(file.path, []).append(file)
+    if not pending:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        for path, digest in zip(pending, executor.map(sha256_file, pending)):
+            for file in pending[path]:
+                file.digest = digest
+    return len(pending)
+
+
+def import_hub_caches(
+    store_path: str,
+    caches: Sequence[tuple[str, str]],
+    jobs: int,
+    verify: bool = True,
+    dryrun: bool = False,
+) -> ImportSummary:
+    """
+    Create model store references for every model in the given (source, cache directory)
+    pairs. Blobs are hardlinked or reflinked from the cache when possible, and only files
+    without a recorded digest are read. References already in the store are left alone.
+    """
+    summary = ImportSummary()
+    planned: list[PlannedModel] = []
+    for source, cache_dir in caches:
+        for revision in scan_cache(source, cache_dir):
+            for model in plan_models(revision):
+                if model.model_store(store_path).get_ref_file(model.tag) is not None:
+                    summary.existing.append(model.model)
+                else:
+                    planned.append(model)
+
+    if dryrun:
+        summary.imported = [model.model for model in planned]
+        return summary
+
+    summary.hashed = hash_files((file for model in planned for file, _ in model.files), jobs)
+    for model in planned:
+        snapshot_files: list[SnapshotFile] = [
+            CachedSnapshotFile(file, type, summary.transfers) for file, type in model.files
+        ]
+        try:
+            model.model_store(store_path).new_snapshot(model.tag, model.snapshot_hash, snapshot_files, verify=verify)
+        except Exception as e:
+            summary.failed.append((model.model, str(e)))
+            continue
+        summary.imported.append(model.model)
+
+    return summary
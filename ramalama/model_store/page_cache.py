@@ -0,0 +1,151 @@
+"""Reading model files into the page cache before the server maps them, and dropping them once unloaded"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from ramalama import tracing
+from ramalama.common import get_available_memory, perror
+from ramalama.logger import logger
+
+MIB = 1024 * 1024
+GIB = 1024 * MIB
+
+# Each worker reads a segment of a file front to back, in reads large enough to keep readahead busy
+SEGMENT_SIZE = 256 * MIB
+READ_SIZE = 8 * MIB
+PREWARM_WORKERS = 4
+
+# Share of the available memory the model may take; beyond it warming would only evict its own pages
+PREWARM_MEMORY_RATIO = 0.8
+
+
+@dataclass
+class PrewarmResult:
+    size: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.size / GIB:.2f} GiB in {self.seconds:.1f}s ({self.throughput / MIB:.0f} MiB/s)"
+
+
+def model_files(paths: Iterable[str]) -> dict[str, int]:
+    """Size of every distinct file behind paths; directories are walked and symlinks resolved."""
+    files: dict[str, int] = {}
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            real_path = os.path.realpath(candidate)
+            if real_path not in files and os.path.isfile(real_path):
+                files[real_path] = os.path.getsize(real_path)
+    return files
+
+
+def _advise(fd: int, offset: int, length: int, advice_name: str) -> None:
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, advice)
+    except OSError as e:
+        logger.debug(f"posix_fadvise {advice_name} failed: {e}")
+
+
+def _read_segment(path: str, offset: int, length: int) -> int:
+    buffer = memoryview(bytearray(min(READ_SIZE, length)))
+    read = 0
+    with open(path, "rb", buffering=0) as f:
+        _advise(f.fileno(), offset, length, "POSIX_FADV_SEQUENTIAL")
+        _advise(f.fileno(), offset, length, "POSIX_FADV_WILLNEED")
+        f.seek(offset)
+        while read < length:
+            n = f.readinto(buffer[: min(READ_SIZE, length - read)])
+            if not n:
+                break
+            read += n
+    return read
+
+
+def prewarm(
+    paths: Iterable[str], workers: int = PREWARM_WORKERS, available_memory: Optional[int] = None
+) -> Optional[PrewarmResult]:
+    """
+    Read the files behind paths into the page cache, in parallel sequential segments. None
+    without files to read or when they would not fit in the available memory.
+    """
+    files = model_files(paths)
+    size = sum(files.values())
+    if not size:
+        return None
+    if available_memory is None:
+        available_memory = get_available_memory()
+    if available_memory is not None and size > available_memory * PREWARM_MEMORY_RATIO:
+        logger.debug(f"Not prewarming {size / GIB:.2f} GiB with {available_memory / GIB:.2f} GiB available")
+        return None
+
+    segments = [
+        (path, offset, min(SEGMENT_SIZE, file_size - offset))
+        for path, file_size in files.items()
+        for offset in range(0, file_size, SEGMENT_SIZE)
+    ]
+    start = time.monotonic()
+    with tracing.span("page_cache.prewarm", bytes=size, files=len(files)):
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(segments))), thread_name_prefix="prewarm") as pool:
+            read = sum(pool.map(lambda segment: _read_segment(*segment), segments))
+    return PrewarmResult(read, time.monotonic() - start)
+
+
+def evict(paths: Iterable[str]) -> int:
+    """Ask the kernel to drop the cached pages of the files behind paths; returns their total size."""
+    size = 0
+    for path, file_size in model_files(paths).items():
+        try:
+            with open(path, "rb", buffering=0) as f:
+                _advise(f.fileno(), 0, 0, "POSIX_FADV_DONTNEED")
+        except OSError as e:
+            logger.debug(f"Failed to evict {path}: {e}")
+            continue
+        size += file_size
+    return size
+
+
+def _run_prewarm(future: Future, paths: list[str], quiet: bool) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        result = prewarm(paths)
+    except BaseException as e:
+        logger.debug(f"Prewarming the page cache failed: {e}")
+        future.set_exception(e)
+        return
+    if result is not None:
+        message = f"Prewarmed the model: {result}"
+        if quiet:
+            logger.debug(message)
+        else:
+            perror(message)
+    future.set_result(result)
+
+
+def start_prewarm(paths: Iterable[str], quiet: bool = False) -> Future:
+    """
+    Prewarm the page cache in a background thread, so it overlaps with the server or container
+    starting up, and report the throughput when done. The thread is daemonic so it never holds up exit.
+    """
+    future: Future = Future()
+    threading.Thread(target=_run_prewarm, args=(future, list(paths), quiet), name="prewarm", daemon=True).start()
+    return future
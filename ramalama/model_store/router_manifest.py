@@ -0,0 +1,106 @@
+"""Persistent list of the GGUF models in the store, so router mode starts without reading every ref file"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ramalama.logger import logger
+from ramalama.model_store.constants import (
+    DIRECTORY_NAME_BLOBS,
+    DIRECTORY_NAME_INTERMEDIATES,
+    DIRECTORY_NAME_REFS,
+    DIRECTORY_NAME_SNAPSHOTS,
+    FILE_NAME_ROUTER_MANIFEST,
+)
+from ramalama.model_store.global_store import GlobalModelStore
+
+ROUTER_MANIFEST_VERSION = 2
+MODEL_DATA_DIRECTORIES = (
+    DIRECTORY_NAME_BLOBS,
+    DIRECTORY_NAME_INTERMEDIATES,
+    DIRECTORY_NAME_REFS,
+    DIRECTORY_NAME_SNAPSHOTS,
+)
+
+
+@dataclass
+class StoreStamp:
+    """
+    State of the store a manifest was built from. The generation is bumped by every ref write
+    through ModelStore; anything else, such as older versions, a manual copy or a cleanup, is
+    caught by the mtimes of the refs directories and of the directories that hold model
+    directories, which change when a ref file or a model directory is added or removed.
+    """
+
+    generation: tuple[int, int]
+    dirs: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def current(cls, store: GlobalModelStore) -> "StoreStamp":
+        stamp = cls(store.generation())
+        for root, subdirs, _ in os.walk(store.path):
+            # the store directory itself changes with every manifest and generation write
+            if root != store.path:
+                stamp.dirs[os.path.relpath(root, store.path)] = os.stat(root).st_mtime_ns
+            if DIRECTORY_NAME_REFS in subdirs:
+                refs_dir = os.path.join(root, DIRECTORY_NAME_REFS)
+                stamp.dirs[os.path.relpath(refs_dir, store.path)] = os.stat(refs_dir).st_mtime_ns
+                # only model directories can nest, e.g. hf://org/repo and hf://org/repo/file.gguf
+                subdirs[:] = [subdir for subdir in subdirs if subdir not in MODEL_DATA_DIRECTORIES]
+        return stamp
+
+    def is_current(self, store: GlobalModelStore) -> bool:
+        if tuple(self.generation) != store.generation():
+            return False
+        for directory, mtime_ns in self.dirs.items():
+            try:
+                if os.stat(os.path.join(store.path, directory)).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+class RouterManifest:
+    """(host blob path, model file name) of every GGUF model, kept next to the store and rebuilt when it changes."""
+
+    def __init__(self, store: GlobalModelStore):
+        self.store = store
+        self.path = os.path.join(store.path, FILE_NAME_ROUTER_MANIFEST)
+
+    def load(self) -> Optional[list[tuple[str, str]]]:
+        """The recorded models if the store did not change since they were recorded, otherwise None."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != ROUTER_MANIFEST_VERSION:
+                return None
+            stamp = StoreStamp(tuple(data["generation"]), data["dirs"])
+            models = [(model["blob"], model["name"]) for model in data["models"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if not stamp.is_current(self.store):
+            logger.debug("Router manifest is out of date")
+            return None
+        # a blob removed behind the store's back is dropped instead of failing the mount
+        return [(blob, name) for blob, name in models if os.path.exists(blob)]
+
+    def save(self, stamp: StoreStamp, models: list[tuple[str, str]]) -> None:
+        data = {
+            "version": ROUTER_MANIFEST_VERSION,
+            "generation": list(stamp.generation),
+            "dirs": stamp.dirs,
+            "models": [{"blob": blob, "name": name} for blob, name in models],
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.store.path, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Failed to write router manifest {self.path}: {e}")
@@ -0,0 +1,71 @@
+"""Present the files of a model snapshot to a container without copying them"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from ramalama.logger import logger
+from ramalama.path_utils import get_container_mount_path, link_or_copy
+
+if TYPE_CHECKING:
+    from ramalama.engine import Engine
+    from ramalama.model_store.store import ModelStore
+
+# Beyond this many files a single directory mount is cheaper than one mount per file
+MAX_BIND_MOUNTS = 128
+
+
+def _bind_mountable(name: str) -> bool:
+    # --mount options are comma separated, so a comma cannot appear in the destination
+    return "," not in name and not os.path.isabs(name) and ".." not in name.split("/")
+
+
+@contextmanager
+def stage_snapshot(model_store: ModelStore, model_tag: str, engine: Engine, dest: str) -> Iterator[str]:
+    """
+    Make the files of model_tag appear read-only under dest in the container engine runs.
+
+    Every blob is bind mounted straight from the store under its file name. Snapshots
+    with too many files, or names a mount cannot express, are staged in a temporary
+    directory next to the blobs with hardlinks or reflinks instead, copying only when
+    neither works. Yields a description of the method; the staging is removed on exit.
+    """
+    start = time.perf_counter()
+    ref_file = model_store.get_ref_file(model_tag)
+    if ref_file is None:
+        raise ValueError(f"No ref file found for {model_tag}")
+    files = [(model_store.get_blob_file_path(file.hash), file.name) for file in ref_file.files]
+
+    if len(files) <= MAX_BIND_MOUNTS and all(_bind_mountable(name) for _, name in files):
+        for blob_path, name in files:
+            engine.add(
+                [
+                    f"--mount=type=bind,src={get_container_mount_path(blob_path)},"
+                    f"destination={dest}/{name},ro{engine.relabel()}"
+                ]
+            )
+        _report("bind mount", len(files), start)
+        yield "bind mount"
+        return
+
+    try:
+        # inside the store, so hardlinks to the blobs stay on one filesystem
+        staging_dir = tempfile.TemporaryDirectory(prefix="RamaLama_convert_src_", dir=model_store.base_path)
+    except OSError:
+        staging_dir = tempfile.TemporaryDirectory(prefix="RamaLama_convert_src_")
+    with staging_dir as srcdir:
+        methods = Counter(link_or_copy(blob_path, os.path.join(srcdir, name)) for blob_path, name in files)
+        engine.add_volume(srcdir, dest)
+        method = ", ".join(f"{count} {name}" for name, count in methods.most_common())
+        _report(method, len(files), start)
+        yield method
+
+
+def _report(method: str, count: int, start: float) -> None:
+    logger.debug(f"Staged {count} model files by {method} in {time.perf_counter() - start:.3f}s")
@@ -8,12 +8,18 @@ from http import HTTPStatus
 from pathlib import Path
 from typing import Optional, Sequence, Tuple
 
+from ramalama import tracing
 from ramalama.common import perror, sanitize_filename, verify_checksum
 from ramalama.endian import EndianMismatchError, get_system_endianness
 from ramalama.logger import logger
 from ramalama.model_inspect.gguf_parser import GGUFInfoParser, GGUFModelInfo
 from ramalama.model_store import go2jinja
-from ramalama.model_store.constants import DIRECTORY_NAME_BLOBS, DIRECTORY_NAME_REFS, DIRECTORY_NAME_SNAPSHOTS
+from ramalama.model_store.constants import (
+    DIRECTORY_NAME_BLOBS,
+    DIRECTORY_NAME_INTERMEDIATES,
+    DIRECTORY_NAME_REFS,
+    DIRECTORY_NAME_SNAPSHOTS,
+)
 from ramalama.model_store.global_store import GlobalModelStore
 from ramalama.model_store.reffile import RefJSONFile, StoreFile, StoreFileType, migrate_reffile_to_refjsonfile
 from ramalama.model_store.snapshot_file import (
@@ -86,6 +92,14 @@ class ModelStore:
     def snapshots_directory(self) -> str:
         return os.path.join(self.model_base_directory, DIRECTORY_NAME_SNAPSHOTS)
 
+    @property
+    def intermediates_directory(self) -> str:
+        return os.path.join(self.model_base_directory, DIRECTORY_NAME_INTERMEDIATES)
+
+    def get_intermediate_directory(self, snapshot_hash: str) -> str:
+        """Files derived from a snapshot, such as the unquantized GGUF conversion, kept until it is removed."""
+        return os.path.join(self.intermediates_directory, sanitize_filename(snapshot_hash))
+
     def file_exists(self, file_path: str) -> bool:
         return os.path.exists(file_path)
 
@@ -123,6 +137,7 @@ class ModelStore:
             ref_file.files.append(StoreFile(file.hash, file.name, map_to_store_file_type(file.type)))
 
         ref_file.write_to_file()
+        self._store.bump_generation()
 
         return ref_file
 
@@ -224,7 +239,8 @@ class ModelStore:
         for file in snapshot_files:
             dest_path = self.get_blob_file_path(file.hash)
             try:
-                file.download(dest_path, self.get_snapshot_directory(snapshot_hash))
+                with tracing.span("store.download", file=file.name):
+                    file.download(dest_path, self.get_snapshot_directory(snapshot_hash))
             except urllib.error.HTTPError as ex:
                 if file.required:
                     raise ex
@@ -234,7 +250,9 @@ class ModelStore:
                 continue
 
             if file.should_verify_checksum:
-                if not verify_checksum(dest_path):
+                with tracing.span("store.verify_checksum", file=file.name):
+                    checksum_ok = verify_checksum(dest_path)
+                if not checksum_ok:
                     logger.info(f"Checksum mismatch for blob {dest_path}, retrying download ...")
                     os.remove(dest_path)
                     file.download(dest_path, self.get_snapshot_directory(snapshot_hash))
@@ -249,6 +267,7 @@ class ModelStore:
 
         # save updated ref file
         ref_file.write_to_file()
+        self._store.bump_generation()
 
     def _try_convert_existing_chat_template(self, ref_file: RefJSONFile, snapshot_hash: str) -> bool:
         for file in ref_file.chat_templates:
@@ -355,7 +374,10 @@ class ModelStore:
 
     def new_snapshot(self, model_tag: str, snapshot_hash: str, snapshot_files: list[SnapshotFile], verify: bool = True):
         snapshot_hash = sanitize_filename(snapshot_hash)
+        with tracing.span("store.new_snapshot", model=self.model_name, tag=model_tag, files=len(snapshot_files)):
+            self._new_snapshot(model_tag, snapshot_hash, snapshot_files, verify)
 
+    def _new_snapshot(self, model_tag: str, snapshot_hash: str, snapshot_files: list[SnapshotFile], verify: bool):
         try:
             ref_file = self._prepare_new_snapshot(model_tag, snapshot_hash, snapshot_files)
             self._download_snapshot_files(ref_file, snapshot_hash, snapshot_files)
@@ -372,7 +394,8 @@ class ModelStore:
 
         try:
             if verify:
-                self.verify_snapshot(model_tag)
+                with tracing.span("store.verify_snapshot"):
+                    self.verify_snapshot(model_tag)
         except EndianMismatchError as ex:
             perror(f"Verification of snapshot failed: {ex}")
             perror("Removing snapshot...")
@@ -452,10 +475,12 @@ class ModelStore:
             self._remove_blob_path(partial_blob_file_path)
             snapshot_directory = self.get_snapshot_directory_from_tag(model_tag)
             shutil.rmtree(snapshot_directory, ignore_errors=True)
+            shutil.rmtree(self.get_intermediate_directory(ref_file.hash), ignore_errors=True)
             logger.debug(f"Snapshot removed {ref_file.hash}")
         else:
             logger.debug(f"Not removing snapshot {ref_file.hash} refcount={snapshot_refcount}")
 
         # Remove ref file, ignore if file is not found
         Path(self.get_ref_file_path(model_tag)).unlink(missing_ok=True)
+        self._store.bump_generation()
         return True
@@ -0,0 +1,394 @@
+"""Event-driven watchers for inference server processes and containers"""
+
+from __future__ import annotations
+
+import _thread
+import json
+import os
+import select
+import subprocess
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from ramalama.logger import logger
+
+# podman reports "died", docker reports "die"
+EXIT_STATUSES = frozenset({"died", "die", "remove", "destroy"})
+
+
+@dataclass
+class ContainerEvent:
+    status: str
+    name: str
+    exit_code: Optional[int] = None
+    health: Optional[str] = None
+
+    @property
+    def exited(self) -> bool:
+        return self.status in EXIT_STATUSES
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_event(line: str) -> Optional[ContainerEvent]:
+    """Normalize one line of `podman events --format json` or `docker events --format '{{json .}}'`."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("Type", "container") != "container":
+        return None
+
+    if "Actor" in data:
+        # docker: {"Action": "die", "Actor": {"Attributes": {"name": ..., "exitCode": "1"}}}
+        attributes = data["Actor"].get("Attributes", {})
+        action = data.get("Action") or data.get("status", "")
+        status, _, health = action.partition(": ")
+        return ContainerEvent(
+            status=status,
+            name=attributes.get("name", ""),
+            exit_code=_int_or_none(attributes.get("exitCode")),
+            health=health or None,
+        )
+
+    return ContainerEvent(
+        status=data.get("Status", ""),
+        name=data.get("Name", ""),
+        exit_code=_int_or_none(data.get("ContainerExitCode")),
+        health=data.get("HealthStatus") or None,
+    )
+
+
+def events_command(engine: str, container_name: str) -> list[str]:
+    fmt = "{{json .}}" if os.path.basename(engine) == "docker" else "json"
+    return [engine, "events", "--format", fmt, "--filter", f"container={container_name}"]
+
+
+class ContainerEventStream:
+    """
+    One long-lived `<engine> events` process for a container. Iterating yields its
+    events as they happen and ends when the stream is stopped or the engine exits.
+    """
+
+    def __init__(self, engine: str, container_name: str, command: Optional[list[str]] = None):
+        self.engine = engine
+        self.container_name = container_name
+        self.command = command or events_command(engine, container_name)
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> "ContainerEventStream":
+        self._process = subprocess.Popen(
+            self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, text=True
+        )
+        return self
+
+    def __iter__(self) -> Iterator[ContainerEvent]:
+        if self._process is None or self._process.stdout is None:
+            return
+        with self._process.stdout:
+            for line in self._process.stdout:
+                if self._stopped.is_set():
+                    return
+                event = parse_event(line)
+                if event is not None and event.name in ("", self.container_name):
+                    yield event
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+
+class ProcessExitWatcher:
+    """
+    Block until a child process exits without polling it. On Linux this waits on a
+    pidfd; elsewhere a helper thread blocks in Popen.wait().
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._stop_w: Optional[int] = None
+
+    def wait(self) -> Optional[int]:
+        """Return the exit code, or None if stop() was called first."""
+        pidfd = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(self.process.pid)
+            except OSError:
+                # already reaped, or pidfds unsupported by the kernel
+                pidfd = None
+
+        if pidfd is None:
+            return self._wait_in_thread()
+
+        stop_r, stop_w = os.pipe()
+        with self._lock:
+            self._stop_w = stop_w
+        try:
+            if not self._stopped.is_set():
+                ready, _, _ = select.select([pidfd, stop_r], [], [])
+                if pidfd in ready:
+                    return self.process.wait()
+            return None
+        finally:
+            os.close(pidfd)
+            with self._lock:
+                self._stop_w = None
+            os.close(stop_r)
+            os.close(stop_w)
+
+    def _wait_in_thread(self) -> Optional[int]:
+        result: list[int] = []
+
+        def waiter():
+            result.append(self.process.wait())
+            self._stopped.set()
+
+        threading.Thread(target=waiter, daemon=True).start()
+        self._stopped.wait()
+        return result[0] if result else None
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            if self._stop_w is not None:
+                os.write(self._stop_w, b"x")
+
+
+class ServerMonitor:
+    """
+    Monitor server process or container and report when it exits.
+
+    Processes are watched with a blocking wait on their exit, containers through a single
+    long-lived `<engine> events` stream, so nothing is forked per check. If the engine
+    cannot stream events the container is polled with inspect instead.
+    """
+
+    def __init__(
+        self,
+        server_process=None,
+        container_name=None,
+        container_engine=None,
+        join_timeout=3.0,
+        check_interval=0.5,
+        inspect_timeout=30.0,
+        events_command=None,
+    ):
+        """
+        Initialize the server monitor.
+
+        Args:
+            server_process: subprocess.Popen object to monitor
+            container_name: Container name to monitor (for container monitoring)
+            container_engine: Container engine command (podman/docker)
+            join_timeout: Seconds for thread join when stopping (default: 3.0)
+            check_interval: Seconds between checks when container events are unavailable (default: 0.5)
+            inspect_timeout: Seconds to wait for container inspect command to complete (default: 30.0)
+            events_command: Command producing the container event stream, defaults to `<engine> events`
+
+        Note: If neither server_process nor container_name is provided, the monitor
+        operates in no-op mode (no actual monitoring occurs).
+        """
+        self.server_process = server_process
+        self.container_name = container_name
+        self.container_engine = container_engine
+        self.timeout = join_timeout
+        self.check_interval = check_interval
+        self.inspect_timeout = inspect_timeout
+        self.events_command = events_command
+        self.health = None
+        self._stop_event = threading.Event()
+        self._exited_event = threading.Event()
+        self._changed = threading.Condition()
+        self._exit_info = {}
+        self._monitor_thread = None
+        self._watcher = None
+        self._interrupt_main = True
+
+        # Determine monitoring mode
+        if self.server_process:
+            self._mode = "process"
+        elif container_name and container_engine:
+            self._mode = "container"
+        else:
+            # No monitoring needed - chat is being used without a service
+            self._mode = "none"
+
+    def start(self, interrupt_main=True):
+        """
+        Start the monitoring thread. With interrupt_main the main thread receives a
+        KeyboardInterrupt when the server exits, otherwise callers use wait_for_change().
+        """
+        # No-op if not monitoring anything
+        if self._mode == "none":
+            return
+
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            logger.warning("Monitor thread already running")
+            return
+
+        self._interrupt_main = interrupt_main
+        if self._mode == "process":
+            self._watcher = ProcessExitWatcher(self.server_process)
+            target = self._monitor_process
+        else:
+            self._watcher = ContainerEventStream(self.container_engine, self.container_name, self.events_command)
+            target = self._monitor_container
+
+        self._monitor_thread = threading.Thread(target=target, daemon=True)
+        self._monitor_thread.start()
+
+    def stop(self):
+        """Stop the monitoring thread."""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            self._stop_event.set()
+            if self._watcher is not None:
+                self._watcher.stop()
+            self._monitor_thread.join(timeout=self.timeout)
+
+    def is_exited(self):
+        """Check if the monitored server/container has exited."""
+        return self._exited_event.is_set()
+
+    def is_stopping(self):
+        """Check if the monitor is in the process of stopping."""
+        return self._stop_event.is_set()
+
+    def get_exit_info(self):
+        """Get information about the exit."""
+        return self._exit_info.copy()
+
+    def wait_for_change(self, timeout):
+        """Wait up to timeout seconds for the server to exit or report a health change."""
+        with self._changed:
+            if not self._exited_event.is_set():
+                self._changed.wait(timeout)
+        return self.is_exited()
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def _report_exit(self):
+        self._exited_event.set()
+        self._notify()
+        if self._interrupt_main:
+            # Send SIGINT to main process to interrupt the chat
+            _thread.interrupt_main()
+
+    def _monitor_process(self):
+        """Monitor the server process and report if it exits."""
+        try:
+            exit_code = self._watcher.wait()
+        except Exception as e:
+            logger.debug(f"Error monitoring process: {e}", exc_info=True)
+            self._exit_info["pid"] = self.server_process.pid
+            self._exit_info["type"] = "missing"
+            self._report_exit()
+            return
+
+        if exit_code is None or self._stop_event.is_set():
+            return
+        self._exit_info["pid"] = self.server_process.pid
+        self._exit_info["type"] = "exit"
+        self._exit_info["code"] = exit_code
+        self._report_exit()
+
+    def _container_exited(self, status, code, name=None):
+        self._exit_info["name"] = name or self.container_name
+        self._exit_info["type"] = "container"
+        # Default to 'exited' if status is empty but exit code exists
+        self._exit_info["status"] = status if status else "exited"
+        self._exit_info["code"] = code if code is not None else "unknown"
+        self._report_exit()
+
+    def _monitor_container(self):
+        """Follow the container's event stream and report if it exits."""
+        try:
+            self._watcher.start()
+        except OSError as e:
+            logger.debug(f"Cannot stream events for container {self.container_name}: {e}")
+            self._poll_container()
+            return
+
+        # The container may have exited before the stream was subscribed
+        if self._inspect_container():
+            self._watcher.stop()
+            return
+
+        for event in self._watcher:
+            if event.exited:
+                self._container_exited("exited" if event.status in ("died", "die") else event.status, event.exit_code)
+                break
+            if event.health:
+                self.health = event.health
+                self._notify()
+        self._watcher.stop()
+
+        if not self._exited_event.is_set() and not self._stop_event.is_set():
+            logger.debug(f"Event stream for container {self.container_name} ended, polling instead")
+            self._poll_container()
+
+    def _inspect_container(self):
+        """Check the container state once. Returns True if the exit was reported."""
+        try:
+            inspect_format = "{{.State.Status}}\n{{.State.ExitCode}}"
+            result = subprocess.run(
+                [self.container_engine, "inspect", "--format", inspect_format, self.container_name],
+                capture_output=True,
+                text=True,
+                timeout=self.inspect_timeout,
+            )
+            output_lines = result.stdout.strip().split('\n')
+            status = output_lines[0] if output_lines else ""
+            exit_code_str = output_lines[1] if len(output_lines) > 1 else ""
+
+            # Explicitly check for non-running states
+            if status in ["exited", "dead", "removing"] or (status == "" and exit_code_str != ""):
+                try:
+                    code = int(exit_code_str)
+                except (ValueError, AttributeError):
+                    code = None
+                self._container_exited(status, code)
+                return True
+        except subprocess.TimeoutExpired:
+            logger.debug(f"Timeout checking container {self.container_name} status")
+        except subprocess.CalledProcessError:
+            # Container not found or error checking status
+            self._exit_info["name"] = self.container_name
+            self._exit_info["type"] = "container_missing"
+            self._report_exit()
+            return True
+        except Exception as e:
+            logger.debug(f"Error checking container status: {e}")
+        return False
+
+    def _poll_container(self):
+        """Fallback for engines without an event stream."""
+        while not self._stop_event.is_set():
+            if self._inspect_container():
+                break
+            # Use wait() instead of sleep() for responsive shutdown
+            self._stop_event.wait(self.check_interval)
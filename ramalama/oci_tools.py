@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import glob
 import json
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from itertools import chain
-from typing import Optional, TypedDict
+from typing import Any, Optional, TypedDict
 
 import ramalama.annotations as oci_annotations
 from ramalama.arg_types import EngineArgType
 from ramalama.common import SemVer, engine_version, run_cmd
 from ramalama.logger import logger
+from ramalama.toml_parser import TOMLParser
 
 ocilabeltype = "org.containers.type"
 
+MAX_INSPECT_WORKERS = 8
+LIST_CACHE_VERSION = 1
+
 
 def convert_from_human_readable_size(input) -> int:
     """
@@ -82,25 +89,9 @@ def list_artifacts(args: EngineArgType):
         return []
 
     models = []
-    for artifact in artifacts:
-        conman_args = [
-            args.engine,
-            "artifact",
-            "inspect",
-            artifact["ID"],
-        ]
-        try:
-            output = run_cmd(conman_args, ignore_stderr=True).stdout.decode("utf-8").strip()
-        except Exception:
-            continue
-
-        if output == "":
-            continue
-        try:
-            inspect = json.loads(output)
-        except json.JSONDecodeError:
-            continue
-        if "Manifest" not in inspect:
+    inspects = inspect_objects(args.engine, "artifact", [artifact["ID"] for artifact in artifacts])
+    for artifact, inspect in zip(artifacts, inspects):
+        if not isinstance(inspect, dict) or "Manifest" not in inspect:
             continue
         if "artifactType" not in inspect["Manifest"]:
             continue
@@ -116,6 +107,54 @@ def list_artifacts(args: EngineArgType):
     return models
 
 
+def decode_json_documents(output: str) -> list[Any]:
+    """Decode engine output holding a JSON array or a sequence of concatenated JSON documents."""
+    decoder = json.JSONDecoder()
+    documents: list[Any] = []
+    index = 0
+    while index < len(output):
+        if output[index].isspace():
+            index += 1
+            continue
+        document, index = decoder.raw_decode(output, index)
+        documents.append(document)
+    if len(documents) == 1 and isinstance(documents[0], list):
+        return documents[0]
+    return documents
+
+
+def _inspect_one(engine: str, kind: str, object_id: str) -> Optional[Any]:
+    try:
+        output = run_cmd([engine, kind, "inspect", object_id], ignore_stderr=True).stdout.decode("utf-8").strip()
+        return json.loads(output) if output else None
+    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        logger.debug(f"Failed to inspect {kind} {object_id}: {e}")
+        return None
+
+
+def inspect_objects(engine: str, kind: str, object_ids: list[str]) -> list[Optional[Any]]:
+    """
+    Inspect several artifacts or manifests, returning one result (or None) per id.
+
+    All ids are passed to a single inspect call first. Engines whose inspect command only
+    accepts one object fall back to inspecting them concurrently.
+    """
+    if len(object_ids) > 1:
+        try:
+            output = run_cmd([engine, kind, "inspect", *object_ids], ignore_stderr=True).stdout.decode("utf-8")
+            documents = decode_json_documents(output)
+            if len(documents) == len(object_ids):
+                return documents
+            logger.debug(f"Bulk {kind} inspect returned {len(documents)} results for {len(object_ids)} objects")
+        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            logger.debug(f"Bulk {kind} inspect is not supported: {e}")
+
+    if len(object_ids) <= 1:
+        return [_inspect_one(engine, kind, object_id) for object_id in object_ids]
+    with ThreadPoolExecutor(max_workers=min(MAX_INSPECT_WORKERS, len(object_ids))) as executor:
+        return list(executor.map(lambda object_id: _inspect_one(engine, kind, object_id), object_ids))
+
+
 def engine_supports_manifest_attributes(engine) -> bool:
     if not engine or engine == "" or engine == "docker":
         return False
@@ -162,21 +201,9 @@ def list_manifests(args: EngineArgType) -> list[ListModelResponse]:
         ]
 
     models: list[ListModelResponse] = []
-    for manifest in manifests:
-        conman_args = [
-            args.engine,
-            "manifest",
-            "inspect",
-            manifest["ID"],
-        ]
-        output = run_cmd(conman_args).stdout.decode("utf-8").strip()
-
-        if output == "":
-            continue
-        inspect = json.loads(output)
-        if 'manifests' not in inspect:
-            continue
-        if not inspect['manifests']:
+    inspects = inspect_objects(args.engine, "manifest", [manifest["ID"] for manifest in manifests])
+    for manifest, inspect in zip(manifests, inspects):
+        if not isinstance(inspect, dict) or not inspect.get('manifests'):
             continue
         img = inspect['manifests'][0]
         if 'annotations' not in img:
@@ -253,19 +280,136 @@ def list_images(args: EngineArgType) -> list[ListModelResponse]:
     ]
 
 
-def list_models(args: EngineArgType) -> list[ListModelResponse]:
+def _podman_graphroot() -> Optional[str]:
+    """Locate podman's storage root the way containers/storage does, or None if it cannot be determined."""
+    if not hasattr(os, "geteuid"):
+        return None
+
+    system_conf = "/etc/containers/storage.conf"
+    if os.geteuid() == 0:
+        graphroot = "/var/lib/containers/storage"
+        candidates = [(os.getenv("CONTAINERS_STORAGE_CONF", system_conf), "storage.graphroot")]
+    else:
+        data_home = os.getenv("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+        config_home = os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+        graphroot = os.path.join(data_home, "containers", "storage")
+        user_conf = os.getenv("CONTAINERS_STORAGE_CONF", os.path.join(config_home, "containers", "storage.conf"))
+        candidates = [(user_conf, "storage.graphroot"), (system_conf, "storage.rootless_storage_path")]
+
+    for conf_file, key in candidates:
+        if not os.path.exists(conf_file):
+            continue
+        parser = TOMLParser()
+        try:
+            parser.parse_file(conf_file)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cannot determine podman storage root from {conf_file}: {e}")
+            return None
+        if configured := parser.get(key):
+            return os.path.expanduser(str(configured).replace("$HOME", os.path.expanduser("~")))
+        if key == "storage.graphroot":
+            break
+    return graphroot
+
+
+def storage_fingerprint(engine: str) -> Optional[list[tuple[str, int]]]:
+    """
+    Return the modification times of the podman image and artifact stores, or None when
+    they cannot be located. Any pull, tag, removal or artifact change rewrites one of them.
+    """
+    if os.path.basename(engine) != "podman":
+        return None
+
+    graphroot = _podman_graphroot()
+    if graphroot is None:
+        return None
+    paths = sorted(glob.glob(os.path.join(graphroot, "*-images", "images.json")))
+    if not paths:
+        return None
+    paths.append(os.path.join(graphroot, "artifacts", "index.json"))
+
+    fingerprint = []
+    for path in paths:
+        try:
+            fingerprint.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            fingerprint.append((path, 0))
+    return fingerprint
+
+
+def _read_list_cache(cache_path: str, engine: str, fingerprint: list) -> Optional[list[ListModelResponse]]:
+    try:
+        with open(cache_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != LIST_CACHE_VERSION or data.get("engine") != engine:
+        return None
+    if data.get("fingerprint") != [list(entry) for entry in fingerprint]:
+        return None
+    return [
+        {
+            "name": m["name"],
+            "modified": datetime.fromisoformat(m["modified"]) if m["modified"] else None,
+            "size": m["size"],
+        }
+        for m in data["models"]
+    ]
+
+
+def _write_list_cache(cache_path: str, engine: str, fingerprint: list, models: list[ListModelResponse]) -> None:
+    data = {
+        "version": LIST_CACHE_VERSION,
+        "engine": engine,
+        "fingerprint": fingerprint,
+        "models": [
+            {
+                "name": m["name"],
+                "modified": m["modified"].isoformat() if m["modified"] else None,
+                "size": m["size"],
+            }
+            for m in models
+        ],
+    }
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Failed to write model list cache {cache_path}: {e}")
+
+
+def list_models(args: EngineArgType, cache_dir: Optional[str] = None) -> list[ListModelResponse]:
+    """
+    List the models held by the container engine as images, manifest lists and artifacts.
+
+    The three object types are queried concurrently. When cache_dir is given the result is
+    cached there and reused as long as the engine's storage has not been modified since.
+    """
     if args.engine is None:
         return []
 
-    model_gen = chain(list_images(args), list_manifests(args), list_artifacts(args))
+    cache_path = os.path.join(cache_dir, "oci-models.json") if cache_dir else None
+    fingerprint = storage_fingerprint(args.engine) if cache_path else None
+    if cache_path and fingerprint and (cached := _read_list_cache(cache_path, args.engine, fingerprint)) is not None:
+        return cached
 
-    seen: set[str] = set()
-    models: list[ListModelResponse] = []
-    for m in model_gen:
-        if (name := m["name"]) in seen:
-            continue
-        seen.add(name)
-        models.append(m)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(lister, args) for lister in (list_images, list_manifests, list_artifacts)]
+        model_gen = chain.from_iterable(future.result() for future in futures)
+
+        seen: set[str] = set()
+        models: list[ListModelResponse] = []
+        for m in model_gen:
+            if (name := m["name"]) in seen:
+                continue
+            seen.add(name)
+            models.append(m)
+
+    if cache_path and fingerprint:
+        _write_list_cache(cache_path, args.engine, fingerprint, models)
     return models
 
 
@@ -175,6 +175,47 @@ def create_file_link(src: str, dst: str) -> None:
         raise OSError(f"Failed to create link from {src} to {dst}: all methods failed") from e
 
 
+# ioctl request that clones a file's extents on btrfs, XFS and other CoW filesystems
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> None:
+    import fcntl
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.unlink(dst)
+            raise
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    Give dst the contents of src without a symlink, which would not resolve inside a
+    container. Tries a hardlink, then a reflink, then copies. Returns the method used.
+    """
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except (OSError, NotImplementedError, AttributeError):
+        pass
+
+    if platform.system() == "Linux":
+        try:
+            _reflink(src, dst)
+            return "reflink"
+        except OSError:
+            pass
+
+    import shutil
+
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
 def file_uri_to_path(uri: str) -> str:
     # based on the 3.14 Path.from_uri logic
     if not uri.startswith('file:'):
@@ -68,6 +68,11 @@ class RuntimePlugin(ABC):
         """Check if the service is ready to receive requests."""
         return True
 
+    @property
+    def health_check_path(self) -> Optional[str]:
+        """HTTP path answering 200 once the server is ready, probed by generated deployments."""
+        return None
+
 
 class InferenceRuntimePlugin(RuntimePlugin, ABC):
     """Abstract base class for inference runtime plugins."""
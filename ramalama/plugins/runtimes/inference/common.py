@@ -23,7 +23,8 @@ from ramalama.common import (
     sanitize_filename,
     set_accel_env_vars,
 )
-from ramalama.config import ActiveConfig
+from ramalama.config import ActiveConfig, coerce_to_int_or_auto
+from ramalama.image_cache import start_prefetch
 from ramalama.logger import logger
 from ramalama.model_store.reffile import StoreFileType
 from ramalama.plugins.interface import InferenceRuntimePlugin
@@ -71,9 +72,9 @@ class BaseInferenceRuntime(InferenceRuntimePlugin):
             "-c",
             "--ctx-size",
             dest="ctx_size",
-            type=int,
+            type=coerce_to_int_or_auto,
             default=config.ctx_size,
-            help="size of the prompt context (0 = loaded from model)",
+            help="size of the prompt context (0 = loaded from model, auto = the largest that fits in memory)",
             completer=suppressCompleter,
         )
         parser.add_argument(
@@ -158,11 +159,8 @@ class BaseInferenceRuntime(InferenceRuntimePlugin):
             return
 
         if args.container and not args.dryrun:
-            config = ActiveConfig()
-            should_pull = config.pull in ["always", "missing", "newer"]
-            args.image = ensure_image(
-                config.engine, accel_image(config), should_pull=should_pull, quiet=getattr(args, "quiet", False)
-            )
+            engine, image, should_pull = self._inference_image(args)
+            args.image = ensure_image(engine, image, should_pull=should_pull, quiet=getattr(args, "quiet", False))
 
         cmd = assemble_command(args)
         if len(cmd) > 0 and isinstance(cmd[0], ContainerEntryPoint):
@@ -175,12 +173,8 @@ class BaseInferenceRuntime(InferenceRuntimePlugin):
         """Execute serve after the model is resolved. Override to inject pre-serve logic."""
         set_accel_env_vars()
         if args.container and not args.dryrun:
-            config = ActiveConfig()
-            generate = getattr(args, "generate", None)
-            should_pull = False if generate else config.pull in ["always", "missing", "newer"]
-            args.image = ensure_image(
-                config.engine, accel_image(config), should_pull=should_pull, quiet=getattr(args, "quiet", False)
-            )
+            engine, image, should_pull = self._inference_image(args)
+            args.image = ensure_image(engine, image, should_pull=should_pull, quiet=getattr(args, "quiet", False))
 
         cmd = assemble_command(args)
         if getattr(args, "generate", None):
@@ -200,7 +194,29 @@ class BaseInferenceRuntime(InferenceRuntimePlugin):
         ):
             model.wait_for_healthy(args)
 
+    @staticmethod
+    def _inference_image(args: argparse.Namespace) -> tuple[str, str, bool]:
+        """Engine, image and whether to pull it, honouring --engine, --image and --pull over the config."""
+        config = ActiveConfig()
+        engine = getattr(args, "engine", None) or config.engine
+        image = getattr(args, "image", None) or accel_image(config)
+        pull = getattr(args, "pull", None) or config.pull
+        should_pull = not getattr(args, "generate", None) and pull in ["always", "missing", "newer"]
+        return engine, image, should_pull
+
+    def _prefetch_image(self, args: argparse.Namespace) -> None:
+        """
+        Start pulling the inference image in the background while the model is fetched. It is the
+        same engine and image ensure_image() is given later, so that call waits for this pull.
+        """
+        if not args.container or args.dryrun:
+            return
+        engine, image, should_pull = self._inference_image(args)
+        if engine and should_pull:
+            start_prefetch(engine, [image])
+
     def _run_handler(self, args: argparse.Namespace) -> None:
+        self._prefetch_image(args)
         try:
             # detect available port and update arguments
             args.port = compute_serving_port(args)
@@ -235,6 +251,7 @@ class BaseInferenceRuntime(InferenceRuntimePlugin):
             stack = Stack(args)
             return stack.serve()
 
+        self._prefetch_image(args)
         try:
             # detect available port and update arguments
             args.port = compute_serving_port(args)
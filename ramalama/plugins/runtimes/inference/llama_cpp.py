@@ -5,19 +5,33 @@ import copy
 import json
 import os
 import platform
-import shutil
 import subprocess
 import sys
 import tempfile
+import time
 from collections.abc import Mapping
-from dataclasses import asdict, dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, asdict, dataclass, field, fields
 from datetime import datetime, timezone
 from http.client import HTTPConnection
-from typing import Any, Literal, Optional, get_args
+from typing import Any, Literal, Optional, Union, get_args
 from urllib.parse import urlparse
 
+from ramalama.benchmarks.compare import compare_records, comparison_to_dict, parse_selector, print_comparisons
+from ramalama.benchmarks.errors import MissingStorageFolderError
 from ramalama.benchmarks.manager import BenchmarksManager
-from ramalama.benchmarks.schemas import BenchmarkRecord, get_benchmark_record
+from ramalama.benchmarks.schemas import BenchmarkRecord, DeviceInfoV1, get_benchmark_record
+from ramalama.benchmarks.tune import (
+    RUNTIME_FLAGS,
+    TUNE_GEN_TOKENS,
+    TUNE_PROMPT_TOKENS,
+    Candidate,
+    TunedProfiles,
+    device_fingerprint,
+    search_space,
+    successive_halving,
+    throughput_score,
+)
 from ramalama.benchmarks.utilities import parse_json, print_bench_results
 from ramalama.cli import (
     CoerceToBool,
@@ -39,18 +53,23 @@ from ramalama.common import (
     accel_image,
     ensure_image,
     genname,
+    get_available_memory,
     get_gpu_type_env_vars,
+    perror,
     run_cmd,
     set_accel_env_vars,
     set_gpu_type_env_vars,
     version_tagged_image,
 )
-from ramalama.config import ActiveConfig, DefaultConfig, coerce_to_bool
+from ramalama.config import ActiveConfig, DefaultConfig, coerce_to_bool, coerce_to_int_or_auto
 from ramalama.engine import Engine, dry_run, image_inspect
 from ramalama.logger import logger
+from ramalama.model_inspect.memory_plan import ModelLayout, host_budgets, parse_ngl, plan_memory
 from ramalama.model_store.constants import DIRECTORY_NAME_BLOBS, DIRECTORY_NAME_REFS, DIRECTORY_NAME_SNAPSHOTS
 from ramalama.model_store.global_store import GlobalModelStore
 from ramalama.model_store.reffile import RefJSONFile, migrate_reffile_to_refjsonfile
+from ramalama.model_store.router_manifest import RouterManifest, StoreStamp
+from ramalama.model_store.staging import stage_snapshot
 from ramalama.path_utils import file_uri_to_path, get_container_mount_path
 from ramalama.plugins.loader import assemble_command
 from ramalama.plugins.runtimes.inference.common import ContainerizedInferenceRuntimePlugin, enumerate_store_gguf_models
@@ -86,7 +105,7 @@ class LlamaCppConfig:
     cache_reuse: Optional[int] = None
     gguf_quantization_mode: GGUF_QUANTIZATION_MODES = DEFAULT_GGUF_QUANTIZATION_MODE  # type: ignore[assignment]
     ngl: Optional[str] = None
-    ncmoe: Optional[int] = None
+    ncmoe: Optional[Union[int, Literal["auto"]]] = None
     spec_type: Optional[str] = None
     spec_draft_n_max: Optional[int] = None
     spec_draft_n_min: Optional[int] = None
@@ -94,6 +113,7 @@ class LlamaCppConfig:
     temp: float = 0.8
     thinking: Optional[bool] = None
     threads: int = field(default_factory=_default_threads)
+    use_tuned_profile: bool = True
 
     def __post_init__(self):
         if self.cache_reuse is not None:
@@ -101,7 +121,7 @@ class LlamaCppConfig:
         if self.ngl is not None:
             self.ngl = str(self.ngl)
         if self.ncmoe is not None:
-            self.ncmoe = int(self.ncmoe)
+            self.ncmoe = coerce_to_int_or_auto(self.ncmoe)
         if self.spec_type is not None:
             self.spec_type = str(self.spec_type)
         if self.spec_draft_n_max is not None:
@@ -114,6 +134,48 @@ class LlamaCppConfig:
         self.threads = int(self.threads)
         if self.thinking is not None:
             self.thinking = coerce_to_bool(self.thinking)
+        self.use_tuned_profile = coerce_to_bool(self.use_tuned_profile)
+
+
+def parse_gguf_modes(value: str) -> str:
+    """argparse type for --gguf: a quantization mode or a comma separated list of them."""
+    modes = list(dict.fromkeys(mode.strip() for mode in value.split(",") if mode.strip()))
+    valid = get_args(GGUF_QUANTIZATION_MODES)
+    if not modes or any(mode not in valid for mode in modes):
+        raise argparse.ArgumentTypeError(f"invalid choice: '{value}' (choose one or more of {', '.join(valid)})")
+    return ",".join(modes)
+
+
+def gguf_modes(value: Optional[str]) -> list[str]:
+    return value.split(",") if value else []
+
+
+def quantization_target(target: str, mode: str) -> str:
+    """Image name for one quantization of target: granite:1.0 becomes granite:1.0-Q4_K_M, granite granite:Q4_K_M."""
+    name, sep, tag = target.rpartition(":")
+    if sep and "/" not in tag:
+        return f"{name}:{tag}-{mode}"
+    return f"{target}:{mode}"
+
+
+# CPU threads below which a quantization is better run after another than next to it
+QUANTIZE_MIN_THREADS = 4
+
+
+def quantize_workers(
+    jobs: int, input_size: int, cpu_count: Optional[int] = None, available_memory: Optional[int] = None
+) -> int:
+    """
+    Quantizations to run at once. Each should get QUANTIZE_MIN_THREADS CPUs and, since
+    llama-quantize reads the whole input and writes up to half its size, memory for it.
+    """
+    cpu_count = cpu_count if cpu_count is not None else (os.cpu_count() or 1)
+    workers = min(jobs, max(1, cpu_count // QUANTIZE_MIN_THREADS))
+    if available_memory is None:
+        available_memory = get_available_memory()
+    if available_memory is not None and input_size > 0:
+        workers = min(workers, max(1, available_memory // input_size))
+    return workers
 
 
 def _positive_int(value: str) -> int:
@@ -231,22 +293,17 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
     def name(self) -> str:
         return "llama.cpp"
 
-    def _convert_to_gguf(self, outdir, source_model, args):
-        """Run llama-convert-hf-to-gguf inside a container to produce a GGUF file."""
-        with tempfile.TemporaryDirectory(prefix="RamaLama_convert_src_") as srcdir:
-            ref_file = source_model.model_store.get_ref_file(source_model.model_tag)
-            for file in ref_file.files:
-                blob_file_path = source_model.model_store.get_blob_file_path(file.hash)
-                shutil.copyfile(blob_file_path, os.path.join(srcdir, file.name))
-            engine = Engine(args)
-            if engine.use_docker:
-                # The uid in the container must match the euid on the host for contents of the
-                # volumes to be readable.
-                if hasattr(os, "geteuid"):
-                    # Note: geteuid() doesn't exist on Windows, but this is only needed on Unix
-                    engine.add_args(f"--user={os.geteuid()}")
-            engine.add_volume(srcdir, "/model")
-            engine.add_volume(outdir.name, "/output", opts="rw")
+    def _run_convert(self, source_model, args, outdir: str) -> None:
+        """Run llama-convert-hf-to-gguf inside a container, writing the GGUF file to outdir."""
+        engine = Engine(args)
+        if engine.use_docker:
+            # The uid in the container must match the euid on the host for contents of the
+            # volumes to be readable.
+            if hasattr(os, "geteuid"):
+                # Note: geteuid() doesn't exist on Windows, but this is only needed on Unix
+                engine.add_args(f"--user={os.geteuid()}")
+        with stage_snapshot(source_model.model_store, source_model.model_tag, engine, "/model"):
+            engine.add_volume(outdir, "/output", opts="rw")
             args = copy.copy(args)
             args.model = source_model
             if not args.dryrun:
@@ -259,11 +316,46 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
             if args.dryrun:
                 engine.dryrun()
             else:
+                start = time.perf_counter()
                 engine.run()
-        return self._quantize(source_model, args, outdir.name)
+                logger.debug(f"Converted {source_model.model_name} to GGUF in {time.perf_counter() - start:.1f}s")
+
+    def _converted_gguf(self, source_model, args) -> str:
+        """
+        Host path of the unquantized GGUF conversion of source_model, converting it on first
+        use. It is kept in the model store under the source snapshot digest, so quantizing
+        the same snapshot again skips the conversion, and is removed with the snapshot.
+        """
+        store = source_model.model_store
+        cache_dir = store.get_intermediate_directory(store.get_snapshot_hash(source_model.model_tag))
+        path = os.path.join(cache_dir, f"{source_model.model_name}.gguf")
+        if os.path.exists(path):
+            logger.debug(f"Using the cached GGUF conversion {path}")
+            return path
+        if args.dryrun:
+            self._run_convert(source_model, args, cache_dir)
+            return path
+
+        os.makedirs(store.intermediates_directory, exist_ok=True)
+        # converted next to the cache and moved into place, so concurrent converts never see a partial file
+        with tempfile.TemporaryDirectory(prefix=".convert-", dir=store.intermediates_directory) as outdir:
+            self._run_convert(source_model, args, outdir)
+            os.makedirs(cache_dir, exist_ok=True)
+            os.replace(os.path.join(outdir, f"{source_model.model_name}.gguf"), path)
+        return path
 
-    def _quantize(self, source_model, args, model_dir):
-        """Run llama-quantize inside a container to quantize a GGUF model."""
+    def _convert_to_gguf(self, outdir, source_model, args):
+        """Quantize the GGUF conversion of source_model into outdir, converting it first if not cached."""
+        converted = self._converted_gguf(source_model, args)
+        args = copy.copy(args)
+        args.model = source_model
+        return self._quantize(source_model, args, outdir.name, converted)
+
+    def _quantize(self, source_model, args, model_dir, input_path: Optional[str] = None):
+        """
+        Run llama-quantize inside a container to quantize a GGUF model. The input is read
+        from model_dir unless input_path is given, which is mounted in its place read-only.
+        """
         engine = Engine(args)
         if engine.use_docker:
             # The uid in the container must match the euid on the host for contents of the
@@ -272,6 +364,13 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
                 # Note: geteuid() doesn't exist on Windows, but this is only needed on Unix
                 engine.add_args(f"--user={os.geteuid()}")
         engine.add_volume(model_dir, "/model", opts="rw")
+        if input_path is not None:
+            engine.add(
+                [
+                    f"--mount=type=bind,src={get_container_mount_path(input_path)},"
+                    f"destination=/model/{source_model.model_name}.gguf,ro{engine.relabel()}"
+                ]
+            )
         if not args.dryrun:
             config = ActiveConfig()
             should_pull = config.pull in ["always", "missing", "newer"]
@@ -287,6 +386,10 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
             engine.run()
         return f"{source_model.model_name}-{args.gguf}.gguf"
 
+    @property
+    def health_check_path(self) -> Optional[str]:
+        return "/health"
+
     def service_ready_check(self, conn: HTTPConnection, args: Any, model_name: Optional[str] = None) -> bool:
         container_name = f"container {args.name}" if getattr(args, 'container', None) else 'server'
         conn.request("GET", "/health")
@@ -387,17 +490,30 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
         parser.add_argument(
             "--ngl",
             dest="ngl",
-            default=None,
+            default=self.get_runtime_config(ActiveConfig()).ngl,
             help="number of layers to store in VRAM: a number, 'auto', or 'all' (default: auto)",
             completer=suppressCompleter,
         )
 
-    def _add_ncmoe_arg(self, parser: "argparse.ArgumentParser") -> None:
+    def _add_ncmoe_arg(self, parser: "argparse.ArgumentParser", plan: bool = True) -> None:
+        if not plan:
+            parser.add_argument(
+                "--ncmoe",
+                dest="ncmoe",
+                type=int,
+                help="keep the Mixture of Experts (MoE) weights of the first N layers in the CPU",
+                completer=suppressCompleter,
+            )
+            return
         parser.add_argument(
             "--ncmoe",
             dest="ncmoe",
-            type=int,
-            help="keep the Mixture of Experts (MoE) weights of the first N layers in the CPU",
+            type=coerce_to_int_or_auto,
+            default=self.get_runtime_config(ActiveConfig()).ncmoe,
+            help=(
+                "keep the Mixture of Experts (MoE) weights of the first N layers in the CPU"
+                " (auto = as few as fit in GPU memory)"
+            ),
             completer=suppressCompleter,
         )
 
@@ -408,6 +524,7 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
             "--threads",
             type=int,
             default=rt_config.threads,
+            action=OverrideDefaultAction,
             help=(
                 f"number of cpu threads to use, the default is {rt_config.threads} on this system,"
                 " -1 means use this default"
@@ -520,14 +637,105 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
                 raise ValueError("ramalama run --rag is not supported for hosted API transports.")
             self._run_rag(args, model)
             return
+        if not isinstance(model, APITransport):
+            self._apply_tuned_profile(args, model)
+            self._apply_memory_plan(args, model)
         super()._do_run(args, model)
 
     def _do_serve(self, args: argparse.Namespace, model: Any) -> None:
         if getattr(args, "rag", None):
             self._serve_rag(args, model)
             return
+        self._apply_tuned_profile(args, model)
+        self._apply_memory_plan(args, model)
         super()._do_serve(args, model)
 
+    def _apply_memory_plan(self, args: argparse.Namespace, model: Any) -> None:
+        """Replace --ctx-size auto and --ncmoe auto with the largest context and offload that fit in memory."""
+        if getattr(args, "ctx_size", None) != "auto" and getattr(args, "ncmoe", None) != "auto":
+            return
+        ngl = getattr(args, "ngl", None)
+        try:
+            if getattr(args, "router_mode", False) or args.dryrun:
+                raise ValueError("memory is planned for a single local model")
+            layout = ModelLayout.from_gguf(model.gguf_parts())
+            host_budget, gpu_budget = host_budgets()
+            plan = plan_memory(
+                layout,
+                host_budget,
+                gpu_budget,
+                ctx_size=None if args.ctx_size == "auto" else args.ctx_size,
+                ngl=parse_ngl(ngl, layout.layers),
+                ncmoe=None if args.ncmoe == "auto" else args.ncmoe,
+            )
+        except Exception as e:
+            logger.debug(f"Not planning memory for {getattr(model, 'model', model)}: {e}")
+            # llama.cpp falls back to the context the model was trained with
+            if args.ctx_size == "auto":
+                args.ctx_size = 0
+            if args.ncmoe == "auto":
+                args.ncmoe = None
+            return
+
+        if args.ctx_size == "auto":
+            # without the host memory there is nothing to size the context against, so llama.cpp
+            # uses the context the model was trained with
+            args.ctx_size = plan.ctx_size if host_budget is not None else 0
+        if args.ncmoe == "auto":
+            args.ncmoe = plan.ncmoe
+        if plan.ngl_option is not None and (ngl is None or ngl == "auto"):
+            args.ngl = plan.ngl_option
+        logger.debug(f"Memory plan for {model.model}: {' '.join(plan.options())}")
+        if not plan.fits:
+            perror(
+                f"Warning: {model.model} does not fit in the available memory even with "
+                f"{' '.join(plan.options())}; it may load slowly or fail"
+            )
+
+    @staticmethod
+    def _configured_settings(rt_config: Any) -> set[str]:
+        """Runtime settings whose configured value differs from the default, i.e. set in ramalama.conf."""
+        if not isinstance(rt_config, LlamaCppConfig):
+            return set()
+        configured = set()
+        for f in fields(LlamaCppConfig):
+            default = f.default_factory() if f.default_factory is not MISSING else f.default
+            if getattr(rt_config, f.name) != default:
+                configured.add(f.name)
+        return configured
+
+    def _apply_tuned_profile(self, args: argparse.Namespace, model: Any) -> None:
+        """Use the settings `ramalama bench --tune` found fastest for this model on this hardware."""
+        config = ActiveConfig()
+        if not self.get_runtime_config(config).use_tuned_profile or getattr(args, "router_mode", False):
+            return
+        digest = self._model_digest(model)
+        if digest is None:
+            return
+        try:
+            settings = TunedProfiles(config.benchmarks.storage_folder).get(digest, device_fingerprint())
+        except MissingStorageFolderError:
+            return
+        if not settings:
+            return
+
+        runtime_args = getattr(args, "runtime_args", None) or []
+        configured = self._configured_settings(self.get_runtime_config(config))
+        applied = {}
+        for key, value in settings.items():
+            # options given on the command line or set in ramalama.conf win over the profile
+            if key == "threads":
+                explicit = getattr(args, "threads_override", False)
+            else:
+                explicit = getattr(args, key, None) is not None
+            explicit = explicit or key in configured
+            if explicit or any(flag in runtime_args for flag in RUNTIME_FLAGS.get(key, ())):
+                continue
+            setattr(args, key, value)
+            applied[key] = value
+        if applied:
+            logger.debug(f"Applying tuned profile for {digest}: {applied}")
+
     def _serve_handler(self, args: argparse.Namespace) -> None:
         if not args.container:
             args.detach = False
@@ -552,14 +760,7 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
         if args.MODEL:
             models = self._resolve_specified_models(args)
         else:
-            store = GlobalModelStore(args.store)
-            self._migrate_store_ref_files(store)
-            models = enumerate_store_gguf_models(
-                store,
-                DIRECTORY_NAME_REFS,
-                DIRECTORY_NAME_BLOBS,
-                RefJSONFile,
-            )
+            models = self._store_gguf_models(GlobalModelStore(args.store))
 
         if not models:
             sys.exit("Error: no GGUF models found in the model store. Pull a model first with: ramalama pull <model>")
@@ -604,6 +805,24 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
 
         subprocess.Popen(engine.exec_args)
 
+    def _store_gguf_models(self, store: GlobalModelStore) -> list[tuple[str, str]]:
+        """GGUF models of the store from the router manifest, enumerating the store only when it changed."""
+        manifest = RouterManifest(store)
+        models = manifest.load()
+        if models is not None:
+            return models
+
+        self._migrate_store_ref_files(store)
+        stamp = StoreStamp.current(store)
+        models = enumerate_store_gguf_models(
+            store,
+            DIRECTORY_NAME_REFS,
+            DIRECTORY_NAME_BLOBS,
+            RefJSONFile,
+        )
+        manifest.save(stamp, models)
+        return models
+
     @staticmethod
     def _migrate_store_ref_files(store: Any) -> None:
         """Migrate any old-format ref files to JSON before enumeration."""
@@ -739,7 +958,7 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
         runtime_options(bench_parser, "bench")
         self._add_backend_arg(bench_parser)
         self._add_ngl_arg(bench_parser)
-        self._add_ncmoe_arg(bench_parser)
+        self._add_ncmoe_arg(bench_parser, plan=False)
         self._add_threads_arg(bench_parser)
         bench_parser.add_argument(
             "--runtime-args",
@@ -756,6 +975,54 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
             default="table",
             help="output format (table or json)",
         )
+        bench_parser.add_argument(
+            "--tune",
+            action="store_true",
+            help="search for the fastest threads, batch sizes and flash attention settings for the model on this "
+            "hardware and save them for `ramalama run` and `ramalama serve`",
+        )
+        bench_parser.add_argument(
+            "--serve",
+            action="store_true",
+            help="benchmark the model through its OpenAI endpoint, as served by `ramalama serve`",
+        )
+        bench_parser.add_argument("--concurrency", type=int, default=4, help="requests in flight at once (--serve)")
+        bench_parser.add_argument(
+            "--request-rate",
+            dest="request_rate",
+            type=float,
+            default=0.0,
+            help="open-loop request arrivals per second, 0 for back-to-back requests (--serve)",
+        )
+        bench_parser.add_argument(
+            "--num-requests", dest="num_requests", type=int, default=32, help="number of requests to send (--serve)"
+        )
+        bench_parser.add_argument(
+            "--prompt-tokens",
+            dest="prompt_tokens",
+            default="128",
+            help="prompt length in tokens: N, MIN-MAX or N,N,... (--serve)",
+        )
+        bench_parser.add_argument(
+            "--output-tokens",
+            dest="output_tokens",
+            default="128",
+            help="output length in tokens: N, MIN-MAX or N,N,... (--serve)",
+        )
+        bench_parser.add_argument(
+            "--slo-ttft",
+            dest="slo_ttft",
+            type=float,
+            default=1000.0,
+            help="time to first token objective in ms, used for goodput (--serve)",
+        )
+        bench_parser.add_argument(
+            "--slo-itl",
+            dest="slo_itl",
+            type=float,
+            default=100.0,
+            help="mean inter-token latency objective in ms, used for goodput (--serve)",
+        )
         bench_parser.set_defaults(func=self._bench_handler)
 
         # perplexity
@@ -777,11 +1044,13 @@ class LlamaCppPlugin(LlamaCppCommands, ContainerizedInferenceRuntimePlugin):
         convert_parser.add_argument("--carimage", default=config.carimage, help=argparse.SUPPRESS)
         convert_parser.add_argument(
             "--gguf",
-            choices=get_args(GGUF_QUANTIZATION_MODES),
+            type=parse_gguf_modes,
             nargs="?",
             const=rt_config.gguf_quantization_mode,
             default=None,
-            help=f"GGUF quantization format. If specified without value, {rt_config.gguf_quantization_mode} is used.",
+            metavar="{" + ",".join(get_args(GGUF_QUANTIZATION_MODES)) + "}",
+            help=f"GGUF quantization format. If specified without value, {rt_config.gguf_quantization_mode} is used.\n"
+            "A comma separated list converts once and creates one image per format, tagged with it.",
         )
         add_network_argument(convert_parser)
         convert_parser.add_argument(
@@ -841,7 +1110,32 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
         benchmarks_list_parser.add_argument(
             "--format", choices=["table", "json"], default="table", help="output format (table or json)"
         )
+        benchmarks_list_parser.add_argument(
+            "--filter",
+            dest="filters",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="only list matching results, e.g. model=granite.gguf or image=quay.io/ramalama/cuda:0.12",
+        )
         benchmarks_list_parser.set_defaults(func=self._benchmarks_list_handler)
+        benchmarks_compare_parser = benchmarks_subparsers.add_parser(
+            "compare", help="compare the throughput of two benchmark runs or configurations"
+        )
+        benchmarks_compare_parser.add_argument(
+            "BASELINE", help="result id, selecting its whole run, or KEY=VALUE[,KEY=VALUE...] filters"
+        )
+        benchmarks_compare_parser.add_argument("CANDIDATE", help="result id or filters, like BASELINE")
+        benchmarks_compare_parser.add_argument(
+            "--format", choices=["table", "json"], default="table", help="output format (table or json)"
+        )
+        benchmarks_compare_parser.add_argument(
+            "--fail-on-regression",
+            dest="fail_on_regression",
+            action="store_true",
+            help="exit with an error if any test is significantly slower",
+        )
+        benchmarks_compare_parser.set_defaults(func=self._benchmarks_compare_handler)
 
         # rag
         name_map = getattr(subparsers, "_name_parser_map", {})
@@ -859,43 +1153,88 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
 
         shortnames = get_shortnames()
         tgt = shortnames.resolve(args.TARGET)
+        modes = gguf_modes(args.gguf)
+        if len(modes) > 1:
+            return self._convert_quantizations(_get_source_model(args), tgt, modes, args)
+
         model = TransportFactory(tgt, args, transport="oci").create_oci()
         source_model = _get_source_model(args)
         model.convert(source_model, args)
 
+    def _convert_quantizations(self, source_model: Any, target: str, modes: list[str], args: argparse.Namespace):
+        """
+        Convert source_model once and build one image per quantization mode, tagged
+        with the mode. The quantizations run concurrently as far as CPUs and memory allow.
+        """
+        if args.type == "artifact":
+            raise ValueError("several --gguf quantizations cannot be converted to --type artifact")
+
+        converted = self._converted_gguf(source_model, args)
+        workers = 1 if args.dryrun else quantize_workers(len(modes), os.path.getsize(converted))
+        threads = max(1, (os.cpu_count() or 1) // workers) if workers > 1 else None
+
+        def convert_one(mode: str) -> str:
+            mode_args = copy.copy(args)
+            mode_args.gguf = mode
+            mode_args.quantize_threads = threads
+            mode_target = quantization_target(target, mode)
+            TransportFactory(mode_target, mode_args, transport="oci").create_oci().convert(source_model, mode_args)
+            return mode_target
+
+        logger.debug(f"Quantizing to {', '.join(modes)} with {workers} concurrent job(s)")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            targets = list(executor.map(convert_one, modes))
+        for mode_target in targets:
+            perror(f"Created {mode_target}")
+
+    @staticmethod
+    def _model_digest(model: Any) -> Optional[str]:
+        """Digest of the model's main file, so results stay comparable across renames."""
+        try:
+            ref_file = model.model_store.get_ref_file(model.model_tag)
+            return ref_file.model_files[0].hash if ref_file and ref_file.model_files else None
+        except Exception:
+            return None
+
+    def _llama_bench(self, args: argparse.Namespace, model: Any) -> tuple[list[str], Optional[str]]:
+        """Run llama-bench for args and return its command and output, which is None for a dry run."""
+        cmd = assemble_command(args)
+        if args.container:
+            model.setup_container(args)
+            model.setup_mounts(args)
+            model.engine.add_container_image(args.image, cmd)
+            if args.dryrun:
+                model.engine.dryrun()
+                return cmd, None
+            return cmd, model.engine.run_process().stdout
+        if args.dryrun:
+            dry_run(cmd)
+            return cmd, None
+        return cmd, run_cmd(cmd, encoding="utf-8").stdout
+
     def _bench_handler(self, args: argparse.Namespace) -> None:
+        if getattr(args, "serve", False) is True:
+            return self._serve_bench_handler(args)
+        if getattr(args, "tune", False) is True:
+            return self._tune_handler(args)
+
         model = New(args.MODEL, args)
         model.ensure_model_exists(args)
 
         if isinstance(model, APITransport):
             raise NotImplementedError("bench is not supported for hosted API transports.")
 
-        cmd = assemble_command(args)
         set_accel_env_vars()
         output_format = getattr(args, "format", "table")
 
-        if args.dryrun:
-            if args.container:
-                model.setup_container(args)
-                model.setup_mounts(args)
-                model.engine.add_container_image(args.image, cmd)
-                model.engine.dryrun()
-            else:
-                dry_run(cmd)
+        cmd, stdout = self._llama_bench(args, model)
+        if stdout is None:
             return
 
-        if args.container:
-            model.setup_container(args)
-            model.setup_mounts(args)
-            model.engine.add_container_image(args.image, cmd)
-            result = model.engine.run_process()
-        else:
-            result = run_cmd(cmd, encoding="utf-8")
-
         try:
-            bench_results = parse_json(result.stdout)
+            bench_results = parse_json(stdout)
         except (json.JSONDecodeError, ValueError):
-            raise ValueError(f"Could not parse benchmark output. Expected JSON but got:\n{result.stdout}")
+            raise ValueError(f"Could not parse benchmark output. Expected JSON but got:\n{stdout}")
 
         base_payload: dict = {
             "created_at": datetime.now(timezone.utc).isoformat(),
@@ -904,6 +1243,7 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
                 "container_runtime": args.engine,
                 "inference_engine": args.runtime,
                 "runtime_args": cmd,
+                "model_digest": self._model_digest(model),
             },
         }
         results: list[BenchmarkRecord] = [
@@ -911,7 +1251,7 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
         ]
 
         if output_format == "json":
-            print(result.stdout)
+            print(stdout)
         else:
             print_bench_results(results)
 
@@ -919,6 +1259,175 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
         if not config.benchmarks.disable:
             BenchmarksManager(config.benchmarks.storage_folder).save(results)
 
+    @staticmethod
+    def _moe_layers(model: Any) -> int:
+        """Layer count of a Mixture of Experts model, 0 for dense models or unreadable metadata."""
+        try:
+            metadata = model.inspect_metadata()
+        except Exception:
+            return 0
+        architecture = metadata.get("general.architecture")
+        if not metadata.get(f"{architecture}.expert_count"):
+            return 0
+        return int(metadata.get(f"{architecture}.block_count") or 0)
+
+    def _tune_handler(self, args: argparse.Namespace) -> None:
+        model = New(args.MODEL, args)
+        model.ensure_model_exists(args)
+        if isinstance(model, APITransport):
+            raise NotImplementedError("bench --tune is not supported for hosted API transports.")
+        set_accel_env_vars()
+
+        device = DeviceInfoV1.current_device_info()
+        candidates = search_space(
+            os.cpu_count() or 1,
+            gpu=device.accel not in ("", "none"),
+            threads=args.threads if getattr(args, "threads_override", False) else None,
+            ngl=args.ngl,
+            ncmoe=args.ncmoe,
+            moe_layers=self._moe_layers(model),
+        )
+        base_runtime_args = list(args.runtime_args or [])
+
+        def trial_args(candidate: Candidate, repetitions: int) -> argparse.Namespace:
+            trial = copy.copy(args)
+            for key, value in asdict(candidate).items():
+                setattr(trial, key, value)
+            trial.runtime_args = [
+                *base_runtime_args,
+                *("-p", str(TUNE_PROMPT_TOKENS), "-n", str(TUNE_GEN_TOKENS), "-r", str(repetitions)),
+            ]
+            return trial
+
+        if args.dryrun:
+            for candidate in candidates:
+                self._llama_bench(trial_args(candidate, 1), model)
+            return
+
+        def evaluate(candidate: Candidate, repetitions: int) -> Optional[float]:
+            try:
+                _, stdout = self._llama_bench(trial_args(candidate, repetitions), model)
+                score = throughput_score(parse_json(stdout or ""))
+            except (subprocess.CalledProcessError, ValueError) as e:
+                logger.debug(f"llama-bench failed for {candidate.describe()}: {e}")
+                score = None
+            print(f"{candidate.describe()}: {'failed' if score is None else f'{score:.2f} t/s'} (r={repetitions})")
+            return score
+
+        print(f"Tuning {args.MODEL} over {len(candidates)} configurations")
+        best, score = successive_halving(candidates, evaluate)
+
+        digest = self._model_digest(model)
+        config = ActiveConfig()
+        if digest is not None:
+            TunedProfiles(config.benchmarks.storage_folder).save(
+                digest, device_fingerprint(device), args.MODEL, best, score
+            )
+        else:
+            logger.warning(f"Cannot identify {args.MODEL} by digest, its tuned settings are not saved")
+
+        if getattr(args, "format", "table") == "json":
+            print(json.dumps({"model": args.MODEL, "digest": digest, "score": score, **best.settings()}, indent=2))
+        else:
+            print(f"Best: {best.describe()}: {score:.2f} t/s")
+
+    def _serve_bench_args(self, args: argparse.Namespace) -> argparse.Namespace:
+        """Arguments for `ramalama serve` of the benchmarked model, carrying over the bench options."""
+        from ramalama.cli import parse_args_from_cmd
+
+        cmd = ["--runtime", args.runtime]
+        if not args.container:
+            cmd.append("--nocontainer")
+        _, serve_args = parse_args_from_cmd([*cmd, "serve", args.MODEL])
+        skip = {"subcommand", "func", "port", "format", "serve"}
+        for key, value in vars(args).items():
+            if key not in skip and hasattr(serve_args, key):
+                setattr(serve_args, key, value)
+        if isinstance(getattr(serve_args, "model", None), list):
+            serve_args.model = args.MODEL
+        serve_args.port = compute_serving_port(serve_args)
+        return serve_args
+
+    def _serve_bench_handler(self, args: argparse.Namespace) -> None:
+        from ramalama.benchmarks.load import LengthDistribution, LoadSpec, run_load
+        from ramalama.engine import stop_container
+
+        spec = LoadSpec(
+            prompt_tokens=LengthDistribution.parse(args.prompt_tokens),
+            output_tokens=LengthDistribution.parse(args.output_tokens),
+            num_requests=args.num_requests,
+            concurrency=args.concurrency,
+            request_rate=args.request_rate,
+            slo_ttft_ms=args.slo_ttft,
+            slo_itl_ms=args.slo_itl,
+            seed=int(args.seed) if getattr(args, "seed", None) else 0,
+        )
+        serve_args = self._serve_bench_args(args)
+        model = New(serve_args.MODEL, serve_args)
+        model.ensure_model_exists(serve_args)
+        if isinstance(model, APITransport):
+            raise NotImplementedError("bench is not supported for hosted API transports.")
+
+        if serve_args.container and not serve_args.dryrun:
+            config = ActiveConfig()
+            should_pull = config.pull in ["always", "missing", "newer"]
+            serve_args.image = ensure_image(config.engine, serve_args.image, should_pull=should_pull, quiet=True)
+
+        cmd = assemble_command(serve_args)
+        process = model.serve_nonblocking(serve_args, cmd)
+        if serve_args.dryrun:
+            return
+
+        try:
+            if serve_args.container and process is not None and process.wait() != 0:
+                raise ValueError(f"Failed to serve model {model.model_name} for benchmarking")
+            if not serve_args.container:
+                serve_args.server_process = process
+            model.wait_for_healthy(serve_args)
+            url = f"http://127.0.0.1:{serve_args.port}/v1"
+            report = run_load(url, f"{model.model_organization}/{model.model_name}", spec)
+        finally:
+            if serve_args.container:
+                stop_container(serve_args, serve_args.name, remove=True)
+            else:
+                model._cleanup_server_process(process)
+
+        result = {
+            "model": args.MODEL,
+            "num_requests": spec.num_requests,
+            "concurrency": spec.concurrency,
+            "request_rate": spec.request_rate,
+            "prompt_tokens": spec.prompt_tokens.spec,
+            "output_tokens": spec.output_tokens.spec,
+            "slo_ttft_ms": spec.slo_ttft_ms,
+            "slo_itl_ms": spec.slo_itl_ms,
+            **report.summary(),
+        }
+        record = get_benchmark_record(
+            {
+                "kind": "serve",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "configuration": {
+                    "container_image": serve_args.image if serve_args.container else "",
+                    "container_runtime": serve_args.engine if serve_args.container else "",
+                    "inference_engine": args.runtime,
+                    "runtime_args": cmd,
+                    "model_digest": self._model_digest(model),
+                },
+                "result": result,
+            },
+            "v1",
+        )
+
+        if getattr(args, "format", "table") == "json":
+            print(json.dumps(asdict(record), indent=2))
+        else:
+            print_bench_results([record])
+
+        config = ActiveConfig()
+        if not config.benchmarks.disable:
+            BenchmarksManager(config.benchmarks.storage_folder).save(record)
+
     def _perplexity_handler(self, args: argparse.Namespace) -> None:
         model = New(args.MODEL, args)
         model.ensure_model_exists(args)
@@ -936,14 +1445,40 @@ Model "raw" contains the model and a link file model.file to it stored at /.""",
     def _benchmarks_list_handler(self, args: argparse.Namespace) -> None:
         config = ActiveConfig()
         bench_manager = BenchmarksManager(config.benchmarks.storage_folder)
-        results = bench_manager.list()
+        filters = parse_selector(",".join(args.filters)) if args.filters else None
+        rows = bench_manager.query(filters, limit=args.limit, offset=args.offset)
 
-        if not results:
+        if not rows:
             print("No benchmark results found")
             return
 
         if args.format == "json":
-            output = [asdict(item) for item in results]
+            output = [{"id": row_id, **asdict(item)} for row_id, item in rows]
             print(json.dumps(output, indent=2, sort_keys=True))
         else:
-            print_bench_results(results)
+            print_bench_results([item for _, item in rows], ids=[row_id for row_id, _ in rows])
+
+    def _benchmarks_compare_handler(self, args: argparse.Namespace) -> None:
+        config = ActiveConfig()
+        bench_manager = BenchmarksManager(config.benchmarks.storage_folder)
+        baseline_filters, candidate_filters = parse_selector(args.BASELINE), parse_selector(args.CANDIDATE)
+        baseline = bench_manager.list(baseline_filters)
+        candidate = bench_manager.list(candidate_filters)
+        if not baseline or not candidate:
+            raise ValueError(f"no benchmark results match {args.BASELINE if not baseline else args.CANDIDATE}")
+
+        # comparing two models against each other only makes sense per test
+        model_keys = {"model", "digest", "run"}
+        match_models = not (model_keys & (baseline_filters.keys() | candidate_filters.keys()))
+        comparisons = compare_records(baseline, candidate, match_models=match_models)
+        if not comparisons:
+            raise ValueError("the selected benchmark results have no tests in common")
+
+        if args.format == "json":
+            print(json.dumps([comparison_to_dict(item) for item in comparisons], indent=2))
+        else:
+            print_comparisons(comparisons)
+
+        regressions = [item for item in comparisons if item.verdict == "regression"]
+        if args.fail_on_regression and regressions:
+            raise ValueError(f"{len(regressions)} test(s) regressed")
@@ -90,7 +90,7 @@ class LlamaCppCommands:
             cmd += ["--alias", model.model_alias]
 
         ctx_size = getattr(args, 'ctx_size', None)
-        if ctx_size and ctx_size > 0:
+        if isinstance(ctx_size, int) and ctx_size > 0:
             cmd += ["--ctx-size", str(ctx_size)]
 
         temp = getattr(args, 'temp', None)
@@ -114,7 +114,7 @@ class LlamaCppCommands:
                 cmd += ["-ngl", ngl_str]
 
             ncmoe = getattr(args, 'ncmoe', None)
-            if ncmoe is not None:
+            if ncmoe is not None and ncmoe != "auto":
                 cmd += ["-ncmoe", str(ncmoe)]
 
             model_draft = getattr(args, 'model_draft', None)
@@ -149,6 +149,18 @@ class LlamaCppCommands:
         if threads is not None:
             cmd += ["--threads", str(threads)]
 
+        batch_size = getattr(args, 'batch_size', None)
+        if batch_size is not None:
+            cmd += ["--batch-size", str(batch_size)]
+
+        ubatch_size = getattr(args, 'ubatch_size', None)
+        if ubatch_size is not None:
+            cmd += ["--ubatch-size", str(ubatch_size)]
+
+        flash_attn = getattr(args, 'flash_attn', None)
+        if flash_attn is not None:
+            cmd += ["--flash-attn", "on" if flash_attn else "off"]
+
         seed = getattr(args, 'seed', None)
         if seed is not None:
             cmd += ["--seed", str(seed)]
@@ -191,7 +203,7 @@ class LlamaCppCommands:
             cmd += ["-ngl", ngl_str]
 
         ncmoe = getattr(args, 'ncmoe', None)
-        if ncmoe is not None:
+        if ncmoe is not None and ncmoe != "auto":
             cmd += ["-ncmoe", str(ncmoe)]
 
         model_draft = getattr(args, 'model_draft', None)
@@ -204,7 +216,7 @@ class LlamaCppCommands:
             cmd += ["--threads", str(threads)]
 
         ctx_size = getattr(args, 'ctx_size', None)
-        if ctx_size and ctx_size > 0:
+        if isinstance(ctx_size, int) and ctx_size > 0:
             cmd += ["--ctx-size", str(ctx_size)]
 
         temp = getattr(args, 'temp', None)
@@ -247,7 +259,7 @@ class LlamaCppCommands:
             cmd += ["-ngl", ngl_str]
 
         ncmoe = getattr(args, 'ncmoe', None)
-        if ncmoe is not None:
+        if ncmoe is not None and ncmoe != "auto":
             cmd += ["-ncmoe", str(ncmoe)]
 
         model_draft = getattr(args, 'model_draft', None)
@@ -259,6 +271,18 @@ class LlamaCppCommands:
         if threads is not None:
             cmd += ["--threads", str(threads)]
 
+        batch_size = getattr(args, 'batch_size', None)
+        if batch_size is not None:
+            cmd += ["-b", str(batch_size)]
+
+        ubatch_size = getattr(args, 'ubatch_size', None)
+        if ubatch_size is not None:
+            cmd += ["-ub", str(ubatch_size)]
+
+        flash_attn = getattr(args, 'flash_attn', None)
+        if flash_attn is not None:
+            cmd += ["-fa", "1" if flash_attn else "0"]
+
         cmd += ["-o", "json"]
 
         runtime_args = getattr(args, 'runtime_args', None)
@@ -291,13 +315,16 @@ class LlamaCppCommands:
             cmd += ["--chunk-size", str(chunk_size)]
 
         ctx_size = getattr(args, 'ctx_size', None)
-        if ctx_size:
+        if isinstance(ctx_size, int) and ctx_size > 0:
             cmd += ["--ctx-size", str(ctx_size)]
 
         caption_url = getattr(args, 'caption_url', None)
         if caption_url:
             cmd += ["--caption-url", str(caption_url)]
 
+        if getattr(args, 'incremental', False):
+            cmd.append("--incremental")
+
         cmd.append("/output")
 
         if getattr(args, 'PATHS', None) and getattr(args, 'inputdir', None):
@@ -348,4 +375,7 @@ class LlamaCppCommands:
         model_name = self._get_model_name(args)
         gguf = getattr(args, 'gguf', None) or ""
         cmd += [f"/model/{model_name}.gguf", f"/model/{model_name}-{gguf}.gguf", str(gguf)]
+        quantize_threads = getattr(args, 'quantize_threads', None)
+        if quantize_threads:
+            cmd.append(str(quantize_threads))
         return cmd
@@ -90,6 +90,10 @@ class MlxPlugin(BaseInferenceRuntime):
             logger.info("MLX runtime automatically uses --nocontainer mode")
         args.container = False
 
+    @property
+    def health_check_path(self) -> Optional[str]:
+        return "/health"
+
     def service_ready_check(self, conn: HTTPConnection, args: Any, model_name: Optional[str] = None) -> bool:
         conn.request("GET", "/health")
         resp = conn.getresponse()
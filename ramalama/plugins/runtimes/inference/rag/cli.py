@@ -71,6 +71,11 @@ def register_rag_subcommand(plugin, subparsers):
         help="max tokens per chunk for embedding (default: 400)",
         completer=suppressCompleter,
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="update an existing vector database, only processing new or changed documents",
+    )
     parser.add_argument(
         "--ngl",
         dest="ngl",
@@ -220,18 +220,18 @@ def _wait_for_server(plugin: RuntimePlugin, args: argparse.Namespace, model_alia
 
 def _cleanup_servers(args, all_serve_args, all_procs):
     """Stop llama.cpp server containers and terminate any lingering processes."""
-    from ramalama.engine import stop_container
-
-    for serve_args in all_serve_args:
-        name = getattr(serve_args, "name", None)
-        if name:
-            try:
-                stop_args = argparse.Namespace(engine=args.engine, ignore=True)
-                stop_container(stop_args, name)
-            except Exception as e:
-                from ramalama.logger import logger
-
-                logger.debug(f"Failed to stop container {name}: {e}")
+    from ramalama.engine import stop_containers
+    from ramalama.logger import logger
+
+    names = [name for serve_args in all_serve_args if (name := getattr(serve_args, "name", None))]
+    if names:
+        try:
+            stop_args = argparse.Namespace(engine=args.engine, ignore=True)
+            for name, error in stop_containers(stop_args, names).items():
+                if error is not None:
+                    logger.debug(f"Failed to stop container {name}: {error}")
+        except Exception as e:
+            logger.debug(f"Failed to stop containers {', '.join(names)}: {e}")
     for proc in all_procs:
         if proc is not None and proc.poll() is None:
             proc.terminate()
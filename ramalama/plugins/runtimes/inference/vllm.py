@@ -6,7 +6,7 @@ from typing import Any, Optional
 
 from ramalama.cli import suppressCompleter
 from ramalama.common import ContainerEntryPoint
-from ramalama.config import ActiveConfig
+from ramalama.config import ActiveConfig, coerce_to_int_or_auto
 from ramalama.logger import logger
 from ramalama.plugins.runtimes.inference.common import ContainerizedInferenceRuntimePlugin
 from ramalama.transports.transport_factory import New
@@ -45,7 +45,7 @@ class VllmPlugin(ContainerizedInferenceRuntimePlugin):
             cmd += ["--served-model-name", model.model_alias]
 
         ctx_size = getattr(args, 'ctx_size', None)
-        if ctx_size:
+        if isinstance(ctx_size, int) and ctx_size > 0:
             cmd += ["--max-model-len", str(ctx_size)]
 
         # --host: use :: in container, or the configured host otherwise
@@ -75,7 +75,7 @@ class VllmPlugin(ContainerizedInferenceRuntimePlugin):
         parser.add_argument(
             "--max-model-len",
             dest="ctx_size",
-            type=int,
+            type=coerce_to_int_or_auto,
             default=config.ctx_size,
             help="model context length (sequence length); alias for --ctx-size",
             completer=suppressCompleter,
@@ -99,6 +99,10 @@ class VllmPlugin(ContainerizedInferenceRuntimePlugin):
 
         return config.images.get("VLLM") or _VLLM_DEFAULT_IMAGE
 
+    @property
+    def health_check_path(self) -> Optional[str]:
+        return "/ping"
+
     def service_ready_check(self, conn: HTTPConnection, args: Any, model_name: Optional[str] = None) -> bool:
         conn.request("GET", "/ping")
         resp = conn.getresponse()
@@ -7,6 +7,7 @@ from typing import Optional, Tuple
 from ramalama.common import MNT_DIR, RAG_DIR, ContainerEntryPoint, get_accel, get_accel_env_vars
 from ramalama.file import UnitFile
 from ramalama.host_utils import format_bind_host_literal
+from ramalama.model_resources import PROBE_PERIOD_SECONDS, ModelResources, container_port
 
 
 class Quadlet:
@@ -50,6 +51,7 @@ class Quadlet:
         self.artifact = artifact
         self.exec_args = exec_args
         self.image = args.image
+        self.resources = ModelResources.estimate([src for src, _ in self.model_parts] + [self.src_mmproj_path], args)
         self.rag = ""
         self.rag_name = ""
         if getattr(args, 'rag', None):
@@ -101,6 +103,8 @@ class Quadlet:
         self._gen_env(quadlet_file)
         self._gen_name(quadlet_file)
         self._gen_port(quadlet_file)
+        self._gen_resources(quadlet_file)
+        self._gen_healthcheck(quadlet_file)
 
         volume_files = self._gen_model_volume(quadlet_file)
         files.extend(volume_files)
@@ -190,6 +194,20 @@ class Quadlet:
             host = format_bind_host_literal(getattr(self.args, "host", None) or "::")
             quadlet_file.add("Container", "PublishPort", f"{host}:{self.args.port}:{self.args.port}")
 
+    def _gen_resources(self, quadlet_file: UnitFile):
+        if self.resources is None:
+            return
+        quadlet_file.add("Container", "PodmanArgs", f"--memory-reservation={self.resources.memory_request_mib}m")
+        quadlet_file.add("Container", "PodmanArgs", f"--memory={self.resources.memory_limit_mib}m")
+
+    def _gen_healthcheck(self, quadlet_file: UnitFile):
+        port = container_port(self.args)
+        if self.resources is None or not self.resources.health_path or port is None:
+            return
+        quadlet_file.add("Container", "HealthCmd", f"curl -sf http://localhost:{port}{self.resources.health_path}")
+        quadlet_file.add("Container", "HealthInterval", f"{PROBE_PERIOD_SECONDS}s")
+        quadlet_file.add("Container", "HealthStartPeriod", f"{self.resources.startup_seconds}s")
+
     def _gen_rag_volume(self, quadlet_file: UnitFile):
         files: list[UnitFile] = []
 
@@ -3,13 +3,14 @@ from __future__ import annotations
 import os
 import subprocess
 import tempfile
+import uuid
 from functools import partial
 from textwrap import dedent
 from typing import Literal
 
 from ramalama.arg_types import RagArgsType
 from ramalama.chat import ChatOperationalArgs
-from ramalama.common import ensure_image, perror, set_accel_env_vars
+from ramalama.common import ensure_image, perror, run_cmd, set_accel_env_vars
 from ramalama.compat import StrEnum
 from ramalama.config import ActiveConfig, Config
 from ramalama.engine import BuildEngine, Engine, is_healthy, stop_container, wait_for_healthy
@@ -72,6 +73,20 @@ class Rag:
             tag=self.target,
         )
 
+    def seed_from_image(self, args, dbdir: str) -> bool:
+        """Copy the vector database out of a previously built image so doc2rag can update it in place."""
+        name = f"ramalama-rag-{uuid.uuid4().hex[:12]}"
+        try:
+            run_cmd([args.engine, "create", "--name", name, self.target, "sh"], ignore_all=True)
+        except subprocess.CalledProcessError:
+            perror(f"{self.target} does not exist locally, building a new vector database")
+            return False
+        try:
+            run_cmd([args.engine, "cp", f"{name}:/vector.db/.", dbdir])
+        finally:
+            run_cmd([args.engine, "rm", name], ignore_all=True)
+        return True
+
     def generate(self, args, cmd):
         args.nocapdrop = True
         if not args.container:
@@ -87,6 +102,8 @@ class Rag:
             ragdb = tempfile.TemporaryDirectory(prefix="RamaLama_rag_")
             dbdir = os.path.join(ragdb.name, "vectordb")
             os.makedirs(dbdir)
+            if getattr(args, "incremental", False) and not args.dryrun:
+                self.seed_from_image(args, dbdir)
         else:
             dbdir = self.target
 
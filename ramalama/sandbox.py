@@ -5,15 +5,18 @@ import copy
 import json
 import platform
 import sys
+import threading
+import time
 from collections.abc import Callable
-from functools import partial
 from http.client import HTTPConnection
 from typing import Optional, cast
 
 from ramalama.arg_types import BaseEngineArgsType
-from ramalama.common import genname, perror, run_cmd
+from ramalama.common import ensure_image, genname, perror, run_cmd
 from ramalama.config import ActiveConfig
-from ramalama.engine import Engine, is_healthy, stop_container, wait_for_healthy
+from ramalama.engine import Engine, stop_container, wait_for_healthy
+from ramalama.image_cache import start_prefetch
+from ramalama.logger import logger
 from ramalama.model_server import ModelServerError, list_server_models
 from ramalama.plugins.loader import get_runtime
 from ramalama.transports.base import compute_serving_port
@@ -177,13 +180,51 @@ class Agent:
     Run an agent in a container.
     """
 
+    # name of the argument holding the agent's container image
+    image_arg = ""
+
     def __init__(self, args: SandboxEngineArgsType, model_name: str):
         self.engine = SandboxEngine(args)
         self.model_name = model_name
+        self.container_name: Optional[str] = None
+        self.created = False
+
+    @classmethod
+    def image(cls, args: SandboxEngineArgsType) -> Optional[str]:
+        return getattr(args, cls.image_arg, None)
+
+    def add_name(self, name: str) -> None:
+        self.container_name = name
+        self.engine.add_name(name)
+
+    def pull_image(self) -> None:
+        image = self.image(self.engine.args)
+        if image:
+            ensure_image(self.engine.args.engine, image, should_pull=True, quiet=True)
+
+    def create(self) -> None:
+        """Create the agent container without starting it, so it starts as soon as the model server is ready."""
+        # exec_args is [engine, "run", ...]; create takes the same options
+        run_cmd([self.engine.exec_args[0], "create", *self.engine.exec_args[2:]])
+        self.created = True
 
     def run(self) -> None:
+        if self.created and self.container_name:
+            self.created = False
+            run_cmd(
+                [self.engine.exec_args[0], "start", "--attach", "--interactive", self.container_name],
+                stdout=None,
+                stdin=None,
+            )
+            return
         run_cmd(self.engine.exec_args, stdout=None, stdin=None)
 
+    def discard(self) -> None:
+        """Remove the container if it was created but never started."""
+        if self.created and self.container_name:
+            self.created = False
+            run_cmd([self.engine.exec_args[0], "rm", "--force", self.container_name], ignore_all=True)
+
 
 class Goose(Agent):
     """
@@ -193,12 +234,14 @@ class Goose(Agent):
     is a tty, an interactive session will be started. Otherwise, instructions will be read from stdin.
     """
 
+    image_arg = "goose_image"
+
     def __init__(self, args: GooseArgsType, model_name: str) -> None:
         super().__init__(args, model_name)
         if self.engine.use_podman:
             if platform.system() != "Windows":
                 self.engine.add_args("--uidmap=+1000:0")
-        self.engine.add_name(f"goose-{args.name}")  # type: ignore[attr-defined]
+        self.add_name(f"goose-{args.name}")  # type: ignore[attr-defined]
         self.add_env_options(args)
         self.engine.add_workdir(args)
         self.engine.add_args(args.goose_image)
@@ -231,9 +274,11 @@ class OpenCode(Agent):
     read from stdin.
     """
 
+    image_arg = "opencode_image"
+
     def __init__(self, args: OpenCodeArgsType, model_name: str) -> None:
         super().__init__(args, model_name)
-        self.engine.add_name(f"opencode-{args.name}")  # type: ignore[attr-defined]
+        self.add_name(f"opencode-{args.name}")  # type: ignore[attr-defined]
         self.add_env_options(args)
         self.engine.add_workdir(args)
         self.engine.add_args(args.opencode_image)
@@ -284,10 +329,12 @@ class Pi(Agent):
     will choose its interactive or print behavior based on whether stdin is attached to a tty.
     """
 
+    image_arg = "pi_image"
+
     def __init__(self, args: PiArgsType, model_name: str) -> None:
         super().__init__(args, model_name)
         provider_id = _pi_provider_id()
-        self.engine.add_name(f"pi-{args.name}")  # type: ignore[attr-defined]
+        self.add_name(f"pi-{args.name}")  # type: ignore[attr-defined]
         self.add_provider_discovery_env(args)
         self.engine.add_workdir(args)
         self.engine.add_args(args.pi_image)
@@ -371,8 +418,73 @@ def run_sandbox(args: SandboxEngineArgsType, agent_cls: type[Agent]) -> None:
         _run_sandbox_router(sb_args, agent_cls)
 
 
+class StartupTimer:
+    """Seconds from the start of the sandbox to each startup stage, reported as the time to first prompt."""
+
+    def __init__(self) -> None:
+        self.start = time.monotonic()
+        self.stages: dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        self.stages[stage] = time.monotonic() - self.start
+
+    def report(self, args: SandboxEngineArgsType) -> float:
+        elapsed = time.monotonic() - self.start
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.stages.items())
+        message = f"Time to first prompt: {elapsed:.2f}s" + (f" ({stages})" if stages else "")
+        if getattr(args, "quiet", False):
+            logger.info(message)
+        else:
+            perror(message)
+        return elapsed
+
+
+def _prefetch_agent_image(args: SandboxEngineArgsType, agent_cls: type[Agent]) -> None:
+    """Pull the agent image in the background while the model is pulled and loaded."""
+    engine, image = getattr(args, "engine", None), agent_cls.image(args)
+    if engine and image:
+        start_prefetch(engine, [image])
+
+
+class AgentPreparation:
+    """
+    Pulls the agent image and creates the agent container in a background thread. If the
+    sandbox fails before the agent starts, the preparation is abandoned without waiting for
+    a pull, and a container it still creates is removed.
+    """
+
+    def __init__(self, agent: Agent, timer: StartupTimer) -> None:
+        self.agent = agent
+        self.timer = timer
+        self._abandoned = threading.Event()
+        self._thread = threading.Thread(target=self._prepare, name="sandbox-agent", daemon=True)
+        self._thread.start()
+
+    def _prepare(self) -> None:
+        try:
+            self.agent.pull_image()
+            if not self._abandoned.is_set():
+                self.agent.create()
+                self.timer.mark("agent")
+        except Exception as e:
+            # the agent is run the usual way once the server is ready
+            logger.debug(f"Failed to create the agent container ahead of time: {e}")
+        if self._abandoned.is_set():
+            self.agent.discard()
+
+    def wait(self) -> None:
+        self._thread.join()
+
+    def abandon(self) -> None:
+        self._abandoned.set()
+
+
 def _run_sandbox_single_model(args: SandboxEngineArgsType, agent_cls: type[Agent]) -> None:
-    """Run sandbox with a single model (original behavior)."""
+    """
+    Run sandbox with a single model. The agent image is pulled while the model is pulled,
+    and the agent container is created while the server loads the model, so the agent
+    starts the moment the server is ready.
+    """
     model = New(args.MODEL, args)
 
     if args.dryrun:
@@ -380,18 +492,29 @@ def _run_sandbox_single_model(args: SandboxEngineArgsType, agent_cls: type[Agent
         agent.engine.dryrun()
         return
 
+    timer = StartupTimer()
+    _prefetch_agent_image(args, agent_cls)
     model.ensure_model_exists(args)
+    timer.mark("model")
 
     runtime = get_runtime(ActiveConfig().runtime)
     cmd = runtime.handle_subcommand("serve", cast(argparse.Namespace, args))
 
     model.serve_nonblocking(args, cmd)  # type: ignore[union-attr]
+    timer.mark("server")
+    # the agent joins the server container's network, so it is created once that exists
     agent = agent_cls(args, model.model_alias)
 
+    preparation = AgentPreparation(agent, timer)
     try:
         model.wait_for_healthy(args)  # type: ignore[union-attr]
+        timer.mark("ready")
+        preparation.wait()
+        timer.report(args)
         agent.run()
     finally:
+        preparation.abandon()
+        agent.discard()
         args.ignore = True  # type: ignore[attr-defined]
         stop_container(args, args.name, remove=True)  # type: ignore[attr-defined]
 
@@ -414,6 +537,18 @@ def _query_router_models(port: int | str) -> list[str]:
             conn.close()
 
 
+def _router_healthy(port: int | str) -> bool:
+    """Whether the llama.cpp router server answers /health; connection errors propagate to the caller."""
+    conn = HTTPConnection("127.0.0.1", int(port), timeout=5)
+    try:
+        conn.request("GET", "/health")
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status == 200
+    finally:
+        conn.close()
+
+
 def _run_sandbox_router(args: SandboxEngineArgsType, agent_cls: type[Agent]) -> None:
     """Run sandbox in router mode (zero or multiple models)."""
     runtime = get_runtime(ActiveConfig().runtime)
@@ -422,6 +557,9 @@ def _run_sandbox_router(args: SandboxEngineArgsType, agent_cls: type[Agent]) ->
     if serve_router is None:
         raise ValueError("Router mode (zero or multiple models) is only supported with the llama.cpp runtime.")
 
+    timer = StartupTimer()
+    if not args.dryrun:
+        _prefetch_agent_image(args, agent_cls)
     serve_router(cast(argparse.Namespace, args))
 
     if args.dryrun:
@@ -430,16 +568,32 @@ def _run_sandbox_router(args: SandboxEngineArgsType, agent_cls: type[Agent]) ->
         return
 
     try:
-        wait_for_healthy(args, partial(is_healthy))
-
         if args.port is None:
             raise ValueError("Router mode requires a resolved serving port")
-        model_ids = _query_router_models(args.port)
+        timer.mark("server")
+
+        # the router is ready once it is healthy; its models are what the agent is configured with
+        model_ids: list[str] = []
+
+        def models_listed(args) -> bool:
+            if not _router_healthy(args.port):
+                return False
+            model_ids[:] = _query_router_models(args.port)
+            if not model_ids:
+                # a healthy router lists the store's models right away; waiting will not add any
+                raise ValueError(
+                    "The model server is running but lists no models; pull a model or pass one to ramalama sandbox"
+                )
+            return True
+
+        wait_for_healthy(args, models_listed)
+        timer.mark("ready")
         args.router_model_ids = model_ids  # type: ignore[attr-defined]
         assert model_ids, "router model discovery returned no model IDs"
         first_model = model_ids[0]
 
         agent = agent_cls(args, first_model)
+        timer.report(args)
         agent.run()
     finally:
         args.ignore = True  # type: ignore[attr-defined]
@@ -5,7 +5,9 @@ import os
 import re
 import sys
 import sysconfig
-from typing import Optional
+from typing import Any, Optional
+
+from ramalama import config_cache
 
 
 class Shortnames:
@@ -15,8 +17,24 @@ class Shortnames:
     config_sources: dict[str, str] = {}
 
     def __init__(self):
-        self.shortnames = {}
-        self.config_sources = {}
+        file_paths = self._file_paths()
+        stamps = config_cache.source_stamps(file_paths)
+        compiled = config_cache.load("shortnames", stamps)
+        if compiled is None:
+            compiled = self._parse(file_paths)
+            config_cache.save("shortnames", stamps, compiled)
+
+        self.shortnames = compiled["shortnames"]
+        self.config_sources = compiled["config_sources"]
+        self.paths = compiled["paths"]
+
+        self._targets: dict[str, list[str]] = {}
+        for name, target in self.shortnames.items():
+            self._targets.setdefault(target, []).append(name)
+
+    @staticmethod
+    def _file_paths() -> list[str]:
+        """shortnames.conf locations, from the lowest to the highest precedence."""
         data_path = sysconfig.get_path("data")
         file_paths = [
             "./shortnames/shortnames.conf",  # for development
@@ -51,24 +69,28 @@ class Shortnames:
                 ]
             )
 
-        self.paths = []
+        return file_paths
+
+    @classmethod
+    def _parse(cls, file_paths: list[str]) -> dict[str, Any]:
+        shortnames: dict[str, str] = {}
+        config_sources: dict[str, str] = {}
+        paths: list[str] = []
         for file_path in file_paths:
             config = configparser.ConfigParser(delimiters="=")
             config.read(file_path)
             if "shortnames" in config:
                 real_path = os.path.realpath(file_path)
-                self.paths.append(real_path)
+                paths.append(real_path)
                 for key, value in config["shortnames"].items():
-                    name = self._strip_quotes(key)
-                    target = self._strip_quotes(value)
-                    self.shortnames[name] = target
-                    self.config_sources[name] = real_path
+                    name = cls._strip_quotes(key)
+                    target = cls._strip_quotes(value)
+                    shortnames[name] = target
+                    config_sources[name] = real_path
+        return {"shortnames": shortnames, "config_sources": config_sources, "paths": paths}
 
-        self._targets: dict[str, list[str]] = {}
-        for name, target in self.shortnames.items():
-            self._targets.setdefault(target, []).append(name)
-
-    def _strip_quotes(self, s) -> str:
+    @staticmethod
+    def _strip_quotes(s) -> str:
         return s.strip("'\"")
 
     def resolve(self, model: str) -> str:
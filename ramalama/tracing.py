@@ -0,0 +1,182 @@
+"""Opt-in timed spans around pull, serve, chat and daemon work, exported as Chrome trace-event JSON"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from ramalama.logger import logger
+
+# A long running daemon keeps recording; beyond this the oldest events are kept and the rest counted
+MAX_EVENTS = 100_000
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled, so hooks cost a global lookup and a call."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start_ns")
+
+    def __init__(self, tracer: Tracer, name: str, attrs: dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+
+    def __enter__(self) -> Span:
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer.complete(self.name, self.start_ns, end_ns, self.attrs)
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes only known once the work is under way, e.g. sizes or status codes."""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Collects complete ("X") and instant ("i") trace events from every thread. Timestamps are
+    microseconds since the epoch, so traces written by several ramalama processes line up.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        self.events: list[dict[str, Any]] = []
+        self.dropped = 0
+        self._threads: set[Optional[int]] = set()
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_us = time.time_ns() / 1000
+
+    def _ts(self, ns: int) -> float:
+        return self._origin_us + (ns - self._origin_ns) / 1000
+
+    def _append(self, event: dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        tid = thread.ident
+        event["pid"] = self.pid
+        event["tid"] = tid
+        with self._lock:
+            if tid not in self._threads:
+                # names the thread's track in the viewer
+                self._threads.add(tid)
+                self.events.append(
+                    {"ph": "M", "name": "thread_name", "pid": self.pid, "tid": tid, "args": {"name": thread.name}}
+                )
+            if len(self.events) >= MAX_EVENTS:
+                self.dropped += 1
+                return
+            self.events.append(event)
+
+    def complete(self, name: str, start_ns: int, end_ns: int, attrs: dict[str, Any]) -> None:
+        self._append(
+            {"ph": "X", "name": name, "ts": self._ts(start_ns), "dur": (end_ns - start_ns) / 1000, "args": attrs}
+        )
+
+    def instant(self, name: str, attrs: dict[str, Any]) -> None:
+        self._append({"ph": "i", "s": "t", "name": name, "ts": self._ts(time.perf_counter_ns()), "args": attrs})
+
+    def _merged_events(self) -> list[dict[str, Any]]:
+        """
+        Our events plus those a child ramalama process (e.g. `daemon run` started by `daemon start`)
+        wrote to the same file while we ran. A file left by an earlier invocation is replaced.
+        """
+        try:
+            if os.stat(self.path).st_mtime_ns / 1000 < self._origin_us:
+                return self.events
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self.events
+        if not isinstance(data, dict) or not isinstance(data.get("traceEvents"), list):
+            return self.events
+        return [event for event in data["traceEvents"] if event.get("pid") != self.pid] + self.events
+
+    def write(self) -> None:
+        with self._lock:
+            trace = {
+                "traceEvents": self._merged_events(),
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped},
+            }
+            tmp_path = f"{self.path}.{self.pid}.tmp"
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(trace, f, default=str)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to write trace {self.path}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(path: str) -> Tracer:
+    """Start recording; the trace is written to path when the process exits."""
+    global _tracer
+    if _tracer is not None and _tracer.path == path:
+        return _tracer
+    _tracer = Tracer(path)
+    atexit.register(_tracer.write)
+    return _tracer
+
+
+def disable() -> None:
+    global _tracer
+    if _tracer is not None:
+        atexit.unregister(_tracer.write)
+    _tracer = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, /, **attrs: Any) -> Any:
+    """
+    Context manager timing the enclosed block as a span named name. Spans opened inside it on
+    the same thread nest under it; an exception leaving the block is recorded as its error.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return Span(tracer, name, attrs)
+
+
+def mark(name: str, /, **attrs: Any) -> None:
+    """Record a point in time, such as the first token of a response."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.instant(name, attrs)
@@ -8,6 +8,7 @@ import subprocess
 import sys
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, wait
 from functools import partial
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -26,6 +27,7 @@ from ramalama.model_inspect.gguf_parser import GGUFInfoParser
 from ramalama.model_inspect.safetensor_info import SafetensorModelInfo
 from ramalama.model_inspect.safetensor_parser import SafetensorInfoParser
 from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.page_cache import start_prewarm
 from ramalama.model_store.store import ModelStore
 from ramalama.quadlet import Quadlet
 
@@ -406,9 +408,13 @@ class Transport(TransportBase):
         if args.dryrun:
             self.engine.dryrun()
             return True
+        prewarming = self.prewarm(args)
         # Detached serve: use run_cmd so the process returns and the plugin can run the healthcheck
         if getattr(args, "detach", False) and getattr(args, "subcommand", "") == "serve":
             run_cmd(self.engine.exec_args, ignore_all=args.noout)
+            if prewarming is not None:
+                # the prewarm thread dies with the CLI, so let it finish while the container starts
+                wait([prewarming])
             return True
         self.engine.exec(stdout2null=args.noout)
         return True
@@ -489,6 +495,7 @@ class Transport(TransportBase):
             process = subprocess.Popen(
                 self.engine.exec_args,
             )
+            self.prewarm(args)
             return process
 
         # Non-container mode: run the command directly with subprocess
@@ -502,6 +509,7 @@ class Transport(TransportBase):
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
+        self.prewarm(args)
         return process
 
     def _connect_and_chat(self, args, server_process):
@@ -675,6 +683,7 @@ class Transport(TransportBase):
             if args.dryrun:
                 dry_run(exec_args)
                 return
+            self.prewarm(args)
             exec_cmd(exec_args, stdout2null=args.noout, stderr2null=args.noout)
         except FileNotFoundError as e:
             if args.container:
@@ -755,6 +764,33 @@ class Transport(TransportBase):
         )
         compose.generate().write(output_dir)
 
+    def page_cache_paths(self) -> list[str]:
+        """Host paths of the model files for the page cache to prewarm or evict, empty if not in the store."""
+        if self.model_type == "oci":
+            return []
+        try:
+            paths = [src_path for src_path, _ in self._get_all_model_part_paths(False, False, False)]
+            if self.draft_model is not None:
+                paths += [src_path for src_path, _ in self.draft_model._get_all_model_part_paths(False, False, False)]
+        except (NoRefFileFound, OSError) as e:
+            logger.debug(f"No model files to prewarm for {self.model}: {e}")
+            return []
+        return paths
+
+    def prewarm(self, args) -> Optional[Future]:
+        """With --prewarm, read the model into the page cache while the server starts."""
+        if not getattr(args, "prewarm", False) or args.dryrun:
+            return None
+        paths = self.page_cache_paths()
+        return start_prewarm(paths, quiet=getattr(args, "quiet", False)) if paths else None
+
+    def gguf_parts(self) -> list[GGUFModelInfo]:
+        """Parsed GGUF files of the model, every part of a split model."""
+        paths = [src_path for src_path, _ in self._get_all_model_part_paths(False, False, False)]
+        if not all(GGUFInfoParser.is_model_gguf(path) for path in paths):
+            raise ValueError(f"{self.model} is not a GGUF model in the local store")
+        return [GGUFInfoParser.parse(self.filename, self.type.lower(), path) for path in paths]
+
     def inspect_metadata(self) -> dict[str, Any]:
         model_path = self._get_entry_model_path(False, False, False)
 
@@ -4,6 +4,7 @@ import json
 import os
 import subprocess
 import tempfile
+import urllib.error
 from functools import cached_property
 from textwrap import dedent
 from typing import Optional, Union
@@ -11,9 +12,11 @@ from typing import Optional, Union
 import ramalama.annotations as oci_annotations
 from ramalama.common import MNT_DIR, exec_cmd, perror, run_cmd, set_accel_env_vars
 from ramalama.engine import BuildEngine, dry_run
+from ramalama.logger import logger
 from ramalama.oci_tools import OciRef, engine_supports_manifest_attributes
 from ramalama.transports.base import Transport
 from ramalama.transports.oci import spec as oci_spec
+from ramalama.transports.oci.oci_artifact import push_oci_artifact
 from ramalama.transports.oci.strategies import BaseOCIStrategy
 from ramalama.transports.oci.strategy import OCIStrategyFactory
 
@@ -313,6 +316,8 @@ class OCI(Transport):
         if str(args.tlsverify).lower() == "false":
             conman_args.extend([f"--tls-verify={args.tlsverify}"])
         conman_args.extend([target])
+        if args.type == "artifact" and self._push_artifact_native(source_model, args):
+            return
         if source != target:
             self._convert(source_model, args)
         try:
@@ -327,6 +332,35 @@ class OCI(Transport):
                 perror(f"Failed to push OCI {target} : {e}")
                 raise e
 
+    def _push_artifact_native(self, source_model, args) -> bool:
+        """
+        Push the model files straight from the model store to the registry. Returns False when the
+        source is not in the model store or the registry push fails, so the caller can fall back to
+        creating and pushing the artifact with the container engine.
+        """
+        if getattr(args, "dryrun", False) or not isinstance(source_model, Transport):
+            return False
+        if source_model.model_store.get_ref_file(source_model.model_tag) is None:
+            return False
+
+        mount_from = []
+        if isinstance(source_model, OCI) and source_model.ref.registry == self.ref.registry:
+            mount_from.append(source_model.ref.repository)
+        try:
+            push_oci_artifact(
+                reference=str(self.ref),
+                model_store=source_model.model_store,
+                model_tag=source_model.model_tag,
+                authfile=args.authfile,
+                tls_verify=str(args.tlsverify).lower() != "false",
+                mount_from=mount_from,
+            )
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.debug(f"Native artifact push of {self.model} failed: {e}")
+            perror(f"Pushing {self.model} directly to the registry failed, falling back to {self.conman}")
+            return False
+        return True
+
     def pull(self, args):
         conman_args = []
         if args.quiet:
@@ -3,15 +3,19 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import ssl
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
-from collections.abc import Iterable
-from tempfile import NamedTemporaryFile
-from typing import Any, Optional
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Optional, Union
 
 from ramalama.common import perror
 from ramalama.logger import logger
+from ramalama.model_store.reffile import StoreFile, StoreFileType
 from ramalama.model_store.snapshot_file import SnapshotFile, SnapshotFileType
 from ramalama.model_store.store import ModelStore
 from ramalama.oci_tools import split_oci_reference
@@ -29,6 +33,17 @@ MANIFEST_ACCEPT_HEADERS = [
 ]
 
 BLOB_CHUNK_SIZE = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+DEFAULT_PUSH_PARALLEL = 4
+RANGE_PART_SIZE = 64 * 1024 * 1024
+DEFAULT_PULL_PARALLEL = 4
+MAX_REGISTRY_CONNECTIONS = 8
+
+LAYER_MEDIA_TYPE_WEIGHT = "application/vnd.cncf.model.weight.v1.raw"
+LAYER_MEDIA_TYPE_WEIGHT_CONFIG = "application/vnd.cncf.model.weight.config.v1.raw"
+LAYER_MEDIA_TYPE_DOC = "application/vnd.cncf.model.doc.v1.raw"
+
+_DOC_SUFFIXES = (".md", ".txt", ".rst")
 
 
 def get_snapshot_file_type(name: str, media_type: str) -> SnapshotFileType:
@@ -51,6 +66,7 @@ class RegistryBlobSnapshotFile(SnapshotFile):
         name: str,
         media_type: str,
         required: bool = True,
+        size: Optional[int] = None,
     ):
         file_type = get_snapshot_file_type(name, media_type)
         super().__init__(
@@ -65,10 +81,11 @@ class RegistryBlobSnapshotFile(SnapshotFile):
         )
         self.client = client
         self.digest = digest
+        self.size = size
 
     def download(self, blob_file_path: str, snapshot_dir: str) -> str:
         if not os.path.exists(blob_file_path):
-            self.client.download_blob(self.digest, blob_file_path)
+            self.client.download_blob(self.digest, blob_file_path, size=self.size)
         else:
             logger.debug(f"Using cached blob for descriptor {self.digest}")
         return os.path.relpath(blob_file_path, start=snapshot_dir)
@@ -80,13 +97,25 @@ class OCIRegistryClient:
         registry: str,
         repository: str,
         reference: str,
+        *,
+        scheme: str = "https",
+        auth: Optional[str] = None,
+        tls_verify: bool = True,
+        parallel: int = DEFAULT_PULL_PARALLEL,
+        part_size: int = RANGE_PART_SIZE,
     ):
         self.registry = registry
         self.repository = repository
         self.reference = reference
-        self.base_url = f"https://{self.registry}/v2/{self.repository}"
+        self.scheme = scheme
+        self.base_url = f"{scheme}://{self.registry}/v2/{self.repository}"
 
+        self._auth = auth
+        self._context = None if tls_verify else ssl._create_unverified_context()
         self._bearer_token: Optional[str] = None
+        self.parallel = max(1, parallel)
+        self.part_size = part_size
+        self._connections = threading.BoundedSemaphore(MAX_REGISTRY_CONNECTIONS)
 
     def get_manifest(self) -> tuple[dict[str, Any], str]:
         headers = {"Accept": ",".join(MANIFEST_ACCEPT_HEADERS)}
@@ -99,50 +128,235 @@ class OCIRegistryClient:
         logger.debug(f"Fetched manifest digest {digest} for {self.repository}@{self.reference}")
         return manifest, digest
 
-    def download_blob(self, digest: str, dest_path: str) -> None:
-        url = f"{self.base_url}/blobs/{digest}"
-        response = self._open(url)
+    def download_blob(self, digest: str, dest_path: str, size: Optional[int] = None) -> None:
+        """
+        Download a blob to dest_path and verify its digest while it is written.
 
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        Blobs larger than part_size are fetched as parallel byte ranges. Completed ranges are
+        recorded in a journal next to the partial file, so an interrupted pull only fetches the
+        ranges that are still missing when it is restarted.
+        """
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
         hash_algo, _, expected_hash = digest.partition(":")
         if hash_algo != "sha256":
             logger.debug(f"Unsupported digest algorithm {hash_algo}, skipping verification.")
 
+        partial_path = f"{dest_path}.partial"
+        journal_path = f"{partial_path}.json"
         hasher = hashlib.sha256()
+        if size is not None and size > self.part_size:
+            try:
+                self._download_ranges(digest, partial_path, journal_path, size, hasher)
+            except _RangeNotSupported:
+                logger.debug(f"Registry {self.registry} ignored range request, downloading {digest} in one stream")
+                hasher = hashlib.sha256()
+                self._download_stream(digest, partial_path, hasher)
+        else:
+            self._download_stream(digest, partial_path, hasher)
 
-        temp_path = None
         try:
-            with NamedTemporaryFile(delete=False, dir=os.path.dirname(dest_path) or ".") as out_file:
-                temp_path = out_file.name
-                while True:
-                    chunk = response.read(BLOB_CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    out_file.write(chunk)
-                    if hash_algo == "sha256":
-                        hasher.update(chunk)
-
             if hash_algo == "sha256" and (actual_hash := hasher.hexdigest()) != expected_hash:
+                os.remove(partial_path)
                 raise ValueError(f"Digest mismatch for {digest}: expected {expected_hash}, got {actual_hash}")
+            os.replace(partial_path, dest_path)
         finally:
-            if temp_path is not None:
-                try:
-                    os.remove(temp_path)
-                except FileNotFoundError:
-                    pass
+            _remove_if_exists(journal_path)
+
+    def _download_stream(self, digest: str, partial_path: str, hasher) -> None:
+        with self._connections:
+            response = self._open(f"{self.base_url}/blobs/{digest}")
+            with open(partial_path, "wb") as out_file:
+                while chunk := response.read(BLOB_CHUNK_SIZE):
+                    out_file.write(chunk)
+                    hasher.update(chunk)
+
+    def _download_ranges(self, digest: str, partial_path: str, journal_path: str, size: int, hasher) -> None:
+        parts = [(start, min(start + self.part_size, size)) for start in range(0, size, self.part_size)]
+        done = _read_journal(journal_path, digest, size, self.part_size) if os.path.exists(partial_path) else set()
+        if done:
+            logger.debug(f"Resuming {digest}: {len(done)}/{len(parts)} ranges already downloaded")
+        with open(partial_path, "r+b" if done else "wb") as out_file:
+            out_file.truncate(size)
+
+        # Ranges complete out of order; the digest is fed with the contiguous prefix of
+        # finished ranges as it grows, reading them back while they are still in the page cache.
+        # The reader is unbuffered so it never serves bytes read before a range was written.
+        next_part = 0
+        with open(partial_path, "rb", buffering=0) as reader:
+
+            def advance_hash() -> None:
+                nonlocal next_part
+                while next_part in done:
+                    start, end = parts[next_part]
+                    reader.seek(start)
+                    remaining = end - start
+                    while remaining:
+                        chunk = reader.read(min(BLOB_CHUNK_SIZE, remaining))
+                        if not chunk:
+                            raise ValueError(f"Partial download of {digest} is truncated")
+                        hasher.update(chunk)
+                        remaining -= len(chunk)
+                    next_part += 1
+
+            advance_hash()
+            pending = [i for i in range(len(parts)) if i not in done]
+            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+                futures = {executor.submit(self._fetch_range, digest, partial_path, *parts[i]): i for i in pending}
+                error: Optional[BaseException] = None
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    if (exc := future.exception()) is not None:
+                        if error is None:
+                            error = exc
+                            for other in futures:
+                                other.cancel()
+                        continue
+                    # Ranges that were already in flight when another one failed are still
+                    # journaled so that a restart does not fetch them again.
+                    done.add(futures[future])
+                    _write_journal(journal_path, digest, size, self.part_size, done)
+                    if error is None:
+                        advance_hash()
+                if error is not None:
+                    raise error
+
+    def _fetch_range(self, digest: str, partial_path: str, start: int, end: int) -> None:
+        with self._connections:
+            response = self._open(f"{self.base_url}/blobs/{digest}", headers={"Range": f"bytes={start}-{end - 1}"})
+            if response.status != 206:
+                response.close()
+                raise _RangeNotSupported(digest)
+            with open(partial_path, "r+b") as out_file:
+                out_file.seek(start)
+                remaining = end - start
+                while remaining and (chunk := response.read(min(BLOB_CHUNK_SIZE, remaining))):
+                    out_file.write(chunk)
+                    remaining -= len(chunk)
+            if remaining:
+                raise ValueError(f"Short read for {digest} range {start}-{end - 1}")
+
+    def blob_exists(self, digest: str) -> bool:
+        try:
+            self._open(f"{self.base_url}/blobs/{digest}", method="HEAD")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 404:
+                return False
             raise
+        return True
+
+    def start_upload(self, digest: Optional[str] = None, mount_from: Optional[str] = None) -> Optional[str]:
+        """
+        Open a blob upload session and return its location.
+
+        When mount_from names another repository on the same registry, the registry is first asked to
+        mount the blob from there; None is returned if it did so and nothing has to be uploaded.
+        """
+        url = f"{self.base_url}/blobs/uploads/"
+        if digest and mount_from:
+            url = f"{url}?{urllib.parse.urlencode({'mount': digest, 'from': mount_from})}"
+
+        response = self._open(url, method="POST", data=b"")
+        if mount_from and response.status == 201:
+            return None
+        return self._resolve_location(response)
+
+    def upload_blob(
+        self,
+        digest: str,
+        source: Union[str, bytes],
+        size: int,
+        *,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        mount_from: Optional[str] = None,
+    ) -> str:
+        """
+        Upload a blob from a file path or from memory, returning how it got to the registry:
+        "exists", "mounted" or "uploaded". Blobs larger than chunk_size are streamed from disk
+        in PATCH requests so only one chunk is held in memory at a time.
+        """
+        if self.blob_exists(digest):
+            return "exists"
+
+        location = self.start_upload(digest, mount_from)
+        if location is None:
+            return "mounted"
+
+        if isinstance(source, bytes) or size <= chunk_size:
+            data = source if isinstance(source, bytes) else _read_file(source)
+            self._open(
+                _with_query(location, digest=digest),
+                method="PUT",
+                data=data,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            return "uploaded"
+
+        offset = 0
+        with open(source, "rb") as f:
+            while chunk := f.read(chunk_size):
+                response = self._open(
+                    location,
+                    method="PATCH",
+                    data=chunk,
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "Content-Range": f"{offset}-{offset + len(chunk) - 1}",
+                    },
+                )
+                location = self._resolve_location(response)
+                offset += len(chunk)
+
+        self._open(_with_query(location, digest=digest), method="PUT", data=b"")
+        return "uploaded"
+
+    def put_manifest(self, manifest: dict[str, Any]) -> str:
+        body = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+        response = self._open(
+            f"{self.base_url}/manifests/{self.reference}",
+            method="PUT",
+            data=body,
+            headers={"Content-Type": manifest.get("mediaType", oci_spec.OCI_MANIFEST_MEDIA_TYPE)},
+        )
+        return response.headers.get("Docker-Content-Digest") or f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+    def use_plain_http_if_unreachable(self) -> None:
+        """Fall back to plain HTTP when the registry does not answer over HTTPS (--tls-verify=false)."""
+        try:
+            self._open(f"https://{self.registry}/v2/")
+        except urllib.error.HTTPError:
+            return
+        except (urllib.error.URLError, OSError) as exc:
+            logger.debug(f"{self.registry} is not reachable over HTTPS ({exc}), using HTTP")
+            self.scheme = "http"
+            self.base_url = f"http://{self.registry}/v2/{self.repository}"
+
+    def _resolve_location(self, response) -> str:
+        location = response.headers.get("Location")
+        if not location:
+            raise ValueError(f"Registry {self.registry} did not return an upload location")
+        return urllib.parse.urljoin(f"{self.scheme}://{self.registry}/", location)
 
     def _prepare_headers(self, headers: Optional[dict[str, str]] = None) -> dict[str, str]:
         final_headers = dict() if headers is None else headers.copy()
         if self._bearer_token is not None:
             final_headers.setdefault("Authorization", f"Bearer {self._bearer_token}")
+        elif self._auth is not None:
+            final_headers.setdefault("Authorization", f"Basic {self._auth}")
 
         return final_headers
 
-    def _open(self, url: str, headers: Optional[dict[str, str]] = None):
-        req = urllib.request.Request(url, headers=self._prepare_headers(headers))
+    def _open(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        *,
+        method: Optional[str] = None,
+        data: Optional[bytes] = None,
+    ):
+        req = urllib.request.Request(url, data=data, headers=self._prepare_headers(headers), method=method)
         try:
-            return urllib.request.urlopen(req, timeout=60)
+            return urllib.request.urlopen(req, timeout=60, context=self._context)
         except urllib.error.HTTPError as exc:
             if exc.code == 401:
                 www_authenticate = exc.headers.get("WWW-Authenticate", "")
@@ -150,8 +364,10 @@ class OCIRegistryClient:
                     token = self._request_bearer_token(www_authenticate)
                     if token:
                         self._bearer_token = token
-                        req = urllib.request.Request(url, headers=self._prepare_headers(headers))
-                        return urllib.request.urlopen(req, timeout=60)
+                        req = urllib.request.Request(
+                            url, data=data, headers=self._prepare_headers(headers), method=method
+                        )
+                        return urllib.request.urlopen(req, timeout=60, context=self._context)
             raise
 
     def _request_bearer_token(self, challenge: str) -> Optional[str]:
@@ -182,10 +398,12 @@ class OCIRegistryClient:
             token_url = f"{realm}?{urllib.parse.urlencode(query)}"
 
         req_headers = {"User-Agent": "ramalama/oci-artifact"}
+        if self._auth is not None:
+            req_headers["Authorization"] = f"Basic {self._auth}"
 
         request = urllib.request.Request(token_url, headers=req_headers)
         try:
-            response = urllib.request.urlopen(request)
+            response = urllib.request.urlopen(request, context=self._context)
             data = json.loads(response.read().decode("utf-8"))
             token = data.get("token") or data.get("access_token")
             return token
@@ -219,7 +437,31 @@ def _build_snapshot_files(client: OCIRegistryClient, manifest: dict[str, Any]) -
             raise ValueError("layer annotation mediatype.untested must be 'true' or 'false'")
 
         media_type = descriptor.get("mediaType", "")
-        yield RegistryBlobSnapshotFile(client, digest, filepath, media_type)
+        size = descriptor.get("size")
+        yield RegistryBlobSnapshotFile(
+            client, digest, filepath, media_type, size=size if isinstance(size, int) else None
+        )
+
+
+def _prefetch_blobs(model_store: ModelStore, snapshot_files: list[SnapshotFile]) -> None:
+    """Download all missing layers concurrently so new_snapshot only has to link them."""
+    missing = [
+        file
+        for file in snapshot_files
+        if isinstance(file, RegistryBlobSnapshotFile) and not os.path.exists(model_store.get_blob_file_path(file.hash))
+    ]
+    if len(missing) < 2:
+        return
+
+    with ThreadPoolExecutor(max_workers=DEFAULT_PULL_PARALLEL) as executor:
+        futures = [
+            executor.submit(
+                file.client.download_blob, file.digest, model_store.get_blob_file_path(file.hash), file.size
+            )
+            for file in missing
+        ]
+        for future in futures:
+            future.result()
 
 
 def download_oci_artifact(*, reference: str, model_store: ModelStore, model_tag: str) -> bool:
@@ -247,5 +489,209 @@ def download_oci_artifact(*, reference: str, model_store: ModelStore, model_tag:
         perror("Artifact manifest contained no downloadable blobs.")
         return False
 
+    _prefetch_blobs(model_store, snapshot_files)
     model_store.new_snapshot(model_tag, manifest_digest, snapshot_files)
     return True
+
+
+class _RangeNotSupported(Exception):
+    pass
+
+
+def _remove_if_exists(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_journal(path: str, digest: str, size: int, part_size: int) -> set[int]:
+    try:
+        with open(path, "r") as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if journal.get("digest") != digest or journal.get("size") != size or journal.get("part_size") != part_size:
+        return set()
+    return set(journal.get("done", []))
+
+
+def _write_journal(path: str, digest: str, size: int, part_size: int, done: set[int]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"digest": digest, "size": size, "part_size": part_size, "done": sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+
+def _with_query(url: str, **params: str) -> str:
+    separator = "&" if urllib.parse.urlsplit(url).query else "?"
+    return f"{url}{separator}{urllib.parse.urlencode(params)}"
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _auth_file_candidates(authfile: Optional[str]) -> list[str]:
+    if authfile:
+        return [authfile]
+
+    candidates = []
+    if env_authfile := os.getenv("REGISTRY_AUTH_FILE"):
+        candidates.append(env_authfile)
+    if runtime_dir := os.getenv("XDG_RUNTIME_DIR"):
+        candidates.append(os.path.join(runtime_dir, "containers", "auth.json"))
+    config_home = os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    candidates.append(os.path.join(config_home, "containers", "auth.json"))
+    candidates.append(os.path.join(os.getenv("DOCKER_CONFIG", os.path.expanduser("~/.docker")), "config.json"))
+    return candidates
+
+
+def registry_auth(registry: str, repository: str = "", authfile: Optional[str] = None) -> Optional[str]:
+    """
+    Look up the base64 encoded "user:password" credentials for a registry in the
+    containers/docker auth files, preferring the most specific repository entry.
+    """
+    keys = []
+    path = f"{registry}/{repository}".rstrip("/")
+    while path:
+        keys.append(path)
+        path = path.rpartition("/")[0] if "/" in path else ""
+    keys.extend([f"https://{registry}", f"http://{registry}"])
+
+    for candidate in _auth_file_candidates(authfile):
+        try:
+            with open(candidate, "r") as f:
+                auths = json.load(f).get("auths") or {}
+        except (OSError, ValueError, AttributeError):
+            continue
+        for key in keys:
+            if auth := (auths.get(key) or {}).get("auth"):
+                return auth
+    return None
+
+
+def _layer_media_type(file: StoreFile) -> str:
+    if file.type in {StoreFileType.GGUF_MODEL, StoreFileType.SAFETENSOR_MODEL, StoreFileType.MMPROJ}:
+        return LAYER_MEDIA_TYPE_WEIGHT
+    if file.name.lower().endswith(_DOC_SUFFIXES):
+        return LAYER_MEDIA_TYPE_DOC
+    return LAYER_MEDIA_TYPE_WEIGHT_CONFIG
+
+
+def _blob_digest(file_hash: str, path: str) -> str:
+    algo, _, value = file_hash.replace("-", ":", 1).partition(":")
+    if algo == "sha256" and len(value) == 64:
+        return f"sha256:{value}"
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(BLOB_CHUNK_SIZE):
+            hasher.update(chunk)
+    return f"sha256:{hasher.hexdigest()}"
+
+
+@dataclass
+class _PushBlob:
+    descriptor: oci_spec.Descriptor
+    source: Union[str, bytes]
+
+
+def _build_push_blobs(model_store: ModelStore, model_tag: str, name: str) -> tuple[_PushBlob, list[_PushBlob]]:
+    ref_file = model_store.get_ref_file(model_tag)
+    if ref_file is None or not ref_file.files:
+        raise ValueError(f"No files found in the model store for {model_store.model_name}:{model_tag}")
+
+    layers = []
+    created = ""
+    for file in ref_file.files:
+        path = model_store.get_blob_file_path(file.hash)
+        filepath = oci_spec.normalize_layer_filepath(file.name)
+        metadata = oci_spec.FileMetadata.from_path(path, name=file.name)
+        descriptor = oci_spec.Descriptor(
+            media_type=_layer_media_type(file),
+            digest=_blob_digest(file.hash, path),
+            size=metadata.size,
+            annotations={
+                oci_spec.LAYER_ANNOTATION_FILEPATH: filepath,
+                oci_spec.LAYER_ANNOTATION_FILE_METADATA: metadata.to_json(),
+                oci_spec.LAYER_ANNOTATION_FILE_MEDIATYPE_UNTESTED: "true",
+            },
+        )
+        layers.append(_PushBlob(descriptor, path))
+        created = max(created, metadata.mtime)
+
+    # createdAt is derived from the files rather than the clock so that pushing the
+    # same snapshot again produces the same config blob and manifest digest.
+    model_config = {
+        "descriptor": {"name": name, "createdAt": created},
+        "config": {"format": "gguf" if ref_file.model_files else ""},
+        "modelfs": {"type": "layers", "diffIds": [layer.descriptor.digest for layer in layers]},
+    }
+    config_bytes = json.dumps(model_config, separators=(",", ":")).encode("utf-8")
+    config = _PushBlob(
+        oci_spec.Descriptor(
+            media_type=oci_spec.CNAI_CONFIG_MEDIA_TYPE,
+            digest=f"sha256:{hashlib.sha256(config_bytes).hexdigest()}",
+            size=len(config_bytes),
+        ),
+        config_bytes,
+    )
+    return config, layers
+
+
+def push_oci_artifact(
+    *,
+    reference: str,
+    model_store: ModelStore,
+    model_tag: str,
+    authfile: Optional[str] = None,
+    tls_verify: bool = True,
+    mount_from: Sequence[str] = (),
+    parallel: int = DEFAULT_PUSH_PARALLEL,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> str:
+    """
+    Push the model files of a store snapshot to a registry as a CNAI model artifact, without
+    staging them in container storage first. Blobs the registry already has are skipped, blobs
+    present in one of the mount_from repositories on the same registry are mounted, and the
+    rest are uploaded concurrently. The manifest is pushed last and its digest is returned.
+    """
+    oci_ref = split_oci_reference(reference)
+    client = OCIRegistryClient(
+        oci_ref.registry,
+        oci_ref.repository,
+        oci_ref.specifier or "latest",
+        auth=registry_auth(oci_ref.registry, oci_ref.repository, authfile),
+        tls_verify=tls_verify,
+    )
+    if not tls_verify:
+        client.use_plain_http_if_unreachable()
+
+    config, layers = _build_push_blobs(model_store, model_tag, model_store.model_name)
+    mount_repository = next((repo for repo in mount_from if repo != oci_ref.repository), None)
+
+    def push_blob(blob: _PushBlob) -> None:
+        digest = blob.descriptor.digest
+        result = client.upload_blob(
+            digest, blob.source, blob.descriptor.size, chunk_size=chunk_size, mount_from=mount_repository
+        )
+        perror(f"Copying blob {digest[:19]} {'skipped: already exists' if result == 'exists' else result}")
+
+    # Layers are independent, so they go up concurrently; chunks within a layer
+    # are sent in order as required by the distribution spec.
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        for future in [executor.submit(push_blob, blob) for blob in [config, *layers]]:
+            future.result()
+
+    manifest = oci_spec.Manifest(
+        schema_version=2,
+        media_type=oci_spec.OCI_MANIFEST_MEDIA_TYPE,
+        artifact_type=oci_spec.CNAI_ARTIFACT_TYPE,
+        config=config.descriptor,
+        layers=[layer.descriptor for layer in layers],
+    )
+    digest = client.put_manifest(manifest.to_dict())
+    perror(f"Writing manifest {digest}")
+    return digest
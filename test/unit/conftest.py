@@ -5,7 +5,13 @@ import pytest
 from ramalama.transports.oci.strategy import OCIStrategyFactory
 
 initial_env = os.environ.copy()
-setup_env_vars = {"RAMALAMA__USER__NO_MISSING_GPU_PROMPT": "True"}
+setup_env_vars = {
+    "RAMALAMA__USER__NO_MISSING_GPU_PROMPT": "True",
+    "RAMALAMA_ACCEL_CACHE": "",
+    "RAMALAMA_CONFIG_CACHE": "",
+    "RAMALAMA_IMAGE_CACHE": "",
+    "RAMALAMA_TRACE": "",
+}
 
 
 def pytest_configure(config):
@@ -30,3 +36,26 @@ def restores_user_environment_at_end_of_tests():
 @pytest.fixture
 def force_oci_image(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(OCIStrategyFactory, "resolve", lambda self, model: self.strategies("image"))
+
+
+SIZED_MODEL_METADATA = {
+    "general.architecture": "llama",
+    "llama.block_count": 32,
+    "llama.context_length": 8192,
+    "llama.embedding_length": 4096,
+    "llama.attention.head_count": 32,
+    "llama.attention.head_count_kv": 8,
+}
+
+
+@pytest.fixture
+def sized_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every model file reads as a 4 GiB GGUF with a Llama 3 8B attention layout, served by llama.cpp."""
+    from ramalama.model_inspect.gguf_info import GGUFModelMetadata
+
+    monkeypatch.setattr("ramalama.model_resources.os.path.getsize", lambda path: 4 * 1024**3)
+    monkeypatch.setattr("ramalama.model_resources.GGUFInfoParser.is_model_gguf", lambda path: True)
+    monkeypatch.setattr(
+        "ramalama.model_resources.GGUFInfoParser.parse_metadata", lambda path: GGUFModelMetadata(SIZED_MODEL_METADATA)
+    )
+    monkeypatch.setattr("ramalama.model_resources.runtime_health_path", lambda: "/health")
@@ -0,0 +1,152 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ramalama.benchmarks import manager, schemas
+from ramalama.benchmarks.load import LengthDistribution, LoadSpec, percentile, run_load
+from ramalama.benchmarks.utilities import print_bench_results
+
+TOKEN_DELAY = 0.01
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Streams `max_tokens` chunks for every chat completion request."""
+
+    protocol_version = "HTTP/1.1"
+    fail_every = 0
+    requests: list[dict] = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append(body)
+        if self.fail_every and len(self.requests) % self.fail_every == 0:
+            self.send_response(503)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"busy")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for _ in range(body["max_tokens"]):
+            time.sleep(TOKEN_DELAY)
+            self._send_event({"choices": [{"delta": {"content": "tok"}}]})
+        self._send_event({"choices": [], "usage": {"completion_tokens": body["max_tokens"]}})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_event(self, payload):
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+
+@pytest.fixture
+def fake_server():
+    FakeOpenAIHandler.requests = []
+    FakeOpenAIHandler.fail_every = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def _spec(**kwargs) -> LoadSpec:
+    defaults = {
+        "prompt_tokens": LengthDistribution.parse("16"),
+        "output_tokens": LengthDistribution.parse("4"),
+        "num_requests": 6,
+        "concurrency": 3,
+    }
+    return LoadSpec(**{**defaults, **kwargs})
+
+
+@pytest.mark.parametrize(
+    "spec, samples",
+    [("64", {64}), ("8-10", {8, 9, 10}), ("16,256", {16, 256})],
+)
+def test_length_distribution(spec, samples):
+    rng = random.Random(0)
+    distribution = LengthDistribution.parse(spec)
+    assert {distribution.sample(rng) for _ in range(200)} == samples
+
+
+@pytest.mark.parametrize("spec", ["0", "10-5", "a", "4,0"])
+def test_length_distribution_rejects_invalid(spec):
+    with pytest.raises(ValueError, match="invalid token length"):
+        LengthDistribution.parse(spec)
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+
+
+def test_run_load_measures_latencies(fake_server):
+    report = run_load(fake_server, "org/model", _spec())
+    summary = report.summary()
+
+    assert summary["completed"] == 6
+    assert summary["failed"] == 0
+    assert all(result.output_tokens == 4 and len(result.itls) == 3 for result in report.requests)
+    assert summary["ttft_ms_p50"] >= TOKEN_DELAY * 1000 * 0.5
+    assert summary["itl_ms_p50"] >= TOKEN_DELAY * 1000 * 0.5
+    assert summary["e2e_ms_p99"] >= summary["ttft_ms_p99"]
+    assert summary["goodput"] == pytest.approx(summary["request_throughput"])
+    request = FakeOpenAIHandler.requests[0]
+    assert request["model"] == "org/model" and request["stream"] is True and request["max_tokens"] == 4
+
+
+def test_goodput_counts_only_requests_meeting_slo(fake_server):
+    summary = run_load(fake_server, "m", _spec(slo_itl_ms=0.001)).summary()
+    assert summary["completed"] == 6
+    assert summary["goodput"] == 0
+
+
+def test_failed_requests_are_reported(fake_server):
+    FakeOpenAIHandler.fail_every = 2
+    report = run_load(fake_server, "m", _spec(concurrency=1))
+    summary = report.summary()
+    assert summary["failed"] == 3
+    assert summary["completed"] == 3
+    assert sum(1 for result in report.requests if result.error and "503" in result.error) == 3
+
+
+def test_open_loop_arrivals_follow_rate(fake_server):
+    start = time.perf_counter()
+    report = run_load(fake_server, "m", _spec(num_requests=5, request_rate=50.0, seed=1))
+    assert report.summary()["completed"] == 5
+    assert time.perf_counter() - start < 5
+
+
+def test_serve_record_round_trips_through_manager(tmp_path, capsys):
+    record = schemas.ServeBenchRecordV1(
+        configuration=schemas.TestConfigurationV1(container_runtime="podman", inference_engine="llama.cpp"),
+        result=schemas.ServeBenchResultV1(
+            model="granite", concurrency=4, prompt_tokens="128", output_tokens="64", request_throughput=2.5
+        ),
+        created_at="2024-01-01 00:00:00",
+        device=schemas.DeviceInfoV1(hostname="host", operating_system="os", cpu_info="cpu", accel="none"),
+    )
+    db = manager.BenchmarksManager(tmp_path)
+    db.save(record)
+
+    (loaded,) = db.list()
+    assert isinstance(loaded, schemas.ServeBenchRecordV1)
+    assert loaded == record
+
+    print_bench_results([loaded])
+    output = capsys.readouterr().out
+    assert "granite" in output and "128/64" in output and "2.50" in output
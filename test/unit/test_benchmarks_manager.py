@@ -1,8 +1,9 @@
+import dataclasses
 import json
 
 import pytest
 
-from ramalama.benchmarks import manager, schemas
+from ramalama.benchmarks import compare, manager, schemas, stats
 
 
 def _make_config(engine: str) -> schemas.TestConfigurationV1:
@@ -107,3 +108,118 @@ def test_list_returns_saved_records_in_order(tmp_path):
 
     assert stored[0].result.avg_ts == 1.0
     assert stored[1].result.avg_ts == 2.0
+
+
+def _make_record(model_name: str, image: str, samples: list[float], created_at: str) -> schemas.BenchmarkRecordV1:
+    result = _make_result(model_name, sum(samples) / len(samples))
+    result.samples_ts = json.dumps(samples)
+    cfg = _make_config("llama.cpp")
+    cfg.container_image = image
+    return schemas.BenchmarkRecordV1(configuration=cfg, result=result, created_at=created_at, device=_make_device())
+
+
+def test_query_filters_and_paginates(tmp_path):
+    db = manager.BenchmarksManager(tmp_path)
+    db.save(
+        [
+            _make_record("a.gguf", "img:1", [10.0], "run-1"),
+            _make_record("b.gguf", "img:1", [20.0], "run-1"),
+            _make_record("a.gguf", "img:2", [30.0], "run-2"),
+        ]
+    )
+
+    assert [r.result.avg_ts for r in db.list({"model": "a.gguf"})] == [10.0, 30.0]
+    assert [r.result.avg_ts for r in db.list({"model": "a.gguf", "image": "img:2"})] == [30.0]
+    assert [r.result.avg_ts for r in db.list({"run": "2"})] == [10.0, 20.0]
+    assert [row_id for row_id, _ in db.query(limit=1, offset=1)] == [2]
+    assert len(db.list({"config": manager.record_config(db.list()[0])[:4]})) == 3
+
+    with pytest.raises(ValueError, match="unknown benchmark filter"):
+        db.list({"gpu": "x"})
+
+
+def test_index_imports_existing_and_appended_jsonl(tmp_path):
+    record = _make_record("a.gguf", "img:1", [10.0], "run-1")
+    storage = tmp_path / manager.BENCHMARKS_FILENAME
+    storage.write_text(json.dumps(dataclasses.asdict(record)) + "\n")
+
+    db = manager.BenchmarksManager(tmp_path)
+    assert len(db.list()) == 1
+    assert db.index_file.exists()
+
+    # lines appended by another writer, and a partially written last line
+    with storage.open("a") as handle:
+        handle.write(json.dumps(dataclasses.asdict(record)) + "\n")
+        handle.write('{"version": "v1", ')
+    assert len(db.list()) == 2
+
+    storage.write_text(json.dumps(dataclasses.asdict(record)) + "\n")
+    assert len(db.list()) == 1
+
+
+def test_index_skips_unreadable_lines(tmp_path):
+    line = json.dumps(dataclasses.asdict(_make_record("a.gguf", "img:1", [10.0], "run-1"))) + "\n"
+    storage = tmp_path / manager.BENCHMARKS_FILENAME
+    # a line cut short by a crash, followed by records appended later
+    storage.write_text(line + '{"version": "v1", "resu\n' + line)
+
+    db = manager.BenchmarksManager(tmp_path)
+    assert len(db.list()) == 2
+
+    with storage.open("a") as handle:
+        handle.write(line)
+    assert len(db.list()) == 3
+
+
+def test_index_detects_rewrite_of_the_same_size(tmp_path):
+    storage = tmp_path / manager.BENCHMARKS_FILENAME
+    storage.write_text(json.dumps(dataclasses.asdict(_make_record("a.gguf", "img:1", [10.0], "run-1"))) + "\n")
+    db = manager.BenchmarksManager(tmp_path)
+    assert [r.result.model_filename for r in db.list()] == ["a.gguf"]
+
+    # rewritten in place with a record of the same length, and then appended to
+    with storage.open("r+") as handle:
+        handle.write(json.dumps(dataclasses.asdict(_make_record("b.gguf", "img:1", [10.0], "run-1"))) + "\n")
+    with storage.open("a") as handle:
+        handle.write(json.dumps(dataclasses.asdict(_make_record("c.gguf", "img:1", [10.0], "run-1"))) + "\n")
+
+    assert [r.result.model_filename for r in db.list()] == ["b.gguf", "c.gguf"]
+
+
+def test_compare_records_detects_regression(tmp_path):
+    baseline = [_make_record("a.gguf", "img:1", [100.0, 101.0, 99.0, 100.5, 99.5], "run-1")]
+    candidate = [_make_record("a.gguf", "img:2", [90.0, 91.0, 89.0, 90.5, 89.5], "run-2")]
+
+    [item] = compare.compare_records(baseline, candidate)
+
+    assert item.model == "a.gguf"
+    assert item.comparison.significant
+    assert item.verdict == "regression"
+    assert item.comparison.change_pct == pytest.approx(-10.0)
+    assert compare.comparison_to_dict(item)["verdict"] == "regression"
+
+
+def test_compare_records_noise_and_single_samples():
+    noisy_a = [_make_record("a.gguf", "img:1", [100.0, 110.0, 90.0], "run-1")]
+    noisy_b = [_make_record("a.gguf", "img:2", [102.0, 92.0, 111.0], "run-2")]
+    assert compare.compare_records(noisy_a, noisy_b)[0].verdict == "no change"
+
+    single_a = [_make_record("a.gguf", "img:1", [100.0], "run-1")]
+    single_b = [_make_record("a.gguf", "img:2", [50.0], "run-2")]
+    assert compare.compare_records(single_a, single_b)[0].verdict == "insufficient samples"
+
+    other_model = [_make_record("b.gguf", "img:2", [100.0, 101.0], "run-2")]
+    assert compare.compare_records(noisy_a, other_model) == []
+    assert len(compare.compare_records(noisy_a, other_model, match_models=False)) == 1
+
+
+def test_parse_selector():
+    assert compare.parse_selector("12") == {"run": "12"}
+    assert compare.parse_selector("image=img:2,accel=cuda") == {"image": "img:2", "accel": "cuda"}
+    with pytest.raises(ValueError, match="invalid benchmark selector"):
+        compare.parse_selector("gpu=cuda")
+
+
+@pytest.mark.parametrize("df,expected", [(1, 12.706), (10, 2.228), (35, 2.042), (60, 2.000), (500, 1.980)])
+def test_t_critical(df, expected):
+    assert stats.t_critical(df) == expected
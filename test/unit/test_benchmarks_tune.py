@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ramalama.benchmarks import tune
+from ramalama.plugins.runtimes.inference.llama_cpp import LlamaCppConfig, LlamaCppPlugin
+
+
+def test_search_space_cpu_varies_threads():
+    candidates = tune.search_space(16, gpu=False)
+
+    assert {c.threads for c in candidates} == {4, 8, 12, 16}
+    assert {c.flash_attn for c in candidates} == {False, True}
+    assert all(c.ngl is None and c.ncmoe is None for c in candidates)
+    assert all(c.ubatch_size <= c.batch_size for c in candidates)
+    assert len(candidates) == 4 * len(tune.BATCH_SIZES) * 2
+
+
+def test_search_space_holds_given_values_fixed():
+    candidates = tune.search_space(16, gpu=True, threads=6, ncmoe=3, moe_layers=48)
+
+    assert {c.threads for c in candidates} == {6}
+    assert {c.ncmoe for c in candidates} == {3}
+    assert {c.ngl for c in candidates} == {"999"}
+
+
+def test_search_space_gpu_moe_tries_expert_offload():
+    candidates = tune.search_space(16, gpu=True, moe_layers=48)
+
+    assert {c.threads for c in candidates} == {None}
+    assert {c.ncmoe for c in candidates} == {None, 12, 24}
+
+
+def test_successive_halving_finds_best_and_spends_budget_on_survivors():
+    candidates = [tune.Candidate(threads=t) for t in range(1, 28)]
+    calls = []
+
+    def evaluate(candidate, repetitions):
+        calls.append((candidate.threads, repetitions))
+        return None if candidate.threads == 20 else -abs(candidate.threads - 13)
+
+    best, score = tune.successive_halving(candidates, evaluate)
+
+    assert best.threads == 13
+    assert score == 0
+    assert sum(1 for _, r in calls if r == 1) == 27
+    assert sorted({r for _, r in calls}) == [1, 3, 9]
+    assert len(calls) < 27 * 2
+
+
+def test_successive_halving_all_failed():
+    with pytest.raises(ValueError, match="every configuration failed"):
+        tune.successive_halving([tune.Candidate(threads=1)], lambda candidate, repetitions: None)
+
+
+def test_throughput_score_is_geometric_mean():
+    assert tune.throughput_score([{"avg_ts": 100.0}, {"avg_ts": 25.0}]) == pytest.approx(50.0)
+    assert tune.throughput_score([{"avg_ts": None}]) is None
+
+
+def test_tuned_profiles_round_trip(tmp_path):
+    profiles = tune.TunedProfiles(tmp_path)
+    candidate = tune.Candidate(threads=8, batch_size=1024, ubatch_size=256, flash_attn=True)
+
+    assert profiles.get("sha256-abc", "host") is None
+    profiles.save("sha256-abc", "host", "granite", candidate, 42.0)
+
+    assert profiles.get("sha256-abc", "host") == {
+        "threads": 8,
+        "batch_size": 1024,
+        "ubatch_size": 256,
+        "flash_attn": True,
+    }
+    assert profiles.get("sha256-abc", "other-host") is None
+
+
+def test_tuned_profiles_missing_storage_folder():
+    with pytest.raises(tune.MissingStorageFolderError):
+        tune.TunedProfiles(None)
+
+
+class TestApplyTunedProfile:
+    @pytest.fixture
+    def plugin(self, tmp_path):
+        tune.TunedProfiles(tmp_path).save(
+            "sha256-abc",
+            tune.device_fingerprint(),
+            "granite",
+            tune.Candidate(threads=8, batch_size=1024, ubatch_size=256, flash_attn=True),
+            42.0,
+        )
+        config = MagicMock()
+        config.benchmarks.storage_folder = str(tmp_path)
+        plugin = LlamaCppPlugin()
+        self.rt_config = LlamaCppConfig()
+        with (
+            patch("ramalama.plugins.runtimes.inference.llama_cpp.ActiveConfig", return_value=config),
+            patch.object(LlamaCppPlugin, "get_runtime_config", side_effect=lambda config: self.rt_config),
+            patch.object(LlamaCppPlugin, "_model_digest", return_value="sha256-abc"),
+        ):
+            yield plugin
+
+    def test_applies_profile(self, plugin):
+        args = SimpleNamespace(threads=4, runtime_args=[])
+
+        plugin._apply_tuned_profile(args, MagicMock())
+
+        assert (args.threads, args.batch_size, args.ubatch_size, args.flash_attn) == (8, 1024, 256, True)
+
+    def test_command_line_wins(self, plugin):
+        args = SimpleNamespace(threads=2, threads_override=True, batch_size=None, runtime_args=["-ub", "64"])
+
+        plugin._apply_tuned_profile(args, MagicMock())
+
+        assert args.threads == 2
+        assert args.batch_size == 1024
+        assert not hasattr(args, "ubatch_size")
+
+    def test_configured_threads_win(self, plugin):
+        # any count other than this host's default is a setting from ramalama.conf
+        threads = LlamaCppConfig().threads + 1
+        self.rt_config = LlamaCppConfig(threads=threads)
+        args = SimpleNamespace(threads=threads, threads_override=False, runtime_args=[])
+
+        plugin._apply_tuned_profile(args, MagicMock())
+
+        assert args.threads == threads
+        assert args.batch_size == 1024
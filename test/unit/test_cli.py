@@ -178,6 +178,24 @@ def test_pull_verify(monkeypatch, option, value):
     assert args.verify == value
 
 
+def test_import_cache_sources(monkeypatch, tmp_path):
+    from ramalama.cli import init_cli
+
+    monkeypatch.setattr(
+        sys, "argv", ["ramalama", "import-cache", "--source", "modelscope", "--cache-dir", str(tmp_path)]
+    )
+    _, args = init_cli()
+    with mock.patch("ramalama.cli.import_hub_caches") as import_hub_caches:
+        import_hub_caches.return_value.failed = []
+        args.func(args)
+    assert import_hub_caches.call_args.args[1] == [("modelscope", str(tmp_path))]
+
+    monkeypatch.setattr(sys, "argv", ["ramalama", "import-cache", "--cache-dir", str(tmp_path)])
+    _, args = init_cli()
+    with pytest.raises(ValueError, match="exactly one --source"):
+        args.func(args)
+
+
 @pytest.mark.parametrize(
     "raw,expected",
     [
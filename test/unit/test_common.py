@@ -1,6 +1,8 @@
 import os
 import shutil
 import subprocess
+import threading
+from argparse import Namespace
 from contextlib import ExitStack
 from pathlib import Path
 from sys import platform
@@ -9,6 +11,8 @@ from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import pytest
 
+import ramalama.accel_cache as accel_cache
+import ramalama.image_cache as image_cache
 from ramalama.cli import (
     default_image,
     default_rag_image,
@@ -25,11 +29,13 @@ from ramalama.common import (
     get_accel,
     load_cdi_config,
     populate_volume_from_image,
+    refresh_accel,
     rm_until_substring,
     verify_checksum,
 )
 from ramalama.compat import NamedTemporaryFile
 from ramalama.config import DEFAULT_IMAGE, load_config
+from ramalama.plugins.runtimes.inference.llama_cpp import LlamaCppPlugin
 
 
 @pytest.mark.parametrize(
@@ -253,6 +259,78 @@ class TestEnsureImage:
             ensure_image("podman", "quay.io/ramalama/ramalama:0.17", should_pull=True)
 
 
+class TestImageCache:
+    """Tests for the image presence cache and background prefetch used by ensure_image()"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch, tmp_path):
+        self.fingerprint = [("/storage/overlay-images/images.json", 1)]
+        monkeypatch.setenv("RAMALAMA_IMAGE_CACHE", str(tmp_path / "images.json"))
+        monkeypatch.setattr(image_cache, "storage_fingerprint", lambda engine: self.fingerprint)
+
+    @patch("ramalama.common.run_cmd")
+    def test_cached_image_skips_inspect(self, mock_run_cmd):
+        assert ensure_image("podman", "myimage:1.0") == "myimage:1.0"
+        assert ensure_image("podman", "myimage:1.0") == "myimage:1.0"
+        mock_run_cmd.assert_called_once_with(["podman", "inspect", "myimage:1.0"], ignore_all=True)
+
+    @patch("ramalama.common.run_cmd")
+    def test_storage_change_revalidates(self, mock_run_cmd):
+        ensure_image("podman", "myimage:1.0")
+        self.fingerprint = [("/storage/overlay-images/images.json", 2)]
+        ensure_image("podman", "myimage:1.0")
+        assert mock_run_cmd.call_count == 2
+
+    @patch("ramalama.common.run_cmd")
+    def test_pulled_image_is_recorded(self, mock_run_cmd):
+        mock_run_cmd.side_effect = [subprocess.CalledProcessError(125, "podman"), MagicMock()]
+        ensure_image("podman", "myimage:1.0", should_pull=True)
+        assert image_cache.is_present("podman", "myimage:1.0")
+        assert not image_cache.is_present("docker", "myimage:1.0")
+
+    def test_unfingerprintable_engine_is_not_cached(self, monkeypatch):
+        monkeypatch.setattr(image_cache, "storage_fingerprint", lambda engine: None)
+        image_cache.record_present("docker", "myimage:1.0")
+        assert not image_cache.is_present("docker", "myimage:1.0")
+
+    def test_ensure_image_waits_for_prefetch(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_run_cmd(cmd, **kwargs):
+            calls.append(cmd)
+            release.wait(5)
+            return True
+
+        with patch("ramalama.common.run_cmd", side_effect=slow_run_cmd):
+            futures = image_cache.start_prefetch("podman", ["myimage"])
+            release.set()
+            assert ensure_image("podman", "myimage", should_pull=True) == "myimage:latest"
+        assert futures[0].result() == "myimage:latest"
+        assert calls == [["podman", "inspect", "myimage:latest"]]
+
+    @pytest.mark.parametrize(
+        "pull,expected",
+        [
+            ("missing", [("docker", ["quay.io/custom/image:1.0"])]),
+            ("never", []),
+        ],
+    )
+    def test_prefetch_honours_command_line(self, pull, expected):
+        args = Namespace(container=True, dryrun=False, engine="docker", image="quay.io/custom/image:1.0", pull=pull)
+        calls = []
+        with patch(
+            "ramalama.plugins.runtimes.inference.common.start_prefetch",
+            side_effect=lambda engine, images: calls.append((engine, images)),
+        ):
+            LlamaCppPlugin()._prefetch_image(args)
+
+        assert calls == expected
+        engine, image, should_pull = LlamaCppPlugin._inference_image(args)
+        # ensure_image() is later given the same engine and image, so it waits for the prefetch
+        assert (engine, image, should_pull) == ("docker", "quay.io/custom/image:1.0", pull != "never")
+
+
 class TestCheckNvidia:
     def setup_method(self):
         check_nvidia.cache_clear()
@@ -382,6 +460,71 @@ class TestGetAccel:
             assert returned_accel == "none"
 
 
+def _fake_pci_device(root: Path, address: str, pci_class: str, vendor: str, device: str):
+    device_dir = root / "sys/bus/pci/devices" / address
+    device_dir.mkdir(parents=True)
+    (device_dir / "class").write_text(f"{pci_class}\n")
+    (device_dir / "vendor").write_text(f"{vendor}\n")
+    (device_dir / "device").write_text(f"{device}\n")
+
+
+@pytest.mark.skipif(platform != "linux", reason="accelerator cache is only used on Linux")
+class TestAccelCache:
+    @pytest.fixture
+    def sysfs(self, tmp_path, monkeypatch):
+        root = tmp_path / "root"
+        _fake_pci_device(root, "0000:00:02.0", "0x030000", "0x8086", "0x46a6")
+        _fake_pci_device(root, "0000:00:1f.0", "0x060100", "0x8086", "0x7a84")
+        (root / "sys/module/i915").mkdir(parents=True)
+        (root / "sys/module/i915/srcversion").write_text("ABC123\n")
+
+        fingerprint = accel_cache.fingerprint
+        monkeypatch.setattr(accel_cache, "fingerprint", lambda env_names: fingerprint(env_names, root=str(root)))
+        monkeypatch.setenv("RAMALAMA_ACCEL_CACHE", str(tmp_path / "accel.json"))
+        get_accel.cache_clear()
+        yield root
+        get_accel.cache_clear()
+
+    def test_fingerprint_lists_accelerator_devices_only(self, sysfs):
+        fingerprint = accel_cache.fingerprint([])
+
+        assert fingerprint["pci"] == ["0000:00:02.0 0x8086:0x46a6 0x030000"]
+        assert fingerprint["modules"] == {"i915": "ABC123"}
+
+    def test_get_accel_reuses_cached_detection(self, sysfs):
+        with patch.dict("os.environ"), patch("ramalama.common._detect_accel") as detect:
+
+            def fake_detect():
+                os.environ["INTEL_VISIBLE_DEVICES"] = "1"
+                return "intel"
+
+            detect.side_effect = fake_detect
+            assert get_accel() == "intel"
+            del os.environ["INTEL_VISIBLE_DEVICES"]
+            get_accel.cache_clear()
+
+            assert get_accel() == "intel"
+            assert os.environ["INTEL_VISIBLE_DEVICES"] == "1"
+            assert detect.call_count == 1
+
+    def test_get_accel_detects_again_when_hardware_changes(self, sysfs):
+        with patch("ramalama.common._detect_accel", return_value="none") as detect:
+            get_accel()
+            _fake_pci_device(sysfs, "0000:01:00.0", "0x030200", "0x10de", "0x2684")
+            get_accel.cache_clear()
+            get_accel()
+
+            assert detect.call_count == 2
+
+    def test_refresh_accel_forces_detection(self, sysfs):
+        with patch("ramalama.common._detect_accel", return_value="none") as detect:
+            get_accel()
+            refresh_accel()
+            get_accel()
+
+            assert detect.call_count == 2
+
+
 CDI_GPU_UUID = "GPU-08b3c2e8-cb7b-ea3f-7711-a042c580b3e8"
 
 # Sample from WSL2
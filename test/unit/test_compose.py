@@ -286,3 +286,26 @@ def test_compose_no_devices(monkeypatch):
     result = compose.generate().content
 
     assert "devices:" not in result
+
+
+@pytest.mark.usefixtures("sized_model")
+def test_compose_generate_sized(monkeypatch):
+    """Memory and CPU reservations and a healthcheck are sized for a local model."""
+    monkeypatch.setattr("os.path.exists", lambda path: path == "/models/gemma.gguf")
+    monkeypatch.setattr("ramalama.compose.get_accel_env_vars", lambda: {})
+    monkeypatch.setattr("ramalama.compose.version", lambda: "0.1.0-test")
+
+    args = Args(port="8080", image="test-image/cuda:latest")
+    args.ctx_size = 4096
+    args.threads = 8
+    compose = Compose(
+        model_name="gemma",
+        model_paths=("/models/gemma.gguf", "/mnt/models/gemma.gguf"),
+        chat_template_paths=None,
+        mmproj_paths=None,
+        args=args,
+        exec_args=["llama-server", "--model", "/mnt/models/gemma.gguf"],
+        draft_model_paths=None,
+    )
+
+    assert compose.generate().content.strip() == (DATA_PATH / "with_resources.yaml").read_text().strip()
@@ -187,6 +187,17 @@ def test_load_env_config_invalid_log_level_raises(invalid_level):
         load_env_config({"RAMALAMA_LOG_LEVEL": invalid_level})
 
 
+@pytest.mark.parametrize("value,expected", [("auto", "auto"), ("AUTO", "auto"), ("8192", 8192), (4096, 4096)])
+def test_ctx_size_accepts_auto(value, expected):
+    assert BaseConfig(engine=None, ctx_size=value).ctx_size == expected
+    assert load_env_config({"RAMALAMA_CTX_SIZE": str(value)})["ctx_size"] == expected
+
+
+def test_ctx_size_rejects_other_strings():
+    with pytest.raises(ValueError):
+        load_env_config({"RAMALAMA_CTX_SIZE": "large"})
+
+
 class TestGetDefaultEngine:
     def test_get_default_engine_with_toolboxenv(self):
         with patch("os.getenv", return_value=None):
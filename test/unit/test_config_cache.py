@@ -0,0 +1,127 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ramalama import config_cache
+from ramalama.config import load_file_config
+from ramalama.shortnames import Shortnames
+from ramalama.toml_parser import TOMLParser
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "config.json"
+    monkeypatch.setenv("RAMALAMA_CONFIG_CACHE", str(path))
+    monkeypatch.setattr(config_cache, "_snapshot", None)
+    return path
+
+
+def new_process(monkeypatch):
+    """Forget the snapshot read by this process, as the next invocation would start without it."""
+    monkeypatch.setattr(config_cache, "_snapshot", None)
+
+
+def write(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def conf(tmp_path, monkeypatch):
+    path = tmp_path / "ramalama.conf"
+    write(path, '[ramalama]\nruntime = "vllm"\n', 1_000_000_000)
+    monkeypatch.setenv("RAMALAMA_CONFIG", str(path))
+    return path
+
+
+def test_config_is_parsed_once(cache_path, conf, monkeypatch):
+    assert load_file_config()["runtime"] == "vllm"
+    assert cache_path.exists()
+
+    new_process(monkeypatch)
+    with patch.object(TOMLParser, "parse_file") as parse_file:
+        config = load_file_config()
+
+    parse_file.assert_not_called()
+    assert config["runtime"] == "vllm"
+    assert config["settings"] == {"config_files": [str(conf)]}
+
+
+def test_changed_config_is_parsed_again(cache_path, conf, monkeypatch):
+    load_file_config()
+
+    write(conf, '[ramalama]\nruntime = "mlx"\n', 2_000_000_000)
+    new_process(monkeypatch)
+
+    assert load_file_config()["runtime"] == "mlx"
+
+
+def test_other_config_file_is_parsed(cache_path, conf, tmp_path, monkeypatch):
+    load_file_config()
+
+    other = tmp_path / "other.conf"
+    write(other, '[ramalama]\nruntime = "mlx"\n', 1_000_000_000)
+    monkeypatch.setenv("RAMALAMA_CONFIG", str(other))
+
+    assert load_file_config()["runtime"] == "mlx"
+
+
+def test_callers_cannot_change_the_snapshot(cache_path, conf, monkeypatch):
+    load_file_config()["runtime"] = "changed"
+
+    assert load_file_config()["runtime"] == "vllm"
+
+
+def test_corrupt_cache_is_ignored(cache_path, conf):
+    cache_path.parent.mkdir()
+    cache_path.write_text("{not json")
+
+    assert load_file_config()["runtime"] == "vllm"
+    assert json.loads(cache_path.read_text())["version"] == config_cache.CONFIG_CACHE_VERSION
+
+
+def test_empty_path_disables_cache(tmp_path, conf, monkeypatch):
+    monkeypatch.setenv("RAMALAMA_CONFIG_CACHE", "")
+
+    assert load_file_config()["runtime"] == "vllm"
+    assert config_cache.default_cache_path() is None
+    assert not list(tmp_path.glob("**/*.json"))
+
+
+class TestShortnames:
+    @pytest.fixture
+    def sources(self, tmp_path, monkeypatch):
+        paths = [tmp_path / "system.conf", tmp_path / "user.conf"]
+        write(paths[0], '[shortnames]\n"tiny" = "hf://tiny"\n"granite" = "ollama://granite"\n', 1_000_000_000)
+        monkeypatch.setattr(Shortnames, "_file_paths", staticmethod(lambda: [str(path) for path in paths]))
+        return paths
+
+    def test_table_is_parsed_once(self, cache_path, sources, monkeypatch):
+        assert Shortnames().resolve("tiny") == "hf://tiny"
+
+        new_process(monkeypatch)
+        with patch.object(Shortnames, "_parse") as parse:
+            shortnames = Shortnames()
+
+        parse.assert_not_called()
+        assert shortnames.resolve("granite") == "ollama://granite"
+        assert shortnames.lookup("hf://tiny") == "tiny"
+        assert shortnames.config_sources["tiny"] == str(sources[0])
+
+    def test_new_file_is_parsed(self, cache_path, sources, monkeypatch):
+        Shortnames()
+
+        write(sources[1], '[shortnames]\n"tiny" = "hf://tinier"\n', 1_000_000_000)
+        new_process(monkeypatch)
+        shortnames = Shortnames()
+
+        assert shortnames.resolve("tiny") == "hf://tinier"
+        assert shortnames.paths == [str(path) for path in sources]
+
+    def test_shares_the_snapshot_with_config(self, cache_path, sources, conf):
+        load_file_config()
+        Shortnames()
+
+        assert set(json.loads(cache_path.read_text())) == {"version", "config", "shortnames"}
@@ -0,0 +1,234 @@
+import base64
+import importlib.util
+import io
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent.parent / "container-images" / "scripts"
+
+
+def _load(name):
+    loader = SourceFileLoader(name, str(SCRIPTS / name))
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def doc2rag():
+    return _load("doc2rag")
+
+
+def _embedder(doc2rag, batch_tokens=None, parallel=None):
+    return doc2rag.LlamaCppEmbedder("http://embed:8080/", batch_tokens=batch_tokens, parallel=parallel)
+
+
+class TestEmbeddingBatches:
+    def test_texts_are_packed_within_the_token_budget(self, doc2rag):
+        # each 8 character text is estimated at 8 // 3 + 1 = 3 tokens
+        embedder = _embedder(doc2rag, batch_tokens=7, parallel=1)
+
+        assert embedder._make_batches(["x" * 8] * 5) == [(0, 2), (2, 4), (4, 5)]
+
+    def test_oversized_text_gets_a_batch_of_its_own(self, doc2rag):
+        embedder = _embedder(doc2rag, batch_tokens=10, parallel=1)
+
+        assert embedder._make_batches(["a", "x" * 300, "b"]) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_no_texts_no_batches(self, doc2rag):
+        assert _embedder(doc2rag, batch_tokens=10, parallel=1)._make_batches([]) == []
+
+    def test_rejected_batch_is_split(self, doc2rag):
+        embedder = _embedder(doc2rag, batch_tokens=100, parallel=1)
+        sizes = []
+
+        def embed_batch(texts):
+            sizes.append(len(texts))
+            if len(texts) > 2:
+                raise doc2rag.EmbeddingBatchTooLarge("too large")
+            return [[float(text)] for text in texts]
+
+        embedder._embed_batch = embed_batch
+
+        assert embedder._embed_adaptive([str(i) for i in range(5)]) == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        assert sizes == [5, 2, 3, 1, 2]
+
+    def test_single_rejected_text_is_an_error(self, doc2rag):
+        embedder = _embedder(doc2rag, batch_tokens=100, parallel=1)
+        embedder._embed_batch = MagicMock(side_effect=doc2rag.EmbeddingBatchTooLarge("too large"))
+
+        with pytest.raises(doc2rag.EmbeddingBatchTooLarge):
+            embedder._embed_adaptive(["text"])
+
+    def test_embeddings_keep_the_order_of_the_texts(self, doc2rag):
+        embedder = _embedder(doc2rag, batch_tokens=2, parallel=4)
+        embedder._embed_batch = lambda texts: [[float(text)] for text in texts]
+
+        assert embedder.embed([str(i) for i in range(20)]) == [[float(i)] for i in range(20)]
+
+    @pytest.mark.parametrize("code", [413, 500])
+    def test_server_rejection_is_batch_too_large(self, doc2rag, code):
+        error = HTTPError("http://embed:8080/v1/embeddings", code, "rejected", {}, io.BytesIO(b"input too large"))
+
+        with patch.object(doc2rag, "urlopen", side_effect=error):
+            with pytest.raises(doc2rag.EmbeddingBatchTooLarge, match="input too large"):
+                _embedder(doc2rag)._embed_batch(["text"])
+
+    def test_server_failure_is_not_split(self, doc2rag):
+        error = HTTPError("http://embed:8080/v1/embeddings", 500, "failed", {}, io.BytesIO(b"CUDA out of memory"))
+
+        with patch.object(doc2rag, "urlopen", side_effect=error) as urlopen:
+            with pytest.raises(RuntimeError, match="out of memory") as raised:
+                _embedder(doc2rag, batch_tokens=100, parallel=1)._embed_adaptive(["a", "b", "c", "d"])
+
+        assert not isinstance(raised.value, doc2rag.EmbeddingBatchTooLarge)
+        assert urlopen.call_count == 1
+
+    def test_response_is_sorted_by_index(self, doc2rag):
+        response = MagicMock()
+        response.__enter__.return_value.read.return_value = (
+            b'{"data": [{"index": 1, "embedding": [1.0, 1.0]}, {"index": 0, "embedding": [0.0, 0.0]}]}'
+        )
+        embedder = _embedder(doc2rag)
+
+        with patch.object(doc2rag, "urlopen", return_value=response):
+            assert embedder._embed_batch(["a", "b"]) == [[0.0, 0.0], [1.0, 1.0]]
+        assert embedder.dimension == 2
+
+
+class TestServerLimits:
+    def test_smallest_reported_batch_size_is_used(self, doc2rag):
+        props = {"n_batch": 2048, "n_ubatch": 512, "total_slots": 2}
+        embedder = _embedder(doc2rag)
+
+        with patch.object(doc2rag, "server_props", return_value=props):
+            embedder._detect_limits()
+
+        assert (embedder.batch_tokens, embedder.parallel) == (512, 2)
+
+    def test_defaults_without_props(self, doc2rag):
+        embedder = _embedder(doc2rag)
+
+        with patch.object(doc2rag, "server_props", return_value={}):
+            embedder._detect_limits()
+
+        assert embedder.batch_tokens == doc2rag.DEFAULT_EMBEDDING_BATCH_TOKENS
+        assert embedder.parallel == doc2rag.DEFAULT_SERVER_PARALLEL
+
+    def test_given_limits_skip_the_server(self, doc2rag):
+        embedder = _embedder(doc2rag, batch_tokens=64, parallel=3)
+
+        with patch.object(doc2rag, "server_props") as server_props:
+            embedder._detect_limits()
+
+        server_props.assert_not_called()
+        assert (embedder.batch_tokens, embedder.parallel) == (64, 3)
+
+    @pytest.mark.parametrize("slots,expected", [(0, 4), (1, 1), (6, 6), (64, 8)])
+    def test_server_slots_are_capped(self, doc2rag, slots, expected):
+        assert doc2rag.server_slots("http://embed:8080", {"total_slots": slots}) == expected
+
+    def test_unreachable_server_has_no_props(self, doc2rag):
+        with patch.object(doc2rag, "urlopen", side_effect=OSError("connection refused")):
+            assert doc2rag.server_props("http://embed:8080") == {}
+
+
+class TestChunkIds:
+    def test_ids_are_stable_and_distinct(self, doc2rag):
+        ids = {doc2rag._chunk_id(doc_id, index) for doc_id in range(10) for index in range(10)}
+
+        assert len(ids) == 100
+        assert doc2rag._chunk_id(3, 4) == doc2rag._chunk_id(3, 4)
+        assert all(0 <= point_id < 1 << 63 for point_id in ids)
+
+    def test_doc_ids_depend_on_file_and_position(self, doc2rag):
+        assert doc2rag._doc_id("a.pdf", 0) == doc2rag._doc_id("a.pdf", 0)
+        assert doc2rag._doc_id("a.pdf", 0) != doc2rag._doc_id("a.pdf", 1)
+        assert doc2rag._doc_id("a.pdf", 0) != doc2rag._doc_id("b.pdf", 0)
+
+    def test_rag_framework_derives_the_same_ids(self, doc2rag):
+        if sys.version_info < (3, 10):
+            pytest.skip("rag_framework requires Python 3.10")
+        for module in ("aiohttp", "fastapi", "openai", "qdrant_client", "uvicorn"):
+            pytest.importorskip(module)
+        rag_framework = _load("rag_framework")
+
+        assert rag_framework.CHUNK_ID_SCHEME == doc2rag.CHUNK_ID_SCHEME
+        doc_id = doc2rag._doc_id("manual.pdf", 2)
+        for index in range(5):
+            assert rag_framework._chunk_id(doc_id, index) == doc2rag._chunk_id(doc_id, index)
+
+
+class TestPdfPipeline:
+    @pytest.fixture
+    def converter(self, doc2rag, monkeypatch):
+        """A converter for a 20 page PDF whose queued pages finish rendering in reverse order."""
+        n_pages = 20
+        rendered = []
+        pdfium = types.ModuleType("pypdfium2")
+        pdfium.PdfDocument = MagicMock(return_value=MagicMock(__len__=MagicMock(return_value=n_pages)))
+        image = MagicMock()
+        pil = types.ModuleType("PIL")
+        pil.Image = image
+        document = MagicMock()
+        document.load_from_doctags.side_effect = lambda doctags, document_name: document_name
+        doc_module = types.ModuleType("docling_core.types.doc")
+        doc_module.DoclingDocument = document
+        document_module = types.ModuleType("docling_core.types.doc.document")
+        document_module.DocTagsDocument = MagicMock()
+        for name, module in {
+            "pypdfium2": pdfium,
+            "PIL": pil,
+            "docling_core": types.ModuleType("docling_core"),
+            "docling_core.types": types.ModuleType("docling_core.types"),
+            "docling_core.types.doc": doc_module,
+            "docling_core.types.doc.document": document_module,
+        }.items():
+            monkeypatch.setitem(sys.modules, name, module)
+
+        def render(pdf_path, page_idx, max_size):
+            rendered.append(page_idx)
+            time.sleep((n_pages - page_idx) * 0.005)
+            return page_idx, f"png{page_idx}".encode()
+
+        monkeypatch.setattr(doc2rag, "_render_pdf_page", render)
+        converter = doc2rag.GraniteDoclingConverter("http://vlm:8080", parallel=2, render_workers=3)
+        converter._render_pool = lambda: ThreadPoolExecutor(max_workers=converter.render_workers)
+        converter.n_pages = n_pages
+        converter.rendered = rendered
+        return converter
+
+    def test_pages_are_reassembled_in_order(self, converter):
+        sent = []
+        converter._send_image_b64 = lambda image_b64: sent.append(base64.b64decode(image_b64)) or "<doctag/>"
+
+        docs = converter._convert_pdf(Path("manual.pdf"))
+
+        assert docs == [f"manual_p{page + 1}" for page in range(converter.n_pages)]
+        assert sorted(sent) == sorted(f"png{page}".encode() for page in range(converter.n_pages))
+
+    def test_queue_depth_follows_the_workers(self, converter):
+        assert converter.queue_depth == 2 * 2 + 3
+
+    def test_failed_page_stops_the_conversion(self, converter):
+        def send(image_b64):
+            if base64.b64decode(image_b64) == b"png1":
+                raise RuntimeError("llama-server returned 500")
+            return "<doctag/>"
+
+        converter._send_image_b64 = send
+
+        with pytest.raises(RuntimeError, match="returned 500"):
+            converter._convert_pdf(Path("manual.pdf"))
+
+        # only the pages queued behind the failed one were rendered, not the whole document
+        assert len(converter.rendered) <= converter.queue_depth + 1
@@ -1,8 +1,10 @@
+import json
+import sys
 import unittest
 from argparse import Namespace
 from http.client import HTTPException
 from json import JSONDecodeError
-from subprocess import TimeoutExpired
+from subprocess import CalledProcessError, CompletedProcess, TimeoutExpired
 from unittest.mock import Mock, patch
 
 import pytest
@@ -44,9 +46,9 @@ class TestEngine(unittest.TestCase):
         self.assertIn("--rm", exec_args)
 
     @patch('os.access')
-    @patch('ramalama.engine.check_nvidia')
-    def test_add_oci_runtime_nvidia(self, mock_check_nvidia, mock_os_access):
-        mock_check_nvidia.return_value = "cuda"
+    @patch('ramalama.engine.get_accel')
+    def test_add_oci_runtime_nvidia(self, mock_get_accel, mock_os_access):
+        mock_get_accel.return_value = "cuda"
         mock_os_access.return_value = True
 
         # Test Podman
@@ -347,5 +349,125 @@ def test_wait_for_healthy_success():
     ramalama.engine.wait_for_healthy(args, healthy_func, timeout=1)
 
 
+def test_wait_for_healthy_fails_fast_when_container_dies():
+    died = json.dumps({"Type": "container", "Status": "died", "Name": "thecontainer", "ContainerExitCode": 1})
+    fake_events = [sys.executable, "-c", f"import time; print({died!r}, flush=True); time.sleep(30)"]
+    inspect = CompletedProcess([], 0, stdout="running\n0\n", stderr="")
+
+    def healthy_func(args):
+        raise ConnectionError("refused")
+
+    args = Namespace(name="thecontainer", debug=True, engine="podman", container=True)
+    with (
+        patch("ramalama.monitor.events_command", return_value=fake_events),
+        patch("ramalama.monitor.subprocess.run", return_value=inspect),
+    ):
+        with pytest.raises(ValueError, match="container thecontainer exited with code 1"):
+            ramalama.engine.wait_for_healthy(args, healthy_func, timeout=30)
+
+
+PS_OUTPUT = json.dumps(
+    [
+        {"Id": "a" * 64, "Names": ["model-a"], "Pod": ""},
+        {"Id": "b" * 64, "Names": ["model-b"], "Pod": ""},
+        {"Id": "c" * 64, "Names": ["model-c-pod-model-server"], "Pod": "pod123"},
+    ]
+)
+
+
+def fake_engine(calls, fail=()):
+    def run_cmd(cmd, **kwargs):
+        calls.append(cmd)
+        if cmd[1] == "ps":
+            return CompletedProcess(cmd, 0, stdout=PS_OUTPUT.encode(), stderr=b"")
+        if cmd[-1] in fail:
+            raise CalledProcessError(125, cmd)
+        return CompletedProcess(cmd, 0, stdout=b"", stderr=b"")
+
+    return run_cmd
+
+
+def test_stop_containers_batches_engine_calls():
+    calls = []
+    args = Namespace(engine="podman", ignore=False)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine(calls)):
+        results = ramalama.engine.stop_containers(args, ["model-a", "model-b", "model-c"], remove=True)
+
+    assert results == {"model-a": None, "model-b": None, "model-c": None}
+    assert calls[0] == ["podman", "ps", "-a", "--format", "json"]
+    assert ["podman", "pod", "rm", "-t=0", "--ignore", "--force", "pod123"] in calls
+    assert sorted(cmd[-1] for cmd in calls if cmd[1] == "stop") == ["model-a", "model-b"]
+    assert calls[-1] == ["podman", "rm", "--force", "--ignore", "model-a", "model-b"]
+    assert not any(cmd[1] == "inspect" for cmd in calls)
+
+
+def test_stop_containers_all_uses_label_filter():
+    calls = []
+    args = Namespace(engine="podman", ignore=True)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine(calls)):
+        results = ramalama.engine.stop_containers(args)
+
+    assert calls[0] == ["podman", "ps", "-a", "--filter", "label=ai.ramalama", "--format", "json"]
+    assert set(results) == {"model-a", "model-b", "model-c-pod-model-server"}
+
+
+def test_stop_containers_reports_per_container_errors():
+    calls = []
+    args = Namespace(engine="podman", ignore=False)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine(calls, fail=("model-b", "missing"))):
+        results = ramalama.engine.stop_containers(args, ["model-a", "model-b", "missing"], remove=True)
+
+    assert results["model-a"] is None
+    assert isinstance(results["model-b"], CalledProcessError)
+    assert isinstance(results["missing"], CalledProcessError)
+    assert calls[-1] == ["podman", "rm", "--force", "--ignore", "model-a"]
+
+
+def test_stop_containers_ignores_missing():
+    calls = []
+    args = Namespace(engine="podman", ignore=True)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine(calls)):
+        assert ramalama.engine.stop_containers(args, ["missing"]) == {"missing": None}
+    assert calls == [["podman", "ps", "-a", "--format", "json"]]
+
+
+def fake_engine_without_ps(calls):
+    run_cmd = fake_engine(calls)
+
+    def without_ps(cmd, **kwargs):
+        if cmd[1] == "ps":
+            calls.append(cmd)
+            raise CalledProcessError(125, cmd, stderr=b"Cannot connect to Podman")
+        return run_cmd(cmd, **kwargs)
+
+    return without_ps
+
+
+def test_stop_containers_all_fails_when_listing_fails():
+    calls = []
+    args = Namespace(engine="podman", ignore=True)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine_without_ps(calls)):
+        with pytest.raises(ValueError, match="failed to list RamaLama containers"):
+            ramalama.engine.stop_containers(args)
+
+    assert not any(cmd[1] == "stop" for cmd in calls)
+
+
+def test_stop_containers_named_when_listing_fails():
+    calls = []
+    args = Namespace(engine="podman", ignore=False)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine_without_ps(calls)):
+        assert ramalama.engine.stop_containers(args, ["model-a"]) == {"model-a": None}
+
+    assert ["podman", "stop", "-t=0", "model-a"] in calls
+
+
+def test_stop_container_raises_error():
+    args = Namespace(engine="podman", ignore=False)
+    with patch("ramalama.engine.run_cmd", side_effect=fake_engine([], fail=("model-a",))):
+        with pytest.raises(CalledProcessError):
+            ramalama.engine.stop_container(args, "model-a")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,7 @@ from ramalama.file_loaders.file_manager import ImageFileManager, OpanAIChatAPIMe
 from ramalama.file_loaders.file_types.base import BaseFileLoader
 from ramalama.file_loaders.file_types.image import BasicImageFileLoader
 from ramalama.file_loaders.file_types.txt import TXTFileLoader
+from ramalama.file_loaders.retrieval import BM25Index, Chunk, LocalRetrievalIndex, iter_file_chunks
 
 
 def _text_content(message):
@@ -418,3 +419,100 @@ class TestFileUploadIntegration:
 
             for filename in files_content.keys():
                 assert filename in content
+
+
+class TestLocalRetrieval:
+    """Test chunking and BM25 retrieval used by chat --rag-top-k."""
+
+    def test_iter_file_chunks_splits_with_overlap(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(" ".join(f"word{i}" for i in range(1000)))
+        try:
+            chunks = list(iter_file_chunks(f.name, chunk_size=200, overlap=50))
+        finally:
+            os.unlink(f.name)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 for chunk in chunks)
+        assert chunks[0].startswith("word0 ")
+        assert chunks[-1].endswith("word999")
+        # Consecutive chunks share some text
+        assert chunks[0].split()[-1] in chunks[1]
+
+    def test_iter_file_chunks_advances_with_large_overlap(self):
+        # long words put the only whitespace cut near the middle of the chunk, before the overlap
+        text = " ".join(f"{i:04}" + "x" * 36 for i in range(300))
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(text)
+        try:
+            chunks = list(iter_file_chunks(f.name, chunk_size=100, overlap=90))
+        finally:
+            os.unlink(f.name)
+
+        # every chunk starts at least half of the 10 character stride after the previous one
+        assert len(chunks) <= 2 * len(text) // 10 + 1
+        assert len(set(chunks)) == len(chunks)
+        assert "0299" in chunks[-1]
+
+    def test_iter_file_chunks_rejects_large_overlap(self):
+        with pytest.raises(ValueError, match="overlap"):
+            list(iter_file_chunks("unused.txt", chunk_size=100, overlap=100))
+
+    def test_bm25_ranks_matching_chunk_first(self):
+        index = BM25Index(
+            [
+                Chunk.from_text("a.txt", "Podman runs containers without a daemon."),
+                Chunk.from_text("b.txt", "Llamas are domesticated South American camelids."),
+                Chunk.from_text("c.txt", "Containers share the host kernel."),
+            ]
+        )
+
+        results = index.search("Where do llamas come from?", top_k=2)
+
+        assert [chunk.source for chunk in results] == ["b.txt"]
+
+    def test_bm25_empty_query(self):
+        index = BM25Index([Chunk.from_text("a.txt", "some text")])
+        assert index.search("?!") == []
+
+    def test_index_cache_reused_for_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            doc = os.path.join(tmp_dir, "doc.txt")
+            with open(doc, "w") as f:
+                f.write("The quick brown fox jumps over the lazy dog.")
+            cache_dir = os.path.join(tmp_dir, "cache")
+
+            index = LocalRetrievalIndex([doc], cache_dir=cache_dir)
+            assert os.path.exists(index.cache_path)
+
+            with patch("ramalama.file_loaders.retrieval.iter_file_chunks") as mock_chunks:
+                cached = LocalRetrievalIndex([doc], cache_dir=cache_dir)
+            mock_chunks.assert_not_called()
+            assert [c.text for c in cached.search("fox")] == ["The quick brown fox jumps over the lazy dog."]
+
+            with open(doc, "w") as f:
+                f.write("A completely different sentence about llamas.")
+            os.utime(doc, (0, 0))
+            reindexed = LocalRetrievalIndex([doc], cache_dir=cache_dir)
+            assert reindexed.search("fox") == []
+            assert len(reindexed.search("llamas")) == 1
+
+    def test_builder_load_retrieval(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "notes.md"), "w") as f:
+                f.write("RamaLama serves models in containers.")
+            with open(os.path.join(tmp_dir, "image.png"), "wb") as f:
+                f.write(b"fake png")
+
+            builder = OpanAIChatAPIMessageBuilder()
+            index, messages = builder.load_retrieval(tmp_dir)
+
+            assert index is not None
+            assert len(messages) == 1
+            assert len(_image_parts(messages[0])) == 1
+
+            context = builder.retrieval_message(index, "how are models served?", top_k=3)
+            assert context is not None
+            assert "RamaLama serves models in containers." in context
+            assert "<!--start_document" in context
+            assert builder.retrieval_message(index, "unrelated", top_k=3) is None
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from ramalama.chat import RamaLamaShell, chat
-from ramalama.chat_utils import ImageURLPart
+from ramalama.chat_utils import ImageURLPart, UserMessage
 
 
 def _text_content(message):
@@ -77,6 +77,33 @@ class TestFileUploadChatIntegration:
             assert "readme.md" in content
             assert "<!--start_document" in content
 
+    @patch('urllib.request.urlopen')
+    def test_chat_with_rag_top_k_injects_retrieved_chunks(self, mock_urlopen):
+        """Test that --rag-top-k sends only the matching chunks with the latest message."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "llamas.txt"), "w") as f:
+                f.write("Llamas are native to South America.")
+            with open(os.path.join(tmp_dir, "podman.txt"), "w") as f:
+                f.write("Podman is a daemonless container engine.")
+
+            mock_args = MagicMock()
+            mock_args.rag = tmp_dir
+            mock_args.rag_top_k = 1
+            mock_args.store = tmp_dir
+            mock_args.dryrun = False
+
+            shell = RamaLamaShell(mock_args)
+            assert shell.conversation_history == []
+
+            shell.conversation_history.append(UserMessage(text="Where do llamas live?"))
+            messages = shell._request_messages()
+
+            assert len(shell.conversation_history) == 1
+            content = _text_content(messages[-1])
+            assert "Llamas are native to South America." in content
+            assert "Podman" not in content
+            assert content.endswith("Where do llamas live?")
+
     @pytest.mark.filterwarnings("ignore:.*Unsupported file types detected!.*")
     @patch('urllib.request.urlopen')
     def test_chat_with_file_input_no_files(self, mock_urlopen):
@@ -0,0 +1,169 @@
+import hashlib
+import os
+
+import pytest
+
+from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.hub_cache import (
+    CachedFile,
+    CachedRevision,
+    import_hub_caches,
+    plan_models,
+    quantization_tag,
+    scan_huggingface_cache,
+)
+from ramalama.model_store.reffile import StoreFileType
+from ramalama.model_store.snapshot_file import SnapshotFileType
+from ramalama.model_store.store import ModelStore
+
+COMMIT = "a" * 40
+
+
+def hf_repo(cache_dir, repo_id, files, lfs=(".gguf", ".safetensors")):
+    """Lay out a repository the way huggingface_hub caches it: blobs named by etag, snapshot symlinks."""
+    repo_dir = cache_dir / f"models--{repo_id.replace('/', '--')}"
+    (repo_dir / "blobs").mkdir(parents=True)
+    (repo_dir / "refs").mkdir()
+    (repo_dir / "refs" / "main").write_text(COMMIT)
+    snapshot_dir = repo_dir / "snapshots" / COMMIT
+    for name, content in files.items():
+        algorithm = hashlib.sha256 if name.endswith(lfs) else hashlib.sha1
+        blob = repo_dir / "blobs" / algorithm(content).hexdigest()
+        blob.write_bytes(content)
+        link = snapshot_dir / name
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to(os.path.relpath(blob, link.parent))
+    return repo_dir
+
+
+def store_for(store_path, source, organization, name):
+    return ModelStore(GlobalModelStore(str(store_path)), name, source, organization)
+
+
+def test_import_gguf_repository(tmp_path):
+    cache_dir = tmp_path / "hub"
+    files = {
+        "tiny-Q4_K_M.gguf": b"q4 weights",
+        "tiny-Q8_0.gguf": b"q8 weights",
+        "mmproj-tiny-f16.gguf": b"projector",
+        "README.md": b"readme",
+    }
+    hf_repo(cache_dir, "org/tiny-GGUF", files)
+    store_path = tmp_path / "store"
+
+    summary = import_hub_caches(str(store_path), [("huggingface", str(cache_dir))], jobs=2)
+
+    assert summary.failed == []
+    assert sorted(summary.imported) == [
+        "hf://org/tiny-GGUF/tiny-Q4_K_M.gguf:latest",
+        "hf://org/tiny-GGUF/tiny-Q8_0.gguf:latest",
+        "hf://org/tiny-GGUF:Q4_K_M",
+        "hf://org/tiny-GGUF:Q8_0",
+        "hf://org/tiny-GGUF:latest",
+    ]
+    # every imported file had its digest in the cache
+    assert summary.hashed == 0
+
+    store = store_for(store_path, "huggingface", "org", "tiny-GGUF")
+    ref = store.get_ref_file("latest")
+    q4_hash = f"sha256:{hashlib.sha256(b'q4 weights').hexdigest()}"
+    assert ref.hash == q4_hash.replace(":", "-")
+    assert [(file.name, file.type) for file in ref.files][:2] == [
+        ("tiny-Q4_K_M.gguf", StoreFileType.GGUF_MODEL),
+        ("mmproj-tiny-f16.gguf", StoreFileType.MMPROJ),
+    ]
+    blob = store.get_blob_file_path(q4_hash)
+    cached_blob = cache_dir / "models--org--tiny-GGUF" / "blobs" / hashlib.sha256(b"q4 weights").hexdigest()
+    assert os.path.samefile(blob, cached_blob)
+    with open(store.get_snapshot_file_path(ref.hash, "tiny-Q4_K_M.gguf"), "rb") as f:
+        assert f.read() == b"q4 weights"
+
+    again = import_hub_caches(str(store_path), [("huggingface", str(cache_dir))], jobs=2)
+    assert again.imported == []
+    assert len(again.existing) == 5
+
+
+def test_import_safetensors_repository_hashes_small_files(tmp_path):
+    cache_dir = tmp_path / "hub"
+    files = {"model.safetensors": b"weights", "config.json": b"{}"}
+    hf_repo(cache_dir, "org/tiny", files)
+    store_path = tmp_path / "store"
+
+    summary = import_hub_caches(str(store_path), [("huggingface", str(cache_dir))], jobs=2)
+
+    assert summary.imported == ["hf://org/tiny:latest"]
+    assert summary.hashed == 1
+    ref = store_for(store_path, "huggingface", "org", "tiny").get_ref_file("latest")
+    assert {file.name: file.hash for file in ref.files} == {
+        "model.safetensors": f"sha256:{hashlib.sha256(b'weights').hexdigest()}",
+        "config.json": f"sha256:{hashlib.sha256(b'{}').hexdigest()}",
+    }
+
+
+def test_import_modelscope_cache(tmp_path):
+    repo_dir = tmp_path / "ms" / "models" / "org" / "tiny___v1"
+    repo_dir.mkdir(parents=True)
+    (repo_dir / "tiny.gguf").write_bytes(b"weights")
+    (repo_dir / ".msc").write_bytes(b"metadata")
+    store_path = tmp_path / "store"
+
+    summary = import_hub_caches(str(store_path), [("modelscope", str(tmp_path / "ms"))], jobs=1)
+
+    assert sorted(summary.imported) == ["ms://org/tiny.v1/tiny.gguf:latest", "ms://org/tiny.v1:latest"]
+    assert summary.hashed == 1
+    ref = store_for(store_path, "modelscope", "org", "tiny.v1").get_ref_file("latest")
+    assert [file.name for file in ref.files] == ["tiny.gguf"]
+
+
+def test_dryrun_leaves_store_untouched(tmp_path):
+    cache_dir = tmp_path / "hub"
+    hf_repo(cache_dir, "org/tiny", {"model.safetensors": b"weights"})
+    store_path = tmp_path / "store"
+
+    summary = import_hub_caches(str(store_path), [("huggingface", str(cache_dir))], jobs=1, dryrun=True)
+
+    assert summary.imported == ["hf://org/tiny:latest"]
+    assert not store_path.exists()
+
+
+def test_scan_huggingface_cache_revisions(tmp_path):
+    repo_dir = hf_repo(tmp_path, "org/tiny", {"model.safetensors": b"weights"})
+    (repo_dir / "refs" / "pr").mkdir()
+    (repo_dir / "refs" / "pr" / "1").write_text(COMMIT)
+    other = repo_dir / "snapshots" / ("b" * 40)
+    other.mkdir()
+    (other / "model.safetensors").symlink_to("../../blobs/missing")
+
+    revisions = scan_huggingface_cache(str(tmp_path))
+
+    assert sorted(revision.tag for revision in revisions) == ["latest", "pr-1"]
+    assert revisions[0].files[0].digest == f"sha256:{hashlib.sha256(b'weights').hexdigest()}"
+
+
+def test_plan_groups_split_models():
+    parts = [CachedFile(f"Q8_0/big-Q8_0-0000{i}-of-00002.gguf", f"/cache/{i}", f"sha256:{i}") for i in (1, 2)]
+    incomplete = CachedFile("big-Q4_K_M-00001-of-00003.gguf", "/cache/3", "sha256:3")
+    revision = CachedRevision("huggingface", "org", "big", "latest", [*parts, incomplete])
+
+    planned = plan_models(revision)
+
+    assert [model.model for model in planned] == [
+        "hf://org/big/Q8_0/big-Q8_0-00001-of-00002.gguf:latest",
+        "hf://org/big:Q8_0",
+        "hf://org/big:latest",
+    ]
+    assert planned[0].files == [(parts[0], SnapshotFileType.GGUFModel), (parts[1], SnapshotFileType.Other)]
+
+
+@pytest.mark.parametrize(
+    "file_name,expected",
+    [
+        ("granite-3.3-8b-instruct-Q4_K_M.gguf", "Q4_K_M"),
+        ("tiny-vicuna-1b.q2_k.gguf", "Q2_K"),
+        ("model-IQ4_XS-00001-of-00002.gguf", "IQ4_XS"),
+        ("model-bf16.gguf", "BF16"),
+        ("model.gguf", None),
+    ],
+)
+def test_quantization_tag(file_name, expected):
+    assert quantization_tag(file_name) == expected
@@ -97,6 +97,7 @@ def make_rag_gen_ns(
     inputdir="/input",
     api_url=None,
     embed_url=None,
+    incremental=False,
 ) -> argparse.Namespace:
     return argparse.Namespace(
         debug=debug,
@@ -104,6 +105,7 @@ def make_rag_gen_ns(
         inputdir=inputdir,
         api_url=api_url,
         embed_url=embed_url,
+        incremental=incremental,
     )
 
 
@@ -563,6 +565,22 @@ class TestLlamaCppPlugin:
         assert "-o" in cmd
         assert cmd[cmd.index("-o") + 1] == "json"
 
+    @patch("ramalama.plugins.runtimes.inference.llama_cpp_commands.New")
+    def test_bench_tuned_settings(self, mock_new, container_image_is_ggml):
+        mock_new.return_value = make_transport_model()
+
+        ns = make_ns(MODEL="ollama://mymodel")
+        ns.batch_size, ns.ubatch_size, ns.flash_attn = 1024, 256, True
+        cmd = self.plugin.handle_subcommand("bench", ns)
+        assert cmd[cmd.index("-b") + 1] == "1024"
+        assert cmd[cmd.index("-ub") + 1] == "256"
+        assert cmd[cmd.index("-fa") + 1] == "1"
+
+        cmd = self.plugin.handle_subcommand("serve", ns)
+        assert cmd[cmd.index("--batch-size") + 1] == "1024"
+        assert cmd[cmd.index("--ubatch-size") + 1] == "256"
+        assert cmd[cmd.index("--flash-attn") + 1] == "on"
+
     @patch("ramalama.plugins.runtimes.inference.llama_cpp_commands.New")
     def test_bench_runtime_args(self, mock_new, container_image_is_ggml):
         mock_model = make_transport_model()
@@ -597,6 +615,14 @@ class TestLlamaCppPlugin:
         assert "--embed-url" in cmd
         assert cmd[cmd.index("--embed-url") + 1] == "http://localhost:8081"
 
+    def test_rag_generate_incremental(self):
+        ns = make_rag_gen_ns(embed_url="http://localhost:8081")
+        assert "--incremental" not in self.plugin.handle_subcommand("rag", ns)
+
+        ns = make_rag_gen_ns(embed_url="http://localhost:8081", incremental=True)
+        cmd = self.plugin.handle_subcommand("rag", ns)
+        assert cmd.index("--incremental") < cmd.index("/output")
+
     def test_run_rag(self):
         # RAG routing is internal: _cmd_run dispatches to _cmd_run_rag when args.rag is set
         ns = make_rag_ns(port="9090", model_host="host.containers.internal", model_port="8080")
@@ -343,3 +343,28 @@ def test_kube_no_devices(monkeypatch):
     assert "name: dri" not in content
     assert "name: kfd" not in content
     assert "name: accel" not in content
+
+
+@pytest.mark.usefixtures("sized_model")
+def test_kube_generate_sized(monkeypatch):
+    """Memory and CPU requests and health probes are sized for a local model."""
+    monkeypatch.setattr("os.path.exists", lambda path: path == "/path/to/model.file")
+    monkeypatch.setattr("ramalama.kube.get_accel_env_vars", lambda: {})
+    monkeypatch.setattr("ramalama.kube.check_nvidia", lambda: "cuda")
+    monkeypatch.setattr("ramalama.kube.version", lambda: "test-version")
+
+    args = Args(port="8080")
+    args.ctx_size = 4096
+    args.threads = 8
+    kube = Kube(
+        "tinyllama",
+        ("/path/to/model.file", "/mnt/models/model.file"),
+        None,
+        None,
+        args,
+        ["llama-server", "--model", "/mnt/models/model.file"],
+        None,
+        False,
+    )
+
+    assert kube.generate().content == (DATA_PATH / "with_resources.yaml").read_text()
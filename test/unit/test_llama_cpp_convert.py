@@ -0,0 +1,171 @@
+import argparse
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.reffile import RefJSONFile, StoreFile, StoreFileType
+from ramalama.model_store.store import ModelStore
+from ramalama.plugins.runtimes.inference.llama_cpp import (
+    LlamaCppPlugin,
+    parse_gguf_modes,
+    quantization_target,
+    quantize_workers,
+)
+
+LLAMA_CPP = "ramalama.plugins.runtimes.inference.llama_cpp"
+
+
+class StubEngine:
+    """Stands in for the container engine: the convert and quantize commands write their outputs."""
+
+    runs: list[list[str]] = []
+
+    def __init__(self, args):
+        self.use_docker = False
+        self.exec_args: list[str] = []
+        self.volumes: dict[str, str] = {}
+
+    def add(self, newargs):
+        self.exec_args.extend(newargs)
+
+    def add_args(self, *args):
+        self.add(args)
+
+    def add_volume(self, src, dest, *, opts="ro"):
+        self.volumes[dest] = src
+        self.add(["-v", f"{src}:{dest}:{opts}"])
+
+    def relabel(self):
+        return ""
+
+    def add_container_image(self, image, cmd):
+        self.cmd = list(cmd)
+
+    def dryrun(self):
+        pass
+
+    def run(self):
+        StubEngine.runs.append(self.exec_args + self.cmd)
+        if self.cmd[0] == "llama-convert-hf-to-gguf":
+            outfile = self.cmd[self.cmd.index("--outfile") + 1]
+            with open(os.path.join(self.volumes["/output"], os.path.basename(outfile)), "w") as f:
+                f.write("f16")
+        else:
+            with open(os.path.join(self.volumes["/model"], os.path.basename(self.cmd[2])), "w") as f:
+                f.write(self.cmd[3])
+
+
+@pytest.fixture
+def source_model(tmp_path):
+    store = ModelStore(GlobalModelStore(str(tmp_path)), model_name="tiny", model_type="file", model_organization="o")
+    store.ensure_directory_setup()
+    files = []
+    for i, name in enumerate(["model.safetensors", "config.json"]):
+        blob_hash = f"sha256-{i:064d}"
+        with open(store.get_blob_file_path(blob_hash), "w") as f:
+            f.write(name)
+        files.append(StoreFile(blob_hash, name, StoreFileType.SAFETENSOR_MODEL))
+    ref_path = store.get_ref_file_path("latest")
+    os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+    RefJSONFile(hash="sha256-snap", path=ref_path, files=files).write_to_file()
+    return SimpleNamespace(model_store=store, model_tag="latest", model_name="tiny")
+
+
+@pytest.fixture
+def plugin():
+    StubEngine.runs = []
+    with (
+        patch(f"{LLAMA_CPP}.Engine", StubEngine),
+        patch(f"{LLAMA_CPP}.ensure_image", side_effect=lambda engine, image, **kwargs: image),
+        patch(f"{LLAMA_CPP}.ActiveConfig"),
+        patch.object(LlamaCppPlugin, "_container_image_is_ggml", return_value=False),
+    ):
+        yield LlamaCppPlugin()
+
+
+def make_args(gguf):
+    return argparse.Namespace(
+        dryrun=False, engine="podman", image="quantize-image", tools_image="tools-image", gguf=gguf, type="raw"
+    )
+
+
+def test_conversion_is_cached_across_quantizations(plugin, source_model, tmp_path):
+    outputs = []
+    for mode in ("Q4_K_M", "Q8_0"):
+        outdir = SimpleNamespace(name=str(tmp_path / mode))
+        os.makedirs(outdir.name)
+        outputs.append(plugin._convert_to_gguf(outdir, source_model, make_args(mode)))
+
+    assert outputs == ["tiny-Q4_K_M.gguf", "tiny-Q8_0.gguf"]
+    commands = [run[-4] if "llama-quantize" in run else "convert" for run in StubEngine.runs]
+    assert commands.count("convert") == 1
+    assert len(StubEngine.runs) == 3
+
+    cached = os.path.join(source_model.model_store.get_intermediate_directory("sha256-snap"), "tiny.gguf")
+    assert open(cached).read() == "f16"
+    assert f"--mount=type=bind,src={cached},destination=/model/tiny.gguf,ro" in StubEngine.runs[-1]
+    assert open(tmp_path / "Q8_0" / "tiny-Q8_0.gguf").read() == "Q8_0"
+
+    # the staged source blobs are bind mounted, not copied
+    blob = source_model.model_store.get_blob_file_path(f"sha256-{0:064d}")
+    assert f"--mount=type=bind,src={blob},destination=/model/model.safetensors,ro" in StubEngine.runs[0]
+
+
+def test_intermediate_removed_with_snapshot(plugin, source_model):
+    cached = plugin._converted_gguf(source_model, make_args("Q4_K_M"))
+    assert os.path.exists(cached)
+
+    source_model.model_store.remove_snapshot("latest")
+
+    assert not os.path.exists(cached)
+
+
+def test_convert_quantizations_tags_each_mode(plugin, source_model):
+    converted = []
+
+    def create(target, args, transport):
+        oci = MagicMock()
+        oci.create_oci.return_value.convert.side_effect = lambda source, mode_args: converted.append(
+            (target, mode_args.gguf, mode_args.quantize_threads)
+        )
+        return oci
+
+    with (
+        patch(f"{LLAMA_CPP}.TransportFactory", side_effect=create),
+        patch(f"{LLAMA_CPP}.quantize_workers", return_value=2),
+        patch(f"{LLAMA_CPP}.os.cpu_count", return_value=16),
+    ):
+        plugin._convert_quantizations(source_model, "quay.io/me/tiny:1.0", ["Q4_K_M", "Q8_0"], make_args("Q4_K_M,Q8_0"))
+
+    assert sorted(converted) == [("quay.io/me/tiny:1.0-Q4_K_M", "Q4_K_M", 8), ("quay.io/me/tiny:1.0-Q8_0", "Q8_0", 8)]
+    assert sum(1 for run in StubEngine.runs if "llama-convert-hf-to-gguf" in run) == 1
+
+
+def test_parse_gguf_modes():
+    assert parse_gguf_modes("Q4_K_M") == "Q4_K_M"
+    assert parse_gguf_modes("Q4_K_M, Q8_0,Q4_K_M") == "Q4_K_M,Q8_0"
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_gguf_modes("Q4_K_M,Q9")
+
+
+@pytest.mark.parametrize(
+    "target,expected",
+    [
+        ("granite", "granite:Q8_0"),
+        ("quay.io/me/granite:1.0", "quay.io/me/granite:1.0-Q8_0"),
+        ("localhost:5000/granite", "localhost:5000/granite:Q8_0"),
+        ("oci://quay.io/me/granite", "oci://quay.io/me/granite:Q8_0"),
+    ],
+)
+def test_quantization_target(target, expected):
+    assert quantization_target(target, "Q8_0") == expected
+
+
+def test_quantize_workers_respects_cpu_and_memory():
+    gib = 1024**3
+    assert quantize_workers(3, 16 * gib, cpu_count=32, available_memory=256 * gib) == 3
+    assert quantize_workers(3, 16 * gib, cpu_count=8, available_memory=256 * gib) == 2
+    assert quantize_workers(3, 16 * gib, cpu_count=32, available_memory=20 * gib) == 1
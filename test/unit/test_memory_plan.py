@@ -0,0 +1,287 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ramalama.cli import plan_cli
+from ramalama.endian import GGUFEndian
+from ramalama.model_inspect.base_info import Tensor
+from ramalama.model_inspect.gguf_info import GGUFModelInfo
+from ramalama.model_inspect.memory_plan import (
+    ModelLayout,
+    footprints,
+    host_budgets,
+    parse_ngl,
+    plan_memory,
+    tensor_bytes,
+)
+from ramalama.plugins.runtimes.inference.llama_cpp import LlamaCppPlugin
+
+MIB = 1024 * 1024
+
+METADATA = {
+    "general.architecture": "llama",
+    "llama.block_count": 4,
+    "llama.context_length": 8192,
+    "llama.embedding_length": 256,
+    "llama.vocab_size": 1000,
+    "llama.attention.head_count": 4,
+    "llama.attention.head_count_kv": 4,
+}
+
+# an f16 tensor of 1 MiB
+MIB_F16 = [256, 2048]
+
+
+def gguf(tensors: list[tuple[str, list[int], str]], metadata=None, path="/models/model.gguf") -> GGUFModelInfo:
+    parsed = []
+    offset = 0
+    for name, dimensions, tensor_type in tensors:
+        parsed.append(Tensor(name, len(dimensions), dimensions, tensor_type, offset))
+        offset += tensor_bytes(dimensions, tensor_type) or MIB
+    return GGUFModelInfo("model", "file", path, 3, metadata or METADATA, parsed, GGUFEndian.LITTLE)
+
+
+def dense_tensors(layers=range(4)):
+    return [(f"blk.{i}.attn_q.weight", MIB_F16, "GGML_TYPE_F16") for i in layers]
+
+
+def dense_model() -> GGUFModelInfo:
+    return gguf(
+        [("token_embd.weight", MIB_F16, "GGML_TYPE_F16")]
+        + dense_tensors()
+        + [("output.weight", MIB_F16, "GGML_TYPE_F16")]
+    )
+
+
+def moe_model() -> GGUFModelInfo:
+    experts = [(f"blk.{i}.ffn_up_exps.weight", [256, 2048, 4], "GGML_TYPE_F16") for i in range(4)]
+    return gguf(dense_tensors() + experts + [("output.weight", MIB_F16, "GGML_TYPE_F16")])
+
+
+@pytest.mark.parametrize(
+    "dimensions,tensor_type,expected",
+    [
+        ([256, 2048], "GGML_TYPE_F16", MIB),
+        ([256, 256], "GGML_TYPE_Q4_K", 256 * 144),
+        ([33], "GGML_TYPE_Q8_0", 2 * 34),
+        ([256], "GGML_TYPE_UNKNOWN", None),
+    ],
+)
+def test_tensor_bytes(dimensions, tensor_type, expected):
+    assert tensor_bytes(dimensions, tensor_type) == expected
+
+
+def test_layout_from_gguf():
+    layout = ModelLayout.from_gguf([dense_model()])
+
+    assert layout.layers == 4
+    assert layout.layer_bytes == [MIB] * 4
+    assert (layout.output_bytes, layout.other_bytes, layout.weights) == (MIB, MIB, 6 * MIB)
+    # 4 KV heads * (64 + 64) head dims * 2 bytes
+    assert layout.kv_bytes_per_token == [1024] * 4
+    assert not layout.is_moe
+
+
+def test_layout_of_split_model():
+    parts = [gguf(dense_tensors(range(2))), gguf(dense_tensors(range(2, 4)), path="/models/model-00002.gguf")]
+
+    assert ModelLayout.from_gguf(parts).layer_bytes == [MIB] * 4
+
+
+def test_layout_sizes_unknown_types_by_offset():
+    part = gguf(dense_tensors())
+    part.Tensors[0].type = "GGML_TYPE_UNKNOWN"
+
+    assert ModelLayout.from_gguf([part]).layer_bytes == [MIB] * 4
+
+
+def test_layout_requires_block_count():
+    with pytest.raises(ValueError):
+        ModelLayout.from_gguf([gguf([], {"general.architecture": "clip"})])
+
+
+def test_plan_without_gpu_budget_uses_trained_context():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), 1024 * MIB)
+
+    assert plan.fits
+    assert (plan.ctx_size, plan.ngl, plan.ncmoe) == (8192, None, 0)
+    assert plan.gpu.total == 0
+    assert plan.host.weights == 6 * MIB
+    assert plan.host.kv_cache == 4 * 1024 * 8192
+
+
+def test_cpu_plan_shrinks_context_to_host_memory():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), 40 * MIB)
+
+    assert plan.fits
+    assert plan.ctx_size == 4096
+    assert plan.host.total <= 40 * MIB
+
+
+def test_plan_without_gpu_budget_leaves_offload_to_llama_cpp():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), 64 << 30, 0)
+
+    assert plan.ngl_option is None
+    assert "--ngl" not in plan.options()
+    # the context is sized as if the whole model were in host memory
+    assert plan.host.weights == 6 * MIB
+
+
+def test_plan_without_host_budget_uses_trained_context():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), None)
+
+    assert plan.fits
+    assert plan.ctx_size == 8192
+    assert "Budget: unknown host, 0.00 GiB GPU" in plan.serialize()
+
+
+def test_host_budget_is_unknown_without_available_memory():
+    with (
+        patch("ramalama.model_inspect.memory_plan.get_available_memory", return_value=None),
+        patch("ramalama.model_inspect.memory_plan.get_gpu_memory", return_value=None),
+    ):
+        assert host_budgets() == (None, 0)
+
+
+def test_plan_that_does_not_fit():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), MIB)
+
+    assert not plan.fits
+    assert plan.ctx_size == 2048
+
+
+def test_gpu_plan_offloads_everything():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), 1024 * MIB, 1024 * MIB)
+
+    assert plan.options() == ["--ctx-size", "8192", "--ngl", "all"]
+    assert plan.gpu.weights == 5 * MIB
+    assert plan.host.weights == MIB
+    assert plan.host.kv_cache == 0
+
+
+def test_gpu_plan_offloads_the_layers_that_fit():
+    layout = ModelLayout.from_gguf([dense_model()])
+    gpu_budget = 20 * MIB
+
+    plan = plan_memory(layout, 1024 * MIB, gpu_budget)
+
+    assert plan.fits
+    assert 0 < plan.ngl <= layout.layers
+    assert plan.gpu.total <= gpu_budget
+    assert footprints(layout, plan.ctx_size, plan.ngl + 1, 0)[0].total > gpu_budget
+    # a longer context never costs layers on the GPU
+    assert plan.ngl == plan_memory(layout, 1024 * MIB, gpu_budget, ctx_size=2048).ngl
+
+
+def test_moe_plan_moves_experts_before_layers():
+    layout = ModelLayout.from_gguf([moe_model()])
+    assert layout.is_moe
+
+    plan = plan_memory(layout, 1024 * MIB, 28 * MIB, ctx_size=2048)
+
+    assert plan.fits
+    assert plan.ngl_option == "all"
+    assert 0 < plan.ncmoe < layout.layers
+    assert plan.options()[-2:] == ["--ncmoe", str(plan.ncmoe)]
+
+
+def test_fixed_options_are_kept():
+    layout = ModelLayout.from_gguf([moe_model()])
+
+    plan = plan_memory(layout, 1024 * MIB, ctx_size=4096, ngl=2, ncmoe=1)
+
+    assert (plan.ctx_size, plan.ngl, plan.ncmoe) == (4096, 2, 1)
+    assert plan.fits
+
+
+def test_plan_serializes_to_json():
+    plan = plan_memory(ModelLayout.from_gguf([dense_model()]), 1024 * MIB)
+
+    data = json.loads(plan.serialize(json_output=True))
+
+    assert data["options"] == ["--ctx-size", "8192"]
+    assert data["host"]["weights"] == 6 * MIB
+
+
+@pytest.mark.parametrize("value,expected", [(None, None), ("auto", None), ("all", 5), ("-1", 5), ("3", 3), (2, 2)])
+def test_parse_ngl(value, expected):
+    assert parse_ngl(value, 4) == expected
+
+
+def test_inspect_plan_with_budgets():
+    model = MagicMock()
+    model.gguf_parts.return_value = [dense_model()]
+    args = SimpleNamespace(ctx_size=None, ngl=None, ncmoe=None, memory=1024 * MIB, gpu_memory=1024 * MIB, json=False)
+
+    with patch("ramalama.cli.host_budgets", return_value=(0, 0)):
+        output = plan_cli(args, model)
+
+    assert "Budget: 1.00 GiB host, 1.00 GiB GPU" in output
+    assert "Options: --ctx-size 8192 --ngl all" in output
+
+
+class TestApplyMemoryPlan:
+    @pytest.fixture
+    def model(self):
+        model = MagicMock()
+        model.model = "model"
+        model.gguf_parts.return_value = [dense_model()]
+        return model
+
+    @staticmethod
+    def args(**kwargs):
+        return SimpleNamespace(**({"ctx_size": "auto", "ngl": None, "ncmoe": None, "dryrun": False} | kwargs))
+
+    def test_plans_auto_options(self, model):
+        args = self.args()
+
+        with patch("ramalama.plugins.runtimes.inference.llama_cpp.host_budgets", return_value=(40 * MIB, 0)):
+            LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        assert (args.ctx_size, args.ngl, args.ncmoe) == (4096, None, None)
+
+    def test_unknown_gpu_budget_keeps_ngl(self, model):
+        # Metal, Vulkan and other GPUs whose memory is not read leave the offload to llama.cpp
+        args = self.args(ngl=None)
+
+        with patch("ramalama.plugins.runtimes.inference.llama_cpp.host_budgets", return_value=(64 << 30, 0)):
+            LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        assert args.ctx_size == 8192
+        assert args.ngl is None
+
+    def test_unknown_host_memory_uses_trained_context(self, model, capsys):
+        # macOS reports no available memory, which must not plan the context against 0 bytes
+        args = self.args()
+
+        with patch("ramalama.plugins.runtimes.inference.llama_cpp.host_budgets", return_value=(None, 0)):
+            LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        assert args.ctx_size == 0
+        assert "does not fit" not in capsys.readouterr().err
+
+    def test_explicit_ngl_is_kept(self, model):
+        args = self.args(ngl="all", ncmoe="auto")
+
+        with patch("ramalama.plugins.runtimes.inference.llama_cpp.host_budgets", return_value=(1024 * MIB, 0)):
+            LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        assert (args.ctx_size, args.ngl, args.ncmoe) == (8192, "all", 0)
+
+    def test_without_auto_options_nothing_is_planned(self, model):
+        args = self.args(ctx_size=2048)
+
+        LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        model.gguf_parts.assert_not_called()
+        assert args.ctx_size == 2048
+
+    def test_falls_back_to_model_defaults(self, model):
+        model.gguf_parts.side_effect = ValueError("not a GGUF model")
+        args = self.args(ncmoe="auto")
+
+        LlamaCppPlugin()._apply_memory_plan(args, model)
+
+        assert (args.ctx_size, args.ncmoe) == (0, None)
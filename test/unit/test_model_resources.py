@@ -0,0 +1,95 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from ramalama.model_resources import MIB, ModelResources, container_port, kv_cache_bytes
+
+LLAMA_METADATA = {
+    "general.architecture": "llama",
+    "llama.block_count": 32,
+    "llama.context_length": 8192,
+    "llama.embedding_length": 4096,
+    "llama.attention.head_count": 32,
+    "llama.attention.head_count_kv": 8,
+}
+
+
+def write_gguf(path, metadata: dict) -> None:
+    """A GGUF file with string and uint32 metadata and no tensors."""
+    with open(path, "wb") as f:
+        f.write(b"GGUF" + struct.pack("<IQQ", 3, 0, len(metadata)))
+        for key, value in metadata.items():
+            f.write(struct.pack("<Q", len(key)) + key.encode())
+            if isinstance(value, str):
+                f.write(struct.pack("<IQ", 8, len(value)) + value.encode())
+            else:
+                f.write(struct.pack("<II", 4, value))
+
+
+def test_kv_cache_bytes_for_ctx_size():
+    # 32 layers * 8 KV heads * (128 + 128) head dims * 4096 tokens * 2 bytes
+    assert kv_cache_bytes(LLAMA_METADATA, 4096) == 512 * MIB
+
+
+def test_kv_cache_bytes_defaults_to_trained_context():
+    assert kv_cache_bytes(LLAMA_METADATA) == 1024 * MIB
+
+
+def test_kv_cache_bytes_per_layer_head_counts():
+    metadata = LLAMA_METADATA | {
+        "llama.block_count": 4,
+        "llama.attention.head_count_kv": [8, 0, 8, 0],
+        "llama.attention.key_length": 64,
+        "llama.attention.value_length": 64,
+    }
+    assert kv_cache_bytes(metadata, 1024) == 16 * 128 * 1024 * 2
+
+
+def test_kv_cache_bytes_without_attention_layout():
+    assert kv_cache_bytes({"general.architecture": "clip"}, 4096) == 0
+
+
+def test_estimate_reads_local_gguf(tmp_path, monkeypatch):
+    monkeypatch.setattr("ramalama.model_resources.runtime_health_path", lambda: "/health")
+    model = tmp_path / "model.gguf"
+    write_gguf(model, LLAMA_METADATA)
+    with open(model, "ab") as f:
+        f.truncate(3000 * MIB)
+
+    resources = ModelResources.estimate([str(model)], SimpleNamespace(ctx_size=4096, threads=4))
+
+    assert resources is not None
+    assert resources.weights == 3000 * MIB
+    assert resources.kv_cache == 512 * MIB
+    assert resources.memory_request_mib == 4376
+    assert resources.memory_limit_mib == 5470
+    assert resources.cpus == 4
+    assert (resources.startup_seconds, resources.startup_failure_threshold) == (60, 6)
+    assert resources.health_path == "/health"
+
+
+def test_estimate_scales_startup_with_model_size(tmp_path, monkeypatch):
+    monkeypatch.setattr("ramalama.model_resources.runtime_health_path", lambda: None)
+    parts = [tmp_path / "model-00001-of-00002.safetensors", tmp_path / "model-00002-of-00002.safetensors"]
+    for part in parts:
+        with open(part, "wb") as f:
+            f.truncate(10 * 1024 * MIB)
+
+    resources = ModelResources.estimate([str(part) for part in parts], SimpleNamespace())
+
+    assert resources is not None
+    assert resources.kv_cache == 0
+    assert resources.cpus is None
+    # 20 GiB at 100 MiB/s, rounded up to whole probe periods
+    assert resources.startup_seconds == 210
+
+
+@pytest.mark.parametrize("model_files", [[], ["oci://quay.io/ramalama/tinyllama:latest"], ["/nonexistent/model"]])
+def test_estimate_unknown_size(model_files):
+    assert ModelResources.estimate(model_files, SimpleNamespace()) is None
+
+
+@pytest.mark.parametrize("port,expected", [(None, None), ("8080", "8080"), ("8080:3000", "8080")])
+def test_container_port(port, expected):
+    assert container_port(SimpleNamespace(port=port)) == expected
@@ -11,6 +11,7 @@ from ramalama.model_store.snapshot_file import (
     SnapshotFileType,
     validate_snapshot_files,
 )
+from ramalama.model_store.staging import stage_snapshot
 from ramalama.model_store.store import ModelStore
 from ramalama.model_store.template_conversion import wrap_template_with_messages_loop
 
@@ -112,3 +113,57 @@ def test_local_snapshot_file_binary_download_and_digest(tmp_path):
 
     # Assert: digest matches generate_sha256_binary(content)
     assert snapshot_file.hash == expected_digest
+
+
+class _RecordingEngine:
+    def __init__(self):
+        self.exec_args: list[str] = []
+
+    def add(self, newargs):
+        self.exec_args.extend(newargs)
+
+    def add_volume(self, src, dest, *, opts="ro"):
+        self.exec_args += ["-v", f"{src}:{dest}:{opts}"]
+
+    def relabel(self):
+        return ""
+
+
+def _store_with_files(tmp_path, names):
+    model_store = ModelStore(GlobalModelStore(str(tmp_path)), model_name="m", model_type="file", model_organization="o")
+    model_store.ensure_directory_setup()
+    files = []
+    for i, name in enumerate(names):
+        blob_hash = f"sha256-{i:064d}"
+        with open(model_store.get_blob_file_path(blob_hash), "w") as f:
+            f.write(name)
+        files.append(StoreFile(blob_hash, name, StoreFileType.SAFETENSOR_MODEL))
+    ref_path = model_store.get_ref_file_path("latest")
+    os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+    RefJSONFile(hash="snap", path=ref_path, files=files).write_to_file()
+    return model_store
+
+
+def test_stage_snapshot_bind_mounts_blobs(tmp_path):
+    model_store = _store_with_files(tmp_path, ["model.safetensors", "config.json"])
+    engine = _RecordingEngine()
+
+    with stage_snapshot(model_store, "latest", engine, "/model") as method:
+        assert method == "bind mount"
+
+    blob = model_store.get_blob_file_path(f"sha256-{0:064d}")
+    assert f"--mount=type=bind,src={blob},destination=/model/model.safetensors,ro" in engine.exec_args
+    assert len(engine.exec_args) == 2
+
+
+def test_stage_snapshot_links_when_names_cannot_be_mounted(tmp_path):
+    model_store = _store_with_files(tmp_path, ["model.safetensors", "weird,name.json"])
+    engine = _RecordingEngine()
+
+    with stage_snapshot(model_store, "latest", engine, "/model") as method:
+        assert method == "2 hardlink"
+        srcdir = engine.exec_args[1].split(":")[0]
+        staged = os.path.join(srcdir, "weird,name.json")
+        assert os.stat(staged).st_ino == os.stat(model_store.get_blob_file_path(f"sha256-{1:064d}")).st_ino
+
+    assert not os.path.exists(srcdir)
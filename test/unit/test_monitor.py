@@ -0,0 +1,130 @@
+import json
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ramalama.monitor import ContainerEventStream, ProcessExitWatcher, ServerMonitor, parse_event
+
+
+def fake_events(*events, linger=30):
+    """Command that emits events like `podman events --format json`, then stays attached."""
+    lines = "\n".join(json.dumps(event) for event in events)
+    script = f"import sys, time\nprint({lines!r}, flush=True)\ntime.sleep({linger})"
+    return [sys.executable, "-c", script]
+
+
+def podman_event(status, name="thecontainer", **extra):
+    return {"Type": "container", "Status": status, "Name": name, **extra}
+
+
+@pytest.fixture
+def running_container():
+    result = subprocess.CompletedProcess([], 0, stdout="running\n0\n", stderr="")
+    with patch("ramalama.monitor.subprocess.run", return_value=result) as mock_run:
+        yield mock_run
+
+
+@pytest.mark.parametrize(
+    "line, status, exit_code, health",
+    [
+        (json.dumps(podman_event("died", ContainerExitCode=137)), "died", 137, None),
+        (json.dumps(podman_event("health_status", HealthStatus="healthy")), "health_status", None, "healthy"),
+        (
+            json.dumps({"Type": "container", "Action": "die", "Actor": {"Attributes": {"name": "c", "exitCode": "1"}}}),
+            "die",
+            1,
+            None,
+        ),
+        (
+            json.dumps({"Type": "container", "Action": "health_status: unhealthy", "Actor": {"Attributes": {}}}),
+            "health_status",
+            None,
+            "unhealthy",
+        ),
+    ],
+)
+def test_parse_event(line, status, exit_code, health):
+    event = parse_event(line)
+    assert (event.status, event.exit_code, event.health) == (status, exit_code, health)
+
+
+def test_parse_event_ignores_other_types_and_garbage():
+    assert parse_event(json.dumps({"Type": "image", "Status": "pull"})) is None
+    assert parse_event("not json") is None
+
+
+def test_event_stream_filters_other_containers():
+    command = fake_events(podman_event("start", name="other"), podman_event("died", ContainerExitCode=3), linger=0)
+    stream = ContainerEventStream("podman", "thecontainer", command).start()
+    events = list(stream)
+    stream.stop()
+    assert [(e.status, e.exit_code) for e in events] == [("died", 3)]
+
+
+def test_container_death_reported_from_event_stream(running_container):
+    monitor = ServerMonitor(
+        container_name="thecontainer",
+        container_engine="podman",
+        events_command=fake_events(podman_event("start"), podman_event("died", ContainerExitCode=137)),
+    )
+    monitor.start(interrupt_main=False)
+    assert monitor.wait_for_change(10)
+    monitor.stop()
+    assert monitor.get_exit_info() == {"name": "thecontainer", "type": "container", "status": "exited", "code": 137}
+    # one inspect to catch an exit before the stream attached, never one per check
+    running_container.assert_called_once()
+
+
+def test_health_transition_from_event_stream(running_container):
+    monitor = ServerMonitor(
+        container_name="thecontainer",
+        container_engine="podman",
+        events_command=fake_events(podman_event("health_status", HealthStatus="healthy")),
+    )
+    monitor.start(interrupt_main=False)
+    for _ in range(100):
+        if monitor.health == "healthy":
+            break
+        monitor.wait_for_change(0.1)
+    monitor.stop()
+    assert monitor.health == "healthy"
+    assert not monitor.is_exited()
+
+
+def test_stop_ends_event_stream_promptly(running_container):
+    monitor = ServerMonitor(container_name="thecontainer", container_engine="podman", events_command=fake_events())
+    monitor.start(interrupt_main=False)
+    monitor.stop()
+    assert not monitor._monitor_thread.is_alive()
+    assert not monitor.is_exited()
+
+
+def test_process_exit_watcher_returns_exit_code():
+    process = subprocess.Popen([sys.executable, "-c", "raise SystemExit(7)"])
+    assert ProcessExitWatcher(process).wait() == 7
+
+
+def test_process_exit_watcher_stop():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    watcher = ProcessExitWatcher(process)
+    result = []
+    try:
+        thread = threading.Thread(target=lambda: result.append(watcher.wait()))
+        thread.start()
+        watcher.stop()
+        thread.join(5)
+        assert result == [None]
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_process_monitor_reports_exit():
+    process = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+    monitor = ServerMonitor(server_process=process)
+    monitor.start(interrupt_main=False)
+    assert monitor.wait_for_change(10)
+    assert monitor.get_exit_info() == {"pid": process.pid, "type": "exit", "code": 3}
@@ -0,0 +1,297 @@
+import hashlib
+import json
+import threading
+import urllib.error
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import pytest
+
+from ramalama.model_store.global_store import GlobalModelStore
+from ramalama.model_store.snapshot_file import LocalSnapshotFile, SnapshotFileType
+from ramalama.model_store.store import ModelStore
+from ramalama.transports.oci import spec as oci_spec
+from ramalama.transports.oci.oci_artifact import (
+    OCIRegistryClient,
+    _build_snapshot_files,
+    push_oci_artifact,
+    registry_auth,
+)
+
+
+class FakeRegistry:
+    """In-memory subset of the distribution API implemented by registry:2."""
+
+    def __init__(self):
+        self.blobs: dict[str, dict[str, bytes]] = {}
+        self.manifests: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, bytearray] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.ranges: list[str] = []
+        self.support_ranges = True
+        self.fail_ranges_from: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def repo_blobs(self, repo: str) -> dict[str, bytes]:
+        return self.blobs.setdefault(repo, {})
+
+
+def _make_handler(registry: FakeRegistry):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _route(self):
+            url = urllib.parse.urlsplit(self.path)
+            with registry.lock:
+                registry.requests.append((self.command, url.path))
+            return url.path, dict(urllib.parse.parse_qsl(url.query))
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def _reply(self, code: int, headers=None, body: bytes = b""):
+            self.send_response(code)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _split(self, path: str, marker: str) -> tuple[str, str]:
+            repo, _, rest = path.removeprefix("/v2/").partition(marker)
+            return repo, rest
+
+        def do_HEAD(self):
+            path, _ = self._route()
+            repo, digest = self._split(path, "/blobs/")
+            if digest in registry.repo_blobs(repo):
+                self._reply(200, {"Docker-Content-Digest": digest})
+            else:
+                self._reply(404)
+
+        def do_GET(self):
+            path, _ = self._route()
+            if "/manifests/" in path:
+                repo, ref = self._split(path, "/manifests/")
+                body = registry.manifests.get((repo, ref))
+                if body is None:
+                    return self._reply(404)
+                return self._reply(200, {"Content-Type": oci_spec.OCI_MANIFEST_MEDIA_TYPE}, body)
+            repo, digest = self._split(path, "/blobs/")
+            body = registry.repo_blobs(repo).get(digest)
+            if body is None:
+                return self._reply(404)
+            byte_range = self.headers.get("Range")
+            if not byte_range or not registry.support_ranges:
+                return self._reply(200, {}, body)
+            start, end = (int(value) for value in byte_range.removeprefix("bytes=").split("-"))
+            with registry.lock:
+                registry.ranges.append(byte_range)
+            if registry.fail_ranges_from is not None and start >= registry.fail_ranges_from:
+                return self._reply(500)
+            headers = {"Content-Range": f"bytes {start}-{end}/{len(body)}"}
+            self._reply(206, headers, body[start : end + 1])
+
+        def do_POST(self):
+            path, query = self._route()
+            self._body()
+            repo, _ = self._split(path, "/blobs/uploads/")
+            digest, source = query.get("mount"), query.get("from")
+            if digest and source and digest in registry.repo_blobs(source):
+                registry.repo_blobs(repo)[digest] = registry.repo_blobs(source)[digest]
+                return self._reply(201, {"Location": f"/v2/{repo}/blobs/{digest}"})
+            session = uuid.uuid4().hex
+            registry.uploads[session] = bytearray()
+            self._reply(202, {"Location": f"/v2/{repo}/blobs/uploads/{session}?_state=x"})
+
+        def do_PATCH(self):
+            path, _ = self._route()
+            repo, session = self._split(path, "/blobs/uploads/")
+            buffer = registry.uploads[session]
+            start = int(self.headers["Content-Range"].split("-")[0])
+            if start != len(buffer):
+                return self._reply(416)
+            buffer.extend(self._body())
+            self._reply(202, {"Location": f"/v2/{repo}/blobs/uploads/{session}?_state=y"})
+
+        def do_PUT(self):
+            path, query = self._route()
+            body = self._body()
+            if "/manifests/" in path:
+                repo, ref = self._split(path, "/manifests/")
+                registry.manifests[(repo, ref)] = body
+                digest = f"sha256:{hashlib.sha256(body).hexdigest()}"
+                return self._reply(201, {"Docker-Content-Digest": digest})
+            repo, session = self._split(path, "/blobs/uploads/")
+            data = bytes(registry.uploads.pop(session)) + body
+            digest = query["digest"]
+            if f"sha256:{hashlib.sha256(data).hexdigest()}" != digest:
+                return self._reply(400)
+            registry.repo_blobs(repo)[digest] = data
+            self._reply(201, {"Location": f"/v2/{repo}/blobs/{digest}"})
+
+    return Handler
+
+
+@pytest.fixture
+def fake_registry():
+    registry = FakeRegistry()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(registry))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    registry.host = f"127.0.0.1:{server.server_address[1]}"
+    yield registry
+    server.shutdown()
+    server.server_close()
+
+
+MODEL_CONTENT = bytes(range(256)) * 40
+TEMPLATE_CONTENT = b"{{ messages }}"
+
+
+@pytest.fixture
+def model_store(tmp_path):
+    store = ModelStore(GlobalModelStore(str(tmp_path)), "tiny", "ollama", "library")
+    store.new_snapshot(
+        "latest",
+        "sha256-snapshot",
+        [
+            LocalSnapshotFile(MODEL_CONTENT, "tiny.gguf", SnapshotFileType.GGUFModel),
+            LocalSnapshotFile(TEMPLATE_CONTENT, "chat_template", SnapshotFileType.Other),
+        ],
+        verify=False,
+    )
+    return store
+
+
+def _push(registry, store, repo="models/tiny", **kwargs):
+    kwargs.setdefault("chunk_size", 1024)
+    return push_oci_artifact(
+        reference=f"{registry.host}/{repo}:v1",
+        model_store=store,
+        model_tag="latest",
+        tls_verify=False,
+        **kwargs,
+    )
+
+
+def test_push_uploads_chunked_blobs_and_manifest_last(fake_registry, model_store):
+    digest = _push(fake_registry, model_store)
+
+    body = fake_registry.manifests[("models/tiny", "v1")]
+    assert digest == f"sha256:{hashlib.sha256(body).hexdigest()}"
+    manifest = oci_spec.Manifest.from_dict(json.loads(body))
+    assert [layer.filepath() for layer in manifest.layers] == ["tiny.gguf", "chat_template"]
+    assert manifest.layers[0].media_type == "application/vnd.cncf.model.weight.v1.raw"
+
+    blobs = fake_registry.repo_blobs("models/tiny")
+    assert blobs[manifest.layers[0].digest] == MODEL_CONTENT
+    assert blobs[manifest.layers[1].digest] == TEMPLATE_CONTENT
+    config = json.loads(blobs[manifest.config.digest])
+    assert config["modelfs"]["diffIds"] == [layer.digest for layer in manifest.layers]
+
+    methods = [method for method, _ in fake_registry.requests]
+    assert methods.count("PATCH") == len(MODEL_CONTENT) // 1024
+    assert fake_registry.requests[-1] == ("PUT", "/v2/models/tiny/manifests/v1")
+
+
+def test_push_skips_existing_blobs(fake_registry, model_store):
+    _push(fake_registry, model_store)
+    fake_registry.requests.clear()
+
+    _push(fake_registry, model_store)
+
+    assert {method for method, _ in fake_registry.requests} == {"HEAD", "PUT"}
+    assert [path for method, path in fake_registry.requests if method == "PUT"] == ["/v2/models/tiny/manifests/v1"]
+
+
+def test_push_mounts_blobs_from_other_repository(fake_registry, model_store):
+    _push(fake_registry, model_store)
+    fake_registry.requests.clear()
+
+    _push(fake_registry, model_store, repo="models/copy", mount_from=["models/tiny"])
+
+    assert "PATCH" not in {method for method, _ in fake_registry.requests}
+    assert fake_registry.repo_blobs("models/copy") == fake_registry.repo_blobs("models/tiny")
+
+
+def test_pushed_artifact_round_trips_through_pull(fake_registry, model_store):
+    _push(fake_registry, model_store)
+
+    client = OCIRegistryClient(fake_registry.host, "models/tiny", "v1", scheme="http")
+    manifest, _ = client.get_manifest()
+    assert oci_spec.is_cncf_artifact_manifest(manifest)
+    assert [f.name for f in _build_snapshot_files(client, manifest)] == ["tiny.gguf", "chat_template"]
+
+
+def test_registry_auth_prefers_repository_entry(tmp_path):
+    authfile = tmp_path / "auth.json"
+    authfile.write_text(json.dumps({"auths": {"quay.io": {"auth": "cmVnOnB3"}, "quay.io/org": {"auth": "b3JnOnB3"}}}))
+
+    assert registry_auth("quay.io", "org/model", str(authfile)) == "b3JnOnB3"
+    assert registry_auth("quay.io", "other/model", str(authfile)) == "cmVnOnB3"
+    assert registry_auth("docker.io", "other/model", str(authfile)) is None
+
+
+def _client(registry, repo="models/tiny", part_size=1024):
+    return OCIRegistryClient(registry.host, repo, "v1", scheme="http", part_size=part_size)
+
+
+def _seed_blob(registry, data: bytes, repo="models/tiny") -> str:
+    digest = f"sha256:{hashlib.sha256(data).hexdigest()}"
+    registry.repo_blobs(repo)[digest] = data
+    return digest
+
+
+def test_download_blob_fetches_ranges_in_parallel(fake_registry, tmp_path):
+    digest = _seed_blob(fake_registry, MODEL_CONTENT)
+    dest = tmp_path / "blobs" / "model"
+
+    _client(fake_registry).download_blob(digest, str(dest), size=len(MODEL_CONTENT))
+
+    assert dest.read_bytes() == MODEL_CONTENT
+    assert len(fake_registry.ranges) == len(MODEL_CONTENT) // 1024
+    assert list(tmp_path.joinpath("blobs").iterdir()) == [dest]
+
+
+def test_download_blob_resumes_from_journal(fake_registry, tmp_path):
+    digest = _seed_blob(fake_registry, MODEL_CONTENT)
+    dest = tmp_path / "model"
+    fake_registry.fail_ranges_from = 4096
+
+    with pytest.raises(urllib.error.HTTPError):
+        _client(fake_registry).download_blob(digest, str(dest), size=len(MODEL_CONTENT))
+    assert not dest.exists()
+    assert json.loads((tmp_path / "model.partial.json").read_text())["done"] == [0, 1, 2, 3]
+
+    fake_registry.fail_ranges_from = None
+    fake_registry.ranges.clear()
+    _client(fake_registry).download_blob(digest, str(dest), size=len(MODEL_CONTENT))
+
+    assert dest.read_bytes() == MODEL_CONTENT
+    assert sorted(int(r.split("=")[1].split("-")[0]) for r in fake_registry.ranges) == list(range(4096, 10240, 1024))
+    assert not (tmp_path / "model.partial.json").exists()
+
+
+def test_download_blob_falls_back_without_range_support(fake_registry, tmp_path):
+    digest = _seed_blob(fake_registry, MODEL_CONTENT)
+    fake_registry.support_ranges = False
+    dest = tmp_path / "model"
+
+    _client(fake_registry).download_blob(digest, str(dest), size=len(MODEL_CONTENT))
+
+    assert dest.read_bytes() == MODEL_CONTENT
+
+
+def test_download_blob_rejects_digest_mismatch(fake_registry, tmp_path):
+    digest = f"sha256:{hashlib.sha256(b'other').hexdigest()}"
+    fake_registry.repo_blobs("models/tiny")[digest] = TEMPLATE_CONTENT
+    dest = tmp_path / "template"
+
+    with pytest.raises(ValueError, match="Digest mismatch"):
+        _client(fake_registry).download_blob(digest, str(dest), size=len(TEMPLATE_CONTENT))
+    assert list(tmp_path.iterdir()) == []
@@ -1,4 +1,5 @@
 import json
+import os
 import subprocess
 from datetime import datetime, timedelta
 from types import SimpleNamespace
@@ -125,3 +126,100 @@ def test_engine_supports_manifest_attributes_uses_semver(monkeypatch):
 
     monkeypatch.setattr(oci_tools, "engine_version", lambda engine: SemVer(4, 9, 9))
     assert oci_tools.engine_supports_manifest_attributes("podman") is False
+
+
+def _artifact_ls_output(count: int) -> str:
+    return "".join(
+        f'{{"name":"oci://localhost/artifact{i}:latest","created":"2026-01-01 00:00:00 +0000",'
+        f'"size":"1KB","ID":"sha256:{i}"}},'
+        for i in range(count)
+    )
+
+
+def _artifact_inspect(artifact_type: str) -> dict:
+    return {"Manifest": {"artifactType": artifact_type}}
+
+
+def test_list_artifacts_inspects_all_artifacts_in_one_call(monkeypatch):
+    calls = []
+
+    def fake_run_cmd(args, **kwargs):
+        calls.append(args)
+        if args[:3] == ["podman", "artifact", "ls"]:
+            return _result(_artifact_ls_output(3))
+        if args[:3] == ["podman", "artifact", "inspect"]:
+            payload = [
+                _artifact_inspect(oci_tools.oci_annotations.ArtifactTypeModelManifest),
+                _artifact_inspect("application/vnd.other"),
+                _artifact_inspect(oci_tools.oci_annotations.ArtifactTypeModelManifest),
+            ]
+            return _result(json.dumps(payload))
+        raise AssertionError(f"Unexpected command: {args}")
+
+    monkeypatch.setattr(oci_tools, "run_cmd", fake_run_cmd)
+
+    models = oci_tools.list_artifacts(EngineArgs(engine="podman"))
+
+    assert [m["name"] for m in models] == ["oci://localhost/artifact0:latest", "oci://localhost/artifact2:latest"]
+    assert calls[1] == ["podman", "artifact", "inspect", "sha256:0", "sha256:1", "sha256:2"]
+    assert len(calls) == 2
+
+
+def test_list_artifacts_falls_back_to_single_inspects(monkeypatch):
+    def fake_run_cmd(args, **kwargs):
+        if args[:3] == ["podman", "artifact", "ls"]:
+            return _result(_artifact_ls_output(3))
+        if args[:3] == ["podman", "artifact", "inspect"]:
+            if len(args) > 4:
+                raise subprocess.CalledProcessError(125, args)
+            artifact_type = oci_tools.oci_annotations.ArtifactTypeModelManifest
+            if args[3] == "sha256:1":
+                artifact_type = "application/vnd.other"
+            return _result(json.dumps(_artifact_inspect(artifact_type)))
+        raise AssertionError(f"Unexpected command: {args}")
+
+    monkeypatch.setattr(oci_tools, "run_cmd", fake_run_cmd)
+
+    models = oci_tools.list_artifacts(EngineArgs(engine="podman"))
+
+    assert [m["name"] for m in models] == ["oci://localhost/artifact0:latest", "oci://localhost/artifact2:latest"]
+
+
+def test_list_models_uses_cache_until_storage_changes(monkeypatch, tmp_path):
+    graphroot = tmp_path / "storage"
+    (graphroot / "overlay-images").mkdir(parents=True)
+    images_json = graphroot / "overlay-images" / "images.json"
+    images_json.write_text("[]")
+    monkeypatch.setattr(oci_tools, "_podman_graphroot", lambda: str(graphroot))
+
+    calls = []
+    label_output = (
+        '{"name":"oci://localhost/demo:latest","modified":"2026-01-01 00:00:00 +0000","size":123,"ID":"sha256:a"},'
+    )
+
+    def fake_run_cmd(args, **kwargs):
+        calls.append(args)
+        if args[:4] == ["podman", "images", "--filter", "label=org.containers.type"]:
+            return _result(label_output)
+        return _result("")
+
+    monkeypatch.setattr(oci_tools, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(oci_tools, "engine_supports_manifest_attributes", lambda engine: False)
+    cache_dir = str(tmp_path / "cache")
+
+    first = oci_tools.list_models(EngineArgs(engine="podman"), cache_dir=cache_dir)
+    count = len(calls)
+    assert oci_tools.list_models(EngineArgs(engine="podman"), cache_dir=cache_dir) == first
+    assert len(calls) == count
+
+    os.utime(images_json, ns=(0, images_json.stat().st_mtime_ns + 1_000_000_000))
+    oci_tools.list_models(EngineArgs(engine="podman"), cache_dir=cache_dir)
+    assert len(calls) == 2 * count
+
+
+def test_podman_graphroot_honours_storage_conf(monkeypatch, tmp_path):
+    conf = tmp_path / "storage.conf"
+    conf.write_text('[storage]\ndriver = "overlay"\ngraphroot = "/srv/containers"\n')
+    monkeypatch.setenv("CONTAINERS_STORAGE_CONF", str(conf))
+
+    assert oci_tools._podman_graphroot() == "/srv/containers"
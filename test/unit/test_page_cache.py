@@ -0,0 +1,120 @@
+import os
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ramalama.daemon.service.model_runner import ManagedModel
+from ramalama.model_store import page_cache
+from ramalama.model_store.page_cache import PrewarmResult, evict, model_files, prewarm, start_prewarm
+from ramalama.transports.base import Transport
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    blobs = tmp_path / "blobs"
+    blobs.mkdir()
+    (blobs / "sha256-a").write_bytes(os.urandom(1000))
+    (blobs / "sha256-b").write_bytes(os.urandom(300))
+    snapshot = tmp_path / "snapshot"
+    snapshot.mkdir()
+    (snapshot / "model-00001-of-00002.gguf").symlink_to(blobs / "sha256-a")
+    (snapshot / "model-00002-of-00002.gguf").symlink_to(blobs / "sha256-b")
+    return tmp_path
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    monkeypatch.setattr(page_cache, "SEGMENT_SIZE", 256)
+    monkeypatch.setattr(page_cache, "READ_SIZE", 64)
+
+
+def test_model_files_resolves_links_and_directories(model_dir):
+    paths = [str(model_dir / "snapshot"), str(model_dir / "snapshot" / "model-00001-of-00002.gguf")]
+
+    files = model_files(paths)
+
+    assert files == {str(model_dir / "blobs" / "sha256-a"): 1000, str(model_dir / "blobs" / "sha256-b"): 300}
+
+
+def test_prewarm_reads_every_segment(model_dir, small_reads):
+    advice = []
+    with patch("os.posix_fadvise", side_effect=lambda fd, offset, length, how: advice.append((offset, length))):
+        result = prewarm([str(model_dir / "snapshot")], available_memory=1 << 30)
+
+    assert result is not None
+    assert result.size == 1300
+    # both files in 256 byte segments, each advised sequential and willneed
+    segments = [(0, 256), (256, 256), (512, 256), (768, 232), (0, 256), (256, 44)]
+    assert sorted(advice) == sorted(segments * 2)
+
+
+def test_prewarm_skips_models_larger_than_memory(model_dir):
+    assert prewarm([str(model_dir / "snapshot")], available_memory=1000) is None
+
+
+def test_prewarm_without_files(tmp_path):
+    assert prewarm([str(tmp_path / "missing")]) is None
+
+
+def test_evict_drops_pages(model_dir):
+    with patch("os.posix_fadvise") as fadvise:
+        assert evict([str(model_dir / "snapshot")]) == 1300
+
+    assert {call.args[1:] for call in fadvise.call_args_list} == {(0, 0, os.POSIX_FADV_DONTNEED)}
+
+
+def test_start_prewarm_reports_throughput(model_dir, capsys):
+    with patch.object(page_cache, "prewarm", return_value=PrewarmResult(3 * page_cache.GIB, 2.0)):
+        future = start_prewarm([str(model_dir / "snapshot")])
+        assert future.result(timeout=5).size == 3 * page_cache.GIB
+
+    assert "Prewarmed the model: 3.00 GiB in 2.0s (1536 MiB/s)" in capsys.readouterr().err
+
+
+def test_transport_prewarm_only_when_requested():
+    transport = MagicMock(spec=Transport)
+    transport.page_cache_paths.return_value = ["/models/model.gguf"]
+
+    with patch("ramalama.transports.base.start_prewarm") as start:
+        assert Transport.prewarm(transport, SimpleNamespace(prewarm=False, dryrun=False)) is None
+        assert Transport.prewarm(transport, SimpleNamespace(prewarm=True, dryrun=True)) is None
+        Transport.prewarm(transport, SimpleNamespace(prewarm=True, dryrun=False, quiet=True))
+
+    start.assert_called_once_with(["/models/model.gguf"], quiet=True)
+
+
+def test_detached_serve_waits_for_prewarm():
+    transport = MagicMock(spec=Transport)
+    transport.engine = MagicMock(exec_args=["podman", "run", "-d"])
+    prewarming: Future = Future()
+    transport.prewarm.return_value = prewarming
+    args = SimpleNamespace(container=True, dryrun=False, detach=True, subcommand="serve", noout=False, image="image")
+
+    with patch("ramalama.transports.base.run_cmd") as run_cmd:
+        threading.Timer(0.05, prewarming.set_result, [None]).start()
+        assert Transport.exec_model_in_container(transport, ["llama-server"], args)
+
+    run_cmd.assert_called_once()
+    assert prewarming.done()
+
+
+def test_managed_model_prewarms_on_start_and_evicts_on_stop():
+    model = MagicMock(model_name="tinyllama", model_tag="latest", model_organization="")
+    managed = ManagedModel(model, ["llama-server"], 8081, timedelta(seconds=30), ["/models/model.gguf"])
+
+    with (
+        patch("ramalama.daemon.service.model_runner.subprocess.Popen") as popen,
+        patch("ramalama.daemon.service.model_runner.ServerMonitor"),
+        patch("ramalama.daemon.service.model_runner.start_prewarm") as start,
+        patch("ramalama.daemon.service.model_runner.evict") as evict_pages,
+    ):
+        managed.start()
+        start.assert_called_once_with(["/models/model.gguf"], quiet=True)
+        managed.stop()
+
+    popen.return_value.terminate.assert_called_once()
+    evict_pages.assert_called_once_with(["/models/model.gguf"])
@@ -311,3 +311,32 @@ def test_quadlet_generate(input: Input, expected_files_path: Path, monkeypatch):
             del expected_files[file.filename]
 
     assert expected_files == dict()
+
+
+@pytest.mark.usefixtures("sized_model")
+def test_quadlet_generate_sized(monkeypatch):
+    """Memory reservation, limit and healthcheck are sized for a local model."""
+    model_src_blob = "sha256-2af3b81862c6be03c769683af18efdadb2c33f60ff32ab6f83e42c043d6c7816"
+    monkeypatch.setattr("os.path.exists", lambda path: path == model_src_blob)
+    monkeypatch.setattr(Quadlet, "_gen_env", lambda self, quadlet_file: None)
+    monkeypatch.setattr("ramalama.quadlet.get_accel", lambda: "cuda")
+
+    args = Args(port="8080")
+    args.ctx_size = 4096
+    expected_files_path = DATA_PATH / "sized"
+    generated = Quadlet(
+        "tinyllama",
+        (model_src_blob, "/mnt/models/tinyllama"),
+        None,
+        None,
+        args,
+        ["llama-server", "--port", "8080"],
+        False,
+        None,
+        None,
+    ).generate()
+
+    assert [file.filename for file in generated] == ["tinyllama.container"]
+    with io.StringIO() as sio:
+        generated[0]._write(sio)
+        assert sio.getvalue() == (expected_files_path / "tinyllama.container").read_text()
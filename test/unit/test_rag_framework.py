@@ -0,0 +1,149 @@
+import asyncio
+import importlib.util
+import sys
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent.parent / "container-images" / "scripts" / "rag_framework"
+
+
+@pytest.fixture(scope="module")
+def rag_framework():
+    # The script runs in the RAG container image, whose dependencies ramalama itself does not need
+    if sys.version_info < (3, 10):
+        pytest.skip("rag_framework requires Python 3.10")
+    for module in ("aiohttp", "fastapi", "openai", "qdrant_client", "uvicorn"):
+        pytest.importorskip(module)
+    loader = SourceFileLoader("rag_framework", str(SCRIPT))
+    spec = importlib.util.spec_from_loader("rag_framework", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def _session(response=None, error=None):
+    session = MagicMock()
+    if error is not None:
+        session.post.side_effect = error
+    else:
+        session.post.return_value.__aenter__.return_value = response
+    return session
+
+
+class TestLlamaCppEmbedder:
+    @pytest.mark.parametrize("error", [asyncio.TimeoutError(), KeyError("data"), RuntimeError("refused")])
+    def test_warmup_failure_is_not_fatal(self, rag_framework, error):
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080")
+        embedder._request = AsyncMock(side_effect=error)
+
+        asyncio.run(embedder.warmup())
+
+        embedder._request.assert_awaited_once_with("warmup")
+
+    @pytest.mark.parametrize(
+        "body", [{}, {"data": []}, {"data": [{"index": 0}]}, None], ids=["no-data", "empty", "no-embedding", "null"]
+    )
+    def test_unexpected_response_is_a_runtime_error(self, rag_framework, body):
+        response = MagicMock()
+        response.json = AsyncMock(return_value=body)
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080")
+        embedder._get_session = MagicMock(return_value=_session(response))
+
+        with pytest.raises(RuntimeError, match="unexpected response"):
+            asyncio.run(embedder._request("query"))
+
+    def test_timeout_is_a_runtime_error(self, rag_framework):
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080")
+        embedder._get_session = MagicMock(return_value=_session(error=asyncio.TimeoutError()))
+
+        with pytest.raises(RuntimeError, match="request failed"):
+            asyncio.run(embedder._request("query"))
+
+    def test_embedding_is_returned(self, rag_framework):
+        response = MagicMock()
+        response.json = AsyncMock(return_value={"data": [{"index": 0, "embedding": [0.5, 0.25]}]})
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080/")
+        session = _session(response)
+        embedder._get_session = MagicMock(return_value=session)
+
+        assert asyncio.run(embedder._request("query")) == [0.5, 0.25]
+        session.post.assert_called_once_with("http://embed:8080/v1/embeddings", json={"input": ["query"]})
+
+    def test_queries_differing_in_whitespace_share_a_cache_entry(self, rag_framework):
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080")
+        embedder._request = AsyncMock(return_value=[1.0])
+
+        async def embed():
+            return [await embedder.embed_query(q) for q in ("what is  ramalama", " what is ramalama\n")]
+
+        assert asyncio.run(embed()) == [[1.0], [1.0]]
+        embedder._request.assert_awaited_once_with("what is ramalama")
+
+    def test_least_recently_used_query_is_evicted(self, rag_framework):
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080", cache_size=2)
+        embedder._request = AsyncMock(side_effect=lambda text: [float(len(text))])
+
+        async def embed():
+            for query in ("a", "bb", "a", "ccc", "a", "bb"):
+                await embedder.embed_query(query)
+
+        asyncio.run(embed())
+
+        assert [call.args[0] for call in embedder._request.await_args_list] == ["a", "bb", "ccc", "bb"]
+        assert list(embedder._cache) == ["a", "bb"]
+
+    def test_cache_can_be_disabled(self, rag_framework):
+        embedder = rag_framework.LlamaCppEmbedder("http://embed:8080", cache_size=0)
+        embedder._request = AsyncMock(return_value=[1.0])
+
+        async def embed():
+            await embedder.embed_query("query")
+            await embedder.embed_query("query")
+
+        asyncio.run(embed())
+
+        assert embedder._request.await_count == 2
+        assert not embedder._cache
+
+
+class TestStreamCompletion:
+    def _service(self, rag_framework, stream):
+        service = object.__new__(rag_framework.RagService)
+        service.metrics = rag_framework.StageMetrics()
+        service._stream_llm = stream
+        return service
+
+    def _drain(self, rag_framework, service):
+        request = rag_framework.ChatCompletionRequest(model="granite", messages=[{"role": "user", "content": "hi"}])
+
+        async def drain():
+            response = await service._stream_completion("chatcmpl-1", 0, request, [])
+            return [line async for line in response.body_iterator]
+
+        return asyncio.run(drain())
+
+    def test_llm_time_is_recorded(self, rag_framework):
+        async def stream(*args):
+            yield "data: {}\n\n"
+
+        service = self._service(rag_framework, stream)
+
+        lines = self._drain(rag_framework, service)
+
+        assert lines[-1] == "data: [DONE]\n\n"
+        assert service.metrics.count["llm_total"] == 1
+
+    def test_llm_time_is_recorded_when_the_stream_fails(self, rag_framework):
+        async def stream(*args):
+            yield "data: {}\n\n"
+            raise ConnectionError("LLM went away")
+
+        service = self._service(rag_framework, stream)
+
+        with pytest.raises(ConnectionError):
+            self._drain(rag_framework, service)
+
+        assert service.metrics.count["llm_total"] == 1
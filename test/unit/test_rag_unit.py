@@ -1,10 +1,11 @@
 from argparse import Namespace
 from pathlib import Path
-from unittest.mock import MagicMock
+from subprocess import CalledProcessError
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ramalama.rag import RagSource, RagTransport
+from ramalama.rag import Rag, RagSource, RagTransport
 
 
 def _build_rag_transport(path: str, store: str, engine: str = "podman") -> RagTransport:
@@ -87,3 +88,26 @@ class TestRagTransportLocalhostPrefix:
         RagTransport(imodel=MagicMock(), cmd=[], args=args)
 
         assert args.rag == "localhost/myrag:latest"
+
+
+class TestRagSeedFromImage:
+    """Rag.seed_from_image copies an existing vector database out of the target image."""
+
+    def test_copies_vector_db(self, tmp_path: Path) -> None:
+        args = Namespace(engine="podman")
+        with patch("ramalama.rag.run_cmd") as mock_run:
+            assert Rag("myrag").seed_from_image(args, str(tmp_path))
+
+        cmds = [call.args[0] for call in mock_run.call_args_list]
+        assert cmds[0][:3] == ["podman", "create", "--name"]
+        assert "myrag" in cmds[0]
+        name = cmds[0][3]
+        assert cmds[1] == ["podman", "cp", f"{name}:/vector.db/.", str(tmp_path)]
+        assert cmds[2] == ["podman", "rm", name]
+
+    def test_missing_image(self, tmp_path: Path) -> None:
+        args = Namespace(engine="podman")
+        with patch("ramalama.rag.run_cmd", side_effect=CalledProcessError(125, "podman")) as mock_run:
+            assert not Rag("myrag").seed_from_image(args, str(tmp_path))
+
+        assert mock_run.call_count == 1
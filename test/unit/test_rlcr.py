@@ -210,7 +210,7 @@ class TestOCIArtifactDownload:
                 }
                 return manifest, "sha256:feedfacefeedfacefeedfacefeedfacefeedfacefeedfacefeedfacefeedface"
 
-            def download_blob(self, blob_digest, dest_path):
+            def download_blob(self, blob_digest, dest_path, size=None):
                 assert blob_digest == digest
                 data = b"test"
                 os.makedirs(os.path.dirname(dest_path), exist_ok=True)
@@ -2,6 +2,7 @@
 
 import argparse
 import json
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -62,6 +63,80 @@ class TestEnumerateStoreGgufModels:
         assert models == []
 
 
+# ---------------------------------------------------------------------------
+# Router manifest
+# ---------------------------------------------------------------------------
+
+
+class TestRouterManifest:
+    def setup_method(self):
+        self.plugin = LlamaCppPlugin()
+
+    @staticmethod
+    def pull(store, name, content):
+        from ramalama.model_store.snapshot_file import LocalSnapshotFile, SnapshotFileType
+        from ramalama.model_store.store import ModelStore
+
+        model_store = ModelStore(store, name, "huggingface", "org")
+        model_file = LocalSnapshotFile(content, f"{name}.gguf", SnapshotFileType.GGUFModel)
+        model_store.new_snapshot("latest", model_file.hash, [model_file], verify=False)
+        return model_store
+
+    def enumerate(self, store):
+        with patch(
+            "ramalama.plugins.runtimes.inference.llama_cpp.enumerate_store_gguf_models",
+            side_effect=enumerate_store_gguf_models,
+        ) as enumerate_models:
+            models = self.plugin._store_gguf_models(store)
+        return sorted(name for _, name in models), enumerate_models.called
+
+    def test_manifest_reused_until_refs_change(self, tmp_path):
+        from ramalama.model_store.global_store import GlobalModelStore
+
+        store = GlobalModelStore(str(tmp_path))
+        self.pull(store, "a", b"model a")
+
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf"], True)
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf"], False)
+
+        b = self.pull(store, "b", b"model b")
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf", "huggingface-org-b-latest.gguf"], True)
+
+        b.remove_snapshot("latest")
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf"], True)
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf"], False)
+
+    def test_manifest_invalidated_by_external_ref_changes(self, tmp_path):
+        from ramalama.model_store.global_store import GlobalModelStore
+
+        store = GlobalModelStore(str(tmp_path))
+        a = self.pull(store, "a", b"model a")
+        self.enumerate(store)
+
+        # a ref file written without going through the model store, e.g. by an older version
+        with open(a.get_ref_file_path("latest"), "rb") as ref:
+            content = ref.read()
+        with open(a.get_ref_file_path("copy"), "wb") as ref:
+            ref.write(content)
+
+        assert self.enumerate(store) == (["huggingface-org-a-copy.gguf", "huggingface-org-a-latest.gguf"], True)
+
+    def test_manifest_invalidated_by_model_copied_into_the_store(self, tmp_path):
+        import shutil
+
+        from ramalama.model_store.global_store import GlobalModelStore
+
+        store = GlobalModelStore(str(tmp_path))
+        a = self.pull(store, "a", b"model a")
+        self.enumerate(store)
+
+        # a model directory copied in by hand, without bumping the store generation
+        shutil.copytree(a.model_base_directory, os.path.join(store.path, "huggingface", "org", "b"), symlinks=True)
+
+        assert self.enumerate(store) == (["huggingface-org-a-latest.gguf", "huggingface-org-b-latest.gguf"], True)
+        assert self.enumerate(store)[1] is False
+
+
 # ---------------------------------------------------------------------------
 # Router mode in _cmd_run
 # ---------------------------------------------------------------------------
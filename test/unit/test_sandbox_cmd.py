@@ -1,4 +1,5 @@
 import json
+import time
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -519,3 +520,125 @@ def test_sandbox_prompt_default_none():
     """Sandbox cli should default ARGS to None when --prompt is not specified"""
     _, args = parse_args_from_cmd(["sandbox", "pi", TEST_MODEL])
     assert args.ARGS is None
+
+
+class _Recorder:
+    """Fake engine and server stand-ins recording the order of sandbox startup events."""
+
+    def __init__(self, monkeypatch, health_delay=0.2, health_error=None):
+        self.events: list[str] = []
+        self.health_delay = health_delay
+        self.health_error = health_error
+        recorder = self
+
+        class FakeModel:
+            model_alias = "tiny"
+
+            def ensure_model_exists(self, args):
+                recorder.events.append("pull")
+
+            def serve_nonblocking(self, args, cmd):
+                recorder.events.append("serve")
+
+            def wait_for_healthy(self, args):
+                time.sleep(recorder.health_delay)
+                if recorder.health_error:
+                    raise recorder.health_error
+                recorder.events.append("healthy")
+
+        monkeypatch.setattr("ramalama.sandbox.New", lambda model, args: FakeModel())
+        monkeypatch.setattr(
+            "ramalama.sandbox.get_runtime", lambda name: SimpleNamespace(handle_subcommand=lambda *a: ["llama-server"])
+        )
+        monkeypatch.setattr("ramalama.sandbox.start_prefetch", lambda engine, images: self.events.append("prefetch"))
+        monkeypatch.setattr("ramalama.sandbox.ensure_image", lambda *args, **kwargs: self.events.append("image"))
+        monkeypatch.setattr("ramalama.sandbox.run_cmd", lambda cmd, **kwargs: self.events.append(cmd[1]))
+        monkeypatch.setattr("ramalama.sandbox.stop_container", lambda *args, **kwargs: self.events.append("stop"))
+
+
+def _single_model_args():
+    args = _make_pi_args()
+    args.MODEL = "tiny"
+    args.port = "8080"
+    args.quiet = False
+    return args
+
+
+def test_single_model_agent_created_while_model_loads(monkeypatch, capsys):
+    from ramalama.sandbox import _run_sandbox_single_model
+
+    recorder = _Recorder(monkeypatch)
+    _run_sandbox_single_model(_single_model_args(), Pi)
+
+    events = recorder.events
+    assert events[:3] == ["prefetch", "pull", "serve"]
+    # the agent container exists before the server is ready and is only started afterwards
+    assert events.index("create") < events.index("healthy") < events.index("start")
+    assert events[-1] == "stop"
+    assert "rm" not in events and "run" not in events
+    assert "Time to first prompt" in capsys.readouterr().err
+
+
+def test_single_model_failure_removes_created_agent(monkeypatch):
+    from ramalama.sandbox import _run_sandbox_single_model
+
+    recorder = _Recorder(monkeypatch, health_error=ValueError("server exited"))
+    with pytest.raises(ValueError, match="server exited"):
+        _run_sandbox_single_model(_single_model_args(), Pi)
+
+    assert "start" not in recorder.events
+    assert recorder.events.index("create") < recorder.events.index("rm")
+    assert recorder.events[-1] == "stop"
+
+
+def _wait_for_router(monkeypatch, health, models):
+    """Run the router readiness check against scripted /health and /v1/models answers."""
+    runtime = SimpleNamespace(serve_router_nonblocking=lambda args: None)
+    monkeypatch.setattr("ramalama.sandbox.get_runtime", lambda runtime_name: runtime)
+    monkeypatch.setattr("ramalama.sandbox.start_prefetch", lambda engine, images: None)
+    monkeypatch.setattr("ramalama.sandbox.stop_container", lambda *args, **kwargs: None)
+    health = iter(health)
+    queries = []
+
+    def query(port):
+        queries.append(port)
+        return models
+
+    def wait(args, check):
+        while not check(args):
+            pass
+
+    monkeypatch.setattr("ramalama.sandbox._router_healthy", lambda port: next(health))
+    monkeypatch.setattr("ramalama.sandbox._query_router_models", query)
+    monkeypatch.setattr("ramalama.sandbox.wait_for_healthy", wait)
+    return queries
+
+
+def test_router_discovers_models_in_readiness_check(monkeypatch):
+    queries = _wait_for_router(monkeypatch, [False, False, True], ["model-a", "model-b"])
+    selected = {}
+
+    class FakeAgent(Agent):
+        def __init__(self, args, model_name):
+            selected["model_name"] = model_name
+
+        def run(self):
+            selected["ran"] = True
+
+    args = SimpleNamespace(dryrun=False, port=8080, name="router", quiet=True)
+    _run_sandbox_router(args, FakeAgent)  # type: ignore[arg-type]
+
+    # models are only listed once the router is healthy
+    assert len(queries) == 1
+    assert args.router_model_ids == ["model-a", "model-b"]
+    assert selected == {"model_name": "model-a", "ran": True}
+
+
+def test_healthy_router_without_models_fails_fast(monkeypatch):
+    queries = _wait_for_router(monkeypatch, [True], [])
+    args = SimpleNamespace(dryrun=False, port=8080, name="router", quiet=True)
+
+    with pytest.raises(ValueError, match="lists no models"):
+        _run_sandbox_router(args, Agent)  # type: ignore[arg-type]
+
+    assert len(queries) == 1
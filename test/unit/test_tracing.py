@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ramalama import tracing
+from ramalama.cli import parse_args_from_cmd
+from ramalama.engine import wait_for_healthy
+from ramalama.http_client import _trace_url, download_file
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = tracing.enable(str(tmp_path / "trace.json"))
+    yield tracer
+    tracing.disable()
+
+
+def written(tracer) -> list[dict]:
+    tracer.write()
+    with open(tracer.path) as f:
+        return json.load(f)["traceEvents"]
+
+
+def spans(events: list[dict]) -> dict[str, dict]:
+    return {event["name"]: event for event in events if event["ph"] == "X"}
+
+
+def test_disabled_hooks_do_nothing():
+    assert not tracing.enabled()
+    with tracing.span("pull", model="tiny") as span:
+        span.set(bytes=1)
+    tracing.mark("first token")
+
+    assert span is tracing.NOOP_SPAN
+
+
+def test_nested_spans_are_exported(tracer):
+    with tracing.span("pull", model="tiny"):
+        with tracing.span("download") as span:
+            span.set(bytes=1024)
+
+    events = spans(written(tracer))
+
+    pull, download = events["pull"], events["download"]
+    assert pull["args"] == {"model": "tiny"}
+    assert download["args"] == {"bytes": 1024}
+    assert pull["tid"] == download["tid"] == threading.get_ident()
+    assert pull["ts"] <= download["ts"]
+    assert download["ts"] + download["dur"] <= pull["ts"] + pull["dur"]
+
+
+def test_errors_are_recorded(tracer):
+    with pytest.raises(ValueError):
+        with tracing.span("pull"):
+            raise ValueError("no such model")
+
+    assert spans(written(tracer))["pull"]["args"]["error"] == "ValueError: no such model"
+
+
+def test_marks_and_thread_names(tracer):
+    thread = threading.Thread(target=tracing.mark, args=("first token",), name="chat")
+    thread.start()
+    thread.join()
+
+    events = written(tracer)
+
+    assert [event["ph"] for event in events] == ["M", "i"]
+    assert events[0]["args"] == {"name": "chat"}
+    assert events[1]["name"] == "first token"
+
+
+def test_events_beyond_the_limit_are_counted(tracer, monkeypatch):
+    monkeypatch.setattr(tracing, "MAX_EVENTS", 3)
+    for _ in range(4):
+        tracing.mark("token")
+
+    tracer.write()
+    with open(tracer.path) as f:
+        trace = json.load(f)
+
+    assert len(trace["traceEvents"]) == 3
+    assert trace["otherData"] == {"dropped_events": 2}
+
+
+def test_trace_of_a_child_process_is_merged(tracer):
+    child = {"ph": "X", "name": "daemon.proxy", "pid": tracer.pid + 1, "tid": 1, "ts": 0, "dur": 1, "args": {}}
+    with open(tracer.path, "w") as f:
+        json.dump({"traceEvents": [child]}, f)
+    tracing.mark("done")
+
+    assert [event["name"] for event in written(tracer)] == ["daemon.proxy", "thread_name", "done"]
+
+
+def test_trace_of_an_earlier_run_is_replaced(tracer):
+    with open(tracer.path, "w") as f:
+        json.dump({"traceEvents": [{"ph": "i", "name": "old", "pid": 1}]}, f)
+    os.utime(tracer.path, ns=(0, 0))
+
+    assert "old" not in {event["name"] for event in written(tracer)}
+
+
+def test_download_is_traced(tracer, tmp_path):
+    response = MagicMock(status=200)
+    response.getheader.return_value = "5"
+    response.read.side_effect = [b"hello", b""]
+
+    with patch("ramalama.http_client.urllib.request.urlopen", return_value=response):
+        download_file("https://example.com/model.gguf?token=secret", str(tmp_path / "model.gguf"))
+
+    events = spans(written(tracer))
+    assert events["http.download"]["args"] == {
+        "url": "https://example.com/model.gguf",
+        "file": "model.gguf",
+        "retries": 0,
+    }
+    assert events["http.connect"]["args"] == {"resume_from": 0, "status": 200}
+    assert events["http.transfer"]["args"] == {"bytes": 5}
+
+
+def test_trace_url_drops_query():
+    assert _trace_url("https://cdn.example.com/blob?X-Amz-Signature=abc#frag") == "https://cdn.example.com/blob"
+
+
+def test_wait_for_healthy_is_traced(tracer):
+    probes = iter([ConnectionError("refused"), True])
+
+    def health(args):
+        result = next(probes)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    args = SimpleNamespace(name="server", container=False, debug=True, server_process=None)
+    wait_for_healthy(args, health, timeout=5)
+
+    assert spans(written(tracer))["server.wait_for_healthy"]["args"] == {"timeout": 5, "failed_probes": 1}
+
+
+@pytest.mark.parametrize("cmd,env", [(["--trace", "/tmp/trace.json"], ""), ([], "/tmp/trace.json")])
+def test_trace_option(cmd, env, monkeypatch):
+    monkeypatch.setenv("RAMALAMA_TRACE", env)
+
+    _, args = parse_args_from_cmd(cmd + ["version"])
+
+    assert args.trace == "/tmp/trace.json"